@@ -1,7 +1,11 @@
 """SDK Python pour simplifier l'utilisation de l'API Entrepôt Géoplateforme."""
 
+# pylint: disable=too-many-lines
+
 import sys
 import argparse
+import concurrent.futures
+import functools
 import traceback
 from pathlib import Path
 import shutil
@@ -139,16 +143,20 @@ class Main:
         o_sub_parser.add_argument("--folder", "-f", type=str, default=None, help="Dossier où enregistrer le dataset")
 
         # Parser pour workflow
-        s_epilog_workflow = """quatre types de lancement :
+        s_epilog_workflow = """cinq types de lancement :
         * liste des exemples de workflow disponibles : `` (aucun arguments)
         * Récupération d'un workflow exemple : `--name NAME`
         * Vérification de la structure du fichier workflow et affichage des étapes : `--file FILE`
         * Lancement l'une étape d'un workflow: `--file FILE --step STEP [--behavior BEHAVIOR]`
+        * Lancement de toutes les étapes d'un workflow: `--file FILE --all [--max-parallel-steps N] [--continue-on-error] [--behavior BEHAVIOR]`
         """
         o_sub_parser = o_sub_parsers.add_parser("workflow", help="Workflow (lancement, vérification)", epilog=s_epilog_workflow, formatter_class=argparse.RawTextHelpFormatter)
         o_sub_parser.add_argument("--file", "-f", type=str, default=None, help="Chemin du fichier à utiliser OU chemin où extraire le dataset")
         o_sub_parser.add_argument("--name", "-n", type=str, default=None, help="Nom du workflow à extraire")
         o_sub_parser.add_argument("--step", "-s", type=str, default=None, help="Étape du workflow à lancer")
+        o_sub_parser.add_argument("--all", "-a", action="store_true", help="Lance toutes les étapes du workflow (en parallèle selon leurs parents)")
+        o_sub_parser.add_argument("--max-parallel-steps", type=int, default=None, help="Nombre maximal d'étapes lancées en même temps avec --all")
+        o_sub_parser.add_argument("--continue-on-error", action="store_true", default=None, help="Avec --all, poursuit les étapes indépendantes si une étape échoue")
         o_sub_parser.add_argument("--behavior", "-b", choices=ProcessingExecutionAction.BEHAVIORS, default=None, help="Action à effectuer si l'exécution de traitement existe déjà")
         o_sub_parser.add_argument("--tag", "-t", type=str, nargs=2, action="append", metavar=("Clef", "Valeur"), default=[], help="Tag à ajouter aux actions (plusieurs tags possible)")
         o_sub_parser.add_argument(
@@ -351,6 +359,16 @@ class Main:
             Config().om.error(message_ko.format(upload=upload))
         return b_res
 
+    @staticmethod
+    def __print_check_message(upload: Upload, message: str) -> None:
+        """Affiche le message de suivi des vérifications d'une livraison (plusieurs livraisons sont suivies en même temps).
+
+        Args:
+            upload (Upload): livraison suivie
+            message (str): message de suivi
+        """
+        print(f"{upload} : {message}")
+
     @staticmethod
     def upload_from_descriptor_file(
         file: Union[Path, str],
@@ -396,25 +414,29 @@ class Main:
                 Config().om.error(f"livraison {s_nom} : {e}")
                 Config().om.debug(traceback.format_exc())
 
-        # vérification des livraisons
+        # vérification des livraisons : toutes les livraisons sont suivies en même temps
         Config().om.info("Fin des livraisons.", green_colored=True)
         Config().om.info("Suivi des vérifications :", green_colored=True)
-        l_check_ko = []
-        l_check_ok = []
-        for o_upload in l_uploads:
-            Config().om.info(f"{Color.BLUE} * {o_upload}{Color.END}")
-            b_res = Main.__monitoring_upload(
-                o_upload,
-                "Livraison {upload} créée avec succès.",
-                "Livraison {upload} créée en erreur !",
-                print,
-                Main.ctrl_c_upload,
-                mode_cartes,
-            )
-            if b_res:
-                l_check_ok.append(o_upload)
-            else:
-                l_check_ko.append(o_upload)
+        d_futures = {UploadAction.monitor_in_background(o_upload, functools.partial(Main.__print_check_message, o_upload), mode_cartes): o_upload for o_upload in l_uploads}
+        s_pending = set(d_futures)
+        while s_pending:
+            try:
+                # on traite chaque livraison dès que ses vérifications sont terminées
+                l_done, s_pending = concurrent.futures.wait(s_pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for o_future in l_done:
+                    if o_future.result():
+                        Config().om.info(f"Livraison {d_futures[o_future]} créée avec succès.", green_colored=True)
+                    else:
+                        Config().om.error(f"Livraison {d_futures[o_future]} créée en erreur !")
+            except KeyboardInterrupt:
+                if Main.ctrl_c_upload():
+                    # on arrête le suivi et les vérifications non terminées
+                    for o_future in s_pending:
+                        o_future.cancel()
+                        UploadAction.interrupt_checks(d_futures[o_future])
+                    raise
+        l_check_ok = [o_upload for o_future, o_upload in d_futures.items() if o_future.result()]
+        l_check_ko = [o_upload for o_future, o_upload in d_futures.items() if not o_future.result()]
         Config().om.info("Fin des vérifications.", green_colored=True)
 
         return {
@@ -509,8 +531,8 @@ class Main:
         else:
             d_infos_filter = StoreEntity.filter_dict_from_str(self.o_args.infos)
             d_tags_filter = StoreEntity.filter_dict_from_str(self.o_args.tags)
-            l_uploads = Upload.api_list(infos_filter=d_infos_filter, tags_filter=d_tags_filter, datastore=self.datastore)
-            for o_upload in l_uploads:
+            # affichage au fur et à mesure de la récupération des pages
+            for o_upload in Upload.api_iter(infos_filter=d_infos_filter, tags_filter=d_tags_filter, datastore=self.datastore):
                 Config().om.info(f"{o_upload}")
 
     def dataset(self) -> None:
@@ -623,7 +645,7 @@ class Main:
             Config().om.info(f"Ouverture du workflow {p_workflow}...")
             o_workflow = Workflow(p_workflow.stem, JsonHelper.load(p_workflow))
             # Y'a-t-il une étape d'indiquée
-            if self.o_args.step is None:
+            if self.o_args.step is None and not self.o_args.all:
                 # Si pas d'étape indiquée, on valide le workflow
                 Config().om.info("Validation du workflow...")
                 l_errors = o_workflow.validate()
@@ -641,33 +663,8 @@ class Main:
                     Config().om.info(f"   * {s_step}")
 
             else:
-                # Sinon, on définit des résolveurs
-                GlobalResolver().add_resolver(StoreEntityResolver("store_entity"))
-                GlobalResolver().add_resolver(UserResolver("user"))
-                GlobalResolver().add_resolver(DateResolver("datetime"))
-                # Résolveur params qui permet d'accéder aux paramètres supplémentaires passés par l'utilisateur
-                GlobalResolver().add_resolver(DictResolver("params", {x[0]: x[1] for x in self.o_args.params}))
-
-                # le comportement
-                s_behavior = str(self.o_args.behavior).upper() if self.o_args.behavior is not None else None
-                # on reset l'afficheur de log
-                PrintLogHelper.reset()
-
-                # et on lance l'étape en précisant l'afficheur de log et le comportement
-                def callback_run_step(processing_execution: ProcessingExecution) -> None:
-                    """fonction callback pour l'affichage des logs lors du suivi d'un traitement
-
-                    Args:
-                        processing_execution (ProcessingExecution): processing exécution en cours
-                    """
-                    try:
-                        PrintLogHelper.print(processing_execution.api_logs())
-                    except Exception:
-                        PrintLogHelper.print("Logs indisponibles pour le moment...")
-
-                # on lance le monitoring de l'étape en précisant la gestion du ctrl-C
-                d_tags = {l_el[0]: l_el[1] for l_el in self.o_args.tag}
-                o_workflow.run_step(self.o_args.step, callback_run_step, self.ctrl_c_action, behavior=s_behavior, datastore=self.datastore, comments=self.o_args.comment, tags=d_tags)
+                # Sinon, on lance l'étape (ou toutes les étapes)
+                self.__run_workflow(o_workflow)
 
         else:
             l_children: List[str] = []
@@ -676,6 +673,48 @@ class Main:
                     l_children.append(p_child.name)
             print("Jeux de données disponibles :\n   * {}".format("\n   * ".join(l_children)))
 
+    def __run_workflow(self, o_workflow: Workflow) -> None:
+        """Lance l'étape demandée du workflow (ou toutes ses étapes).
+
+        Args:
+            o_workflow (Workflow): workflow à lancer
+        """
+        # On définit des résolveurs
+        GlobalResolver().add_resolver(StoreEntityResolver("store_entity"))
+        GlobalResolver().add_resolver(UserResolver("user"))
+        GlobalResolver().add_resolver(DateResolver("datetime"))
+        # Résolveur params qui permet d'accéder aux paramètres supplémentaires passés par l'utilisateur
+        GlobalResolver().add_resolver(DictResolver("params", {x[0]: x[1] for x in self.o_args.params}))
+
+        # le comportement
+        s_behavior = str(self.o_args.behavior).upper() if self.o_args.behavior is not None else None
+        # on reset l'afficheur de log
+        PrintLogHelper.reset()
+
+        # et on lance l'étape en précisant l'afficheur de log et le comportement
+        def callback_run_step(processing_execution: ProcessingExecution) -> None:
+            """fonction callback pour l'affichage des logs lors du suivi d'un traitement
+
+            Args:
+                processing_execution (ProcessingExecution): processing exécution en cours
+            """
+            try:
+                if self.o_args.all:
+                    # plusieurs exécutions peuvent être suivies en même temps : logs affichés par exécution
+                    PrintLogHelper.print_by_key(processing_execution.id, processing_execution.api_logs())
+                else:
+                    PrintLogHelper.print(processing_execution.api_logs())
+            except Exception:
+                PrintLogHelper.print("Logs indisponibles pour le moment...")
+
+        # on lance le monitoring de l'étape (ou de toutes les étapes) en précisant la gestion du ctrl-C
+        d_tags = {l_el[0]: l_el[1] for l_el in self.o_args.tag}
+        d_run_args = {"behavior": s_behavior, "datastore": self.datastore, "comments": self.o_args.comment, "tags": d_tags}
+        if self.o_args.all:
+            o_workflow.run_all(callback_run_step, self.ctrl_c_action, max_parallel_steps=self.o_args.max_parallel_steps, continue_on_error=self.o_args.continue_on_error, **d_run_args)
+        else:
+            o_workflow.run_step(self.o_args.step, callback_run_step, self.ctrl_c_action, **d_run_args)
+
     def delete(self) -> None:
         """suppression d'une entité par son type et son id"""
         # création du workflow pour l'action de suppression
@@ -741,8 +780,7 @@ class Main:
         else:
             # on liste toutes les annexes selon les filtres
             d_infos_filter = StoreEntity.filter_dict_from_str(self.o_args.infos)
-            l_annexes = Annexe.api_list(infos_filter=d_infos_filter, datastore=self.datastore)
-            for o_annexe in l_annexes:
+            for o_annexe in Annexe.api_iter(infos_filter=d_infos_filter, datastore=self.datastore):
                 Config().om.info(f"{o_annexe}")
 
     @staticmethod
@@ -793,8 +831,7 @@ class Main:
         else:
             # on liste toutes les fichiers static selon les filtres
             d_infos_filter = StoreEntity.filter_dict_from_str(self.o_args.infos)
-            l_statics = Static.api_list(infos_filter=d_infos_filter, datastore=self.datastore)
-            for o_static in l_statics:
+            for o_static in Static.api_iter(infos_filter=d_infos_filter, datastore=self.datastore):
                 Config().om.info(f"{o_static}")
 
     @staticmethod
@@ -853,8 +890,7 @@ class Main:
         else:
             # on liste toutes les fichiers métadonnées selon les filtres
             d_infos_filter = StoreEntity.filter_dict_from_str(self.o_args.infos)
-            l_metadatas = Metadata.api_list(infos_filter=d_infos_filter, datastore=self.datastore)
-            for o_metadata in l_metadatas:
+            for o_metadata in Metadata.api_iter(infos_filter=d_infos_filter, datastore=self.datastore):
                 Config().om.info(f"{o_metadata}")
 
     @staticmethod
@@ -1,4 +1,5 @@
 import datetime
+import threading
 import time
 import traceback
 from http import HTTPStatus
@@ -8,8 +9,10 @@ import pyotp
 
 from sdk_entrepot_gpf.pattern.Singleton import Singleton
 from sdk_entrepot_gpf.auth.Token import Token
+from sdk_entrepot_gpf.auth.TokenCache import TokenCache
 from sdk_entrepot_gpf.auth.Errors import AuthentificationError
 from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.HttpSession import HttpSession
 
 
 class Authentifier(metaclass=Singleton):
@@ -23,6 +26,9 @@ class Authentifier(metaclass=Singleton):
         __nb_attempts (int): nombre de tentatives possibles en cas de problème rencontré pendant la récupération du jeton
         __sec_between_attempt (int): nombre de secondes entre deux tentatives en cas de problème rencontré pendant la récupération du jeton
         __last_token (Token): sauvegarde du dernier jeton récupéré (pour éviter de multiples requêtes au serveur KeyCloak)
+        __token_cache (Optional[TokenCache]): cache sur disque des jetons, partagé entre processus (None si désactivé)
+        __refresh_ahead_ratio (float): part de la durée de vie du jeton au-delà de laquelle il est renouvelé en arrière-plan
+        __renew_lock (threading.Lock): verrou garantissant un seul renouvellement de jeton à la fois
     """
 
     def __init__(self) -> None:
@@ -43,6 +49,11 @@ class Authentifier(metaclass=Singleton):
         }
         # Permettra la sauvegarde du dernier jeton récupéré (pour éviter de multiples requêtes au serveur KeyCloak)
         self.__last_token: Optional[Token] = None
+        # Cache des jetons sur disque (optionnel)
+        self.__token_cache: Optional[TokenCache] = TokenCache.from_config()
+        # Renouvellement anticipé (en arrière-plan) du jeton, un seul renouvellement à la fois
+        self.__refresh_ahead_ratio: float = Config().get_float("store_authentification", "refresh_ahead_ratio", 0.8)
+        self.__renew_lock = threading.Lock()
 
     def __get_request_params(self) -> Dict[str, str]:
         """Lit la config, la compile et renvoie un dictionnaire contenant les prams de connection.
@@ -90,8 +101,8 @@ class Authentifier(metaclass=Singleton):
                 d_data["totp"] = self.__totp.now()
                 # On affiche le TOTP Code en mode debug :
                 Config().om.debug(f"TOTP code : {d_data['totp']} ({datetime.datetime.now():%H:%M:%S})")
-            # Requête KeyCloak de récupération du jeton
-            o_response = requests.post(
+            # Requête KeyCloak de récupération du jeton (via la session partagée pour réutiliser les connexions)
+            o_response = HttpSession().session.post(
                 self.__token_url,
                 data=d_data,
                 headers={
@@ -140,6 +151,91 @@ class Authentifier(metaclass=Singleton):
                 # On propage l'erreur
                 raise e_error
 
+    def __request_refreshed_token(self, refresh_string: str) -> bool:
+        """Récupère un nouveau jeton à partir d'un jeton de rafraîchissement (`grant_type=refresh_token`) et le sauvegarde.
+
+        Une seule tentative est faite : en cas d'échec, l'appelant se ré-authentifie complètement.
+
+        Args:
+            refresh_string (str): jeton de rafraîchissement
+
+        Returns:
+            bool: True si un nouveau jeton a été récupéré
+        """
+        d_data = {"grant_type": "refresh_token", "refresh_token": refresh_string, "client_id": self.__request_params["client_id"]}
+        if "client_secret" in self.__request_params:
+            d_data["client_secret"] = self.__request_params["client_secret"]
+        try:
+            o_response = HttpSession().session.post(
+                self.__token_url,
+                data=d_data,
+                headers={
+                    "content-type": "application/x-www-form-urlencoded",
+                },
+                proxies=self.__proxy,
+            )
+            if o_response.status_code == HTTPStatus.OK:
+                self.__last_token = Token(o_response.json())
+                Config().om.debug("Jeton d'authentification rafraîchi.")
+                return True
+            Config().om.debug(f"Rafraîchissement du jeton d'authentification refusé (code retour {o_response.status_code}), nouvelle authentification.")
+        except Exception as e_error:
+            Config().om.debug(f"Rafraîchissement du jeton d'authentification impossible ({e_error}), nouvelle authentification.")
+        return False
+
+    def __renew_token(self) -> None:
+        """Récupère un nouveau jeton et le sauvegarde.
+
+        Si le cache sur disque est activé, le jeton d'un autre processus est réutilisé s'il est encore valide.
+        Sinon le jeton est rafraîchi si un jeton de rafraîchissement valide est connu, et récupéré de zéro en dernier recours.
+        """
+        if self.__token_cache is None:
+            self.__renew_token_from(self.__last_token)
+            return
+        with self.__token_cache.lock():
+            o_cached_token = self.__token_cache.load()
+            if o_cached_token is not None and o_cached_token.is_valid() and not self.__needs_refresh(o_cached_token):
+                Config().om.debug("Jeton d'authentification lu dans le cache.")
+                self.__last_token = o_cached_token
+                return
+            self.__renew_token_from(o_cached_token or self.__last_token)
+            if self.__last_token is not None:
+                self.__token_cache.save(self.__last_token)
+
+    def __renew_token_from(self, old_token: Optional[Token]) -> None:
+        """Rafraîchit le jeton si possible, sinon en récupère un nouveau de zéro.
+
+        Args:
+            old_token (Optional[Token]): ancien jeton (pour son jeton de rafraîchissement)
+        """
+        s_refresh = old_token.get_refresh_string() if old_token is not None else None
+        if s_refresh is None or not self.__request_refreshed_token(s_refresh):
+            self.__request_new_token(self.__nb_attempts)
+
+    def __needs_refresh(self, token: Token) -> bool:
+        """Indique si le jeton doit être renouvelé par anticipation (`store_authentification.refresh_ahead_ratio`).
+
+        Args:
+            token (Token): jeton
+
+        Returns:
+            bool: True si le jeton doit être renouvelé
+        """
+        return 0 < self.__refresh_ahead_ratio < 1 and token.needs_refresh(self.__refresh_ahead_ratio)
+
+    def __renew_in_background(self) -> None:
+        """Renouvelle le jeton encore valide ; le verrou `__renew_lock` est pris par l'appelant et relâché ici.
+
+        En cas d'échec, le jeton courant reste utilisé jusqu'à son expiration.
+        """
+        try:
+            self.__renew_token()
+        except Exception as e_error:
+            Config().om.warning(f"Le renouvellement anticipé du jeton d'authentification a échoué ({e_error}), nouvel essai à l'expiration du jeton.")
+            Config().om.debug(traceback.format_exc())
+        finally:
+            self.__renew_lock.release()
+
     def get_access_token_string(self) -> str:
         """Retourne le jeton d'authentification sous forme de chaîne de caractères.
 
@@ -150,9 +246,18 @@ class Authentifier(metaclass=Singleton):
             AuthentificationError : Levée si la récupération de jeton échoue au bout de `nb_attempts` tentatives
         """
         try:
-            while (self.__last_token is None) or (self.__last_token.is_valid() is False):
-                self.__request_new_token(self.__nb_attempts)
-            return self.__last_token.get_access_string()
+            o_token = self.__last_token
+            if o_token is not None and o_token.is_valid():
+                # Jeton valide : s'il arrive en fin de vie, un seul thread lance son renouvellement en arrière-plan,
+                # le jeton courant reste utilisé en attendant
+                if self.__needs_refresh(o_token) and self.__renew_lock.acquire(blocking=False):  # pylint: disable=consider-using-with
+                    threading.Thread(target=self.__renew_in_background, name="token-refresh", daemon=True).start()
+                return o_token.get_access_string()
+            # Pas de jeton valide : un seul thread le renouvelle, les autres attendent puis utilisent le nouveau jeton
+            with self.__renew_lock:
+                while (self.__last_token is None) or (self.__last_token.is_valid() is False):
+                    self.__renew_token()
+                return self.__last_token.get_access_string()
         except AuthentificationError as e_auth:
             # erreur déjà traité
             Config().om.error(e_auth.message)
@@ -181,6 +286,17 @@ class Authentifier(metaclass=Singleton):
             d_http_header["content-type"] = "application/json"
         return d_http_header
 
-    def revoke_token(self) -> None:
-        """Révoque le token actuellement utilisé pour forcer la récupération d'un nouveau token."""
+    def revoke_token(self, access_string: Optional[str] = None) -> None:
+        """Révoque le token actuellement utilisé pour forcer la récupération d'un nouveau token (il est aussi retiré du cache sur disque).
+
+        Args:
+            access_string (Optional[str], optional): jeton refusé ; si précisé, il n'est révoqué que s'il est toujours
+                le jeton courant (plusieurs requêtes refusées avec le même jeton ne provoquent qu'un renouvellement).
+        """
+        o_token = self.__last_token
+        if o_token is None or (access_string is not None and o_token.get_access_string() != access_string):
+            return
+        if self.__token_cache is not None:
+            with self.__token_cache.lock():
+                self.__token_cache.remove(o_token.get_access_string())
         self.__last_token = None
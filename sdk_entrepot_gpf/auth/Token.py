@@ -1,6 +1,6 @@
 from datetime import datetime
 from datetime import timedelta
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 
 class Token:
@@ -8,17 +8,26 @@ class Token:
 
     Attributes:
         __token_dict (dict): Stockage du jeton `{"access_token": "valeur-du-jeton", "expires_in": temps-en-secondes}`
+        __issued_at (datetime): Date de récupération du jeton
         __expiration_date (datetime): Date d'expiration du jeton
+        __refresh_expiration_date (Optional[datetime]): Date d'expiration du jeton de rafraîchissement (si fourni)
     """
 
-    def __init__(self, token_dict: Dict[str, Any]) -> None:
+    def __init__(self, token_dict: Dict[str, Any], issued_at: Optional[datetime] = None) -> None:
         """À l'instanciation : on stocke l'ensemble d'informations clé-valeur et on calcule la date d'expiration à partir de son délai d'expiration.
 
         Args:
             token_dict (dict): Jeton tel que renvoyé par le service d'authentification : `{"access_token": "valeur-du-jeton", "expires_in": temps-en-secondes}`
+            issued_at (Optional[datetime]): Date de récupération du jeton (maintenant si None, à préciser pour un jeton relu depuis le cache)
         """
         self.__token_dict: Dict[str, Any] = token_dict
-        self.__expiration_date: datetime = datetime.now() + timedelta(seconds=token_dict["expires_in"])
+        self.__issued_at: datetime = issued_at if issued_at is not None else datetime.now()
+        self.__expiration_date: datetime = self.__issued_at + timedelta(seconds=token_dict["expires_in"])
+        self.__refresh_expiration_date: Optional[datetime] = None
+        if token_dict.get("refresh_token"):
+            # Keycloak indique la durée de vie du jeton de rafraîchissement (0 : jeton hors ligne, sans expiration)
+            i_refresh_expires_in = int(token_dict.get("refresh_expires_in", 0))
+            self.__refresh_expiration_date = self.__issued_at + timedelta(seconds=i_refresh_expires_in) if i_refresh_expires_in > 0 else datetime.max
 
     def is_valid(self) -> bool:
         """Indique si le jeton est valide par rapport à sa date d'expiration.
@@ -28,6 +37,17 @@ class Token:
         """
         return datetime.now() < self.__expiration_date
 
+    def needs_refresh(self, ratio: float) -> bool:
+        """Indique si le jeton a dépassé la part indiquée de sa durée de vie et doit être renouvelé par anticipation.
+
+        Args:
+            ratio (float): part de la durée de vie (entre 0 et 1) au-delà de laquelle renouveler le jeton
+
+        Returns:
+            bool: `True` si le jeton doit être renouvelé
+        """
+        return datetime.now() >= self.__issued_at + (self.__expiration_date - self.__issued_at) * ratio
+
     def get_access_string(self) -> str:
         """Retourne le jeton d'authentification sous forme de chaîne de caractères.
 
@@ -35,3 +55,33 @@ class Token:
             str: Jeton d'accès
         """
         return str(self.__token_dict["access_token"])
+
+    def get_refresh_string(self) -> Optional[str]:
+        """Retourne le jeton de rafraîchissement s'il est fourni et encore valide.
+
+        Returns:
+            Optional[str]: Jeton de rafraîchissement, None si absent ou expiré
+        """
+        if self.__refresh_expiration_date is None or datetime.now() >= self.__refresh_expiration_date:
+            return None
+        return str(self.__token_dict["refresh_token"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sérialise le jeton (par exemple pour le cache de jetons sur disque).
+
+        Returns:
+            Dict[str, Any]: `{"token": jeton tel que renvoyé par le service d'authentification, "issued_at": date de récupération ISO 8601}`
+        """
+        return {"token": self.__token_dict, "issued_at": self.__issued_at.isoformat()}
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "Token":
+        """Instancie un jeton sérialisé par `to_dict`.
+
+        Args:
+            data (Dict[str, Any]): jeton sérialisé
+
+        Returns:
+            Token: jeton
+        """
+        return Token(data["token"], datetime.fromisoformat(data["issued_at"]))
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from sdk_entrepot_gpf.auth.Token import Token
+from sdk_entrepot_gpf.io.Config import Config
+
+if sys.platform == "win32":
+    import msvcrt  # pylint: disable=import-error
+else:
+    import fcntl
+
+
+class TokenCache:
+    """Cache sur disque des jetons d'authentification, partagé entre les processus d'un même utilisateur.
+
+    Le fichier (JSON, droits 0600) associe à chaque compte (url d'authentification, client et login) le dernier
+    jeton récupéré, jeton de rafraîchissement compris : un nouveau processus réutilise le jeton encore valide
+    ou le rafraîchit au lieu de se ré-authentifier. Les accès sont sérialisés par un verrou sur le fichier `<chemin>.lock`.
+
+    Attributes:
+        __path (Path): chemin du fichier de cache
+        __key (str): clef du compte dans le fichier de cache
+        __lock (threading.Lock): verrou entre les threads du processus (le verrou sur fichier ne les distingue pas)
+    """
+
+    def __init__(self, path: Path, token_url: str, client_id: str, login: str) -> None:
+        """Constructeur.
+
+        Args:
+            path (Path): chemin du fichier de cache
+            token_url (str): url de récupération des jetons
+            client_id (str): identifiant du client
+            login (str): login du compte (vide pour une authentification `client_credentials`)
+        """
+        self.__path = path
+        self.__key = hashlib.sha256(f"{token_url}|{client_id}|{login}".encode("utf-8")).hexdigest()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def from_config() -> Optional["TokenCache"]:
+        """Instancie le cache selon la configuration (`store_authentification.token_cache_file`).
+
+        Returns:
+            Optional[TokenCache]: cache des jetons, None si le paramètre est vide (cache désactivé)
+        """
+        s_path = Config().get("store_authentification", "token_cache_file")
+        if not s_path:
+            return None
+        return TokenCache(
+            Path(s_path).expanduser(),
+            Config().get_str("store_authentification", "token_url"),
+            Config().get_str("store_authentification", "client_id"),
+            Config().get("store_authentification", "login", "") or "",
+        )
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Verrouille le cache (entre threads et entre processus) le temps d'une lecture, d'un renouvellement et d'une écriture.
+
+        Yields:
+            Iterator[None]: verrou pris
+        """
+        with self.__lock:
+            self.__path.parent.mkdir(parents=True, exist_ok=True)
+            i_fd = os.open(f"{self.__path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if sys.platform == "win32":
+                    # LK_LOCK abandonne au bout de 10 secondes : on insiste
+                    while True:
+                        try:
+                            msvcrt.locking(i_fd, msvcrt.LK_LOCK, 1)
+                            break
+                        except OSError:
+                            continue
+                else:
+                    fcntl.flock(i_fd, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if sys.platform == "win32":
+                        os.lseek(i_fd, 0, os.SEEK_SET)
+                        msvcrt.locking(i_fd, msvcrt.LK_UNLCK, 1)
+                    else:
+                        fcntl.flock(i_fd, fcntl.LOCK_UN)
+            finally:
+                os.close(i_fd)
+
+    def load(self) -> Optional[Token]:
+        """Lit le jeton du compte dans le cache (le verrou doit être pris).
+
+        Returns:
+            Optional[Token]: jeton en cache, None si absent ou illisible
+        """
+        d_data = self.__read()
+        if self.__key not in d_data:
+            return None
+        try:
+            return Token.from_dict(d_data[self.__key])
+        except (KeyError, TypeError, ValueError):
+            Config().om.debug(f"Jeton illisible dans le cache {self.__path}, il est ignoré.")
+            return None
+
+    def save(self, token: Token) -> None:
+        """Enregistre le jeton du compte dans le cache (le verrou doit être pris).
+
+        Args:
+            token (Token): jeton à enregistrer
+        """
+        d_data = self.__read()
+        d_data[self.__key] = token.to_dict()
+        self.__write(d_data)
+
+    def remove(self, access_string: Optional[str] = None) -> None:
+        """Retire le jeton du compte du cache (le verrou doit être pris).
+
+        Args:
+            access_string (Optional[str], optional): si précisé, le jeton n'est retiré que s'il correspond
+                (pour ne pas retirer un jeton renouvelé entre temps par un autre processus).
+        """
+        d_data = self.__read()
+        if self.__key not in d_data:
+            return
+        if access_string is not None:
+            o_token = self.load()
+            if o_token is not None and o_token.get_access_string() != access_string:
+                return
+        del d_data[self.__key]
+        self.__write(d_data)
+
+    def __read(self) -> Dict[str, Any]:
+        """Lit le fichier de cache.
+
+        Returns:
+            Dict[str, Any]: contenu du cache (vide si le fichier est absent ou illisible)
+        """
+        try:
+            d_data = json.loads(self.__path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            Config().om.warning(f"Le cache des jetons d'authentification ({self.__path}) est illisible, il sera réinitialisé.")
+            return {}
+        return d_data if isinstance(d_data, dict) else {}
+
+    def __write(self, data: Dict[str, Any]) -> None:
+        """Écrit le fichier de cache de manière atomique (fichier temporaire en 0600 puis renommage).
+
+        Args:
+            data (Dict[str, Any]): contenu du cache
+        """
+        # mkstemp crée le fichier avec les droits 0600
+        i_fd, s_tmp_path = tempfile.mkstemp(dir=self.__path.parent, prefix=f".{self.__path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(i_fd, "w", encoding="utf-8") as o_file:
+                json.dump(data, o_file)
+            os.replace(s_tmp_path, self.__path)
+        except BaseException:
+            Path(s_tmp_path).unlink(missing_ok=True)
+            raise
@@ -2,6 +2,7 @@ from pathlib import Path
 import hashlib
 
 from sdk_entrepot_gpf.Errors import GpfSdkError
+from sdk_entrepot_gpf.io.HashCache import HashCache
 
 
 class FileHelper:
@@ -59,7 +60,8 @@ class FileHelper:
     @staticmethod
     def md5_hash(file_path: Path) -> str:
         """
-        Méthode permettant de calculer la clef md5 d'un fichier
+        Méthode permettant de calculer la clef md5 d'un fichier.
+        La clef est lue dans le cache des empreintes (`HashCache`) si le fichier n'a pas changé depuis son dernier calcul.
 
         Args:
             file_path (Path): chemin d'un fichier
@@ -67,8 +69,34 @@ class FileHelper:
         Returns:
             str: clef md5 du fichier
         """
-        s_file_hash = hashlib.md5()
-        with file_path.open("rb") as o_file:
-            for o_chunk in iter(lambda: o_file.read(4096), b""):
-                s_file_hash.update(o_chunk)
+        s_md5 = HashCache().get(file_path, "md5")
+        if s_md5 is None:
+            o_stat = file_path.stat()
+            s_md5 = FileHelper.file_hash(file_path, "md5")
+            HashCache().put(file_path, "md5", s_md5, o_stat)
+        return s_md5
+
+    @staticmethod
+    def file_hash(file_path: Path, algorithm: str, buffer_size: int = 1048576) -> str:
+        """
+        Méthode permettant de calculer l'empreinte d'un fichier selon l'algorithme indiqué.
+        Le fichier est lu par blocs dans un tampon réutilisé ; `hashlib` libère le GIL pendant le calcul,
+        plusieurs fichiers peuvent donc être traités en parallèle par des threads.
+
+        Args:
+            file_path (Path): chemin d'un fichier
+            algorithm (str): algorithme de hachage (nom compris par `hashlib.new` : md5, sha256...)
+            buffer_size (int, optional): taille (en octets) des blocs lus. Defaults to 1048576.
+
+        Returns:
+            str: empreinte du fichier (hexadécimal)
+        """
+        s_file_hash = hashlib.new(algorithm)
+        b_buffer = bytearray(buffer_size)
+        o_view = memoryview(b_buffer)
+        with file_path.open("rb", buffering=0) as o_file:
+            i_read = o_file.readinto(b_buffer)
+            while i_read:
+                s_file_hash.update(o_view[:i_read])
+                i_read = o_file.readinto(b_buffer)
         return s_file_hash.hexdigest()
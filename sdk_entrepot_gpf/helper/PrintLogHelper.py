@@ -1,15 +1,18 @@
-from typing import Any, Callable
+import builtins
+from typing import Any, Callable, Dict
 
 
 class PrintLogHelper:
     """Classe d'aide pour gérer l'affichage d'un log se complétant au fur et à mesure."""
 
     log = ""
+    logs: Dict[str, str] = {}
 
     @staticmethod
     def reset() -> Any:
         """Reset le log"""
         PrintLogHelper.log = ""
+        PrintLogHelper.logs = {}
 
     @staticmethod
     def print(full_log: str, print_fct: Callable[[object], None] = print) -> None:
@@ -28,3 +31,17 @@ class PrintLogHelper:
         PrintLogHelper.log = full_log
         if s_new_log != "":
             print_fct(s_new_log)
+
+    @staticmethod
+    def print_by_key(key: str, full_log: str, print_fct: Callable[[object], None] = builtins.print) -> None:
+        """Affiche le nouveau log d'une source parmi plusieurs suivies en même temps (chaque ligne est préfixée par la clef).
+
+        Args:
+            key (str): clef de la source du log (par exemple l'identifiant de l'exécution de traitement)
+            full_log (str): log entier de la source
+            print_fct (Callable[[object], None], optional): Fonction d'affichage à utiliser.
+        """
+        s_new_log = full_log.replace(PrintLogHelper.logs.get(key, ""), "").strip("\n")
+        PrintLogHelper.logs[key] = full_log
+        if s_new_log != "":
+            print_fct("\n".join(f"[{key}] {s_line}" for s_line in s_new_log.split("\n")))
@@ -1,12 +1,17 @@
 from __future__ import unicode_literals
 
+import copy
+import json
+import math
 import re
 import time
 import datetime
 import traceback
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from io import BufferedReader
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, List, Union
+from typing import Any, Callable, Deque, Dict, Iterator, NoReturn, Optional, Tuple, List, Union
 import requests
 from requests_toolbelt import MultipartEncoder
 
@@ -15,6 +20,14 @@ from sdk_entrepot_gpf.auth.Authentifier import Authentifier
 from sdk_entrepot_gpf.helper.JsonHelper import JsonHelper
 from sdk_entrepot_gpf.pattern.Singleton import Singleton
 from sdk_entrepot_gpf.io.JsonConverter import JsonConverter
+from sdk_entrepot_gpf.io.CircuitBreaker import CircuitBreaker
+from sdk_entrepot_gpf.io.HashingReader import HashingReader
+from sdk_entrepot_gpf.io.HttpCache import HttpCache
+from sdk_entrepot_gpf.io.HttpSession import HttpSession
+from sdk_entrepot_gpf.io.PageSizeManager import PageSizeManager
+from sdk_entrepot_gpf.io.RateLimiter import RateLimiter
+from sdk_entrepot_gpf.io.RetryPolicy import RetryPolicy
+from sdk_entrepot_gpf.io.SingleFlight import SingleFlight
 from sdk_entrepot_gpf.io.Errors import ApiError, ConflictError, RouteNotFoundError, InternalServerError, NotFoundError, NotAuthorizedError, BadRequestError, StatusCodeError
 from sdk_entrepot_gpf.io.Config import Config
 
@@ -33,8 +46,6 @@ class ApiRequester(metaclass=Singleton):
     def __init__(self) -> None:
         # Récupération du convertisseur Json
         self.__jsonConverter = JsonConverter()
-        self.__nb_attempts = Config().get_int("store_api", "nb_attempts")
-        self.__sec_between_attempt = Config().get_int("store_api", "sec_between_attempt")
         # Récupération des paramètres du proxy
         self.__proxy = {
             "http": Config().get_str("store_api", "http_proxy"),
@@ -50,6 +61,8 @@ class ApiRequester(metaclass=Singleton):
         data: Optional[Union[Dict[str, Any], List[Any]]] = None,
         files: Optional[Dict[str, Tuple[str, BufferedReader]]] = None,
         timeout: Optional[int] = -1000,
+        header: Optional[Dict[str, str]] = None,
+        stream: bool = False,
     ) -> requests.Response:
         """Exécute une requête à l'API à partir du nom d'une route. La requête est retentée plusieurs fois s'il y a un problème.
 
@@ -61,6 +74,8 @@ class ApiRequester(metaclass=Singleton):
             data (Optional[Dict[str, Any]], optional): Données de la requête.
             files (Optional[Dict[str, Tuple[Any]]], optional): Liste des fichiers à envoyer {"file":('fichier.ext', File)}.
             timeout (Optional[int], optional): timeout en seconde ou None pour désactiver le timeout.
+            header (Optional[Dict[str, str]], optional): Header additionnel pour la requête (complète celui de la configuration).
+            stream (bool, optional): si True, le corps de la réponse n'est pas lu (à lire via `iter_content` puis à fermer).
 
         Raises:
             RouteNotFoundError: levée si la route demandée n'est pas définie dans les paramètres
@@ -74,7 +89,34 @@ class ApiRequester(metaclass=Singleton):
             réponse vérifiée
         """
         Config().om.debug(f"route_request(route={route_name}, route_params={route_params})")
+        s_url, data, d_header, timeout = self.prepare_route(route_name, route_params, data, timeout, header)
 
+        # Exécution de la requête en boucle jusqu'au succès (ou erreur au bout d'un certains temps)
+        return self.url_request(s_url, method, params, data, files, d_header, timeout, route_name=route_name, stream=stream)
+
+    def prepare_route(
+        self,
+        route_name: str,
+        route_params: Optional[Dict[str, Any]] = None,
+        data: Optional[Union[Dict[str, Any], List[Any]]] = None,
+        timeout: Optional[int] = -1000,
+        header: Optional[Dict[str, str]] = None,
+    ) -> Tuple[str, Any, Dict[str, str], Optional[int]]:
+        """Prépare une requête à partir du nom d'une route : url, données converties, header additionnel et timeout.
+
+        Args:
+            route_name (str): Route à utiliser
+            route_params (Optional[Dict[str, Any]], optional): Paramètres obligatoires pour compléter la route.
+            data (Optional[Dict[str, Any]], optional): Données de la requête.
+            timeout (Optional[int], optional): timeout en seconde ou None pour désactiver le timeout.
+            header (Optional[Dict[str, str]], optional): Header additionnel pour la requête (complète celui de la configuration).
+
+        Raises:
+            RouteNotFoundError: levée si la route demandée n'est pas définie dans les paramètres
+
+        Returns:
+            Tuple[str, Any, Dict[str, str], Optional[int]]: url, données, header additionnel et timeout de la requête
+        """
         # gestion timeout
         if timeout and timeout < 0:
             s_timeout = Config().get("routing", f"{route_name}_timeout", "-1000")
@@ -107,9 +149,10 @@ class ApiRequester(metaclass=Singleton):
         d_header = {}
         if s_header is not None:
             d_header = JsonHelper.loads(s_header, f"config.routing.{route_name}_header")
+        if header:
+            d_header.update(header)
 
-        # Exécution de la requête en boucle jusqu'au succès (ou erreur au bout d'un certains temps)
-        return self.url_request(s_url, method, params, data, files, d_header, timeout)
+        return s_url, data, d_header, timeout
 
     def url_request(
         self,
@@ -120,9 +163,15 @@ class ApiRequester(metaclass=Singleton):
         files: Optional[Dict[str, Tuple[str, BufferedReader]]] = None,
         header: Dict[str, str] = {},
         timeout: Optional[int] = -1000,
+        route_name: Optional[str] = None,
+        stream: bool = False,
     ) -> requests.Response:
         """Effectue une requête à l'API à partir d'une url. La requête est retentée plusieurs fois s'il y a un problème.
 
+        Les nouvelles tentatives suivent la politique configurée (cf. `RetryPolicy`) pour la route et le code retour.
+        Les requêtes GET identiques (url, paramètres et entêtes additionnels) lancées en même temps par plusieurs threads
+        sont regroupées (`store_api.coalesce_requests`) : une seule requête part et tous reçoivent sa réponse (ou son erreur).
+
         Args:
             url (str): url absolue de la requête
             method (str, optional): méthode de la requête
@@ -131,68 +180,168 @@ class ApiRequester(metaclass=Singleton):
             files (Optional[Dict[str, Tuple[Any]]], optional): fichiers à envoyer
             header (Dict[str, str], optional): Header additionnel pour la requête
             timeout (Optional[int], optional): timeout en seconde ou None pour désactiver le timeout.
+            route_name (Optional[str], optional): nom de la route (pour sa politique de nouvelles tentatives)
+            stream (bool, optional): si True, le corps de la réponse n'est pas lu (à lire via `iter_content` puis à fermer).
 
         Returns:
             réponse si succès
         """
 
-        # gestion timeout
+        timeout = ApiRequester.default_timeout(timeout)
+
+        if method.upper() != ApiRequester.GET or files or stream or not Config().get_bool("store_api", "coalesce_requests", True):
+            return self.__url_request_attempts(url, method, params, data, files, header, timeout, route_name, stream)
+
+        # Regroupement des requêtes identiques en cours (le jeton d'authentification est le même pour tout le processus)
+        s_key = json.dumps([url, params, header], sort_keys=True, default=str)
+        o_response, b_shared = SingleFlight().call(s_key, lambda: self.__url_request_attempts(url, method, params, data, files, header, timeout, route_name))
+        if not b_shared:
+            return o_response
+        Config().om.debug(f"url_request(url={url}, params={params}) : réponse partagée avec une requête identique en cours.")
+        # Chaque appelant a sa propre instance de réponse (le contenu, déjà lu, est partagé)
+        return copy.copy(o_response)
+
+    @staticmethod
+    def default_timeout(timeout: Optional[int]) -> Optional[int]:
+        """Renvoie le timeout de la requête : celui de la configuration (`store_api.timeout`) si la valeur indiquée est négative.
+
+        Args:
+            timeout (Optional[int]): timeout en seconde, None pour désactiver le timeout ou valeur négative pour celui par défaut
+
+        Returns:
+            Optional[int]: timeout en seconde ou None
+        """
         if timeout and timeout < 0:
             s_timeout = Config().get("store_api", "timeout")
-            timeout = None if not s_timeout or s_timeout == "null" else int(s_timeout)
+            return None if not s_timeout or s_timeout == "null" else int(s_timeout)
+        return timeout
 
+    def __url_request_attempts(
+        self,
+        url: str,
+        method: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Union[Dict[str, Any], List[Any]]],
+        files: Optional[Dict[str, Tuple[str, BufferedReader]]],
+        header: Dict[str, str],
+        timeout: Optional[int],
+        route_name: Optional[str],
+        stream: bool = False,
+    ) -> requests.Response:
+        """Effectue une requête à l'API en la retentant selon la politique de nouvelles tentatives de la route.
+
+        Args:
+            url (str): url absolue de la requête
+            method (str): méthode de la requête
+            params (Optional[Dict[str, Any]]): paramètres de la requête (ajouté à l'url)
+            data (Optional[Union[Dict[str, Any], List[Any]]]): contenue de la requête (ajouté au corp)
+            files (Optional[Dict[str, Tuple[Any]]]): fichiers à envoyer
+            header (Dict[str, str]): Header additionnel pour la requête
+            timeout (Optional[int]): timeout en seconde ou None pour désactiver le timeout.
+            route_name (Optional[str]): nom de la route (pour sa politique de nouvelles tentatives)
+            stream (bool, optional): si True, le corps de la réponse n'est pas lu.
+
+        Returns:
+            réponse si succès
+        """
+        o_policy = RetryPolicy.from_config(route_name)
+        f_start = time.monotonic()
         i_nb_attempts = 0
         while True:
             i_nb_attempts += 1
             try:
                 # On fait la requête
-                return self.__url_request(url, method, params=params, data=data, files=files, header=header, timeout=timeout)
-
-            except (requests.HTTPError, requests.URLRequired) as e_error:
-                # S'il y a une erreur d'URL, on ne retente pas, on indique de contacter le support
-                s_message = "L'URL indiquée en configuration est invalide ou inexistante. Contactez le support."
-                raise GpfSdkError(s_message) from e_error
-
-            except BadRequestError as e_error:
-                # S'il y a une erreur de requête incorrecte, on ne retente pas, on indique de contacter le support
-                s_message = f"La requête formulée par le programme est incorrecte ({e_error.message}). Contactez le support."
-                raise GpfSdkError(s_message) from e_error
-
-            except (ConflictError, NotFoundError, requests.Timeout) as e_error:
-                # S'il y a un conflit, un 404 ou un timeout, on ne retente pas, on ne fait rien. On propage l'erreur.
-                raise e_error
-            except requests.exceptions.ConnectionError as e_connexion:
-                s_message = (
-                    f"Le serveur de l'API Entrepôt ({url}) n'est pas joignable. Cela peut être dû à un problème de configuration si elle a changé récemment."
-                    + " Sinon, c'est un problème sur l'API Entrepôt : consultez l'état du service pour en savoir plus "
-                    + f": {Config().get_str('store_api', 'check_status_url')}."
-                )
-                Config().om.warning(s_message)
-                # Affiche la pile d'exécution
-                Config().om.debug(traceback.format_exc())
-                # Une erreur s'est produite : attend un peu et relance une nouvelle fois la fonction
-                if i_nb_attempts < self.__nb_attempts:
-                    time.sleep(self.__sec_between_attempt)
-                # Le nombre de tentatives est atteint : comme dirait Jim, this is the end...
-                else:
-                    raise GpfSdkError(s_message) from e_connexion
+                return self.__url_request(url, method, params=params, data=data, files=files, header=header, timeout=timeout, route_name=route_name, stream=stream)
 
             except (ApiError, requests.RequestException) as e_error:
-                # Pour les autres erreurs, on retente selon les paramètres indiqués.
-                # On récupère la classe de l'erreur histoire que ce soit plus parlant...
-                s_title = e_error.__class__.__name__
-                Config().om.warning(f"L'exécution d'une requête a échoué (tentative {i_nb_attempts}/{self.__nb_attempts})... ({s_title})")
-                # Affiche la pile d'exécution
-                Config().om.debug(traceback.format_exc())
-                # Une erreur s'est produite : attend un peu et relance une nouvelle fois la fonction
-                if i_nb_attempts < self.__nb_attempts:
-                    time.sleep(self.__sec_between_attempt)
-                # Le nombre de tentatives est atteint : comme dirait Jim, this is the end...
-                else:
-                    s_message = f"L'exécution d'une requête a échoué après {i_nb_attempts} tentatives."
-                    raise GpfSdkError(s_message) from e_error
-
-    def __url_request(
+                # Une erreur s'est produite : attend un peu et relance une nouvelle fois la fonction (ou propage l'erreur)
+                time.sleep(ApiRequester.retry_delay(e_error, o_policy, i_nb_attempts, method, f_start, url))
+
+    @staticmethod
+    def retry_delay(error: Exception, policy: RetryPolicy, attempt: int, method: str, start: float, url: str) -> float:
+        """Renvoie le temps d'attente avant une nouvelle tentative après l'échec d'une requête, selon l'erreur et la politique de la route.
+
+        Args:
+            error (Exception): erreur levée par la tentative (à gérer dans le bloc `except`)
+            policy (RetryPolicy): politique de nouvelles tentatives de la route
+            attempt (int): numéro de la tentative ayant échoué
+            method (str): méthode de la requête
+            start (float): date de la première tentative (`time.monotonic()`)
+            url (str): url de la requête
+
+        Raises:
+            GpfSdkError: levée si l'erreur ne doit pas être retentée (URL ou requête incorrecte) ou si les tentatives sont épuisées
+            ConflictError: propagée sans nouvelle tentative
+            NotFoundError: propagée sans nouvelle tentative
+            requests.Timeout: propagée sans nouvelle tentative
+
+        Returns:
+            float: temps d'attente en secondes
+        """
+        if isinstance(error, (requests.HTTPError, requests.URLRequired)):
+            # S'il y a une erreur d'URL, on ne retente pas, on indique de contacter le support
+            s_message = "L'URL indiquée en configuration est invalide ou inexistante. Contactez le support."
+            raise GpfSdkError(s_message) from error
+
+        if isinstance(error, BadRequestError):
+            # S'il y a une erreur de requête incorrecte, on ne retente pas, on indique de contacter le support
+            s_message = f"La requête formulée par le programme est incorrecte ({error.message}). Contactez le support."
+            raise GpfSdkError(s_message) from error
+
+        if isinstance(error, (ConflictError, NotFoundError, requests.Timeout)):
+            # S'il y a un conflit, un 404 ou un timeout, on ne retente pas, on ne fait rien. On propage l'erreur.
+            raise error
+
+        if isinstance(error, requests.exceptions.ConnectionError):
+            s_message = (
+                f"Le serveur de l'API Entrepôt ({url}) n'est pas joignable. Cela peut être dû à un problème de configuration si elle a changé récemment."
+                + " Sinon, c'est un problème sur l'API Entrepôt : consultez l'état du service pour en savoir plus "
+                + f": {Config().get_str('store_api', 'check_status_url')}."
+            )
+            Config().om.warning(s_message)
+            # Affiche la pile d'exécution
+            Config().om.debug(traceback.format_exc())
+            f_delay = policy.get_delay(attempt, method, start)
+            # Le nombre de tentatives (ou le délai total) est atteint : comme dirait Jim, this is the end...
+            if f_delay is None:
+                raise GpfSdkError(s_message) from error
+            return f_delay
+
+        # Pour les autres erreurs, on retente selon les paramètres indiqués.
+        # On récupère la classe de l'erreur histoire que ce soit plus parlant...
+        s_title = error.__class__.__name__
+        o_status_policy = policy.for_status(ApiRequester.__status_code(error))
+        Config().om.warning(f"L'exécution d'une requête a échoué (tentative {attempt}/{o_status_policy.nb_attempts})... ({s_title})")
+        # Affiche la pile d'exécution
+        Config().om.debug(traceback.format_exc())
+        # Attente selon la politique et l'éventuel délai demandé par le serveur
+        f_delay = o_status_policy.get_delay(attempt, method, start, getattr(error, "retry_after", None))
+        # Le nombre de tentatives (ou le délai total) est atteint : comme dirait Jim, this is the end...
+        if f_delay is None:
+            s_message = f"L'exécution d'une requête a échoué après {attempt} tentatives."
+            raise GpfSdkError(s_message) from error
+        Config().om.debug(f"Nouvelle tentative dans {f_delay:.2f} s.")
+        return f_delay
+
+    @staticmethod
+    def __status_code(error: Exception) -> Optional[int]:
+        """Renvoie le code retour à l'origine de l'erreur (pour choisir la politique de nouvelles tentatives).
+
+        Args:
+            error (Exception): erreur levée par la requête
+
+        Returns:
+            Optional[int]: code retour, None si inconnu
+        """
+        if isinstance(error, StatusCodeError):
+            return error.status_code
+        if isinstance(error, InternalServerError):
+            return 500
+        if isinstance(error, requests.RequestException) and error.response is not None:
+            return int(error.response.status_code)
+        return None
+
+    def __url_request(  # pylint: disable=too-many-branches
         self,
         url: str,
         method: str = "GET",
@@ -201,6 +350,8 @@ class ApiRequester(metaclass=Singleton):
         files: Optional[Dict[str, Tuple[str, BufferedReader]]] = None,
         header: Dict[str, str] = {},
         timeout: Optional[int] = None,
+        route_name: Optional[str] = None,
+        stream: bool = False,
     ) -> requests.Response:
         """Effectue une requête à l'API à partir d'une url. Ne retente pas plusieurs fois si problème.
 
@@ -212,14 +363,26 @@ class ApiRequester(metaclass=Singleton):
             files (Optional[Dict[str, Tuple[Any]]], optional): fichiers.
             header (Dict[str, str], optional): Header additionnel pour la requête.
             timeout (Optional[int], optional): timeout en seconde ou None pour désactiver le timeout.
+            route_name (Optional[str], optional): nom de la route (pour le cache HTTP, les limites de débit et le disjoncteur de sa famille)
+            stream (bool, optional): si True, le corps de la réponse n'est pas lu.
 
         Returns:
             réponse si succès
         """
         Config().om.debug(f"__url_request(url={url}, method={method}, params={params}, data={data}, timeout={timeout}, timestamp={datetime.datetime.now()})")
 
+        # Cache HTTP (GET des routes de lecture) : réponse servie directement si possible, sinon requête conditionnelle
+        s_cache_key = HttpCache().key(route_name, method, url, params) if files is None and not stream else None
+        o_cached = HttpCache().get(s_cache_key) if s_cache_key is not None else None
+        if o_cached is not None and route_name is not None and s_cache_key is not None:
+            o_response = HttpCache().serve(route_name, s_cache_key, o_cached)
+            if o_response is not None:
+                return o_response
+
         # Définition du header
         d_headers = Authentifier().get_http_header(json_content_type=files is None)
+        if o_cached is not None:
+            d_headers.update(o_cached.validators)
         d_headers.update(header)
 
         # Création du MultipartEncoder (cf. https://github.com/requests/toolbelt#multipartform-data-encoder)
@@ -230,6 +393,7 @@ class ApiRequester(metaclass=Singleton):
             "proxies": self.__proxy,
             "params": params,
             "timeout": timeout,
+            "stream": stream,
         }
         if files:
             d_fields = {**files}
@@ -240,34 +404,76 @@ class ApiRequester(metaclass=Singleton):
         else:
             d_requests.update({"params": params, "json": data})
 
-        # exécution de la requête
-        r = requests.request(**d_requests)
+        # exécution de la requête (via la session partagée pour réutiliser les connexions) si le disjoncteur de la route est fermé,
+        # dans les limites de débit et de concurrence
+        CircuitBreaker().before(route_name)
+        try:
+            with RateLimiter().limit(route_name):
+                r = HttpSession().session.request(**d_requests)
+        except requests.RequestException:
+            CircuitBreaker().record(route_name, False)
+            raise
+        except BaseException:
+            # Requête arrêtée sans réponse de l'API (interruption, erreur locale) : on libère l'éventuelle requête de test
+            CircuitBreaker().release(route_name)
+            raise
+        CircuitBreaker().record(route_name, r.status_code < 500 and r.status_code != 429)
         Config().om.debug(f"__url_request(url={url}, method={method}, params={params}, data={data}, timeout={timeout}, timestamp={datetime.datetime.now()}, status={r.status_code})")
 
         # Vérification du résultat...
+        if r.status_code == 304 and o_cached is not None and route_name is not None and s_cache_key is not None:
+            # Réponse inchangée : on renvoie celle du cache
+            return HttpCache().revalidate(route_name, s_cache_key, o_cached)
         if r.status_code >= 200 and r.status_code < 300:
-            # Si c'est ok, on renvoie la réponse
+            # Si c'est ok, on met à jour le cache HTTP et on renvoie la réponse
+            if route_name is not None and s_cache_key is not None:
+                HttpCache().store(route_name, s_cache_key, url, r)
+            elif method.upper() != ApiRequester.GET:
+                HttpCache().invalidate(url)
             return r
+        ApiRequester.raise_for_status(r, url, method, params, data, d_headers.get("Authorization", ""))
+
+    @staticmethod
+    def raise_for_status(response: requests.Response, url: str, method: str, params: Optional[Dict[str, Any]], data: Any, authorization: str) -> NoReturn:
+        """Lève l'erreur correspondant au code retour d'une réponse en erreur.
+
+        Args:
+            response (requests.Response): réponse en erreur
+            url (str): url de la requête
+            method (str): méthode de la requête
+            params (Optional[Dict[str, Any]]): paramètres de la requête
+            data (Any): données de la requête
+            authorization (str): header `Authorization` de la requête (jeton révoqué si l'action est refusée)
+
+        Raises:
+            InternalServerError: levée si erreur interne de l'API
+            NotFoundError: levée si l'entité demandée n'est pas trouvée par l'API
+            NotAuthorizedError: levée si l'action effectuée demande d'autres autorisations
+            BadRequestError: levée si la requête envoyée n'est pas correcte
+            ConflictError: levée en cas de conflit
+            StatusCodeError: levée si un "status code" non prévu est récupéré
+        """
         # Erreur sans retour attendu/possible
-        if r.status_code == 500:
+        if response.status_code == 500:
             # Erreur interne (pas de retour)
             raise InternalServerError(url, method, params, data)
         # Erreurs avec retour attendu/possible
-        if r.status_code == 404:
+        if response.status_code == 404:
             # Element non trouvé (pas de retour)
-            raise NotFoundError(url, method, params, data, r.text)
-        if r.status_code in (403, 401):
+            raise NotFoundError(url, method, params, data, response.text)
+        if response.status_code in (403, 401):
             # Action non autorisée
-            Authentifier().revoke_token()  # On révoque le token
-            raise NotAuthorizedError(url, method, params, data, r.text)
-        if r.status_code == 400:
+            # On révoque le token (s'il n'a pas déjà été renouvelé suite à une autre requête refusée)
+            Authentifier().revoke_token(authorization[len("Bearer ") :])
+            raise NotAuthorizedError(url, method, params, data, response.text)
+        if response.status_code == 400:
             # Requête incorrecte
-            raise BadRequestError(url, method, params, data, r.text)
-        if r.status_code == 409:
+            raise BadRequestError(url, method, params, data, response.text)
+        if response.status_code == 409:
             # Conflit
-            raise ConflictError(url, method, params, data, r.text)
-        # Autre erreur
-        raise StatusCodeError(url, method, params, data, r.status_code, r.text)
+            raise ConflictError(url, method, params, data, response.text)
+        # Autre erreur (429, 502, 503... : le serveur peut indiquer quand retenter)
+        raise StatusCodeError(url, method, params, data, response.status_code, response.text, RetryPolicy.parse_retry_after(response.headers.get("Retry-After")))
 
     def route_upload_file(
         self,
@@ -279,6 +485,7 @@ class ApiRequester(metaclass=Singleton):
         params: Optional[Dict[str, Any]] = None,
         data: Optional[Union[Dict[str, Any], List[Any]]] = None,
         timeout: Optional[int] = -1000,
+        on_md5: Optional[Callable[[str], None]] = None,
     ) -> requests.Response:
         """Exécute une requête à l'API à partir du nom d'une route. La requête est retentée plusieurs fois s'il y a un problème.
 
@@ -290,6 +497,8 @@ class ApiRequester(metaclass=Singleton):
             params (Optional[Dict[str, Any]], optional): Paramètres optionnels de l'URL.
             method (str, optional): méthode de la requête.
             data (Optional[Dict[str, Any]], optional): Données de la requête.
+            on_md5 (Optional[Callable[[str], None]], optional): si précisée, la clef md5 du fichier est calculée pendant
+                son envoi (le fichier n'est lu qu'une fois) et transmise à cette fonction une fois le fichier envoyé en entier.
 
         Returns:
             réponse vérifiée
@@ -317,11 +526,122 @@ class ApiRequester(metaclass=Singleton):
 
         # Ouverture du fichier et remplissage du tuple de fichier
         with file_path.open("rb") as o_file_binary:
-            o_tuple_file = (file_path.name, o_file_binary)
+            o_reader = HashingReader(o_file_binary) if on_md5 is not None else None
+            o_tuple_file = (file_path.name, BufferedReader(o_reader) if o_reader is not None else o_file_binary)
             o_dict_files = {file_key: o_tuple_file}
 
             # Requête
-            return self.route_request(route_name, route_params=route_params, method=method, params=params, data=data, files=o_dict_files, timeout=timeout)
+            o_response = self.route_request(route_name, route_params=route_params, method=method, params=params, data=data, files=o_dict_files, timeout=timeout)
+            s_md5 = o_reader.hexdigest() if o_reader is not None else None
+            if on_md5 is not None and s_md5 is not None:
+                on_md5(s_md5)
+            return o_response
+
+    def route_request_pages(
+        self,
+        route_name: str,
+        route_params: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ) -> Iterator[List[Any]]:
+        """Récupère toutes les pages d'une route de listing et les renvoie dans l'ordre, page par page.
+
+        La première page est récupérée seule : le `Content-Range` de sa réponse donne le nombre total d'éléments,
+        les pages restantes sont alors récupérées en parallèle (`store_api.nb_parallel_pages` requêtes simultanées au plus).
+        Si le total n'est pas connu, les pages sont récupérées l'une après l'autre.
+
+        Args:
+            route_name (str): Route de listing à utiliser
+            route_params (Optional[Dict[str, Any]], optional): Paramètres obligatoires pour compléter la route.
+            params (Optional[Dict[str, Any]], optional): Paramètres optionnels de l'URL (hors pagination).
+            limit (int, optional): Nombre d'éléments demandés par page (cf. `PageSizeManager`).
+
+        Yields:
+            Iterator[List[Any]]: contenu JSON de chaque page
+        """
+        d_params = params if params is not None else {}
+
+        def request_page(i_page: int) -> requests.Response:
+            # route_request complète route_params : on en passe une copie à chaque requête
+            try:
+                return self.route_request(route_name, route_params={**(route_params or {})}, params={**d_params, **{"page": i_page, "limit": limit}})
+            except requests.Timeout:
+                # Page trop longue à générer : on demandera moins d'éléments la prochaine fois
+                PageSizeManager().record_timeout(route_name, limit)
+                raise
+
+        # Première page
+        while True:
+            f_start = time.time()
+            try:
+                o_response = request_page(1)
+                break
+            except requests.Timeout:
+                # Rien n'est encore renvoyé : on peut retenter avec une taille de page réduite
+                i_limit = PageSizeManager().get(route_name, limit)
+                if i_limit >= limit:
+                    raise
+                limit = i_limit
+        l_page = o_response.json()
+        i_length = len(l_page)
+        s_content_range = o_response.headers.get("Content-Range")
+        i_total = ApiRequester.range_total(s_content_range)
+        # Ajustement de la taille de page pour les prochains listings de cette route
+        PageSizeManager().record(route_name, limit, i_length, i_total, time.time() - f_start)
+        yield l_page
+        i_page = 2
+
+        # Si le total est connu, on récupère les pages restantes en parallèle
+        if i_total is not None and 0 < i_length < i_total:
+            # Le serveur peut renvoyer moins d'éléments que demandé : la taille de la première page fait foi
+            i_nb_pages = math.ceil(i_total / i_length)
+            i_nb_parallel = max(1, Config().get_int("store_api", "nb_parallel_pages", 4))
+            o_executor = ThreadPoolExecutor(max_workers=i_nb_parallel)
+            # Fenêtre des requêtes lancées : on en garde un nombre borné en avance sur la page renvoyée
+            d_futures: Deque[Future[requests.Response]] = deque()
+            try:
+                while i_page <= i_nb_pages or d_futures:
+                    while i_page <= i_nb_pages and len(d_futures) < 2 * i_nb_parallel:
+                        d_futures.append(o_executor.submit(request_page, i_page))
+                        i_page += 1
+                    o_response = d_futures.popleft().result()
+                    l_page = o_response.json()
+                    i_length += len(l_page)
+                    yield l_page
+            finally:
+                # Arrêt anticipé ou erreur : on annule les requêtes non commencées
+                for o_future in d_futures:
+                    o_future.cancel()
+                o_executor.shutdown(wait=True)
+            s_content_range = o_response.headers.get("Content-Range")
+
+        # Sinon (ou s'il reste des éléments, la liste ayant évolué entre temps) on continue page par page
+        while ApiRequester.range_next_page(s_content_range, i_length):
+            o_response = request_page(i_page)
+            l_page = o_response.json()
+            if not l_page:
+                break
+            i_length += len(l_page)
+            yield l_page
+            s_content_range = o_response.headers.get("Content-Range")
+            i_page += 1
+
+    @staticmethod
+    def range_total(content_range: Optional[str]) -> Optional[int]:
+        """Fonction analysant le `Content-Range` d'une réponse pour renvoyer le nombre total d'éléments.
+
+        Args:
+            content_range (Optional[str]): Content-Range renvoyé par l'API
+
+        Returns:
+            nombre total d'éléments, None s'il n'est pas connu
+        """
+        if content_range is None:
+            return None
+        o_result = ApiRequester.regex_content_range.search(content_range)
+        if o_result is None:
+            return None
+        return int(o_result.group("len"))
 
     @staticmethod
     def range_next_page(content_range: Optional[str], length: int) -> bool:
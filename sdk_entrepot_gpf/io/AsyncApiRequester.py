@@ -0,0 +1,397 @@
+import asyncio
+import functools
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BufferedReader
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from sdk_entrepot_gpf.Errors import GpfSdkError
+from sdk_entrepot_gpf.auth.Authentifier import Authentifier
+from sdk_entrepot_gpf.pattern.Singleton import Singleton
+from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
+from sdk_entrepot_gpf.io.CircuitBreaker import CircuitBreaker
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.Errors import ApiError
+from sdk_entrepot_gpf.io.HttpCache import HttpCache
+from sdk_entrepot_gpf.io.PageSizeManager import PageSizeManager
+from sdk_entrepot_gpf.io.RateLimiter import RateLimiter
+from sdk_entrepot_gpf.io.RetryPolicy import RetryPolicy
+
+if TYPE_CHECKING:
+    # Dépendance optionnelle (extra "async"), importée à la première requête native
+    import httpx
+
+T = TypeVar("T")
+
+
+class AsyncApiRequester(metaclass=Singleton):
+    """Classe singleton permettant d'appeler l'API GPF depuis du code asynchrone (asyncio).
+
+    Deux transports sont disponibles (`store_api.async_transport`) :
+
+    * `thread` (par défaut) : les requêtes sont exécutées par `ApiRequester` (même routage, mêmes tentatives,
+      même session HTTP et mêmes erreurs) dans un pool de threads dédié (`store_api.async_max_workers`) :
+      la boucle d'évènements n'est pas bloquée mais chaque requête en cours occupe un thread ;
+    * `httpx` (extra `async` : `pip install sdk_entrepot_gpf[async]`) : `route_request` et `url_request` (sans fichier)
+      sont exécutées nativement par un client `httpx.AsyncClient`, avec le même routage, les mêmes tentatives (`RetryPolicy`),
+      les mêmes limites (`RateLimiter`), le même disjoncteur (`CircuitBreaker`) et les mêmes erreurs.
+      Le cache HTTP et le regroupement des requêtes identiques ne s'appliquent pas à ces requêtes.
+
+    Les méthodes `*_async` des entités passent par `route_request` (et donc par le transport configuré),
+    sauf les envois de fichiers qui, comme les fonctions exécutées via `run`, passent toujours par le pool de threads.
+
+    Attributes:
+        __executor (ThreadPoolExecutor): pool de threads exécutant les requêtes
+        __client (Optional[Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]]): client httpx et boucle d'évènements associée
+    """
+
+    TRANSPORT_THREAD = "thread"
+    TRANSPORT_HTTPX = "httpx"
+
+    def __init__(self) -> None:
+        self.__executor = ThreadPoolExecutor(max_workers=max(1, Config().get_int("store_api", "async_max_workers", 32)), thread_name_prefix="async-api")
+        self.__client: Optional[Tuple[asyncio.AbstractEventLoop, "httpx.AsyncClient"]] = None
+
+    async def run(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Exécute une fonction synchrone de l'API (requête, fonction d'entité...) sans bloquer la boucle d'évènements.
+
+        Args:
+            function (Callable[..., T]): fonction à exécuter
+            args (Any): paramètres positionnels de la fonction
+            kwargs (Any): paramètres nommés de la fonction
+
+        Returns:
+            T: valeur renvoyée par la fonction (ses exceptions sont propagées)
+        """
+        return await asyncio.get_running_loop().run_in_executor(self.__executor, functools.partial(function, *args, **kwargs))
+
+    async def route_request(
+        self,
+        route_name: str,
+        route_params: Optional[Dict[str, Any]] = None,
+        method: str = "GET",
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Union[Dict[str, Any], List[Any]]] = None,
+        files: Optional[Dict[str, Tuple[str, BufferedReader]]] = None,
+        timeout: Optional[int] = -1000,
+    ) -> requests.Response:
+        """Version asynchrone de `ApiRequester.route_request`.
+
+        Args:
+            route_name (str): Route à utiliser
+            route_params (Optional[Dict[str, Any]], optional): Paramètres obligatoires pour compléter la route.
+            method (str, optional): méthode de la requête.
+            params (Optional[Dict[str, Any]], optional): Paramètres optionnels de l'URL.
+            data (Optional[Dict[str, Any]], optional): Données de la requête.
+            files (Optional[Dict[str, Tuple[Any]]], optional): Liste des fichiers à envoyer {"file":('fichier.ext', File)}.
+            timeout (Optional[int], optional): timeout en seconde ou None pour désactiver le timeout.
+
+        Returns:
+            réponse vérifiée
+        """
+        if files is None and AsyncApiRequester.__native():
+            s_url, data, d_header, timeout = ApiRequester().prepare_route(route_name, route_params, data, timeout)
+            return await self.__native_request(s_url, method, params, data, d_header, timeout, route_name)
+        return await self.run(ApiRequester().route_request, route_name, route_params, method, params, data, files, timeout)
+
+    async def route_request_pages(
+        self,
+        route_name: str,
+        route_params: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ) -> AsyncIterator[List[Any]]:
+        """Version asynchrone de `ApiRequester.route_request_pages` : la première page est récupérée seule,
+        les suivantes en même temps (par groupes de `store_api.nb_parallel_pages` requêtes) si le total est connu.
+
+        Args:
+            route_name (str): Route de listing à utiliser
+            route_params (Optional[Dict[str, Any]], optional): Paramètres obligatoires pour compléter la route.
+            params (Optional[Dict[str, Any]], optional): Paramètres optionnels de l'URL (hors pagination).
+            limit (int, optional): Nombre d'éléments demandés par page (cf. `PageSizeManager`).
+
+        Yields:
+            AsyncIterator[List[Any]]: contenu JSON de chaque page
+        """
+        d_params = params if params is not None else {}
+
+        async def request_page(i_page: int) -> requests.Response:
+            # route_request complète route_params : on en passe une copie à chaque requête
+            return await self.route_request(route_name, route_params={**(route_params or {})}, params={**d_params, **{"page": i_page, "limit": limit}})
+
+        # Première page
+        f_start = time.time()
+        o_response = await request_page(1)
+        l_page = o_response.json()
+        i_length = len(l_page)
+        s_content_range = o_response.headers.get("Content-Range")
+        i_total = ApiRequester.range_total(s_content_range)
+        PageSizeManager().record(route_name, limit, i_length, i_total, time.time() - f_start)
+        yield l_page
+        i_page = 2
+
+        # Si le total est connu, on récupère les pages restantes en même temps
+        if i_total is not None and 0 < i_length < i_total:
+            i_nb_pages = math.ceil(i_total / i_length)
+            i_nb_parallel = max(1, Config().get_int("store_api", "nb_parallel_pages", 4))
+            while i_page <= i_nb_pages:
+                l_responses = await asyncio.gather(*[request_page(i) for i in range(i_page, min(i_page + i_nb_parallel, i_nb_pages + 1))])
+                for o_response in l_responses:
+                    l_page = o_response.json()
+                    i_length += len(l_page)
+                    yield l_page
+                i_page += len(l_responses)
+            s_content_range = o_response.headers.get("Content-Range")
+
+        # Sinon (ou s'il reste des éléments, la liste ayant évolué entre temps) on continue page par page
+        while ApiRequester.range_next_page(s_content_range, i_length):
+            o_response = await request_page(i_page)
+            l_page = o_response.json()
+            if not l_page:
+                break
+            i_length += len(l_page)
+            yield l_page
+            s_content_range = o_response.headers.get("Content-Range")
+            i_page += 1
+
+    async def url_request(
+        self,
+        url: str,
+        method: str = "GET",
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Union[Dict[str, Any], List[Any]]] = None,
+        files: Optional[Dict[str, Tuple[str, BufferedReader]]] = None,
+        header: Optional[Dict[str, str]] = None,
+        timeout: Optional[int] = -1000,
+        route_name: Optional[str] = None,
+    ) -> requests.Response:
+        """Version asynchrone de `ApiRequester.url_request`.
+
+        Args:
+            url (str): url absolue de la requête
+            method (str, optional): méthode de la requête
+            params (Optional[Dict[str, Any]], optional): paramètres de la requête (ajouté à l'url)
+            data (Optional[Union[Dict[str, Any], List[Any]]], optional): contenue de la requête (ajouté au corp)
+            files (Optional[Dict[str, Tuple[Any]]], optional): fichiers à envoyer
+            header (Optional[Dict[str, str]], optional): Header additionnel pour la requête
+            timeout (Optional[int], optional): timeout en seconde ou None pour désactiver le timeout.
+            route_name (Optional[str], optional): nom de la route (pour sa politique de nouvelles tentatives)
+
+        Returns:
+            réponse vérifiée
+        """
+        if files is None and AsyncApiRequester.__native():
+            return await self.__native_request(url, method, params, data, header if header is not None else {}, ApiRequester.default_timeout(timeout), route_name)
+        return await self.run(ApiRequester().url_request, url, method, params, data, files, header if header is not None else {}, timeout, route_name=route_name)
+
+    async def route_upload_file(
+        self,
+        route_name: str,
+        file_path: Path,
+        file_key: str,
+        route_params: Optional[Dict[str, Any]] = None,
+        method: str = "POST",
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Union[Dict[str, Any], List[Any]]] = None,
+        timeout: Optional[int] = -1000,
+    ) -> requests.Response:
+        """Version asynchrone de `ApiRequester.route_upload_file`.
+
+        Args:
+            route_name (str): Route à utiliser
+            file_path (Path): Chemin du fichier à uploader
+            file_key (str): nom de la clef dans le dictionnaire
+            route_params (Optional[Dict[str, Any]], optional): Paramètres obligatoires pour compléter la route.
+            method (str, optional): méthode de la requête.
+            params (Optional[Dict[str, Any]], optional): Paramètres optionnels de l'URL.
+            data (Optional[Dict[str, Any]], optional): Données de la requête.
+            timeout (Optional[int], optional): timeout en seconde ou None pour désactiver le timeout.
+
+        Returns:
+            réponse vérifiée
+        """
+        return await self.run(ApiRequester().route_upload_file, route_name, file_path, file_key, route_params, method, params, data, timeout)
+
+    async def aclose(self) -> None:
+        """Ferme le client httpx (et ses connexions) s'il a été créé dans la boucle d'évènements courante."""
+        if self.__client is not None and self.__client[0] is asyncio.get_running_loop():
+            await self.__client[1].aclose()
+            self.__client = None
+
+    @staticmethod
+    def __native() -> bool:
+        """Indique si les requêtes sont exécutées nativement (transport `httpx`) plutôt que dans le pool de threads.
+
+        Raises:
+            GpfSdkError: levée si le transport est inconnu ou si httpx n'est pas installé
+
+        Returns:
+            bool: True si le transport `httpx` est configuré
+        """
+        s_transport = Config().get_str("store_api", "async_transport", AsyncApiRequester.TRANSPORT_THREAD)
+        if s_transport == AsyncApiRequester.TRANSPORT_THREAD:
+            return False
+        if s_transport != AsyncApiRequester.TRANSPORT_HTTPX:
+            raise GpfSdkError(f"Transport asynchrone inconnu : {s_transport} ({AsyncApiRequester.TRANSPORT_THREAD}|{AsyncApiRequester.TRANSPORT_HTTPX}).")
+        try:
+            import httpx  # pylint: disable=import-outside-toplevel,redefined-outer-name,unused-import
+        except ImportError as e_error:
+            raise GpfSdkError("Le transport asynchrone httpx nécessite l'extra async : pip install sdk_entrepot_gpf[async]") from e_error
+        return True
+
+    async def __native_request(
+        self,
+        url: str,
+        method: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Union[Dict[str, Any], List[Any]]],
+        header: Dict[str, str],
+        timeout: Optional[int],
+        route_name: Optional[str],
+    ) -> requests.Response:
+        """Effectue une requête native (httpx) en la retentant selon la politique de nouvelles tentatives de la route (cf. `ApiRequester.retry_delay`).
+
+        Args:
+            url (str): url absolue de la requête
+            method (str): méthode de la requête
+            params (Optional[Dict[str, Any]]): paramètres de la requête (ajouté à l'url)
+            data (Optional[Union[Dict[str, Any], List[Any]]]): contenue de la requête (ajouté au corp)
+            header (Dict[str, str]): Header additionnel pour la requête
+            timeout (Optional[int]): timeout en seconde ou None pour désactiver le timeout.
+            route_name (Optional[str]): nom de la route (politique de nouvelles tentatives, limites et disjoncteur de sa famille)
+
+        Returns:
+            réponse si succès
+        """
+        o_policy = RetryPolicy.from_config(route_name)
+        f_start = time.monotonic()
+        i_nb_attempts = 0
+        while True:
+            i_nb_attempts += 1
+            try:
+                return await self.__native_attempt(url, method, params, data, header, timeout, route_name)
+            except (ApiError, requests.RequestException) as e_error:
+                # Une erreur s'est produite : attend un peu (sans bloquer la boucle) et relance une nouvelle fois la requête (ou propage l'erreur)
+                await asyncio.sleep(ApiRequester.retry_delay(e_error, o_policy, i_nb_attempts, method, f_start, url))
+
+    async def __native_attempt(
+        self,
+        url: str,
+        method: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Union[Dict[str, Any], List[Any]]],
+        header: Dict[str, str],
+        timeout: Optional[int],
+        route_name: Optional[str],
+    ) -> requests.Response:
+        """Effectue une requête native (httpx). Ne retente pas plusieurs fois si problème.
+
+        Args:
+            url (str): url absolue de la requête
+            method (str): méthode de la requête
+            params (Optional[Dict[str, Any]]): paramètres de la requête
+            data (Optional[Union[Dict[str, Any], List[Any]]]): données de la requête
+            header (Dict[str, str]): Header additionnel pour la requête
+            timeout (Optional[int]): timeout en seconde ou None pour désactiver le timeout.
+            route_name (Optional[str]): nom de la route (limites et disjoncteur de sa famille)
+
+        Returns:
+            réponse si succès (convertie en `requests.Response`)
+        """
+        import httpx  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        d_headers = Authentifier().get_http_header(json_content_type=True)
+        d_headers.update(header)
+        o_client = self.__get_client()
+        # exécution de la requête si le disjoncteur de la route est fermé, dans les limites de débit et de concurrence
+        CircuitBreaker().before(route_name)
+        try:
+            async with RateLimiter().limit_async(route_name):
+                o_httpx_response = await o_client.request(method, url, params=params, json=data, headers=d_headers, timeout=timeout)
+        except httpx.HTTPError as e_error:
+            CircuitBreaker().record(route_name, False)
+            raise AsyncApiRequester.__to_requests_error(e_error) from e_error
+        except BaseException:
+            # Requête arrêtée sans réponse de l'API (annulation, erreur locale) : on libère l'éventuelle requête de test
+            CircuitBreaker().release(route_name)
+            raise
+        CircuitBreaker().record(route_name, o_httpx_response.status_code < 500 and o_httpx_response.status_code != 429)
+        Config().om.debug(f"__native_attempt(url={url}, method={method}, params={params}, status={o_httpx_response.status_code})")
+
+        o_response = AsyncApiRequester.__to_requests_response(o_httpx_response)
+        if 200 <= o_response.status_code < 300:
+            if method.upper() != ApiRequester.GET:
+                HttpCache().invalidate(url)
+            return o_response
+        ApiRequester.raise_for_status(o_response, url, method, params, data, d_headers.get("Authorization", ""))
+
+    def __get_client(self) -> "httpx.AsyncClient":
+        """Renvoie le client httpx de la boucle d'évènements courante en le créant si besoin.
+
+        Returns:
+            client httpx
+        """
+        o_loop = asyncio.get_running_loop()
+        if self.__client is None or self.__client[0] is not o_loop:
+            self.__client = (o_loop, AsyncApiRequester.__create_client())
+        return self.__client[1]
+
+    @staticmethod
+    def __create_client() -> "httpx.AsyncClient":
+        """Crée un client httpx selon les paramètres `pool_maxsize`, `keep_alive` et `*_proxy` de la section `store_api`.
+
+        Returns:
+            client httpx configuré
+        """
+        import httpx  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        Config().om.debug("Création du client HTTP asynchrone.")
+        i_max_connections = Config().get_int("store_api", "pool_maxsize", 10)
+        o_limits = httpx.Limits(max_connections=i_max_connections, max_keepalive_connections=i_max_connections if Config().get_bool("store_api", "keep_alive", True) else 0)
+        d_mounts: Dict[str, httpx.AsyncBaseTransport] = {}
+        for s_scheme in ["http", "https"]:
+            s_proxy = Config().get("store_api", f"{s_scheme}_proxy", fallback=None)
+            if s_proxy:
+                d_mounts[f"{s_scheme}://"] = httpx.AsyncHTTPTransport(proxy=s_proxy, limits=o_limits)
+        return httpx.AsyncClient(limits=o_limits, mounts=d_mounts)
+
+    @staticmethod
+    def __to_requests_response(response: "httpx.Response") -> requests.Response:
+        """Convertit une réponse httpx en `requests.Response` (même interface que les requêtes synchrones).
+
+        Args:
+            response (httpx.Response): réponse httpx (contenu lu)
+
+        Returns:
+            requests.Response: réponse équivalente
+        """
+        o_response = requests.Response()
+        o_response.status_code = response.status_code
+        o_response._content = response.content  # pylint: disable=protected-access
+        o_response.headers = CaseInsensitiveDict(response.headers.items())
+        o_response.url = str(response.url)
+        o_response.encoding = response.encoding
+        o_response.reason = response.reason_phrase
+        return o_response
+
+    @staticmethod
+    def __to_requests_error(error: "httpx.HTTPError") -> requests.RequestException:
+        """Convertit une erreur httpx en erreur `requests` équivalente (pour la politique de nouvelles tentatives).
+
+        Args:
+            error (httpx.HTTPError): erreur httpx
+
+        Returns:
+            requests.RequestException: erreur équivalente
+        """
+        import httpx  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        if isinstance(error, httpx.TimeoutException):
+            return requests.Timeout(str(error))
+        if isinstance(error, httpx.NetworkError):
+            return requests.ConnectionError(str(error))
+        return requests.RequestException(str(error))
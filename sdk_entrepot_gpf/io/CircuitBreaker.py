@@ -0,0 +1,207 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+from sdk_entrepot_gpf.pattern.Singleton import Singleton
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.Errors import CircuitOpenError
+from sdk_entrepot_gpf.io.RateLimiter import RateLimiter
+
+T = TypeVar("T")
+
+
+class Circuit:
+    """État du disjoncteur d'une famille de routes.
+
+    Attributes:
+        state (str): état du disjoncteur (`CircuitBreaker.CLOSED`, `OPEN` ou `HALF_OPEN`)
+        consecutive_failures (int): nombre d'échecs consécutifs
+        outcomes (Deque[bool]): résultats (True si succès) des dernières requêtes
+        opened_at (float): date d'ouverture ou, à l'état semi-ouvert, de départ de la requête de test (`time.monotonic()`)
+    """
+
+    def __init__(self, window: int) -> None:
+        """Constructeur.
+
+        Args:
+            window (int): nombre de requêtes prises en compte pour le taux d'erreur
+        """
+        self.state = CircuitBreaker.CLOSED
+        self.consecutive_failures = 0
+        self.outcomes: Deque[bool] = deque(maxlen=max(1, window))
+        self.opened_at = 0.0
+
+
+class CircuitBreaker(metaclass=Singleton):
+    """Singleton coupant les requêtes vers une famille de routes quand l'API semble indisponible (disjoncteur).
+
+    Les routes sont regroupées selon les familles de `rate_limit.families` (une route sans famille forme sa propre famille).
+    Le disjoncteur d'une famille s'ouvre après `circuit_breaker.consecutive_failures` échecs consécutifs ou quand le taux
+    d'échec des `circuit_breaker.window` dernières requêtes atteint `circuit_breaker.error_rate` (à partir de
+    `circuit_breaker.min_calls` requêtes). Un échec est une erreur de connexion, un timeout, une erreur 5xx ou une erreur 429.
+
+    Tant qu'il est ouvert, les requêtes échouent immédiatement (`CircuitOpenError`) sans solliciter l'API ; au bout de
+    `circuit_breaker.open_sec` secondes, une seule requête de test passe (état semi-ouvert) : le disjoncteur se referme
+    si elle réussit et se rouvre sinon. Si la requête de test s'arrête sans résultat (interruption, erreur locale),
+    elle doit être libérée (`release`) ; à défaut, une nouvelle requête de test passe au bout de `circuit_breaker.open_sec` secondes.
+
+    Attributes:
+        __lock (threading.Lock): verrou protégeant les états
+        __circuits (Dict[str, Circuit]): état du disjoncteur par famille
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__circuits: Dict[str, Circuit] = {}
+
+    @staticmethod
+    def __family(route_name: Optional[str]) -> Optional[str]:
+        """Renvoie la famille du disjoncteur de la route.
+
+        Args:
+            route_name (Optional[str]): nom de la route
+
+        Returns:
+            Optional[str]: famille de la route (la route elle-même si elle n'a pas de famille), None si le disjoncteur ne s'applique pas
+        """
+        if route_name is None or not Config().get_bool("circuit_breaker", "enabled", True):
+            return None
+        return RateLimiter().family(route_name) or route_name
+
+    def state(self, route_name: str) -> str:
+        """Renvoie l'état du disjoncteur de la famille de la route.
+
+        Args:
+            route_name (str): nom de la route
+
+        Returns:
+            str: `CircuitBreaker.CLOSED`, `CircuitBreaker.OPEN` ou `CircuitBreaker.HALF_OPEN`
+        """
+        s_family = CircuitBreaker.__family(route_name)
+        with self.__lock:
+            o_circuit = self.__circuits.get(s_family) if s_family is not None else None
+            return CircuitBreaker.CLOSED if o_circuit is None else o_circuit.state
+
+    def before(self, route_name: Optional[str]) -> None:
+        """Vérifie qu'une requête peut partir sur la route (à appeler avant chaque requête).
+
+        Args:
+            route_name (Optional[str]): nom de la route (aucune vérification si None)
+
+        Raises:
+            CircuitOpenError: le disjoncteur est ouvert (ou la requête de test est déjà en cours)
+        """
+        s_family = CircuitBreaker.__family(route_name)
+        if s_family is None:
+            return
+        f_open_sec = Config().get_float("circuit_breaker", "open_sec", 30)
+        with self.__lock:
+            o_circuit = self.__circuits.get(s_family)
+            if o_circuit is None or o_circuit.state == CircuitBreaker.CLOSED:
+                return
+            f_retry_in = o_circuit.opened_at + f_open_sec - time.monotonic()
+            if f_retry_in <= 0:
+                # Délai écoulé (ouvert, ou semi-ouvert avec une requête de test sans résultat) : cette requête sert de test
+                o_circuit.state = CircuitBreaker.HALF_OPEN
+                o_circuit.opened_at = time.monotonic()
+                Config().om.info(f"Disjoncteur '{s_family}' semi-ouvert : requête de test.")
+                return
+            # Ouvert, ou semi-ouvert avec la requête de test en cours : on n'insiste pas
+            raise CircuitOpenError(s_family, max(f_retry_in, 1.0))
+
+    def release(self, route_name: Optional[str]) -> None:
+        """Libère la requête de test d'un disjoncteur semi-ouvert quand elle s'arrête sans résultat (interruption, erreur locale) :
+        le disjoncteur redevient ouvert et la requête suivante sert de test.
+
+        Args:
+            route_name (Optional[str]): nom de la route (rien n'est fait si None)
+        """
+        s_family = CircuitBreaker.__family(route_name)
+        if s_family is None:
+            return
+        with self.__lock:
+            o_circuit = self.__circuits.get(s_family)
+            if o_circuit is not None and o_circuit.state == CircuitBreaker.HALF_OPEN:
+                o_circuit.state = CircuitBreaker.OPEN
+                o_circuit.opened_at = time.monotonic() - Config().get_float("circuit_breaker", "open_sec", 30)
+
+    def record(self, route_name: Optional[str], success: bool) -> None:
+        """Enregistre le résultat d'une requête et met à jour l'état du disjoncteur.
+
+        Args:
+            route_name (Optional[str]): nom de la route (rien n'est enregistré si None)
+            success (bool): True si l'API a répondu correctement (un échec est une erreur réseau, 5xx ou 429)
+        """
+        s_family = CircuitBreaker.__family(route_name)
+        if s_family is None:
+            return
+        with self.__lock:
+            o_circuit = self.__circuits.setdefault(s_family, Circuit(Config().get_int("circuit_breaker", "window", 20)))
+            o_circuit.outcomes.append(success)
+            if success:
+                o_circuit.consecutive_failures = 0
+                if o_circuit.state != CircuitBreaker.CLOSED:
+                    o_circuit.state = CircuitBreaker.CLOSED
+                    o_circuit.outcomes.clear()
+                    Config().om.info(f"Disjoncteur '{s_family}' refermé : l'API Entrepôt répond de nouveau.")
+                return
+            o_circuit.consecutive_failures += 1
+            if o_circuit.state == CircuitBreaker.HALF_OPEN or (o_circuit.state == CircuitBreaker.CLOSED and CircuitBreaker.__should_open(o_circuit)):
+                o_circuit.state = CircuitBreaker.OPEN
+                o_circuit.opened_at = time.monotonic()
+                Config().om.warning(
+                    f"Disjoncteur '{s_family}' ouvert après {o_circuit.consecutive_failures} échec(s) consécutif(s) : "
+                    + f"requêtes suspendues pendant {Config().get_float('circuit_breaker', 'open_sec', 30):.0f} s."
+                )
+
+    @staticmethod
+    def __should_open(circuit: Circuit) -> bool:
+        """Indique si le disjoncteur doit s'ouvrir (nombre d'échecs consécutifs ou taux d'échec atteint).
+
+        Args:
+            circuit (Circuit): état du disjoncteur
+
+        Returns:
+            bool: True si le disjoncteur doit s'ouvrir
+        """
+        i_consecutive_failures = Config().get_int("circuit_breaker", "consecutive_failures", 5)
+        if 0 < i_consecutive_failures <= circuit.consecutive_failures:
+            return True
+        f_error_rate = Config().get_float("circuit_breaker", "error_rate", 0.5)
+        i_nb_calls = len(circuit.outcomes)
+        if f_error_rate <= 0 or i_nb_calls < max(1, Config().get_int("circuit_breaker", "min_calls", 10)):
+            return False
+        return circuit.outcomes.count(False) / i_nb_calls >= f_error_rate
+
+    @staticmethod
+    def pause_while_open(function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Appelle la fonction en faisant une pause (au lieu d'échouer) tant que le disjoncteur est ouvert.
+
+        La durée totale des pauses est limitée par `circuit_breaker.max_pause_sec` (0 : pas de limite) ;
+        au-delà, l'erreur `CircuitOpenError` est propagée.
+
+        Args:
+            function (Callable[..., T]): fonction faisant des requêtes à l'API
+            args (Any): paramètres positionnels de la fonction
+            kwargs (Any): paramètres nommés de la fonction
+
+        Returns:
+            T: valeur renvoyée par la fonction
+        """
+        f_max_pause = Config().get_float("circuit_breaker", "max_pause_sec", 600)
+        f_paused = 0.0
+        while True:
+            try:
+                return function(*args, **kwargs)
+            except CircuitOpenError as e_open:
+                if 0 < f_max_pause <= f_paused:
+                    raise
+                f_pause = e_open.retry_in if f_max_pause <= 0 else min(e_open.retry_in, f_max_pause - f_paused)
+                Config().om.warning(f"{e_open.message} Pause de {f_pause:.0f} s.")
+                time.sleep(f_pause)
+                f_paused += f_pause
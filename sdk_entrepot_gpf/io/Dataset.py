@@ -1,11 +1,16 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from sdk_entrepot_gpf.helper.FileHelper import FileHelper
 
 from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.HashCache import HashCache
 
 
-class Dataset:
+class Dataset:  # pylint: disable=too-many-instance-attributes
     """Classe portante les infos nécessaires à la création d'une livraison et issues du dataset.
 
     Attributes:
@@ -16,8 +21,18 @@ class Dataset:
         __data_files (List[Path]): Liste des fichiers de donnée à importer sur l'entrepôt.
         __md5_files (List[Path]): Liste des fichiers md5 à importer sur l'entrepôt.
         __root_dir (Path): Chemin racine du dataset (absolu ou relatif ?)
+        __hash_while_upload (bool): clefs md5 calculées pendant l'envoi des fichiers (`upload.hash_while_upload`)
+        __pipeline (bool): fichiers listés et hachés au fil de l'envoi (`upload.pipeline`, cf. `iter_data_files` et `md5`)
+        __listed (bool): parcours des dossiers de données terminé
+        __md5_hashes (Dict[Path, str]): clefs md5 connues des fichiers de données
+        __md5_contents (Dict[Path, Optional[str]]): contenu actuel des fichiers md5 à générer (None s'ils n'existent pas)
+        __md5_listed (Dict[Path, Tuple[Dict[str, str], int]]): par dossier de données, clefs du fichier md5 existant et sa date de modification
+        __md5_dirs (List[Path]): dossiers de données dont le fichier md5 est généré (les autres sont conservés tels quels)
     """
 
+    # Intervalle (en secondes) entre deux messages de progression du calcul des clefs md5
+    PROGRESS_INTERVAL_SEC = 10
+
     def __init__(self, dataset: Dict[Any, Any], p_root_dir: Path) -> None:
         """Constructeur
 
@@ -33,54 +48,237 @@ class Dataset:
         self.__data_files: Dict[Path, str] = {}
         self.__md5_files: List[Path] = []
         self.__root_dir: Path = p_root_dir
+        self.__hash_while_upload = Config().get_bool("upload", "hash_while_upload", False)
+        self.__pipeline = Config().get_bool("upload", "pipeline", False)
+        self.__listed = False
+        self.__md5_hashes: Dict[Path, str] = {}
+        self.__md5_contents: Dict[Path, Optional[str]] = {}
+        self.__md5_listed: Dict[Path, Tuple[Dict[str, str], int]] = {}
+        self.__md5_dirs: List[Path] = []
 
+        # Listing des fichier md5 (et lecture de ceux qui existent)
+        self.__prepare_md5_files()
+        # En pipeline, les fichiers de données sont listés et hachés au fil de l'envoi
+        if self.__pipeline:
+            return
         # Listing des fichiers de donnée à envoyer
         self.__list_data_files()
-        # Génération des fichier md5 si nécessaire et listing
-        self.__generate_md5_files()
+        # Clefs connues (cache ou fichier md5 à jour)
+        for p_file in self.__data_files:
+            s_md5 = self.__known_md5(p_file)
+            if s_md5 is not None:
+                self.__md5_hashes[p_file] = s_md5
+        # Génération des fichiers md5 si nécessaire (sinon à la fin de l'envoi des fichiers de données)
+        if not self.__hash_while_upload:
+            self.write_md5_files()
 
     def __list_data_files(self) -> None:
         """Liste tous les fichiers de données à importer sur l'entrepôt API.
         Pour chaque fichier, on associe son Path local au chemin qui sera fourni à l'API.
         ex : Path(/root/dataset/data/fichier.shp) => "dataset/data"
         """
+        for _ in self.iter_data_files():
+            pass
+
+    def iter_data_files(self) -> Iterator[Tuple[Path, str]]:
+        """Itère sur les fichiers de données (Path local, chemin fourni à l'API). En pipeline (`upload.pipeline`),
+        les dossiers sont parcourus au fur et à mesure de l'itération et les fichiers ajoutés à `data_files`.
+
+        Yields:
+            Iterator[Tuple[Path, str]]: fichier de données et chemin du dossier côté API
+        """
+        if self.__listed:
+            yield from list(self.__data_files.items())
+            return
         p_abs_root_dir = self.__root_dir.absolute()
         for p_dir in self.__data_dirs:
-            self.__list_rec(p_abs_root_dir, p_dir)
+            yield from self.__list_rec(p_abs_root_dir, p_dir)
+        self.__listed = True
 
-    def __generate_md5_files(self) -> None:
-        """Génère les fichiers de clés md5 à importer sur l'entrepôt API.
+    def __prepare_md5_files(self) -> None:
+        """Liste les fichiers de clés md5 à importer sur l'entrepôt API.
         Pour chaque dossier de donnée, cherche un fichier .md5 correspondant,
-        s'il n'existe pas il est créé et rempli en parcourant les fichiers enfants du dossier.
-        S'il existe, rien n'est fait.
+        s'il n'existe pas il sera créé et rempli en parcourant les fichiers enfants du dossier.
+        S'il existe, il sera mis à jour pour les seuls fichiers ajoutés, supprimés ou modifiés depuis
+        (fichier modifié après le fichier .md5 ou dont l'empreinte en cache a changé) ;
+        les autres clefs sont reprises du cache des empreintes (`HashCache`) ou du fichier .md5 existant.
         """
         p_abs_root_dir = self.__root_dir.absolute()
-        s_pattern = Config().get("upload", "md5_pattern")
+        s_pattern = Config().get_str("upload", "md5_pattern")
+
+        for p_dir in self.__data_dirs:
+            p_md5_dir = Path(p_abs_root_dir / p_dir)
+            p_md5_dir_suf = p_md5_dir.with_suffix(".md5")
+            # On l'ajoute à la liste des fichiers md5
+            self.__md5_files.append(p_md5_dir_suf)
+            if p_md5_dir_suf.exists():
+                s_content = p_md5_dir_suf.read_text(encoding="utf-8")
+                d_parsed = Dataset.__parse_md5_file(s_content, s_pattern)
+                if d_parsed is None:
+                    # Fichier non conforme au modèle : il est conservé tel quel
+                    Config().om.debug(f"Le fichier md5 {p_md5_dir_suf.relative_to(self.__root_dir)} ne suit pas le modèle {s_pattern}, il est conservé tel quel.")
+                    continue
+                self.__md5_contents[p_md5_dir_suf] = s_content
+                self.__md5_listed[p_md5_dir] = (d_parsed, p_md5_dir_suf.stat().st_mtime_ns)
+            else:
+                self.__md5_contents[p_md5_dir_suf] = None
+            self.__md5_dirs.append(p_md5_dir)
+
+    def __known_md5(self, file_path: Path) -> Optional[str]:
+        """Renvoie la clef md5 d'un fichier de données si elle est connue sans le lire.
+
+        Args:
+            file_path (Path): fichier de données
+
+        Returns:
+            Optional[str]: clef en cache ou, si le fichier est inconnu du cache (sinon son empreinte a changé)
+                et antérieur au fichier md5 existant, clef reprise du fichier md5 ; None s'il faut calculer la clef
+        """
+        s_cached = HashCache().get(file_path, "md5")
+        if s_cached is not None:
+            return s_cached
+        for p_md5_dir, (d_listed, i_md5_mtime) in self.__md5_listed.items():
+            if p_md5_dir not in file_path.parents:
+                continue
+            s_listed = d_listed.get(file_path.relative_to(self.__root_dir).as_posix())
+            if s_listed is not None and file_path.stat().st_mtime_ns <= i_md5_mtime and not HashCache().contains(file_path, "md5"):
+                return s_listed
+        return None
+
+    def needs_md5(self, file_path: Path) -> bool:
+        """Indique si la clef md5 d'un fichier de données est nécessaire, c'est-à-dire s'il est dans un dossier
+        dont le fichier md5 est généré (les fichiers md5 ne suivant pas le modèle sont conservés tels quels).
+
+        Args:
+            file_path (Path): fichier de données
+
+        Returns:
+            bool: True si la clef md5 du fichier doit être calculée
+        """
+        return any(p_md5_dir in file_path.parents for p_md5_dir in self.__md5_dirs)
+
+    def md5(self, file_path: Path) -> str:
+        """Renvoie la clef md5 d'un fichier de données, calculée si elle n'est pas connue (utilisé par l'étape de hachage du pipeline).
+
+        Args:
+            file_path (Path): fichier de données
+
+        Returns:
+            str: clef md5 du fichier
+        """
+        s_md5 = self.__md5_hashes.get(file_path) or self.__known_md5(file_path) or FileHelper.md5_hash(file_path)
+        self.__md5_hashes[file_path] = s_md5
+        return s_md5
+
+    def set_md5(self, file_path: Path, md5: str, stat_result: Optional[os.stat_result] = None) -> None:
+        """Enregistre la clef md5 d'un fichier de données calculée par ailleurs (pendant son envoi par exemple).
+
+        Args:
+            file_path (Path): fichier de données
+            md5 (str): clef md5 du fichier
+            stat_result (Optional[os.stat_result], optional): état du fichier relevé avant le calcul, pour le cache des empreintes
+        """
+        self.__md5_hashes[file_path] = md5
+        if stat_result is not None:
+            HashCache().put(file_path, "md5", md5, stat_result)
+
+    def write_md5_files(self) -> None:
+        """Calcule les clefs md5 manquantes (en parallèle) puis crée ou met à jour les fichiers md5 qui ne sont plus à jour."""
+        p_abs_root_dir = self.__root_dir.absolute()
+        s_pattern = Config().get_str("upload", "md5_pattern")
+        self.__md5_hashes.update(self.__hash_files(self.pending_md5))
 
         # On parcourt le dictionnaire des répertoires
         for p_dir in self.__data_dirs:
             p_md5_dir = Path(p_abs_root_dir / p_dir)
             p_md5_dir_suf = p_md5_dir.with_suffix(".md5")
 
-            # On teste si le fichier md5 existe, sinon on le crée
-            if not p_md5_dir_suf.exists():
+            # Fichier md5 conservé tel quel s'il ne suit pas le modèle
+            if p_md5_dir_suf not in self.__md5_contents:
+                continue
+
+            # On parcourt les fichiers pour remplir un dictionnaire temporaire
+            # la liste des fichiers est ordonnée selon le chemin complet du ficher
+            d_md5 = {}
+            for p_file in sorted(self.__data_files, key=str):
+                if p_md5_dir in p_file.parents:
+                    p_file_trunc = p_file.relative_to(self.__root_dir)
+                    d_md5[p_file_trunc] = self.__md5_hashes[p_file]
+            s_content = "".join(f"{s_pattern}\n".format(md5_key=s_md5, file_path=p_file.as_posix()) for p_file, s_md5 in d_md5.items())
+
+            # On crée (ou met à jour) le fichier .md5 s'il n'existe pas ou n'est plus à jour
+            s_existing = self.__md5_contents[p_md5_dir_suf]
+            if s_existing is None:
                 Config().om.info(f"Le fichier md5 {p_md5_dir_suf.relative_to(self.__root_dir)} n'existe pas, il va être créé")
+            elif s_existing != s_content:
+                Config().om.info(f"Le fichier md5 {p_md5_dir_suf.relative_to(self.__root_dir)} n'est plus à jour, il va être mis à jour")
+            if s_existing != s_content:
+                p_md5_dir_suf.write_text(s_content, encoding="utf-8")
+            self.__md5_contents[p_md5_dir_suf] = s_content
+
+    @staticmethod
+    def __parse_md5_file(content: str, pattern: str) -> Optional[Dict[str, str]]:
+        """Lit les clefs d'un fichier md5 écrit selon le modèle `upload.md5_pattern`.
 
-                # On parcourt les fichiers pour remplir un dictionnaire temporaire
-                # la liste des fichiers est ordonnée selon le chemin complet du ficher
-                d_md5 = {}
-                for p_file in sorted(self.__data_files, key=str):
-                    if p_md5_dir in p_file.parents:
-                        p_file_trunc = p_file.relative_to(self.__root_dir)
-                        d_md5[p_file_trunc] = FileHelper.md5_hash(p_file)
+        Args:
+            content (str): contenu du fichier md5
+            pattern (str): modèle d'une ligne (`{md5_key}` et `{file_path}`)
 
-                # A la fin on rempli le fichier .md5
-                with open(p_md5_dir_suf, "w", encoding="utf-8") as o_md5_file:
-                    for p_file, s_md5 in d_md5.items():
-                        o_md5_file.write(f"{s_pattern}\n".format(md5_key=s_md5, file_path=p_file.as_posix()))
+        Returns:
+            Optional[Dict[str, str]]: clef md5 par chemin de fichier, None si une ligne ne suit pas le modèle
+        """
+        s_regex = re.escape(pattern).replace(re.escape("{md5_key}"), "(?P<md5_key>[0-9a-fA-F]{32})").replace(re.escape("{file_path}"), "(?P<file_path>.+)")
+        o_regex = re.compile(f"^{s_regex}$")
+        d_listed: Dict[str, str] = {}
+        for s_line in content.splitlines():
+            if not s_line:
+                continue
+            o_match = o_regex.match(s_line)
+            if o_match is None:
+                return None
+            d_listed[o_match.group("file_path")] = o_match.group("md5_key")
+        return d_listed
 
-            # Enfin, on l'ajoute à la liste des fichiers md5
-            self.__md5_files.append(p_md5_dir_suf)
+    @staticmethod
+    def __hash_files(files: List[Path]) -> Dict[Path, str]:
+        """Calcule en parallèle (`upload.md5_max_workers` threads) la clef md5 des fichiers,
+        en affichant régulièrement la progression et le débit.
+
+        Args:
+            files (List[Path]): fichiers à hacher
+
+        Returns:
+            Dict[Path, str]: clef md5 de chaque fichier
+        """
+        d_hashes: Dict[Path, str] = {}
+        if not files:
+            return d_hashes
+        d_sizes = {p_file: p_file.stat().st_size for p_file in files}
+        i_total = sum(d_sizes.values())
+        i_max_workers = Config().get_int("upload", "md5_max_workers", 4) or os.cpu_count() or 1
+        Config().om.info(f"Calcul des clefs md5 de {len(files)} fichier(s) ({FileHelper.format_size(i_total)}) sur {i_max_workers} thread(s)...")
+        f_start = f_last = time.monotonic()
+        i_done = 0
+        with ThreadPoolExecutor(max_workers=i_max_workers, thread_name_prefix="md5") as o_executor:
+            d_futures = {o_executor.submit(FileHelper.md5_hash, p_file): p_file for p_file in files}
+            try:
+                for o_future in as_completed(d_futures):
+                    p_file = d_futures[o_future]
+                    d_hashes[p_file] = o_future.result()
+                    i_done += d_sizes[p_file]
+                    f_now = time.monotonic()
+                    if f_now - f_last >= Dataset.PROGRESS_INTERVAL_SEC:
+                        f_last = f_now
+                        s_rate = FileHelper.format_size(int(i_done / (f_now - f_start)))
+                        Config().om.info(f"Calcul des clefs md5 : {len(d_hashes)}/{len(files)} fichier(s), {FileHelper.format_size(i_done)}/{FileHelper.format_size(i_total)} ({s_rate}/s)")
+            except BaseException:
+                # Erreur : on annule les calculs qui n'ont pas commencé
+                for o_future in d_futures:
+                    o_future.cancel()
+                raise
+        f_duration = max(time.monotonic() - f_start, 1e-6)
+        Config().om.info(f"Clefs md5 calculées : {len(files)} fichier(s), {FileHelper.format_size(i_total)} en {f_duration:.1f} s ({FileHelper.format_size(int(i_total / f_duration))}/s)")
+        return d_hashes
 
     @property
     def data_dirs(self) -> List[Path]:
@@ -106,12 +304,27 @@ class Dataset:
     def md5_files(self) -> List[Path]:
         return self.__md5_files
 
-    def __list_rec(self, root_dir: Path, path_rep: Path) -> None:
-        """Fonction récursive permettant de lister des fichiers
+    @property
+    def hash_while_upload(self) -> bool:
+        return self.__hash_while_upload
+
+    @property
+    def pipeline(self) -> bool:
+        return self.__pipeline
+
+    @property
+    def pending_md5(self) -> List[Path]:
+        return [p_file for p_file in self.__data_files if p_file not in self.__md5_hashes and self.needs_md5(p_file)]
+
+    def __list_rec(self, root_dir: Path, path_rep: Path) -> Iterator[Tuple[Path, str]]:
+        """Fonction récursive permettant de lister des fichiers (au fur et à mesure de l'itération)
 
         Args:
             root_dir (Path): Chemin absolu du dossier racine
             path_rep (Path): Chemin du dossier à lister
+
+        Yields:
+            Iterator[Tuple[Path, str]]: fichier listé et chemin du dossier côté API
         """
 
         p_rep = root_dir / path_rep
@@ -121,10 +334,11 @@ class Dataset:
             p_rep_elt = path_rep / p_elt
             # Appel récursif si l'élément est un dossier
             if p_elt.is_dir():
-                self.__list_rec(p_rep, Path(p_elt.name))
+                yield from self.__list_rec(p_rep, Path(p_elt.name))
             # L'élément est un fichier
             elif p_elt.is_file():
                 # Création du chemin relatif pour l'API
                 p_api = p_rep_elt.relative_to(self.__root_dir)
                 # Remplissage du dictionnaire __data_files
                 self.__data_files[p_rep_elt] = p_api.parent.as_posix()
+                yield p_rep_elt, self.__data_files[p_rep_elt]
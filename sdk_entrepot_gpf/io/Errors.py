@@ -169,6 +169,7 @@ class StatusCodeError(_WithResponseError):
         data: Optional[Union[Dict[str, Any], List[Any]]],
         status_code: int,
         response: str,
+        retry_after: Optional[float] = None,
     ):
         """Instanciée à partir de l'URL, la méthode, les paramètres et les données posant problème ainsi que la réponse et le code de retour de l'API.
 
@@ -179,9 +180,11 @@ class StatusCodeError(_WithResponseError):
             data (Optional[Union[Dict[str, Any], List[Any]]]): données envoyées
             status_code (int): code de retour
             response (str): données reçues
+            retry_after (Optional[float], optional): délai (en secondes) demandé par l'API avant une nouvelle tentative (entête `Retry-After`)
         """
         super().__init__(url, method, params, data, response)
         self.status_code = status_code
+        self.retry_after = retry_after
 
     def __str__(self) -> str:
         return self.__repr__()
@@ -193,3 +196,23 @@ class StatusCodeError(_WithResponseError):
                 f"   * status_code: {self.status_code}",
             ]
         )
+
+
+class CircuitOpenError(GpfSdkError):
+    """Erreur levée sans requêter l'API quand le disjoncteur de la famille de routes est ouvert (API jugée indisponible).
+
+    Attributes:
+        family (str): famille de routes (ou route) concernée
+        retry_in (float): nombre de secondes avant que le disjoncteur ne laisse passer une requête de test
+    """
+
+    def __init__(self, family: str, retry_in: float) -> None:
+        """Constructeur.
+
+        Args:
+            family (str): famille de routes (ou route) concernée
+            retry_in (float): nombre de secondes avant que le disjoncteur ne laisse passer une requête de test
+        """
+        super().__init__(f"L'API Entrepôt semble indisponible pour les requêtes '{family}' : nouvel essai possible dans {retry_in:.0f} s.")
+        self.family = family
+        self.retry_in = retry_in
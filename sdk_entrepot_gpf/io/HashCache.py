@@ -0,0 +1,132 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from sdk_entrepot_gpf.pattern.Singleton import Singleton
+from sdk_entrepot_gpf.io.Config import Config
+
+
+class HashCache(metaclass=Singleton):
+    """Singleton conservant l'empreinte des fichiers déjà hachés, associée à l'identité du fichier
+    (chemin, taille, date de modification en nanosecondes, inode) : tant que le fichier n'a pas changé,
+    son empreinte est réutilisée sans le relire.
+
+    Le cache est une base SQLite, en mémoire pour le processus ou, si `hash_cache.file` est renseigné,
+    dans un fichier partagé entre les exécutions (et entre processus, SQLite gérant les accès concurrents).
+
+    Les fichiers modifiés moins de `RACY_SEC` secondes avant leur hachage ne sont pas conservés : une modification
+    ultérieure pourrait ne pas changer leur date de modification (précision du système de fichiers).
+
+    Attributes:
+        __enabled (bool): cache activé (`hash_cache.enabled`)
+        __lock (threading.Lock): verrou protégeant la connexion
+        __connection (Optional[sqlite3.Connection]): connexion à la base (None si le cache est désactivé)
+        __hits (int): nombre d'empreintes servies par le cache
+        __misses (int): nombre d'empreintes absentes ou périmées
+    """
+
+    RACY_SEC = 2
+
+    def __init__(self) -> None:
+        self.__enabled = Config().get_bool("hash_cache", "enabled", True)
+        self.__lock = threading.Lock()
+        self.__connection: Optional[sqlite3.Connection] = None
+        self.__hits = 0
+        self.__misses = 0
+        if not self.__enabled:
+            return
+        s_file = Config().get("hash_cache", "file")
+        if s_file:
+            p_file = Path(s_file).expanduser()
+            p_file.parent.mkdir(parents=True, exist_ok=True)
+            self.__connection = sqlite3.connect(str(p_file), timeout=30, check_same_thread=False)
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA synchronous=NORMAL")
+        else:
+            self.__connection = sqlite3.connect(":memory:", check_same_thread=False)
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "path TEXT NOT NULL, algorithm TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, inode INTEGER NOT NULL, digest TEXT NOT NULL, "
+            "PRIMARY KEY (path, algorithm))"
+        )
+        self.__connection.commit()
+
+    @property
+    def hits(self) -> int:
+        """Nombre d'empreintes servies par le cache."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """Nombre d'empreintes absentes du cache ou périmées."""
+        return self.__misses
+
+    def get(self, file_path: Path, algorithm: str) -> Optional[str]:
+        """Renvoie l'empreinte du fichier si elle est en cache et que le fichier n'a pas changé depuis.
+
+        Args:
+            file_path (Path): chemin du fichier
+            algorithm (str): algorithme de hachage
+
+        Returns:
+            Optional[str]: empreinte, None si elle est absente du cache ou si le fichier a changé
+        """
+        if self.__connection is None:
+            return None
+        o_stat = file_path.stat()
+        with self.__lock:
+            o_row = self.__connection.execute(
+                "SELECT size, mtime_ns, inode, digest FROM hashes WHERE path = ? AND algorithm = ?",
+                (str(file_path.absolute()), algorithm),
+            ).fetchone()
+            if o_row is None or tuple(o_row[:3]) != (o_stat.st_size, o_stat.st_mtime_ns, o_stat.st_ino):
+                self.__misses += 1
+                return None
+            self.__hits += 1
+            return str(o_row[3])
+
+    def contains(self, file_path: Path, algorithm: str) -> bool:
+        """Indique si le cache a une empreinte pour ce fichier, à jour ou non (une empreinte périmée signale une modification).
+
+        Args:
+            file_path (Path): chemin du fichier
+            algorithm (str): algorithme de hachage
+
+        Returns:
+            bool: True si une empreinte est enregistrée pour ce fichier
+        """
+        if self.__connection is None:
+            return False
+        with self.__lock:
+            o_row = self.__connection.execute("SELECT 1 FROM hashes WHERE path = ? AND algorithm = ?", (str(file_path.absolute()), algorithm)).fetchone()
+        return o_row is not None
+
+    def put(self, file_path: Path, algorithm: str, digest: str, stat_result: os.stat_result) -> None:
+        """Enregistre l'empreinte d'un fichier.
+
+        Args:
+            file_path (Path): chemin du fichier
+            algorithm (str): algorithme de hachage
+            digest (str): empreinte du fichier
+            stat_result (os.stat_result): état du fichier relevé AVANT le hachage (une modification pendant
+                le hachage rend ainsi l'entrée périmée)
+        """
+        if self.__connection is None or time.time_ns() - stat_result.st_mtime_ns < HashCache.RACY_SEC * 1_000_000_000:
+            return
+        with self.__lock:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO hashes (path, algorithm, size, mtime_ns, inode, digest) VALUES (?, ?, ?, ?, ?, ?)",
+                (str(file_path.absolute()), algorithm, stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino, digest),
+            )
+            self.__connection.commit()
+
+    def clear(self) -> None:
+        """Vide le cache."""
+        if self.__connection is None:
+            return
+        with self.__lock:
+            self.__connection.execute("DELETE FROM hashes")
+            self.__connection.commit()
@@ -0,0 +1,88 @@
+import hashlib
+import io
+import os
+from typing import Any, BinaryIO, Optional
+
+
+class HashingReader(io.RawIOBase):
+    """Lecture d'un fichier ouvert en binaire calculant son empreinte au fil des lectures. À envelopper dans un
+    `io.BufferedReader` pour être envoyé par `MultipartEncoder` : le fichier envoyé n'est ainsi lu qu'une fois.
+
+    Seules les lectures séquentielles depuis le début du fichier sont prises en compte ; un retour au début
+    (nouvelle tentative d'envoi) recommence le calcul.
+
+    Attributes:
+        __file (BinaryIO): fichier lu
+        __algorithm (str): algorithme de hachage
+        __hash (Any): calcul de l'empreinte en cours
+        __hashed (int): nombre d'octets pris en compte dans l'empreinte
+    """
+
+    def __init__(self, file_object: BinaryIO, algorithm: str = "md5") -> None:
+        """Constructeur.
+
+        Args:
+            file_object (BinaryIO): fichier ouvert en lecture binaire (au début)
+            algorithm (str, optional): algorithme de hachage (nom compris par `hashlib.new`). Defaults to "md5".
+        """
+        super().__init__()
+        self.__file = file_object
+        self.__algorithm = algorithm
+        self.__hash = hashlib.new(algorithm)
+        self.__hashed = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Lit le fichier dans le tampon et met à jour l'empreinte.
+
+        Args:
+            buffer (Any): tampon à remplir
+
+        Returns:
+            int: nombre d'octets lus (0 à la fin du fichier)
+        """
+        i_position = self.__file.tell()
+        b_data = self.__file.read(len(buffer))
+        i_read = len(b_data)
+        buffer[:i_read] = b_data
+        if i_position == self.__hashed:
+            self.__hash.update(b_data)
+            self.__hashed += i_read
+        return i_read
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Déplace la position de lecture ; un retour au début recommence le calcul de l'empreinte.
+
+        Args:
+            offset (int): décalage
+            whence (int, optional): référence du décalage. Defaults to os.SEEK_SET.
+
+        Returns:
+            int: nouvelle position
+        """
+        i_position = self.__file.seek(offset, whence)
+        if i_position == 0:
+            self.__hash = hashlib.new(self.__algorithm)
+            self.__hashed = 0
+        return i_position
+
+    def tell(self) -> int:
+        return self.__file.tell()
+
+    def fileno(self) -> int:
+        return self.__file.fileno()
+
+    def hexdigest(self) -> Optional[str]:
+        """Empreinte du fichier, si celui-ci a été lu en entier.
+
+        Returns:
+            Optional[str]: empreinte (hexadécimal), None si le fichier n'a pas été lu en entier
+        """
+        if self.__hashed != os.fstat(self.__file.fileno()).st_size:
+            return None
+        return self.__hash.hexdigest()
@@ -0,0 +1,334 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from sdk_entrepot_gpf.pattern.Singleton import Singleton
+from sdk_entrepot_gpf.io.Config import Config
+
+
+class CachedResponse:
+    """Réponse conservée par le cache HTTP.
+
+    Attributes:
+        url (str): url de la requête (sans les paramètres)
+        status_code (int): code retour de la réponse
+        headers (Dict[str, str]): entêtes de la réponse
+        content (bytes): corps de la réponse
+        stored_at (float): date (`time.time()`) de la réponse ou de sa dernière revalidation
+    """
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes, stored_at: Optional[float] = None) -> None:
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.stored_at = stored_at if stored_at is not None else time.time()
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Entêtes de requête conditionnelle (`If-None-Match`, `If-Modified-Since`) correspondant à la réponse, vide si elle n'a pas de validateur."""
+        d_headers = CaseInsensitiveDict(self.headers)
+        d_validators: Dict[str, str] = {}
+        if d_headers.get("ETag"):
+            d_validators["If-None-Match"] = d_headers["ETag"]
+        if d_headers.get("Last-Modified"):
+            d_validators["If-Modified-Since"] = d_headers["Last-Modified"]
+        return d_validators
+
+    def to_response(self) -> requests.Response:
+        """Reconstruit une réponse `requests` (nouvelle instance à chaque appel).
+
+        Returns:
+            requests.Response: réponse équivalente à celle conservée
+        """
+        o_response = requests.Response()
+        o_response.url = self.url
+        o_response.status_code = self.status_code
+        o_response.headers = CaseInsensitiveDict(self.headers)
+        o_response._content = self.content  # pylint: disable=protected-access
+        o_response.encoding = requests.utils.get_encoding_from_headers(o_response.headers)
+        return o_response
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sérialise la réponse (pour le cache sur disque).
+
+        Returns:
+            Dict[str, Any]: réponse sérialisable en JSON
+        """
+        return {
+            "url": self.url,
+            "status_code": self.status_code,
+            "headers": self.headers,
+            "content": base64.b64encode(self.content).decode("ascii"),
+            "stored_at": self.stored_at,
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "CachedResponse":
+        """Instancie une réponse à partir de sa sérialisation.
+
+        Args:
+            data (Dict[str, Any]): réponse sérialisée (cf. `to_dict`)
+
+        Returns:
+            CachedResponse: réponse
+        """
+        return CachedResponse(data["url"], int(data["status_code"]), dict(data["headers"]), base64.b64decode(data["content"]), float(data["stored_at"]))
+
+
+class HttpCache(metaclass=Singleton):
+    """Singleton gérant le cache HTTP des requêtes GET des routes de lecture (`http_cache.routes`).
+
+    Les réponses ayant un validateur (`ETag`, `Last-Modified`) sont revalidées à chaque lecture par une requête
+    conditionnelle (`If-None-Match`, `If-Modified-Since`) : si l'API répond 304, la réponse conservée est renvoyée.
+    Les réponses sans validateur ne sont conservées que si la route a une durée de vie (`http_cache.max_age_sec` ou
+    `http_cache.<route>_max_age_sec`) et sont servies sans requête pendant cette durée.
+
+    Les réponses sont conservées en mémoire (au plus `http_cache.max_entries`, éviction LRU) et, si `http_cache.directory`
+    est renseigné, sur disque pour les réponses avec validateur (toujours revalidées, elles peuvent être partagées entre processus).
+    Toute requête de modification réussie (POST, PUT, PATCH, DELETE) retire de la mémoire les réponses des urls qu'elle préfixe.
+
+    Attributes:
+        __lock (threading.Lock): verrou protégeant le cache et les compteurs
+        __entries (OrderedDict[str, CachedResponse]): réponses par clef
+        __routes (Optional[re.Pattern[str]]): regex des routes pouvant être mises en cache
+        __directory (Optional[Path]): répertoire du cache sur disque (None si désactivé)
+        __hits (int): nombre de réponses servies sans requête (durée de vie)
+        __revalidations (int): nombre de réponses servies après un 304
+        __misses (int): nombre de requêtes sans réponse exploitable dans le cache
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        s_routes = Config().get("http_cache", "routes", "")
+        self.__routes = re.compile(s_routes) if s_routes and Config().get_bool("http_cache", "enabled", True) else None
+        s_directory = Config().get("http_cache", "directory", "")
+        self.__directory = Path(s_directory).expanduser() if s_directory else None
+        self.__hits = 0
+        self.__revalidations = 0
+        self.__misses = 0
+
+    @property
+    def hits(self) -> int:
+        """Nombre de réponses servies sans requête (durée de vie non écoulée)."""
+        return self.__hits
+
+    @property
+    def revalidations(self) -> int:
+        """Nombre de réponses servies après confirmation par l'API (304)."""
+        return self.__revalidations
+
+    @property
+    def misses(self) -> int:
+        """Nombre de requêtes cachables sans réponse exploitable dans le cache."""
+        return self.__misses
+
+    def key(self, route_name: Optional[str], method: str, url: str, params: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Renvoie la clef de la requête dans le cache, si elle peut y être mise.
+
+        La clef dépend de l'url, des paramètres et du compte utilisé (les réponses d'un compte ne sont pas servies à un autre).
+
+        Args:
+            route_name (Optional[str]): nom de la route
+            method (str): méthode de la requête
+            url (str): url de la requête
+            params (Optional[Dict[str, Any]]): paramètres de la requête
+
+        Returns:
+            Optional[str]: clef de la requête, None si elle ne peut pas être mise en cache
+        """
+        if self.__routes is None or route_name is None or method.upper() != "GET" or not self.__routes.search(route_name):
+            return None
+        s_scope = "|".join(
+            [
+                Config().get("store_authentification", "token_url", "") or "",
+                Config().get("store_authentification", "client_id", "") or "",
+                Config().get("store_authentification", "login", "") or "",
+            ]
+        )
+        s_params = urlencode(sorted((params or {}).items()), doseq=True)
+        return hashlib.sha256(f"{url}?{s_params}|{s_scope}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Renvoie la réponse conservée pour la clef (en mémoire puis sur disque).
+
+        Args:
+            key (str): clef de la requête
+
+        Returns:
+            Optional[CachedResponse]: réponse conservée, None si absente
+        """
+        with self.__lock:
+            o_entry = self.__entries.get(key)
+            if o_entry is not None:
+                self.__entries.move_to_end(key)
+                return o_entry
+        o_entry = self.__read(key)
+        if o_entry is not None:
+            self.__remember(key, o_entry)
+        return o_entry
+
+    def serve(self, route_name: str, key: str, entry: CachedResponse) -> Optional[requests.Response]:
+        """Renvoie la réponse conservée si elle peut être servie sans requête (pas de validateur et durée de vie non écoulée).
+
+        Args:
+            route_name (str): nom de la route
+            key (str): clef de la requête
+            entry (CachedResponse): réponse conservée
+
+        Returns:
+            Optional[requests.Response]: réponse à utiliser, None s'il faut faire la requête (conditionnelle si possible)
+        """
+        if entry.validators or time.time() - entry.stored_at >= HttpCache.__max_age(route_name):
+            return None
+        with self.__lock:
+            self.__hits += 1
+        Config().om.debug(f"Cache HTTP : {route_name} ({entry.url}) servi depuis le cache [{key[:8]}].")
+        return entry.to_response()
+
+    def revalidate(self, route_name: str, key: str, entry: CachedResponse) -> requests.Response:
+        """Prend en compte un 304 (réponse inchangée) et renvoie la réponse conservée.
+
+        Args:
+            route_name (str): nom de la route
+            key (str): clef de la requête
+            entry (CachedResponse): réponse conservée
+
+        Returns:
+            requests.Response: réponse conservée
+        """
+        entry.stored_at = time.time()
+        with self.__lock:
+            self.__revalidations += 1
+        Config().om.debug(f"Cache HTTP : {route_name} ({entry.url}) inchangé (304), réponse du cache [{key[:8]}].")
+        return entry.to_response()
+
+    def store(self, route_name: str, key: str, url: str, response: requests.Response) -> None:
+        """Conserve la réponse si elle a un validateur ou si la route a une durée de vie.
+
+        Args:
+            route_name (str): nom de la route
+            key (str): clef de la requête
+            url (str): url de la requête (sans les paramètres)
+            response (requests.Response): réponse de l'API (succès)
+        """
+        with self.__lock:
+            self.__misses += 1
+        o_entry = CachedResponse(url, response.status_code, dict(response.headers), response.content)
+        if o_entry.validators:
+            self.__remember(key, o_entry)
+            self.__write(key, o_entry)
+        elif HttpCache.__max_age(route_name) > 0:
+            self.__remember(key, o_entry)
+
+    def invalidate(self, url: str) -> None:
+        """Retire de la mémoire, après une modification sur l'API, les réponses concernant la ressource modifiée :
+        celles dont l'url commence par celle indiquée (ressource et sous-ressources) et celles des ressources parentes
+        (modifier `.../uploads/{id}/tags` modifie aussi l'entité `.../uploads/{id}`).
+
+        Args:
+            url (str): url de la requête de modification
+        """
+        s_url = url.split("?", 1)[0].rstrip("/")
+        with self.__lock:
+            for s_key in [s_key for s_key, o_entry in self.__entries.items() if HttpCache.__related(o_entry.url, s_url)]:
+                del self.__entries[s_key]
+
+    @staticmethod
+    def __related(entry_url: str, url: str) -> bool:
+        """Indique si une réponse conservée concerne la ressource modifiée, une de ses sous-ressources ou une ressource parente.
+
+        Args:
+            entry_url (str): url de la réponse conservée
+            url (str): url de la ressource modifiée
+
+        Returns:
+            bool: True si la réponse doit être invalidée
+        """
+        s_entry_url = entry_url.rstrip("/")
+        return s_entry_url == url or s_entry_url.startswith(f"{url}/") or url.startswith(f"{s_entry_url}/")
+
+    def clear(self) -> None:
+        """Vide le cache en mémoire."""
+        with self.__lock:
+            self.__entries.clear()
+
+    def __remember(self, key: str, entry: CachedResponse) -> None:
+        """Ajoute la réponse en mémoire en évinçant les moins récemment utilisées au-delà de `http_cache.max_entries`.
+
+        Args:
+            key (str): clef de la requête
+            entry (CachedResponse): réponse
+        """
+        i_max_entries = Config().get_int("http_cache", "max_entries", 500)
+        with self.__lock:
+            self.__entries[key] = entry
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > max(1, i_max_entries):
+                self.__entries.popitem(last=False)
+
+    @staticmethod
+    def __max_age(route_name: str) -> float:
+        """Durée de vie (en secondes) des réponses sans validateur de la route.
+
+        Args:
+            route_name (str): nom de la route
+
+        Returns:
+            float: durée de vie, 0 si ces réponses ne sont pas conservées
+        """
+        return Config().get_float("http_cache", f"{route_name}_max_age_sec", Config().get_float("http_cache", "max_age_sec", 0))
+
+    def __read(self, key: str) -> Optional[CachedResponse]:
+        """Lit une réponse dans le cache sur disque.
+
+        Args:
+            key (str): clef de la requête
+
+        Returns:
+            Optional[CachedResponse]: réponse, None si le cache sur disque est désactivé, si elle est absente ou illisible
+        """
+        if self.__directory is None:
+            return None
+        try:
+            return CachedResponse.from_dict(json.loads((self.__directory / f"{key}.json").read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            Config().om.debug(f"Cache HTTP : réponse illisible sur disque [{key[:8]}], elle est ignorée.")
+            return None
+
+    def __write(self, key: str, entry: CachedResponse) -> None:
+        """Écrit une réponse dans le cache sur disque de manière atomique (fichier temporaire puis renommage).
+
+        Args:
+            key (str): clef de la requête
+            entry (CachedResponse): réponse
+        """
+        if self.__directory is None:
+            return
+        try:
+            self.__directory.mkdir(parents=True, exist_ok=True)
+            i_fd, s_tmp_path = tempfile.mkstemp(dir=self.__directory, prefix=f".{key}.", suffix=".tmp")
+            try:
+                with os.fdopen(i_fd, "w", encoding="utf-8") as o_file:
+                    json.dump(entry.to_dict(), o_file)
+                os.replace(s_tmp_path, self.__directory / f"{key}.json")
+            except BaseException:
+                Path(s_tmp_path).unlink(missing_ok=True)
+                raise
+        except OSError as e_error:
+            Config().om.debug(f"Cache HTTP : écriture impossible dans {self.__directory} ({e_error}).")
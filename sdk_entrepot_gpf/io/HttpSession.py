@@ -0,0 +1,68 @@
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+from sdk_entrepot_gpf.pattern.Singleton import Singleton
+from sdk_entrepot_gpf.io.Config import Config
+
+
+class HttpSession(metaclass=Singleton):
+    """Singleton fournissant la session HTTP partagée par toutes les requêtes du SDK (API Entrepôt et KeyCloak).
+
+    La session conserve un pool de connexions par hôte : les connexions TCP (et leur session TLS)
+    sont réutilisées d'une requête à l'autre au lieu d'être rouvertes à chaque appel.
+    Le pool de `urllib3` est thread-safe, la session peut donc être utilisée depuis plusieurs threads.
+
+    Attributes:
+        __lock (threading.Lock): verrou protégeant la création et la fermeture de la session
+        __session (Optional[requests.Session]): session créée à la première utilisation
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__session: Optional[requests.Session] = None
+
+    @property
+    def session(self) -> requests.Session:
+        """Renvoie la session partagée en la créant si besoin.
+
+        Returns:
+            session HTTP partagée
+        """
+        with self.__lock:
+            if self.__session is None:
+                self.__session = HttpSession.__create_session()
+            return self.__session
+
+    def close(self) -> None:
+        """Ferme la session (et les connexions du pool). Une nouvelle session sera créée au prochain appel."""
+        with self.__lock:
+            if self.__session is not None:
+                self.__session.close()
+                self.__session = None
+
+    @staticmethod
+    def __create_session() -> requests.Session:
+        """Crée une session selon les paramètres `pool_*` et `keep_alive` de la section `store_api`.
+
+        Returns:
+            session HTTP configurée
+        """
+        Config().om.debug("Création de la session HTTP partagée.")
+        o_session = requests.Session()
+        # Pool de connexions par hôte
+        o_adapter = HTTPAdapter(
+            pool_connections=Config().get_int("store_api", "pool_connections", 10),
+            pool_maxsize=Config().get_int("store_api", "pool_maxsize", 10),
+            pool_block=Config().get_bool("store_api", "pool_block", False),
+        )
+        o_session.mount("https://", o_adapter)
+        o_session.mount("http://", o_adapter)
+        # Pas de keep-alive : on demande au serveur de fermer la connexion après chaque réponse
+        if not Config().get_bool("store_api", "keep_alive", True):
+            o_session.headers["Connection"] = "close"
+        # Les requêtes restent sans état : les cookies éventuels ne sont pas conservés entre deux appels
+        o_session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return o_session
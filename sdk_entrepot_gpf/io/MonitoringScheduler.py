@@ -0,0 +1,121 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple, TypeVar, Union
+
+from sdk_entrepot_gpf.pattern.Singleton import Singleton
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.Errors import CircuitOpenError
+
+T = TypeVar("T")
+
+
+class MonitoringScheduler(metaclass=Singleton):
+    """Singleton suivant en arrière-plan, avec une seule boucle, l'avancement d'un nombre quelconque d'entités
+    (vérifications de livraisons, exécutions de traitement, offres...).
+
+    Chaque suivi est décrit par une fonction `poll` renvoyant None tant que l'entité n'est pas dans un état final
+    et le résultat du suivi sinon. Chaque suivi a son propre intervalle : la boucle lance les vérifications arrivées
+    à échéance (au plus `monitoring.max_parallel_polls` en même temps) et replanifie celles non terminées.
+    Le résultat est transmis via un `Future` (utilisable avec `concurrent.futures.wait`/`as_completed`
+    ou `add_done_callback`) dès que l'entité atteint son état final.
+
+    Attributes:
+        __condition (threading.Condition): condition protégeant la file des suivis et réveillant la boucle
+        __queue (List[Tuple[float, int, Any]]): file (tas) des suivis triés par date de prochaine vérification
+        __counter (itertools.count): compteur départageant les suivis de même échéance
+        __thread (Optional[threading.Thread]): thread de la boucle de suivi (démarré au premier suivi)
+        __executor (Optional[ThreadPoolExecutor]): threads réalisant les vérifications
+    """
+
+    def __init__(self) -> None:
+        self.__condition = threading.Condition()
+        self.__queue: List[Tuple[float, int, Any]] = []
+        self.__counter = itertools.count()
+        self.__thread: Optional[threading.Thread] = None
+        self.__executor: Optional[ThreadPoolExecutor] = None
+
+    def watch(self, poll: Callable[[], Optional[T]], interval: Union[float, Callable[[], float]]) -> "Future[T]":
+        """Ajoute un suivi : `poll` est appelée immédiatement puis toutes les `interval` secondes jusqu'à ce qu'elle renvoie autre chose que None.
+
+        L'intervalle peut être une fonction appelée après chaque vérification (par exemple `PollingPolicy.get_interval`).
+
+        Si `poll` lève une exception, le suivi s'arrête et l'exception est transmise au `Future`, sauf `CircuitOpenError`
+        (API momentanément indisponible) : la vérification est alors simplement reportée.
+        Un suivi peut être abandonné avec `Future.cancel()`.
+
+        Args:
+            poll (Callable[[], Optional[T]]): fonction de vérification (None si l'entité n'est pas dans un état final, le résultat sinon)
+            interval (Union[float, Callable[[], float]]): nombre de secondes entre deux vérifications (ou fonction le renvoyant)
+
+        Returns:
+            Future[T]: résultat du suivi
+        """
+        o_future: "Future[T]" = Future()
+        with self.__condition:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(max_workers=max(1, Config().get_int("monitoring", "max_parallel_polls", 4)), thread_name_prefix="monitoring-poll")
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__loop, name="monitoring-scheduler", daemon=True)
+                self.__thread.start()
+            heapq.heappush(self.__queue, (time.monotonic(), next(self.__counter), (poll, interval, o_future)))
+            self.__condition.notify()
+        return o_future
+
+    def __loop(self) -> None:
+        """Boucle de suivi : attend la prochaine échéance puis lance les vérifications arrivées à échéance."""
+        while True:
+            with self.__condition:
+                while not self.__queue or self.__queue[0][0] > time.monotonic():
+                    self.__condition.wait(None if not self.__queue else self.__queue[0][0] - time.monotonic())
+                _, _, o_task = heapq.heappop(self.__queue)
+                o_executor = self.__executor
+            if o_executor is not None:
+                o_executor.submit(self.__poll, *o_task)
+
+    def __poll(self, poll: Callable[[], Optional[T]], interval: Union[float, Callable[[], float]], future: "Future[T]") -> None:
+        """Réalise une vérification et transmet le résultat ou replanifie la suivante.
+
+        Args:
+            poll (Callable[[], Optional[T]]): fonction de vérification
+            interval (Union[float, Callable[[], float]]): nombre de secondes entre deux vérifications (ou fonction le renvoyant)
+            future (Future[T]): résultat du suivi
+        """
+        if future.cancelled():
+            return
+        f_retry_in = 0.0
+        try:
+            o_result = poll()
+        except CircuitOpenError as e_open:
+            # API indisponible (disjoncteur ouvert) : on fait une pause au lieu d'arrêter le suivi
+            Config().om.debug(f"{e_open.message} Vérification reportée.")
+            o_result, f_retry_in = None, e_open.retry_in
+        except Exception as e:
+            MonitoringScheduler.__set(future, exception=e)
+            return
+        if o_result is not None:
+            MonitoringScheduler.__set(future, result=o_result)
+            return
+        with self.__condition:
+            f_interval = max(f_retry_in, interval() if callable(interval) else interval)
+            heapq.heappush(self.__queue, (time.monotonic() + f_interval, next(self.__counter), (poll, interval, future)))
+            self.__condition.notify()
+
+    @staticmethod
+    def __set(future: "Future[Any]", result: Any = None, exception: Optional[BaseException] = None) -> None:
+        """Transmet le résultat (ou l'exception) au Future, sauf s'il a été annulé entre temps.
+
+        Args:
+            future (Future[Any]): résultat du suivi
+            result (Any): résultat à transmettre
+            exception (Optional[BaseException]): exception à transmettre (prioritaire sur le résultat)
+        """
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            Config().om.debug("Suivi annulé : résultat ignoré.")
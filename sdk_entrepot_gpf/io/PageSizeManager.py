@@ -0,0 +1,96 @@
+import threading
+from typing import Dict, Optional
+
+from sdk_entrepot_gpf.pattern.Singleton import Singleton
+from sdk_entrepot_gpf.io.Config import Config
+
+
+class PageSizeManager(metaclass=Singleton):
+    """Singleton choisissant le nombre d'éléments demandés par page pour chaque route de listing.
+
+    La taille est ajustée d'un listing à l'autre et mémorisée pour la durée du processus :
+    elle augmente tant que le serveur renvoie des pages complètes rapidement, se cale sur le
+    maximum accepté par le serveur (déduit du `Content-Range`) et diminue si les réponses
+    sont lentes ou en timeout.
+
+    Attributes:
+        __lock (threading.Lock): verrou protégeant les tailles mémorisées
+        __sizes (Dict[str, int]): taille de page courante par route
+        __max_sizes (Dict[str, int]): taille maximale acceptée par le serveur par route (si connue)
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__sizes: Dict[str, int] = {}
+        self.__max_sizes: Dict[str, int] = {}
+
+    def get(self, route_name: str, default: int) -> int:
+        """Renvoie la taille de page à utiliser pour la route.
+
+        Args:
+            route_name (str): nom de la route de listing
+            default (int): taille à utiliser si rien n'est encore connu pour cette route
+
+        Returns:
+            int: nombre d'éléments à demander par page
+        """
+        if not Config().get_bool("store_api", "adaptive_page_size", True):
+            return default
+        with self.__lock:
+            return self.__sizes.get(route_name, default)
+
+    def record(self, route_name: str, limit: int, nb_received: int, total: Optional[int], elapsed: float) -> None:
+        """Ajuste la taille de page de la route selon la réponse à une requête de listing.
+
+        Args:
+            route_name (str): nom de la route de listing
+            limit (int): nombre d'éléments demandés
+            nb_received (int): nombre d'éléments renvoyés
+            total (Optional[int]): nombre total d'éléments (Content-Range), None si inconnu
+            elapsed (float): durée de la requête en secondes
+        """
+        if not Config().get_bool("store_api", "adaptive_page_size", True) or total is None:
+            return
+        with self.__lock:
+            if nb_received < limit and nb_received < total:
+                # Page incomplète alors qu'il reste des éléments : le serveur a plafonné la taille demandée
+                self.__max_sizes[route_name] = max(1, nb_received)
+                self.__sizes[route_name] = max(1, nb_received)
+                Config().om.debug(f"Taille de page de {route_name} : maximum du serveur atteint ({nb_received}).")
+            elif elapsed > Config().get_float("store_api", "page_size_slow_sec", 5.0):
+                # Réponse lente : on réduit la taille
+                self.__backoff(route_name, limit)
+            elif nb_received == limit and total > limit:
+                # Page complète, rapide et listing sur plusieurs pages : on augmente la taille
+                i_max = Config().get_int("store_api", "page_size_max", 2000)
+                if route_name in self.__max_sizes:
+                    i_max = min(i_max, self.__max_sizes[route_name])
+                i_size = max(limit, min(limit * Config().get_int("store_api", "page_size_growth", 4), i_max))
+                if i_size != limit:
+                    Config().om.debug(f"Taille de page de {route_name} : {limit} -> {i_size}.")
+                self.__sizes[route_name] = i_size
+
+    def record_timeout(self, route_name: str, limit: int) -> None:
+        """Réduit la taille de page de la route suite à un timeout.
+
+        Args:
+            route_name (str): nom de la route de listing
+            limit (int): nombre d'éléments demandés lors du timeout
+        """
+        if not Config().get_bool("store_api", "adaptive_page_size", True):
+            return
+        with self.__lock:
+            self.__backoff(route_name, limit)
+
+    def __backoff(self, route_name: str, limit: int) -> None:
+        """Divise par deux la taille de page de la route (sans descendre sous `store_api.page_size_min`).
+        Le verrou doit être pris par l'appelant.
+
+        Args:
+            route_name (str): nom de la route de listing
+            limit (int): nombre d'éléments demandés
+        """
+        i_size = max(min(limit, Config().get_int("store_api", "page_size_min", 10)), limit // 2)
+        if i_size != limit:
+            Config().om.debug(f"Taille de page de {route_name} : {limit} -> {i_size} (réponse lente).")
+        self.__sizes[route_name] = i_size
@@ -0,0 +1,160 @@
+import queue
+import threading
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+
+class Pipeline:
+    """Chaîne de traitements exécutés en parallèle : les éléments d'une source passent par des étapes successives,
+    chacune ayant ses propres threads, reliées par des files bornées. Les premiers éléments atteignent la dernière étape
+    pendant que les suivants sont encore lus. Seuls les éléments en attente entre deux étapes sont bornés (une étape
+    trop lente bloque les précédentes) : ce que les fonctions des étapes conservent reste à leur charge.
+
+    À la première erreur, toutes les étapes s'arrêtent et l'erreur est levée par `run`.
+
+    Attributes:
+        __queue_size (int): taille maximale des files entre les étapes
+        __stop (threading.Event): arrêt demandé (erreur)
+        __lock (threading.Lock): verrou protégeant les compteurs et les erreurs
+        __errors (List[BaseException]): erreurs levées par les étapes
+    """
+
+    # Délai (en secondes) entre deux vérifications de l'arrêt lorsqu'une file est pleine ou vide
+    POLL_SEC = 0.1
+    # Marqueur de fin de la source
+    __END = object()
+
+    def __init__(self, queue_size: int = 1000) -> None:
+        """Constructeur.
+
+        Args:
+            queue_size (int, optional): taille maximale des files entre les étapes. Defaults to 1000.
+        """
+        self.__queue_size = max(1, queue_size)
+        self.__stop = threading.Event()
+        self.__lock = threading.Lock()
+        self.__errors: List[BaseException] = []
+
+    def run(self, source: Iterable[Any], stages: List[Tuple[Callable[[Any], Any], int]]) -> None:
+        """Fait passer les éléments de la source par les étapes et attend la fin du traitement.
+
+        Args:
+            source (Iterable[Any]): éléments à traiter (lus dans un thread dédié au fur et à mesure)
+            stages (List[Tuple[Callable[[Any], Any], int]]): étapes (fonction et nombre de threads) ; chaque fonction reçoit
+                un élément et renvoie celui transmis à l'étape suivante (le résultat de la dernière étape est ignoré)
+
+        Raises:
+            BaseException: première erreur levée par la source ou par une étape
+        """
+        l_queues: List["queue.Queue[Any]"] = [queue.Queue(self.__queue_size) for _ in stages]
+        l_threads = [threading.Thread(target=self.__guard, args=(self.__feed, source, l_queues[0], stages[0][1]), name="pipeline-source", daemon=True)]
+        for i_stage, (f_function, i_workers) in enumerate(stages):
+            o_output = l_queues[i_stage + 1] if i_stage + 1 < len(stages) else None
+            i_next_workers = stages[i_stage + 1][1] if i_stage + 1 < len(stages) else 0
+            # Nombre de threads de l'étape encore actifs : le dernier à finir signale la fin à l'étape suivante
+            l_remaining = [i_workers]
+            for i_worker in range(i_workers):
+                l_threads.append(
+                    threading.Thread(
+                        target=self.__guard,
+                        args=(self.__work, f_function, l_queues[i_stage], o_output, l_remaining, i_next_workers),
+                        name=f"pipeline-{i_stage}-{i_worker}",
+                        daemon=True,
+                    )
+                )
+        for o_thread in l_threads:
+            o_thread.start()
+        try:
+            for o_thread in l_threads:
+                o_thread.join()
+        except BaseException:
+            # Interruption (Ctrl+C) : on arrête les étapes
+            self.__stop.set()
+            raise
+        if self.__errors:
+            raise self.__errors[0]
+
+    def __guard(self, function: Callable[..., None], *args: Any) -> None:
+        """Exécute une étape en enregistrant son erreur éventuelle et en arrêtant alors toutes les étapes.
+
+        Args:
+            function (Callable[..., None]): étape à exécuter
+            args (Any): paramètres de l'étape
+        """
+        try:
+            function(*args)
+        except BaseException as e_error:  # pylint: disable=broad-exception-caught
+            with self.__lock:
+                self.__errors.append(e_error)
+            self.__stop.set()
+
+    def __put(self, output: "queue.Queue[Any]", item: Any) -> bool:
+        """Ajoute un élément à une file, en attendant qu'elle ait de la place.
+
+        Args:
+            output (queue.Queue[Any]): file
+            item (Any): élément
+
+        Returns:
+            bool: False si l'arrêt a été demandé avant
+        """
+        while not self.__stop.is_set():
+            try:
+                output.put(item, timeout=Pipeline.POLL_SEC)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __get(self, source: "queue.Queue[Any]") -> Optional[Any]:
+        """Récupère un élément d'une file, en attendant qu'il y en ait un.
+
+        Args:
+            source (queue.Queue[Any]): file
+
+        Returns:
+            Optional[Any]: élément, marqueur de fin si l'arrêt a été demandé
+        """
+        while not self.__stop.is_set():
+            try:
+                return source.get(timeout=Pipeline.POLL_SEC)
+            except queue.Empty:
+                continue
+        return Pipeline.__END
+
+    def __feed(self, source: Iterable[Any], output: "queue.Queue[Any]", workers: int) -> None:
+        """Lit la source et alimente la première étape, puis signale la fin à chacun de ses threads.
+
+        Args:
+            source (Iterable[Any]): éléments à traiter
+            output (queue.Queue[Any]): file de la première étape
+            workers (int): nombre de threads de la première étape
+        """
+        for o_item in source:
+            if not self.__put(output, o_item):
+                return
+        for _ in range(workers):
+            self.__put(output, Pipeline.__END)
+
+    def __work(self, function: Callable[[Any], Any], source: "queue.Queue[Any]", output: Optional["queue.Queue[Any]"], remaining: List[int], next_workers: int) -> None:
+        """Thread d'une étape : traite les éléments jusqu'au marqueur de fin.
+
+        Args:
+            function (Callable[[Any], Any]): traitement de l'étape
+            source (queue.Queue[Any]): file de l'étape
+            output (Optional[queue.Queue[Any]]): file de l'étape suivante (None pour la dernière étape)
+            remaining (List[int]): nombre de threads de l'étape encore actifs
+            next_workers (int): nombre de threads de l'étape suivante
+        """
+        while True:
+            o_item = self.__get(source)
+            if o_item is Pipeline.__END:
+                break
+            o_result = function(o_item)
+            if output is not None and not self.__put(output, o_result):
+                return
+        with self.__lock:
+            remaining[0] -= 1
+            b_last = remaining[0] == 0
+        if b_last and output is not None:
+            for _ in range(next_workers):
+                self.__put(output, Pipeline.__END)
@@ -0,0 +1,68 @@
+from typing import Any, Optional
+
+from sdk_entrepot_gpf.io.Config import Config
+
+
+class PollingPolicy:
+    """Calcule le temps d'attente entre deux vérifications du statut d'une entité (livraison, exécution de traitement, offre...).
+
+    Les vérifications commencent rapprochées (`poll_min_sec`) puis s'espacent de manière exponentielle
+    (`poll_factor`) jusqu'à un plafond (`poll_max_sec`) ; l'intervalle repart du début dès que le statut observé change.
+    Le premier intervalle peut être estimé à partir de la durée attendue de la tâche (`poll_seed_ratio`),
+    par exemple d'après les exécutions précédentes du même traitement.
+    Si `adaptive_polling` est désactivé, l'intervalle est fixe (`nb_sec_between_check_updates`).
+
+    Les paramètres sont lus dans la section de configuration indiquée.
+
+    Attributes:
+        __min (float): intervalle initial en secondes
+        __max (float): intervalle maximal en secondes
+        __factor (float): facteur multiplicatif appliqué à chaque vérification sans changement de statut
+        __start (float): intervalle utilisé au début et après chaque changement de statut
+        __interval (Optional[float]): intervalle courant (None avant la première vérification)
+        __state (Any): dernier statut observé
+    """
+
+    def __init__(self, section: str, expected_duration: Optional[float] = None) -> None:
+        """Constructeur.
+
+        Args:
+            section (str): section de configuration contenant les paramètres de la politique
+            expected_duration (Optional[float], optional): durée attendue de la tâche en secondes (si connue).
+        """
+        if Config().get_bool(section, "adaptive_polling", True):
+            self.__max = Config().get_float(section, "poll_max_sec", 60)
+            self.__min = min(Config().get_float(section, "poll_min_sec", 1), self.__max)
+            self.__factor = max(1.0, Config().get_float(section, "poll_factor", 1.5))
+        else:
+            self.__min = self.__max = Config().get_float(section, "nb_sec_between_check_updates", 10)
+            self.__factor = 1.0
+        self.__start = self.__min
+        if expected_duration is not None and expected_duration > 0:
+            self.__start = max(self.__min, min(self.__max, expected_duration * Config().get_float(section, "poll_seed_ratio", 0.1)))
+        self.__interval: Optional[float] = None
+        self.__state: Any = None
+
+    def update(self, state: Any = None) -> float:
+        """Prend en compte le statut observé lors d'une vérification et renvoie le temps d'attente avant la suivante.
+
+        Args:
+            state (Any, optional): statut observé (l'intervalle repart du début s'il a changé)
+
+        Returns:
+            float: temps d'attente en secondes
+        """
+        if self.__interval is None or state != self.__state:
+            self.__interval = self.__start
+        else:
+            self.__interval = min(self.__max, self.__interval * self.__factor)
+        self.__state = state
+        return self.__interval
+
+    def get_interval(self) -> float:
+        """Renvoie le temps d'attente courant (intervalle initial avant la première vérification).
+
+        Returns:
+            float: temps d'attente en secondes
+        """
+        return self.__interval if self.__interval is not None else self.__start
@@ -0,0 +1,203 @@
+import asyncio
+import re
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Pattern, Tuple
+
+from sdk_entrepot_gpf.helper.JsonHelper import JsonHelper
+from sdk_entrepot_gpf.pattern.Singleton import Singleton
+from sdk_entrepot_gpf.io.Config import Config
+
+
+class TokenBucket:
+    """Seau à jetons : limite le débit moyen à `rate` requêtes par seconde en autorisant des rafales de `burst` requêtes.
+
+    Attributes:
+        __rate (float): nombre de jetons ajoutés par seconde
+        __burst (float): nombre maximal de jetons
+        __tokens (float): nombre de jetons disponibles
+        __last (float): date du dernier remplissage (`time.monotonic()`)
+        __lock (threading.Lock): verrou protégeant le seau
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        """Constructeur.
+
+        Args:
+            rate (float): débit moyen en requêtes par seconde (strictement positif)
+            burst (float): taille maximale d'une rafale (au moins 1)
+        """
+        self.__rate = rate
+        self.__burst = max(1.0, burst)
+        self.__tokens = self.__burst
+        self.__last = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Prend un jeton, en attendant qu'il y en ait un de disponible.
+
+        Returns:
+            float: temps attendu en secondes
+        """
+        f_waited = 0.0
+        while True:
+            f_wait = self.try_acquire()
+            if f_wait == 0:
+                return f_waited
+            # Attente hors verrou : les autres threads peuvent calculer leur propre attente
+            time.sleep(f_wait)
+            f_waited += f_wait
+
+    async def acquire_async(self) -> float:
+        """Version asynchrone de `acquire` : l'attente ne bloque pas la boucle d'évènements.
+
+        Returns:
+            float: temps attendu en secondes
+        """
+        f_waited = 0.0
+        while True:
+            f_wait = self.try_acquire()
+            if f_wait == 0:
+                return f_waited
+            await asyncio.sleep(f_wait)
+            f_waited += f_wait
+
+    def try_acquire(self) -> float:
+        """Prend un jeton s'il y en a un de disponible, sans attendre.
+
+        Returns:
+            float: 0 si le jeton a été pris, sinon temps d'attente estimé avant qu'un jeton soit disponible
+        """
+        with self.__lock:
+            f_now = time.monotonic()
+            self.__tokens = min(self.__burst, self.__tokens + (f_now - self.__last) * self.__rate)
+            self.__last = f_now
+            if self.__tokens >= 1:
+                self.__tokens -= 1
+                return 0.0
+            return (1 - self.__tokens) / self.__rate
+
+
+class RateLimiter(metaclass=Singleton):
+    """Limitation, pour tout le processus, du débit et du nombre de requêtes simultanées vers l'API Entrepôt.
+
+    Un seau à jetons global (`rate_limit.rate`, `rate_limit.burst`) s'applique à toutes les requêtes. Les routes sont
+    de plus regroupées en familles (`rate_limit.families` : nom de la famille / regex sur le nom de la route), chaque
+    famille pouvant avoir son propre débit (`<famille>_rate`, `<famille>_burst`) et un nombre maximal de requêtes
+    en cours (`<famille>_max_in_flight`). Un débit ou un maximum à 0 signifie « pas de limite ».
+
+    Attributes:
+        __global_bucket (Optional[TokenBucket]): seau à jetons global
+        __families (List[Tuple[str, Pattern[str]]]): familles et regex associées, dans l'ordre de la configuration
+        __buckets (Dict[str, TokenBucket]): seaux à jetons par famille
+        __semaphores (Dict[str, threading.BoundedSemaphore]): nombre de requêtes en cours par famille
+        __route_families (Dict[str, Optional[str]]): famille de chaque route déjà rencontrée
+    """
+
+    # Intervalle (en secondes) entre deux essais de prise d'une place dans une famille depuis du code asynchrone
+    SEMAPHORE_POLL_SEC = 0.01
+
+    def __init__(self) -> None:
+        self.__global_bucket = RateLimiter.__bucket("rate", "burst")
+        d_families: Dict[str, str] = dict(JsonHelper.loads(Config().get("rate_limit", "families", "{}") or "{}", "config.rate_limit.families"))
+        self.__families: List[Tuple[str, Pattern[str]]] = [(s_family, re.compile(s_regex)) for s_family, s_regex in d_families.items()]
+        self.__buckets: Dict[str, TokenBucket] = {}
+        self.__semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        for s_family in d_families:
+            o_bucket = RateLimiter.__bucket(f"{s_family}_rate", f"{s_family}_burst")
+            if o_bucket is not None:
+                self.__buckets[s_family] = o_bucket
+            i_max_in_flight = Config().get_int("rate_limit", f"{s_family}_max_in_flight", 0)
+            if i_max_in_flight > 0:
+                self.__semaphores[s_family] = threading.BoundedSemaphore(i_max_in_flight)
+        self.__route_families: Dict[str, Optional[str]] = {}
+
+    @staticmethod
+    def __bucket(rate_option: str, burst_option: str) -> Optional[TokenBucket]:
+        """Instancie un seau à jetons d'après la configuration.
+
+        Args:
+            rate_option (str): paramètre du débit
+            burst_option (str): paramètre de la rafale
+
+        Returns:
+            Optional[TokenBucket]: seau à jetons, None si le débit n'est pas limité
+        """
+        f_rate = Config().get_float("rate_limit", rate_option, 0)
+        if f_rate <= 0:
+            return None
+        return TokenBucket(f_rate, Config().get_float("rate_limit", burst_option, f_rate))
+
+    def family(self, route_name: Optional[str]) -> Optional[str]:
+        """Renvoie la famille de la route (la première dont la regex correspond).
+
+        Args:
+            route_name (Optional[str]): nom de la route
+
+        Returns:
+            Optional[str]: nom de la famille, None si la route n'appartient à aucune famille
+        """
+        if route_name is None:
+            return None
+        if route_name not in self.__route_families:
+            self.__route_families[route_name] = next((s_family for s_family, o_regex in self.__families if o_regex.search(route_name)), None)
+        return self.__route_families[route_name]
+
+    @contextmanager
+    def limit(self, route_name: Optional[str] = None) -> Iterator[None]:
+        """Attend que la requête puisse partir (place libre dans la famille, jetons disponibles) et la compte comme en cours.
+
+        Args:
+            route_name (Optional[str], optional): nom de la route (seule la limite globale s'applique si None)
+
+        Yields:
+            Iterator[None]: la requête peut être exécutée
+        """
+        s_family = self.family(route_name)
+        o_semaphore = self.__semaphores.get(s_family) if s_family is not None else None
+        if o_semaphore is not None:
+            o_semaphore.acquire()
+        try:
+            f_waited = 0.0
+            if self.__global_bucket is not None:
+                f_waited += self.__global_bucket.acquire()
+            if s_family is not None and s_family in self.__buckets:
+                f_waited += self.__buckets[s_family].acquire()
+            if f_waited > 0:
+                Config().om.debug(f"Requête ({route_name}) retardée de {f_waited:.2f} s par la limitation de débit.")
+            yield
+        finally:
+            if o_semaphore is not None:
+                o_semaphore.release()
+
+    @asynccontextmanager
+    async def limit_async(self, route_name: Optional[str] = None) -> AsyncIterator[None]:
+        """Version asynchrone de `limit` : les attentes ne bloquent pas la boucle d'évènements.
+
+        Les limites (seaux et nombre de requêtes en cours) sont partagées avec les requêtes synchrones.
+
+        Args:
+            route_name (Optional[str], optional): nom de la route (seule la limite globale s'applique si None)
+
+        Yields:
+            AsyncIterator[None]: la requête peut être exécutée
+        """
+        s_family = self.family(route_name)
+        o_semaphore = self.__semaphores.get(s_family) if s_family is not None else None
+        if o_semaphore is not None:
+            # Sémaphore partagé avec les threads : on réessaie sans bloquer
+            while not o_semaphore.acquire(blocking=False):
+                await asyncio.sleep(RateLimiter.SEMAPHORE_POLL_SEC)
+        try:
+            f_waited = 0.0
+            if self.__global_bucket is not None:
+                f_waited += await self.__global_bucket.acquire_async()
+            if s_family is not None and s_family in self.__buckets:
+                f_waited += await self.__buckets[s_family].acquire_async()
+            if f_waited > 0:
+                Config().om.debug(f"Requête ({route_name}) retardée de {f_waited:.2f} s par la limitation de débit.")
+            yield
+        finally:
+            if o_semaphore is not None:
+                o_semaphore.release()
@@ -0,0 +1,153 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sdk_entrepot_gpf.helper.JsonHelper import JsonHelper
+from sdk_entrepot_gpf.io.Config import Config
+
+
+class RetryPolicy:
+    """Politique de nouvelles tentatives des requêtes à l'API Entrepôt.
+
+    La politique par défaut est lue dans la section `store_api` (`nb_attempts`, `sec_between_attempt` et `retry_*`) ;
+    elle peut être surchargée par route (`routing.<route>_retry`) puis par code retour (`store_api.retry_status`
+    ou clef `status` de la surcharge de la route), sous forme de dictionnaires JSON reprenant les paramètres du constructeur.
+    Les valeurs par défaut correspondent au comportement historique : délai fixe entre les tentatives, pour toutes les méthodes.
+
+    Attributes:
+        nb_attempts (int): nombre maximal de tentatives (première requête comprise)
+        sec_between_attempt (float): délai entre deux tentatives (délai initial si le délai est exponentiel)
+        backoff (str): `fixed` (délai constant) ou `exponential` (délai doublé à chaque tentative)
+        sec_max (float): délai maximal entre deux tentatives
+        jitter (bool): si True, le délai est tiré au hasard entre 0 et le délai calculé (« full jitter »)
+        deadline_sec (float): durée totale maximale des tentatives en secondes (0 : pas de limite)
+        idempotent_only (bool): si True, seules les méthodes idempotentes sont retentées
+        retry_after (bool): si True, le délai indiqué par l'entête `Retry-After` de la réponse est respecté
+        status (Dict[str, Dict[str, Any]]): surcharges par code retour
+    """
+
+    IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+    BACKOFF_FIXED = "fixed"
+    BACKOFF_EXPONENTIAL = "exponential"
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        nb_attempts: int,
+        sec_between_attempt: float,
+        backoff: str = BACKOFF_FIXED,
+        sec_max: float = 60,
+        jitter: bool = False,
+        deadline_sec: float = 0,
+        idempotent_only: bool = False,
+        retry_after: bool = True,
+        status: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        self.nb_attempts = nb_attempts
+        self.sec_between_attempt = sec_between_attempt
+        self.backoff = backoff
+        self.sec_max = sec_max
+        self.jitter = jitter
+        self.deadline_sec = deadline_sec
+        self.idempotent_only = idempotent_only
+        self.retry_after = retry_after
+        self.status = status if status is not None else {}
+
+    @staticmethod
+    def from_config(route_name: Optional[str] = None) -> "RetryPolicy":
+        """Instancie la politique configurée pour la route indiquée.
+
+        Args:
+            route_name (Optional[str], optional): nom de la route (politique par défaut si None ou sans surcharge)
+
+        Returns:
+            RetryPolicy: politique de nouvelles tentatives
+        """
+        d_status: Dict[str, Dict[str, Any]] = dict(JsonHelper.loads(Config().get("store_api", "retry_status", "{}") or "{}", "config.store_api.retry_status"))
+        d_params: Dict[str, Any] = {
+            "nb_attempts": Config().get_int("store_api", "nb_attempts"),
+            "sec_between_attempt": Config().get_float("store_api", "sec_between_attempt"),
+            "backoff": Config().get_str("store_api", "retry_backoff", RetryPolicy.BACKOFF_FIXED),
+            "sec_max": Config().get_float("store_api", "retry_sec_max", 60),
+            "jitter": Config().get_bool("store_api", "retry_jitter", False),
+            "deadline_sec": Config().get_float("store_api", "retry_deadline_sec", 0),
+            "idempotent_only": Config().get_bool("store_api", "retry_idempotent_only", False),
+            "retry_after": Config().get_bool("store_api", "retry_after", True),
+        }
+        if route_name is not None:
+            s_route_retry = Config().get("routing", f"{route_name}_retry")
+            if s_route_retry:
+                d_route: Dict[str, Any] = dict(JsonHelper.loads(s_route_retry, f"config.routing.{route_name}_retry"))
+                # Les surcharges par code retour de la route complètent celles par défaut
+                d_status = {**d_status, **d_route.pop("status", {})}
+                d_params.update(d_route)
+        return RetryPolicy(**d_params, status=d_status)
+
+    def for_status(self, status_code: Optional[int]) -> "RetryPolicy":
+        """Renvoie la politique à appliquer après une réponse ayant le code retour indiqué.
+
+        Args:
+            status_code (Optional[int]): code retour (None si pas de réponse, erreur de connexion par exemple)
+
+        Returns:
+            RetryPolicy: politique surchargée pour ce code retour (elle-même s'il n'y a pas de surcharge)
+        """
+        if status_code is None or str(status_code) not in self.status:
+            return self
+        d_params = {k: v for k, v in vars(self).items() if k != "status"}
+        d_params.update(self.status[str(status_code)])
+        return RetryPolicy(**d_params)
+
+    def get_delay(self, attempt: int, method: str, start: float, retry_after: Optional[float] = None) -> Optional[float]:
+        """Calcule le délai à attendre avant la tentative suivante.
+
+        Args:
+            attempt (int): numéro de la tentative qui vient d'échouer (à partir de 1)
+            method (str): méthode de la requête
+            start (float): date de la première tentative (`time.monotonic()`)
+            retry_after (Optional[float], optional): délai (en secondes) demandé par le serveur via `Retry-After`
+
+        Returns:
+            Optional[float]: délai en secondes, None s'il ne faut plus retenter
+        """
+        if attempt >= self.nb_attempts:
+            return None
+        if self.idempotent_only and method.upper() not in RetryPolicy.IDEMPOTENT_METHODS:
+            return None
+        if self.backoff == RetryPolicy.BACKOFF_EXPONENTIAL:
+            f_delay = min(self.sec_max, self.sec_between_attempt * 2.0 ** (attempt - 1))
+        else:
+            f_delay = self.sec_between_attempt
+        if self.jitter:
+            f_delay = random.uniform(0, f_delay)
+        if self.retry_after and retry_after is not None:
+            f_delay = max(f_delay, retry_after)
+        # Budget total dépassé à la fin de l'attente : inutile d'attendre
+        if self.deadline_sec > 0 and time.monotonic() + f_delay - start > self.deadline_sec:
+            return None
+        return f_delay
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Convertit la valeur d'un entête `Retry-After` (nombre de secondes ou date HTTP) en délai.
+
+        Args:
+            value (Optional[str]): valeur de l'entête
+
+        Returns:
+            Optional[float]: délai en secondes, None si absent ou invalide
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            o_date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if o_date.tzinfo is None:
+            o_date = o_date.replace(tzinfo=timezone.utc)
+        return max(0.0, (o_date - datetime.now(timezone.utc)).total_seconds())
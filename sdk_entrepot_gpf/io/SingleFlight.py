@@ -0,0 +1,60 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+from sdk_entrepot_gpf.pattern.Singleton import Singleton
+
+T = TypeVar("T")
+
+
+class SingleFlight(metaclass=Singleton):
+    """Singleton regroupant les appels identiques simultanés : tant qu'un appel est en cours pour une clef,
+    les appels suivants avec la même clef attendent son résultat (ou son erreur) au lieu de refaire le travail.
+
+    Attributes:
+        __lock (threading.Lock): verrou protégeant les appels en cours
+        __calls (Dict[str, Future[Any]]): résultat à venir de l'appel en cours par clef
+        __shared (int): nombre d'appels ayant reçu le résultat d'un autre appel
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__calls: Dict[str, "Future[Any]"] = {}
+        self.__shared = 0
+
+    @property
+    def shared(self) -> int:
+        """Nombre d'appels ayant reçu le résultat d'un autre appel."""
+        return self.__shared
+
+    def call(self, key: str, function: Callable[[], T]) -> Tuple[T, bool]:
+        """Exécute la fonction, sauf si un appel de même clef est en cours : son résultat est alors attendu et renvoyé.
+
+        Args:
+            key (str): clef identifiant les appels équivalents
+            function (Callable[[], T]): fonction à exécuter
+
+        Returns:
+            Tuple[T, bool]: résultat et True s'il provient d'un autre appel (les erreurs sont propagées à tous les appelants)
+        """
+        with self.__lock:
+            o_future = self.__calls.get(key)
+            b_leader = o_future is None
+            if o_future is None:
+                o_future = Future()
+                self.__calls[key] = o_future
+            else:
+                self.__shared += 1
+        if not b_leader:
+            return o_future.result(), True
+        try:
+            o_result = function()
+        except BaseException as e_error:
+            o_future.set_exception(e_error)
+            raise
+        finally:
+            # Les appels suivants refont le travail
+            with self.__lock:
+                del self.__calls[key]
+        o_future.set_result(o_result)
+        return o_result, False
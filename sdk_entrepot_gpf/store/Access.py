@@ -35,7 +35,7 @@ class Access(StoreEntity):
         # Instanciation
         return o_response.status_code == 204
 
-    def api_update(self) -> None:
+    def api_update(self, use_cache: bool = False) -> None:
         return None
 
     @classmethod
@@ -3,6 +3,7 @@ from sdk_entrepot_gpf.store.Errors import StoreEntityError
 
 from sdk_entrepot_gpf.store.Offering import Offering
 from sdk_entrepot_gpf.store.StoreEntity import StoreEntity
+from sdk_entrepot_gpf.store.EntityCache import EntityCache
 from sdk_entrepot_gpf.store.interface.TagInterface import TagInterface
 from sdk_entrepot_gpf.store.interface.CommentInterface import CommentInterface
 from sdk_entrepot_gpf.store.interface.EventInterface import EventInterface
@@ -46,7 +47,10 @@ class Configuration(TagInterface, CommentInterface, EventInterface, FullEditInte
         Returns:
             Offering: représentation Python de l'Offering créée
         """
-        return Offering.api_create(data_offering, route_params={self._entity_name: self.id, "datastore": self.datastore})
+        o_offering = Offering.api_create(data_offering, route_params={self._entity_name: self.id, "datastore": self.datastore})
+        # Le statut de la configuration change avec la publication
+        EntityCache().invalidate(self)
+        return o_offering
 
     def get_liste_deletable_cascade(self) -> List[StoreEntity]:
         """liste les entités à supprimé lors d'une suppression en cascade de la Configuration en supprimant en cascade les offres liées (et uniquement les offres, pas les données stockées).
@@ -1,5 +1,5 @@
 import re
-from typing import Dict, List, Optional, Type, TypeVar
+from typing import Dict, Iterator, List, Optional, Type, TypeVar
 from sdk_entrepot_gpf.Errors import GpfSdkError
 
 from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
@@ -15,6 +15,20 @@ class Datastore(StoreEntity):
     _entity_name = "datastore"
     _entity_title = "entrepôt"
 
+    @classmethod
+    def api_iter(cls: Type[T], infos_filter: Optional[Dict[str, str]] = None, tags_filter: Optional[Dict[str, str]] = None, datastore: Optional[str] = None) -> Iterator[T]:
+        """Itère sur les entrepôts respectant les paramètres donnés (listés par `api_list`, route non paginée).
+
+        Args:
+            infos_filter: Filtres sur les attributs sous la forme `{"nom_attribut": "valeur_attribut"}`
+            tags_filter: Filtres sur les tags sous la forme `{"nom_tag": "valeur_tag"}`
+            datastore: Identifiant du datastore
+
+        Returns:
+            Iterator[T]: entités retournées
+        """
+        return iter(cls.api_list(infos_filter=infos_filter, tags_filter=tags_filter, datastore=datastore))
+
     @classmethod
     def api_list(cls: Type[T], infos_filter: Optional[Dict[str, str]] = None, tags_filter: Optional[Dict[str, str]] = None, page: Optional[int] = None, datastore: Optional[str] = None) -> List[T]:
         """Liste les entités de l'API respectant les paramètres donnés.
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, Iterator, List, Optional, Type
 from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
 
 from sdk_entrepot_gpf.store.StoreEntity import StoreEntity, T
@@ -11,6 +11,20 @@ class Endpoint(StoreEntity):
     _entity_name = "endpoint"
     _entity_title = "point de montage"
 
+    @classmethod
+    def api_iter(cls: Type[T], infos_filter: Optional[Dict[str, str]] = None, tags_filter: Optional[Dict[str, str]] = None, datastore: Optional[str] = None) -> Iterator[T]:
+        """Itère sur les points de montage respectant les paramètres donnés (listés par `api_list`, route non paginée).
+
+        Args:
+            infos_filter: Filtres sur les attributs sous la forme `{"nom_attribut": "valeur_attribut"}`
+            tags_filter: Filtres sur les tags sous la forme `{"nom_tag": "valeur_tag"}`
+            datastore: Identifiant du datastore
+
+        Returns:
+            Iterator[T]: entités retournées
+        """
+        return iter(cls.api_list(infos_filter=infos_filter, tags_filter=tags_filter, datastore=datastore))
+
     @classmethod
     def api_list(cls: Type[T], infos_filter: Optional[Dict[str, str]] = None, tags_filter: Optional[Dict[str, str]] = None, page: Optional[int] = None, datastore: Optional[str] = None) -> List[T]:
         """Liste les points de montage de l'API respectant les paramètres donnés.
@@ -49,7 +63,7 @@ class Endpoint(StoreEntity):
         # A la fin, on renvoie la liste
         return l_endpoints
 
-    def api_update(self) -> None:
+    def api_update(self, use_cache: bool = False) -> None:
         return None
 
     @classmethod
@@ -0,0 +1,108 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sdk_entrepot_gpf.pattern.Singleton import Singleton
+from sdk_entrepot_gpf.io.Config import Config
+
+
+class EntityCache(metaclass=Singleton):
+    """Singleton gérant la table d'identité des entités (identity map) partagée par tout le processus.
+
+    Les entités récupérées par `StoreEntity.api_get` (ou mises à jour par `api_update`) sont conservées
+    pendant `store_api.entity_cache_ttl` secondes, indexées par (classe, datastore, id) : les lectures
+    suivantes de la même entité renvoient la même instance sans requête. Les actions modifiant une entité
+    (édition, suppression, étiquettes...) la retirent de la table.
+    Le cache est désactivé par défaut (`entity_cache_ttl=0`).
+
+    Attributes:
+        __lock (threading.Lock): verrou protégeant la table
+        __entities (Dict[Tuple[type, Optional[str], str], Tuple[float, Any]]): date d'expiration et entité par clef
+        __hits (int): nombre de lectures servies par la table
+        __misses (int): nombre de lectures ayant nécessité une requête
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__entities: Dict[Tuple[type, Optional[str], str], Tuple[float, Any]] = {}
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Indique si la table d'identité est activée (`store_api.entity_cache_ttl` > 0)."""
+        return Config().get_float("store_api", "entity_cache_ttl", 0) > 0
+
+    @property
+    def hits(self) -> int:
+        """Nombre de lectures servies par la table."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """Nombre de lectures ayant nécessité une requête."""
+        return self.__misses
+
+    def get(self, entity_class: type, datastore: Optional[str], id_: str) -> Optional[Any]:
+        """Renvoie l'entité conservée si elle n'a pas expiré.
+
+        Args:
+            entity_class (type): classe de l'entité
+            datastore (Optional[str]): identifiant du datastore
+            id_ (str): identifiant de l'entité
+
+        Returns:
+            Optional[Any]: l'entité conservée, None si absente, expirée ou si la table est désactivée
+        """
+        if not self.enabled:
+            return None
+        o_key = EntityCache.__key(entity_class, datastore, id_)
+        with self.__lock:
+            o_entry = self.__entities.get(o_key)
+            if o_entry is not None and o_entry[0] > time.monotonic():
+                self.__hits += 1
+                return o_entry[1]
+            # Absente ou expirée
+            self.__entities.pop(o_key, None)
+            self.__misses += 1
+            return None
+
+    def set(self, entity: Any) -> None:
+        """Conserve l'entité dans la table (si elle est activée).
+
+        Args:
+            entity (Any): entité (StoreEntity) à conserver
+        """
+        if not self.enabled:
+            return
+        f_expire = time.monotonic() + Config().get_float("store_api", "entity_cache_ttl", 0)
+        with self.__lock:
+            self.__entities[EntityCache.__key(type(entity), entity.datastore, entity.id)] = (f_expire, entity)
+
+    def invalidate(self, entity: Any) -> None:
+        """Retire l'entité de la table (à appeler après toute modification de l'entité sur l'API).
+
+        Args:
+            entity (Any): entité (StoreEntity) modifiée ou supprimée
+        """
+        with self.__lock:
+            self.__entities.pop(EntityCache.__key(type(entity), entity.datastore, entity.id), None)
+
+    def clear(self) -> None:
+        """Vide la table."""
+        with self.__lock:
+            self.__entities.clear()
+
+    @staticmethod
+    def __key(entity_class: type, datastore: Optional[str], id_: str) -> Tuple[type, Optional[str], str]:
+        """Clef d'une entité dans la table : le datastore non précisé est celui de la configuration.
+
+        Args:
+            entity_class (type): classe de l'entité
+            datastore (Optional[str]): identifiant du datastore
+            id_ (str): identifiant de l'entité
+
+        Returns:
+            Tuple[type, Optional[str], str]: clef de l'entité
+        """
+        return (entity_class, datastore or Config().get("store_api", "datastore", fallback=None), id_)
@@ -1,10 +1,14 @@
+import itertools
+import statistics
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from sdk_entrepot_gpf.store.StoreEntity import StoreEntity
+from sdk_entrepot_gpf.store.EntityCache import EntityCache
 from sdk_entrepot_gpf.store.interface.CsfInterface import CsfInterface
 from sdk_entrepot_gpf.store.interface.LogsInterface import LogsInterface
 from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
+from sdk_entrepot_gpf.io.Config import Config
 
 
 class ProcessingExecution(CsfInterface, LogsInterface, StoreEntity):
@@ -35,6 +39,8 @@ class ProcessingExecution(CsfInterface, LogsInterface, StoreEntity):
             method=ApiRequester.POST,
             route_params={self._entity_name: self.id, "datastore": self.datastore},
         )
+        # Le statut connu localement n'est plus à jour
+        EntityCache().invalidate(self)
 
     def api_abort(self) -> None:
         """Annule l'exécution du traitement sur l'API."""
@@ -47,6 +53,8 @@ class ProcessingExecution(CsfInterface, LogsInterface, StoreEntity):
             method=ApiRequester.POST,
             route_params={self._entity_name: self.id, "datastore": self.datastore},
         )
+        # Le statut connu localement n'est plus à jour
+        EntityCache().invalidate(self)
 
     @property
     def launch(self) -> Optional[datetime]:
@@ -56,3 +64,46 @@ class ProcessingExecution(CsfInterface, LogsInterface, StoreEntity):
             datetime: datetime de lancement de l'exécution du traitement
         """
         return self._get_datetime("launch")
+
+    @property
+    def start(self) -> Optional[datetime]:
+        """Récupère la datetime de début de l'exécution du traitement.
+
+        Returns:
+            datetime: datetime de début de l'exécution du traitement
+        """
+        return self._get_datetime("start")
+
+    @property
+    def finish(self) -> Optional[datetime]:
+        """Récupère la datetime de fin de l'exécution du traitement.
+
+        Returns:
+            datetime: datetime de fin de l'exécution du traitement
+        """
+        return self._get_datetime("finish")
+
+    @staticmethod
+    def api_expected_duration(processing: str, datastore: Optional[str] = None, nb_executions: int = 5) -> Optional[float]:
+        """Estime la durée d'une exécution du traitement indiqué d'après ses dernières exécutions réussies (médiane).
+
+        Args:
+            processing (str): identifiant du traitement
+            datastore (Optional[str], optional): identifiant du datastore. Defaults to None.
+            nb_executions (int, optional): nombre maximal d'exécutions à considérer. Defaults to 5.
+
+        Returns:
+            Optional[float]: durée estimée en secondes, None si aucune exécution réussie n'est connue
+        """
+        l_durations: List[float] = []
+        try:
+            l_executions = ProcessingExecution.api_iter(infos_filter={"processing": processing, "status": ProcessingExecution.STATUS_SUCCESS}, datastore=datastore)
+            for o_execution in itertools.islice(l_executions, nb_executions):
+                o_start, o_finish = o_execution.start, o_execution.finish
+                if o_start is not None and o_finish is not None:
+                    l_durations.append((o_finish - o_start).total_seconds())
+        except Exception as e:
+            Config().om.debug(f"Historique des exécutions du traitement {processing} indisponible : {e}")
+        if not l_durations:
+            return None
+        return float(statistics.median(l_durations))
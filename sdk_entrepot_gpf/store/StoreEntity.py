@@ -1,12 +1,15 @@
 import json
 from abc import ABC
-import time
-from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Type, TypeVar
 from datetime import datetime
 from dateutil import parser
 
 from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
+from sdk_entrepot_gpf.io.AsyncApiRequester import AsyncApiRequester
 from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.PageSizeManager import PageSizeManager
+from sdk_entrepot_gpf.io.Errors import NotFoundError
+from sdk_entrepot_gpf.store.EntityCache import EntityCache
 from sdk_entrepot_gpf.store.Errors import StoreEntityError
 
 T = TypeVar("T", bound="StoreEntity")
@@ -111,6 +114,10 @@ class StoreEntity(ABC):
         Returns:
             (StoreEntity): L'entité instanciée correspondante
         """
+        # Entité déjà récupérée récemment (si la table d'identité est activée)
+        o_entity: Optional[T] = EntityCache().get(cls, datastore, id_)
+        if o_entity is not None:
+            return o_entity
         # Génération du nom de la route
         s_route = f"{cls._entity_name}_get"
         # Requête
@@ -119,7 +126,9 @@ class StoreEntity(ABC):
             route_params={"datastore": datastore, cls._entity_name: id_},
         )
         # Instanciation
-        return cls(o_response.json(), datastore)
+        o_entity = cls(o_response.json(), datastore)
+        EntityCache().set(o_entity)
+        return o_entity
 
     @classmethod
     def api_list(cls: Type[T], infos_filter: Optional[Dict[str, str]] = None, tags_filter: Optional[Dict[str, str]] = None, page: Optional[int] = None, datastore: Optional[str] = None) -> List[T]:
@@ -134,48 +143,61 @@ class StoreEntity(ABC):
         Returns:
             (List[StoreEntity]): liste des entités retournées par l'API
         """
-        # Nombre d'éléments max à lister par requête
-        i_limit = Config().get_int("store_api", "nb_limit")
+        # Toutes les pages sont demandées : on consomme l'itérateur
+        if page is None:
+            return list(cls.api_iter(infos_filter=infos_filter, tags_filter=tags_filter, datastore=datastore))
 
-        # Gestion des paramètres nuls
-        infos_filter = infos_filter if infos_filter is not None else {}
-        tags_filter = tags_filter if tags_filter is not None else {}
+        # Une page précise est demandée : une seule requête
+        o_response = ApiRequester().route_request(
+            f"{cls._entity_name}_list",
+            route_params={"datastore": datastore},
+            params={**cls._list_params(infos_filter, tags_filter), **{"page": page, "limit": Config().get_int("store_api", "nb_limit")}},
+        )
+        return [cls(i, datastore) for i in o_response.json()]
 
-        # Fusion des filtres sur les attributs et les tags
-        d_params: Dict[str, Any] = {**infos_filter, **{f"tags[{k}]": v for k, v in tags_filter.items()}}
+    @classmethod
+    def api_iter(cls: Type[T], infos_filter: Optional[Dict[str, str]] = None, tags_filter: Optional[Dict[str, str]] = None, datastore: Optional[str] = None) -> Iterator[T]:
+        """Itère sur les entités de l'API respectant les paramètres donnés, page par page.
 
-        # Génération du nom de la route
-        s_route = f"{cls._entity_name}_list"
+        Les entités sont renvoyées dès que leur page est récupérée : les pages suivantes sont
+        demandées en arrière-plan pendant que l'appelant traite la page courante.
 
-        # Liste pour stocker les entités
-        l_entities: List[T] = []
+        Args:
+            infos_filter: Filtres sur les attributs sous la forme `{"nom_attribut": "valeur_attribut"}`
+            tags_filter: Filtres sur les tags sous la forme `{"nom_tag": "valeur_tag"}`
+            datastore: Identifiant du datastore
 
-        # Numéro de la page demandée
-        i_page = 1 if page is None else page
+        Yields:
+            (Iterator[StoreEntity]): entités retournées par l'API
+        """
+        # Génération du nom de la route
+        s_route = f"{cls._entity_name}_list"
+        # Nombre d'éléments max à lister par requête (ajusté selon les réponses précédentes)
+        i_limit = PageSizeManager().get(s_route, Config().get_int("store_api", "nb_limit"))
+        for l_page in ApiRequester().route_request_pages(s_route, route_params={"datastore": datastore}, params=cls._list_params(infos_filter, tags_filter), limit=i_limit):
+            for d_entity in l_page:
+                yield cls(d_entity, datastore)
 
-        # Flag indiquant s'il faut requêter la prochaine page
-        b_next_page = True
+    @staticmethod
+    def _list_params(infos_filter: Optional[Dict[str, str]], tags_filter: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        """Fusionne les filtres sur les attributs et les tags en paramètres de requête de listing.
 
-        # On requête tant qu'on est à la page spécifiquement demandée ou qu'on veut toutes les pages et que la dernière n'était pas vide
-        while i_page == page or (page is None and b_next_page is True):
-            # On liste les entités à la bonne page
-            o_response = ApiRequester().route_request(
-                s_route,
-                route_params={"datastore": datastore},
-                params={**d_params, **{"page": i_page, "limit": i_limit}},
-            )
-            # On les ajoute à la liste
-            l_entities += [cls(i, datastore) for i in o_response.json()]
-            # On regarde le Content-Range de la réponse pour savoir si on doit refaire une requête pour récupérer la fin
-            b_next_page = ApiRequester.range_next_page(o_response.headers.get("Content-Range"), len(l_entities))
-            # On passe à la page suivante
-            i_page += 1
+        Args:
+            infos_filter: Filtres sur les attributs sous la forme `{"nom_attribut": "valeur_attribut"}`
+            tags_filter: Filtres sur les tags sous la forme `{"nom_tag": "valeur_tag"}`
 
-        # On renvoie la liste des entités récupérées
-        return l_entities
+        Returns:
+            Dict[str, Any]: paramètres de la requête
+        """
+        # Gestion des paramètres nuls
+        infos_filter = infos_filter if infos_filter is not None else {}
+        tags_filter = tags_filter if tags_filter is not None else {}
+        # Fusion des filtres sur les attributs et les tags
+        return {**infos_filter, **{f"tags[{k}]": v for k, v in tags_filter.items()}}
 
     def api_delete(self) -> None:
         """Supprime l'entité de l'API."""
+        EntityCache().invalidate(self)
         s_route = f"{self._entity_name}_delete"
         # Requête
         ApiRequester().route_request(
@@ -184,19 +206,95 @@ class StoreEntity(ABC):
             route_params={"datastore": self.datastore, self._entity_name: self.id},
         )
 
-    def api_update(self) -> None:
+    def api_update(self, use_cache: bool = False) -> None:
         """Met à jour l'instance Python représentant l'entité en récupérant les infos à jour sur l'API.
         Seules les informations Python sont modifiées, à ne pas confondre avec une fonction d'édition.
+
+        Args:
+            use_cache: Si True, les infos de la table d'identité (si activée et non expirées) sont utilisées sans requête.
         """
+        if use_cache:
+            o_entity = EntityCache().get(type(self), self.datastore, self.id)
+            if o_entity is not None:
+                self._store_api_dict = o_entity.get_store_properties()
+                return
         # Génération du nom de la route
         s_route = f"{self._entity_name}_get"
         # Requête
-        o_response = ApiRequester().route_request(
+        try:
+            o_response = ApiRequester().route_request(
+                s_route,
+                route_params={"datastore": self.datastore, self._entity_name: self.id},
+            )
+        except NotFoundError:
+            # L'entité n'existe plus
+            EntityCache().invalidate(self)
+            raise
+        # Mise à jour du stockage local
+        self._store_api_dict = o_response.json()
+        EntityCache().set(self)
+
+    ##############################################################
+    # Équivalents asynchrones (asyncio) des fonctions d'interface avec l'API
+    # (requêtes via AsyncApiRequester : natives si `store_api.async_transport=httpx`)
+    ##############################################################
+
+    @classmethod
+    async def api_create_async(cls: Type[T], data: Optional[Dict[str, Any]], route_params: Optional[Dict[str, Any]] = None) -> T:
+        """Version asynchrone de `api_create`."""
+        s_datastore = route_params.get("datastore") if isinstance(route_params, dict) else None
+        o_response = await AsyncApiRequester().route_request(f"{cls._entity_name}_create", route_params=route_params, method=ApiRequester.POST, data=data)
+        return cls(o_response.json(), datastore=s_datastore)
+
+    @classmethod
+    async def api_get_async(cls: Type[T], id_: str, datastore: Optional[str] = None) -> T:
+        """Version asynchrone de `api_get`."""
+        o_entity: Optional[T] = EntityCache().get(cls, datastore, id_)
+        if o_entity is not None:
+            return o_entity
+        o_response = await AsyncApiRequester().route_request(f"{cls._entity_name}_get", route_params={"datastore": datastore, cls._entity_name: id_})
+        o_entity = cls(o_response.json(), datastore)
+        EntityCache().set(o_entity)
+        return o_entity
+
+    @classmethod
+    async def api_list_async(
+        cls: Type[T], infos_filter: Optional[Dict[str, str]] = None, tags_filter: Optional[Dict[str, str]] = None, page: Optional[int] = None, datastore: Optional[str] = None
+    ) -> List[T]:
+        """Version asynchrone de `api_list`."""
+        s_route = f"{cls._entity_name}_list"
+        if page is None:
+            i_limit = PageSizeManager().get(s_route, Config().get_int("store_api", "nb_limit"))
+            l_entities: List[T] = []
+            async for l_page in AsyncApiRequester().route_request_pages(s_route, route_params={"datastore": datastore}, params=cls._list_params(infos_filter, tags_filter), limit=i_limit):
+                l_entities.extend(cls(d_entity, datastore) for d_entity in l_page)
+            return l_entities
+        o_response = await AsyncApiRequester().route_request(
             s_route,
-            route_params={"datastore": self.datastore, self._entity_name: self.id},
+            route_params={"datastore": datastore},
+            params={**cls._list_params(infos_filter, tags_filter), **{"page": page, "limit": Config().get_int("store_api", "nb_limit")}},
         )
-        # Mise à jour du stockage local
+        return [cls(i, datastore) for i in o_response.json()]
+
+    async def api_delete_async(self) -> None:
+        """Version asynchrone de `api_delete`."""
+        EntityCache().invalidate(self)
+        await AsyncApiRequester().route_request(f"{self._entity_name}_delete", method=ApiRequester.DELETE, route_params={"datastore": self.datastore, self._entity_name: self.id})
+
+    async def api_update_async(self, use_cache: bool = False) -> None:
+        """Version asynchrone de `api_update`."""
+        if use_cache:
+            o_entity = EntityCache().get(type(self), self.datastore, self.id)
+            if o_entity is not None:
+                self._store_api_dict = o_entity.get_store_properties()
+                return
+        try:
+            o_response = await AsyncApiRequester().route_request(f"{self._entity_name}_get", route_params={"datastore": self.datastore, self._entity_name: self.id})
+        except NotFoundError:
+            EntityCache().invalidate(self)
+            raise
         self._store_api_dict = o_response.json()
+        EntityCache().set(self)
 
     @staticmethod
     def filter_dict_from_str(filters: Optional[str]) -> Dict[str, str]:
@@ -277,10 +375,9 @@ class StoreEntity(ABC):
             Config().om.info("Aucun élément supprimé.")
             return
         Config().om.info("Début de la suppression ...")
-        # suppression
+        # suppression (espacées selon la limite de débit de la famille `delete`)
         for o_entity in l_entities:
             o_entity.api_delete()
-            time.sleep(1)
         Config().om.info("Suppression effectuée.", green_colored=True)
 
     def edit(self, data_edit: Dict[str, Any]) -> None:
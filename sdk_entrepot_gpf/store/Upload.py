@@ -1,13 +1,15 @@
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 from sdk_entrepot_gpf.store.StoreEntity import StoreEntity
+from sdk_entrepot_gpf.store.EntityCache import EntityCache
 from sdk_entrepot_gpf.store.interface.TagInterface import TagInterface
 from sdk_entrepot_gpf.store.interface.CommentInterface import CommentInterface
 from sdk_entrepot_gpf.store.interface.SharingInterface import SharingInterface
 from sdk_entrepot_gpf.store.interface.EventInterface import EventInterface
 from sdk_entrepot_gpf.store.interface.PartialEditInterface import PartialEditInterface
 from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
+from sdk_entrepot_gpf.io.AsyncApiRequester import AsyncApiRequester
 from sdk_entrepot_gpf.io.Config import Config
 from sdk_entrepot_gpf.store.Errors import StoreEntityError
 
@@ -31,12 +33,13 @@ class Upload(TagInterface, CommentInterface, SharingInterface, EventInterface, P
     STATUS_UNSTABLE = "UNSTABLE"
     STATUS_DELETED = "DELETED"
 
-    def api_push_data_file(self, file_path: Path, api_path: str) -> None:
+    def api_push_data_file(self, file_path: Path, api_path: str, on_md5: Optional[Callable[[str], None]] = None) -> None:
         """Téléverse via l'API un fichier de donnée associé à cette Livraison.
 
         Args:
             file_path: chemin local vers le fichier à envoyer
             api_path: chemin distant du dossier où déposer le fichier
+            on_md5: si précisée, fonction recevant la clef md5 du fichier calculée pendant son envoi
         """
         # Génération du nom de la route
         s_route = f"{self._entity_name}_push_data"
@@ -51,7 +54,14 @@ class Upload(TagInterface, CommentInterface, SharingInterface, EventInterface, P
             route_params={"datastore": self.datastore, self._entity_name: self.id},
             params={"path": api_path + "/" + file_path.name},
             method=ApiRequester.POST,
+            on_md5=on_md5,
         )
+        # Le contenu connu localement n'est plus à jour
+        EntityCache().invalidate(self)
+
+    async def api_push_data_file_async(self, file_path: Path, api_path: str) -> None:
+        """Version asynchrone de `api_push_data_file`."""
+        await AsyncApiRequester().run(self.api_push_data_file, file_path, api_path)
 
     def api_delete_data_file(self, api_path: str) -> None:
         """Supprime un fichier de donnée de la Livraison.
@@ -69,6 +79,8 @@ class Upload(TagInterface, CommentInterface, SharingInterface, EventInterface, P
             route_params={"datastore": self.datastore, self._entity_name: self.id},
             params={"path": api_path},
         )
+        # Le contenu connu localement n'est plus à jour
+        EntityCache().invalidate(self)
 
     def api_push_md5_file(self, file_path: Path) -> None:
         """Téléverse via l'API un fichier de clefs associé à cette Livraison.
@@ -89,6 +101,12 @@ class Upload(TagInterface, CommentInterface, SharingInterface, EventInterface, P
             route_params={"datastore": self.datastore, self._entity_name: self.id},
             method=ApiRequester.POST,
         )
+        # Le contenu connu localement n'est plus à jour
+        EntityCache().invalidate(self)
+
+    async def api_push_md5_file_async(self, file_path: Path) -> None:
+        """Version asynchrone de `api_push_md5_file`."""
+        await AsyncApiRequester().run(self.api_push_md5_file, file_path)
 
     def api_delete_md5_file(self, api_path: str) -> None:
         """Supprime un fichier de clefs de la Livraison.
@@ -106,6 +124,8 @@ class Upload(TagInterface, CommentInterface, SharingInterface, EventInterface, P
             route_params={"datastore": self.datastore, self._entity_name: self.id},
             params={"path": api_path},
         )
+        # Le contenu connu localement n'est plus à jour
+        EntityCache().invalidate(self)
 
     def api_open(self) -> None:
         """Ouvre la Livraison."""
@@ -201,3 +221,5 @@ class Upload(TagInterface, CommentInterface, SharingInterface, EventInterface, P
             method=ApiRequester.POST,
             data=check_ids,
         )
+        # Les vérifications connues localement ne sont plus à jour
+        EntityCache().invalidate(self)
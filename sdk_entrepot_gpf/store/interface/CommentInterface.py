@@ -1,6 +1,8 @@
 from typing import Any, Dict, List
 from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
+from sdk_entrepot_gpf.io.AsyncApiRequester import AsyncApiRequester
 from sdk_entrepot_gpf.store.StoreEntity import StoreEntity
+from sdk_entrepot_gpf.store.EntityCache import EntityCache
 
 
 class CommentInterface(StoreEntity):
@@ -21,6 +23,8 @@ class CommentInterface(StoreEntity):
             route_params={self._entity_name: self.id, "datastore": self.datastore},
             data=comment_data,
         )
+        # Les commentaires connus localement ne sont plus à jour
+        EntityCache().invalidate(self)
 
     def api_list_comments(self) -> List[Dict[str, Any]]:
         """Liste les commentaires de l'entité.
@@ -54,6 +58,8 @@ class CommentInterface(StoreEntity):
             route_params={self._entity_name: self.id, "comment": id_, "datastore": self.datastore},
             data=comment_data,
         )
+        # Les commentaires connus localement ne sont plus à jour
+        EntityCache().invalidate(self)
 
     def api_remove_comment(self, id_: str) -> None:
         """Supprime un commentaire de l'entité.
@@ -69,3 +75,43 @@ class CommentInterface(StoreEntity):
             method=ApiRequester.DELETE,
             route_params={self._entity_name: self.id, "comment": id_, "datastore": self.datastore},
         )
+        # Les commentaires connus localement ne sont plus à jour
+        EntityCache().invalidate(self)
+
+    async def api_add_comment_async(self, comment_data: Dict[str, str]) -> None:
+        """Version asynchrone de `api_add_comment`."""
+        await AsyncApiRequester().route_request(
+            f"{self._entity_name}_add_comment",
+            method=ApiRequester.POST,
+            route_params={self._entity_name: self.id, "datastore": self.datastore},
+            data=comment_data,
+        )
+        EntityCache().invalidate(self)
+
+    async def api_list_comments_async(self) -> List[Dict[str, Any]]:
+        """Version asynchrone de `api_list_comments`."""
+        o_response = await AsyncApiRequester().route_request(
+            f"{self._entity_name}_list_comment",
+            route_params={self._entity_name: self.id, "datastore": self.datastore},
+        )
+        l_comments: List[Dict[str, Any]] = o_response.json()
+        return l_comments
+
+    async def api_edit_comment_async(self, id_: str, comment_data: Dict[str, str]) -> None:
+        """Version asynchrone de `api_edit_comment`."""
+        await AsyncApiRequester().route_request(
+            f"{self._entity_name}_edit_comment",
+            method=ApiRequester.PUT,
+            route_params={self._entity_name: self.id, "comment": id_, "datastore": self.datastore},
+            data=comment_data,
+        )
+        EntityCache().invalidate(self)
+
+    async def api_remove_comment_async(self, id_: str) -> None:
+        """Version asynchrone de `api_remove_comment`."""
+        await AsyncApiRequester().route_request(
+            f"{self._entity_name}_remove_comment",
+            method=ApiRequester.DELETE,
+            route_params={self._entity_name: self.id, "comment": id_, "datastore": self.datastore},
+        )
+        EntityCache().invalidate(self)
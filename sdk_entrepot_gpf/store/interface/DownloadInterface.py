@@ -1,29 +1,419 @@
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
+import requests
 
+from sdk_entrepot_gpf.Errors import GpfSdkError
+from sdk_entrepot_gpf.helper.FileHelper import FileHelper
+from sdk_entrepot_gpf.store.Errors import StoreEntityError
 from sdk_entrepot_gpf.store.StoreEntity import StoreEntity
 from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.Errors import StatusCodeError
 
 
 class DownloadInterface(StoreEntity):
-    """Interface de StoreEntity pour gérer les téléchargements"""
+    """Interface de StoreEntity pour gérer les téléchargements.
 
-    def api_download(self, file_path: Path, datastore: Optional[str] = None) -> None:
+    Le fichier est téléchargé par morceaux (`download.chunk_size`) dans un fichier temporaire `<fichier>.part`,
+    renommé une fois le téléchargement terminé (et vérifié si une empreinte est indiquée). Un téléchargement
+    interrompu reprend là où il s'est arrêté (entête `Range`), y compris lors d'un appel ultérieur (`download.resume`).
+    La reprise n'est faite que si le fichier distant n'a pas changé : son validateur (`ETag` fort, sinon `Last-Modified`)
+    est enregistré à côté du fichier temporaire (`<fichier>.part.validator`) et envoyé dans l'entête `If-Range`.
+    Si le serveur renvoie le fichier complet (200) ou un autre validateur, ou si aucun validateur n'est connu,
+    le téléchargement repart de zéro.
+
+    Si le serveur gère les plages, les fichiers plus grands que `download.range_size` sont découpés en plages
+    téléchargées en parallèle (`download.nb_parallel_ranges` connexions) et écrites à leur position dans le fichier
+    temporaire pré-alloué ; sinon le fichier est téléchargé avec une seule connexion.
+    """
+
+    def api_download(self, file_path: Path, datastore: Optional[str] = None, checksum: Optional[str] = None, checksum_algorithm: str = "md5") -> None:
         """Télécharge le Fichier Statique et l'enregistre localement.
 
         Args:
             file_path: chemin local où enregistrer le fichier
             datastore (Optional[str]): id du datastore à utiliser. Si None, le datastore sera récupéré dans configuration. Defaults to None.
+            checksum (Optional[str]): empreinte attendue du fichier (pas de vérification si None). Defaults to None.
+            checksum_algorithm (str): algorithme de l'empreinte (md5, sha256...). Defaults to "md5".
+
+        Raises:
+            GpfSdkError: levée si le téléchargement n'a pas pu aboutir après `download.nb_attempts` tentatives
+            StoreEntityError: levée si l'empreinte du fichier téléchargé ne correspond pas
         """
         if not datastore:
             datastore = self.datastore
 
         s_route = f"{self._entity_name}_download"
-        # Requête "get" à l'API
-        o_response = ApiRequester().route_request(
-            s_route,
-            route_params={self._entity_name: self.id, "datastore": datastore},
-        )
-
-        with file_path.open("wb", encoding="UTF-8") as o_out_file:
-            o_out_file.write(o_response.content)
+        d_route_params = {self._entity_name: self.id, "datastore": datastore}
+        p_part = file_path.with_name(f"{file_path.name}.part")
+        if not Config().get_bool("download", "resume", True):
+            DownloadInterface.__discard(p_part)
+
+        # Téléchargement, repris là où il s'est arrêté en cas d'interruption
+        i_nb_attempts = max(1, Config().get_int("download", "nb_attempts", 5))
+        i_attempt = 0
+        while not DownloadInterface.__download_part(s_route, d_route_params, p_part, i_attempt, i_nb_attempts):
+            i_attempt += 1
+            time.sleep(Config().get_float("download", "sec_between_attempt", 1))
+
+        # Vérification de l'empreinte
+        if checksum is not None:
+            s_hash = FileHelper.file_hash(p_part, checksum_algorithm)
+            if s_hash.lower() != checksum.lower():
+                p_part.unlink()
+                raise StoreEntityError(f"Téléchargement de {file_path.name} : empreinte {checksum_algorithm} incorrecte ({s_hash} au lieu de {checksum}).")
+
+        # Fichier complet : renommage atomique
+        os.replace(p_part, file_path)
+        DownloadInterface.__validator_path(p_part).unlink(missing_ok=True)
+
+    @staticmethod
+    def __download_part(route_name: str, route_params: Dict[str, Any], part_path: Path, attempt: int, nb_attempts: int) -> bool:  # pylint: disable=too-many-branches,too-many-return-statements
+        """Télécharge le fichier (ou ce qu'il en manque si le fichier temporaire existe déjà) dans le fichier temporaire.
+
+        La première requête ne demande que la première plage (`download.range_size`) : si le serveur gère les plages
+        et que le fichier est plus grand, les plages suivantes sont téléchargées en parallèle (cf. `__download_ranges`),
+        sinon la réponse complète est écrite au fil de l'eau. Une reprise n'est faite que si le fichier distant
+        n'a pas changé (entête `If-Range`).
+
+        Args:
+            route_name (str): route de téléchargement
+            route_params (Dict[str, Any]): paramètres de la route
+            part_path (Path): fichier temporaire
+            attempt (int): nombre de tentatives déjà faites
+            nb_attempts (int): nombre maximal de tentatives
+
+        Raises:
+            GpfSdkError: levée si le téléchargement est interrompu alors que le nombre maximal de tentatives est atteint
+
+        Returns:
+            bool: True si le fichier est complet, False s'il faut reprendre le téléchargement
+        """
+        p_ranges = DownloadInterface.__ranges_path(part_path)
+        s_validator = DownloadInterface.__read_validator(part_path)
+        if s_validator is None and (part_path.exists() or p_ranges.exists()):
+            # Impossible de vérifier que le fichier distant n'a pas changé : on repart de zéro
+            Config().om.debug(f"Téléchargement ({route_name}) : fichier temporaire sans validateur, téléchargement complet.")
+            DownloadInterface.__discard(part_path)
+        i_offset = part_path.stat().st_size if part_path.exists() and not p_ranges.exists() else 0
+        i_range_size = Config().get_int("download", "range_size", 33554432) if Config().get_int("download", "nb_parallel_ranges", 4) > 1 else 0
+        i_total: Optional[int] = None
+        try:
+            if p_ranges.exists():
+                # Téléchargement par plages en cours : on télécharge les plages manquantes
+                return DownloadInterface.__download_ranges(route_name, route_params, part_path, s_validator) or DownloadInterface.__restart(route_name, part_path)
+            if i_offset and s_validator is not None:
+                d_header = {"Range": f"bytes={i_offset}-", "If-Range": s_validator}
+            else:
+                d_header = {"Range": f"bytes=0-{i_range_size - 1}"} if i_range_size > 0 else {}
+            try:
+                o_response = ApiRequester().route_request(route_name, route_params=route_params, header=d_header, stream=True)
+            except GpfSdkError as e_error:
+                if isinstance(e_error.__cause__, StatusCodeError) and e_error.__cause__.status_code == 416 and "Range" in d_header:  # pylint: disable=no-member
+                    # Plage demandée hors du fichier : fichier distant vide, ou fichier temporaire (inchangé) déjà complet
+                    return DownloadInterface.__range_not_satisfiable(part_path, i_offset)
+                raise
+            with o_response:
+                if i_offset and o_response.status_code == 206 and DownloadInterface.__changed(o_response, s_validator):
+                    # Le serveur a ignoré If-Range mais le fichier a changé
+                    return DownloadInterface.__restart(route_name, part_path)
+                if i_offset and o_response.status_code != 206:
+                    # Fichier distant modifié (If-Range) ou plages non gérées par le serveur : on repart de zéro
+                    Config().om.debug(f"Téléchargement ({route_name}) : reprise impossible, téléchargement complet.")
+                    i_offset = 0
+                if not i_offset:
+                    DownloadInterface.__write_validator(part_path, o_response)
+                i_total = DownloadInterface.__expected_size(o_response, i_offset)
+                if not i_offset and o_response.status_code == 206 and i_total is not None:
+                    # Le serveur gère les plages : fichier pré-alloué, première plage écrite, les suivantes en parallèle
+                    DownloadInterface.__start_ranges(part_path, i_total, i_range_size)
+                    DownloadInterface.__write_range(o_response, part_path, 0, min(i_range_size, i_total))
+                    DownloadInterface.__range_done(part_path, 0)
+                else:
+                    if i_offset:
+                        Config().om.info(f"Téléchargement ({route_name}) : reprise à partir de {FileHelper.format_size(i_offset)}.")
+                    elif o_response.status_code == 206:
+                        raise GpfSdkError(f"Téléchargement ({route_name}) : taille du fichier inconnue, téléchargement par plages impossible.")
+                    with part_path.open("ab" if i_offset else "wb") as o_file:
+                        for b_chunk in o_response.iter_content(chunk_size=Config().get_int("download", "chunk_size", 1048576)):
+                            o_file.write(b_chunk)
+            if p_ranges.exists():
+                return DownloadInterface.__download_ranges(route_name, route_params, part_path, DownloadInterface.__read_validator(part_path)) or DownloadInterface.__restart(route_name, part_path)
+        except requests.RequestException as e_error:
+            # Coupure pendant le téléchargement : on reprendra là où on s'est arrêté
+            if attempt + 1 >= nb_attempts:
+                raise GpfSdkError(f"Le téléchargement ({route_name}) a échoué après {nb_attempts} tentatives.") from e_error
+            Config().om.warning(f"Téléchargement ({route_name}) interrompu ({e_error.__class__.__name__}), tentative {attempt + 1}/{nb_attempts}...")
+            return False
+        if i_total is not None and part_path.stat().st_size < i_total:
+            if attempt + 1 >= nb_attempts:
+                raise GpfSdkError(f"Le téléchargement ({route_name}) est incomplet après {nb_attempts} tentatives.")
+            Config().om.warning(f"Téléchargement ({route_name}) incomplet, tentative {attempt + 1}/{nb_attempts}...")
+            return False
+        return True
+
+    @staticmethod
+    def __range_not_satisfiable(part_path: Path, offset: int) -> bool:
+        """Traite une réponse 416 (plage demandée hors du fichier) : si la première plage était demandée, le fichier distant est vide
+        et le fichier temporaire est créé vide ; sinon le fichier temporaire est déjà complet.
+
+        Args:
+            part_path (Path): fichier temporaire
+            offset (int): début de la plage demandée
+
+        Returns:
+            bool: True (le fichier temporaire est complet)
+        """
+        if not offset:
+            part_path.write_bytes(b"")
+            DownloadInterface.__validator_path(part_path).unlink(missing_ok=True)
+        return True
+
+    @staticmethod
+    def __validator_path(part_path: Path) -> Path:
+        """Chemin du fichier contenant le validateur du fichier distant (`ETag` ou `Last-Modified`) à envoyer dans l'entête `If-Range`.
+
+        Args:
+            part_path (Path): fichier temporaire
+
+        Returns:
+            Path: fichier `<fichier>.part.validator`
+        """
+        return part_path.with_name(f"{part_path.name}.validator")
+
+    @staticmethod
+    def __response_validator(response: requests.Response) -> Optional[str]:
+        """Renvoie le validateur utilisable dans l'entête `If-Range` : `ETag` fort, sinon `Last-Modified`.
+
+        Args:
+            response (requests.Response): réponse du serveur
+
+        Returns:
+            Optional[str]: validateur, None si le serveur n'en fournit pas
+        """
+        s_etag = response.headers.get("ETag")
+        if s_etag and not s_etag.startswith("W/"):
+            return str(s_etag)
+        s_last_modified = response.headers.get("Last-Modified")
+        return str(s_last_modified) if s_last_modified else None
+
+    @staticmethod
+    def __write_validator(part_path: Path, response: requests.Response) -> None:
+        """Enregistre le validateur du fichier distant à côté du fichier temporaire (ou supprime l'ancien s'il n'y en a pas).
+
+        Args:
+            part_path (Path): fichier temporaire
+            response (requests.Response): réponse du serveur (téléchargement depuis le début)
+        """
+        s_validator = DownloadInterface.__response_validator(response)
+        p_validator = DownloadInterface.__validator_path(part_path)
+        if s_validator is None:
+            p_validator.unlink(missing_ok=True)
+        else:
+            p_validator.write_text(s_validator, encoding="utf-8")
+
+    @staticmethod
+    def __read_validator(part_path: Path) -> Optional[str]:
+        """Renvoie le validateur du fichier distant enregistré avec le fichier temporaire.
+
+        Args:
+            part_path (Path): fichier temporaire
+
+        Returns:
+            Optional[str]: validateur, None s'il est inconnu
+        """
+        p_validator = DownloadInterface.__validator_path(part_path)
+        if not p_validator.exists():
+            return None
+        return p_validator.read_text(encoding="utf-8").strip() or None
+
+    @staticmethod
+    def __changed(response: requests.Response, validator: Optional[str]) -> bool:
+        """Indique si le validateur d'une réponse partielle diffère de celui enregistré (fichier distant modifié).
+
+        Args:
+            response (requests.Response): réponse partielle (206)
+            validator (Optional[str]): validateur enregistré
+
+        Returns:
+            bool: True si le fichier distant a changé
+        """
+        s_validator = DownloadInterface.__response_validator(response)
+        return validator is not None and s_validator is not None and s_validator != validator
+
+    @staticmethod
+    def __discard(part_path: Path) -> None:
+        """Supprime le fichier temporaire et ses fichiers d'état (plages et validateur).
+
+        Args:
+            part_path (Path): fichier temporaire
+        """
+        part_path.unlink(missing_ok=True)
+        DownloadInterface.__ranges_path(part_path).unlink(missing_ok=True)
+        DownloadInterface.__validator_path(part_path).unlink(missing_ok=True)
+
+    @staticmethod
+    def __restart(route_name: str, part_path: Path) -> bool:
+        """Abandonne le fichier temporaire suite à une modification du fichier distant : le téléchargement repartira de zéro.
+
+        Args:
+            route_name (str): route de téléchargement
+            part_path (Path): fichier temporaire
+
+        Returns:
+            bool: False (le téléchargement est à reprendre)
+        """
+        Config().om.warning(f"Téléchargement ({route_name}) : le fichier distant a changé, téléchargement repris depuis le début.")
+        DownloadInterface.__discard(part_path)
+        return False
+
+    @staticmethod
+    def __ranges_path(part_path: Path) -> Path:
+        """Chemin du fichier d'état d'un téléchargement par plages (taille du fichier, taille et début des plages téléchargées).
+
+        Args:
+            part_path (Path): fichier temporaire
+
+        Returns:
+            Path: fichier d'état `<fichier>.part.ranges`
+        """
+        return part_path.with_name(f"{part_path.name}.ranges")
+
+    @staticmethod
+    def __start_ranges(part_path: Path, total: int, range_size: int) -> None:
+        """Pré-alloue le fichier temporaire et initialise le fichier d'état du téléchargement par plages.
+
+        Args:
+            part_path (Path): fichier temporaire
+            total (int): taille du fichier
+            range_size (int): taille des plages
+        """
+        with part_path.open("wb") as o_file:
+            if hasattr(os, "posix_fallocate") and total > 0:
+                os.posix_fallocate(o_file.fileno(), 0, total)
+            else:
+                o_file.truncate(total)
+        DownloadInterface.__ranges_path(part_path).write_text(json.dumps({"size": total, "range_size": range_size, "done": []}), encoding="utf-8")
+
+    @staticmethod
+    def __range_done(part_path: Path, start: int) -> None:
+        """Enregistre dans le fichier d'état qu'une plage est téléchargée (les accès doivent être sérialisés par l'appelant).
+
+        Args:
+            part_path (Path): fichier temporaire
+            start (int): début de la plage
+        """
+        p_ranges = DownloadInterface.__ranges_path(part_path)
+        d_state = json.loads(p_ranges.read_text(encoding="utf-8"))
+        d_state["done"].append(start)
+        p_tmp = p_ranges.with_name(f"{p_ranges.name}.tmp")
+        p_tmp.write_text(json.dumps(d_state), encoding="utf-8")
+        os.replace(p_tmp, p_ranges)
+
+    @staticmethod
+    def __write_range(response: requests.Response, part_path: Path, start: int, length: int) -> None:
+        """Écrit une plage reçue à sa position dans le fichier temporaire (pré-alloué).
+
+        Args:
+            response (requests.Response): réponse (206) contenant la plage
+            part_path (Path): fichier temporaire
+            start (int): début de la plage
+            length (int): taille de la plage
+
+        Raises:
+            requests.exceptions.ChunkedEncodingError: levée si la plage reçue est incomplète (connexion coupée)
+        """
+        i_written = 0
+        with part_path.open("r+b") as o_file:
+            o_file.seek(start)
+            for b_chunk in response.iter_content(chunk_size=Config().get_int("download", "chunk_size", 1048576)):
+                o_file.write(b_chunk)
+                i_written += len(b_chunk)
+        if i_written != length:
+            raise requests.exceptions.ChunkedEncodingError(f"Plage {start}-{start + length - 1} incomplète ({i_written} octets reçus).")
+
+    @staticmethod
+    def __download_ranges(route_name: str, route_params: Dict[str, Any], part_path: Path, validator: Optional[str]) -> bool:
+        """Télécharge en parallèle (`download.nb_parallel_ranges` connexions) les plages manquantes d'après le fichier d'état,
+        puis supprime le fichier d'état.
+
+        Args:
+            route_name (str): route de téléchargement
+            route_params (Dict[str, Any]): paramètres de la route
+            part_path (Path): fichier temporaire (pré-alloué)
+            validator (Optional[str]): validateur du fichier distant (envoyé dans l'entête `If-Range`)
+
+        Raises:
+            GpfSdkError: levée si le serveur ne renvoie pas la plage demandée
+
+        Returns:
+            bool: True si toutes les plages sont téléchargées, False si le fichier distant a changé
+        """
+        p_ranges = DownloadInterface.__ranges_path(part_path)
+        d_state = json.loads(p_ranges.read_text(encoding="utf-8"))
+        i_total = int(d_state["size"])
+        i_range_size = int(d_state["range_size"])
+        l_todo = [i_start for i_start in range(0, i_total, i_range_size) if i_start not in d_state["done"]]
+        if l_todo:
+            Config().om.info(f"Téléchargement ({route_name}) : {FileHelper.format_size(i_total)} en {len(l_todo)} plage(s) restante(s)...")
+        o_lock = threading.Lock()
+
+        def download_range(i_start: int) -> bool:
+            i_length = min(i_range_size, i_total - i_start)
+            d_header = {"Range": f"bytes={i_start}-{i_start + i_length - 1}"}
+            if validator is not None:
+                d_header["If-Range"] = validator
+            o_response = ApiRequester().route_request(route_name, route_params=route_params, header=d_header, stream=True)
+            with o_response:
+                if validator is not None and (o_response.status_code == 200 or DownloadInterface.__changed(o_response, validator)):
+                    # Fichier distant modifié
+                    return False
+                if o_response.status_code != 206:
+                    raise GpfSdkError(f"Téléchargement ({route_name}) : la plage {d_header['Range']} n'a pas été renvoyée par le serveur.")
+                DownloadInterface.__write_range(o_response, part_path, i_start, i_length)
+            with o_lock:
+                DownloadInterface.__range_done(part_path, i_start)
+            return True
+
+        i_max_workers = max(1, Config().get_int("download", "nb_parallel_ranges", 4))
+        with ThreadPoolExecutor(max_workers=i_max_workers, thread_name_prefix="download-range") as o_executor:
+            l_futures = [o_executor.submit(download_range, i_start) for i_start in l_todo]
+            try:
+                b_unchanged = all(o_future.result() for o_future in l_futures)
+            except BaseException:
+                # Erreur : on annule les plages qui n'ont pas commencé (les plages terminées sont conservées pour la reprise)
+                for o_future in l_futures:
+                    o_future.cancel()
+                raise
+            if not b_unchanged:
+                # Fichier distant modifié : les plages restantes sont inutiles
+                for o_future in l_futures:
+                    o_future.cancel()
+                return False
+        p_ranges.unlink()
+        return True
+
+    @staticmethod
+    def __expected_size(response: requests.Response, offset: int) -> Optional[int]:
+        """Renvoie la taille attendue du fichier complet d'après les entêtes de la réponse.
+
+        Args:
+            response (requests.Response): réponse (200 ou 206)
+            offset (int): position de début de la réponse dans le fichier
+
+        Returns:
+            Optional[int]: taille attendue, None si inconnue (ou contenu compressé à la volée)
+        """
+        if response.headers.get("Content-Encoding"):
+            return None
+        o_match = re.search(r"/(\d+)$", response.headers.get("Content-Range", ""))
+        if o_match:
+            return int(o_match.group(1))
+        s_length = response.headers.get("Content-Length")
+        return offset + int(s_length) if s_length and s_length.isdigit() else None
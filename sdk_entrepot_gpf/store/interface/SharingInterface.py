@@ -1,7 +1,9 @@
 from typing import Dict, List
 
 from sdk_entrepot_gpf.store.StoreEntity import StoreEntity
+from sdk_entrepot_gpf.store.EntityCache import EntityCache
 from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
+from sdk_entrepot_gpf.io.AsyncApiRequester import AsyncApiRequester
 
 
 class SharingInterface(StoreEntity):
@@ -22,6 +24,8 @@ class SharingInterface(StoreEntity):
             route_params={self._entity_name: self.id, "datastore": self.datastore},
             data=datastore_ids,
         )
+        # Les partages connus localement ne sont plus à jour
+        EntityCache().invalidate(self)
 
     def api_list_sharings(self) -> List[Dict[str, str]]:
         """Liste les datastore avec lesquels l'entité est partagée.
@@ -55,3 +59,34 @@ class SharingInterface(StoreEntity):
             route_params={self._entity_name: self.id, "datastore": self.datastore},
             params={"datastores": datastore_ids},
         )
+        # Les partages connus localement ne sont plus à jour
+        EntityCache().invalidate(self)
+
+    async def api_add_sharings_async(self, datastore_ids: List[str]) -> None:
+        """Version asynchrone de `api_add_sharings`."""
+        await AsyncApiRequester().route_request(
+            f"{self._entity_name}_add_sharings",
+            method=ApiRequester.POST,
+            route_params={self._entity_name: self.id, "datastore": self.datastore},
+            data=datastore_ids,
+        )
+        EntityCache().invalidate(self)
+
+    async def api_list_sharings_async(self) -> List[Dict[str, str]]:
+        """Version asynchrone de `api_list_sharings`."""
+        o_response = await AsyncApiRequester().route_request(
+            f"{self._entity_name}_list_sharings",
+            route_params={self._entity_name: self.id, "datastore": self.datastore},
+        )
+        l_sharings: List[Dict[str, str]] = o_response.json()
+        return l_sharings
+
+    async def api_remove_sharings_async(self, datastore_ids: List[str]) -> None:
+        """Version asynchrone de `api_remove_sharings`."""
+        await AsyncApiRequester().route_request(
+            f"{self._entity_name}_remove_sharings",
+            method=ApiRequester.DELETE,
+            route_params={self._entity_name: self.id, "datastore": self.datastore},
+            params={"datastores": datastore_ids},
+        )
+        EntityCache().invalidate(self)
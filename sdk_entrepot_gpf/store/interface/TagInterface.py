@@ -2,7 +2,9 @@ from typing import Dict, List
 from sdk_entrepot_gpf.io.Config import Config
 from sdk_entrepot_gpf.store.Errors import StoreEntityError
 from sdk_entrepot_gpf.store.StoreEntity import StoreEntity
+from sdk_entrepot_gpf.store.EntityCache import EntityCache
 from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
+from sdk_entrepot_gpf.io.AsyncApiRequester import AsyncApiRequester
 
 
 class TagInterface(StoreEntity):
@@ -39,6 +41,8 @@ class TagInterface(StoreEntity):
             route_params={self._entity_name: self.id, "datastore": self.datastore},
             data=tags_data,
         )
+        # Les étiquettes connues localement ne sont plus à jour
+        EntityCache().invalidate(self)
 
     def api_remove_tags(self, tag_keys: List[str]) -> None:
         """Supprime des tags de l'entité.
@@ -56,3 +60,25 @@ class TagInterface(StoreEntity):
             # dans les paramètres (params), on met en clé "tag[]" et en valeur la liste des tags :
             params={"tags[]": tag_keys},
         )
+        # Les étiquettes connues localement ne sont plus à jour
+        EntityCache().invalidate(self)
+
+    async def api_add_tags_async(self, tags_data: Dict[str, str]) -> None:
+        """Version asynchrone de `api_add_tags`."""
+        await AsyncApiRequester().route_request(
+            f"{self._entity_name}_add_tags",
+            method=ApiRequester.POST,
+            route_params={self._entity_name: self.id, "datastore": self.datastore},
+            data=tags_data,
+        )
+        EntityCache().invalidate(self)
+
+    async def api_remove_tags_async(self, tag_keys: List[str]) -> None:
+        """Version asynchrone de `api_remove_tags`."""
+        await AsyncApiRequester().route_request(
+            f"{self._entity_name}_delete_tags",
+            method=ApiRequester.DELETE,
+            route_params={self._entity_name: self.id, "datastore": self.datastore},
+            params={"tags[]": tag_keys},
+        )
+        EntityCache().invalidate(self)
@@ -1,6 +1,8 @@
 import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set
 
 import jsonschema
 from sdk_entrepot_gpf.Errors import GpfSdkError
@@ -37,6 +39,8 @@ class Workflow:
     Attributes:
         __name (str): Nom du workflow
         __raw_definition_dict (dict): Définition du workflow
+        __running_executions (Dict[str, ProcessingExecutionAction]): exécutions de traitement suivies, par étape
+        __running_lock (threading.Lock): verrou protégeant `__running_executions`
     """
 
     def __init__(self, name: str, raw_dict: Dict[str, Any]) -> None:
@@ -51,6 +55,8 @@ class Workflow:
         self.__name = name
         self.__raw_definition_dict = raw_dict
         self.__datastore = raw_dict["datastore"] if "datastore" in raw_dict else None
+        self.__running_executions: Dict[str, ProcessingExecutionAction] = {}
+        self.__running_lock = threading.Lock()
 
     def get_raw_dict(self) -> Dict[str, Any]:
         """Renvoie le dictionnaire de définition du workflow.
@@ -60,7 +66,7 @@ class Workflow:
         """
         return self.__raw_definition_dict
 
-    def run_step(
+    def run_step(  # pylint: disable=too-many-branches
         self,
         step_name: str,
         callback: Optional[Callable[[ProcessingExecution], None]] = None,
@@ -70,6 +76,7 @@ class Workflow:
         comments: List[str] = [],
         tags: Dict[str, str] = {},
         compatibility_cartes: Optional[bool] = None,
+        stop_event: Optional[threading.Event] = None,
     ) -> List[StoreEntity]:
         """Lance une étape du workflow à partir de son nom. Liste les entités créées par chaque action et retourne la liste.
 
@@ -82,68 +89,274 @@ class Workflow:
             comments (Optional[List[str]]): liste des commentaire à rajouté à toute les actions de l'étape (les cas de doublons sont géré).
             tags (Optional[Dict[str, str]]): dictionnaire des tag à rajouté pour toutes les action de l'étape. Écrasé par ceux du workflow, de l'étape et de l'action si les clef sont les même.
             compatibility_cartes (Optional[bool]): ajout des tags pour compatibilité avec cartes.gouv.fr.
+            stop_event (Optional[threading.Event]): événement demandant l'arrêt de l'étape (plus aucune action lancée, suivi arrêté).
 
         Raises:
-            WorkflowError: levée si un problème apparaît pendant l'exécution du workflow
+            WorkflowError: levée si un problème apparaît pendant l'exécution du workflow ou si l'étape est arrêtée
 
         Returns:
             List[StoreEntity]: liste des entités créées
         """
         Config().om.info(f"Lancement de l'étape {step_name}...")
-        # si compatibility_cartes n'est pas déterminé on récupère la valeur dans le workflow ou None
-        if compatibility_cartes is None:
-            compatibility_cartes = self.__raw_definition_dict.get("compatibility_cartes")
-        # Création d'une liste pour stocker les entités créées
-        l_store_entity: List[StoreEntity] = []
-        # Récupération de l'étape dans la définition de workflow (datastore forcé, sinon datastore du workflow/None)
-        d_step_definition = self.__get_step_definition(step_name, comments, tags, datastore if datastore else self.__datastore)
-        # initialisation des actions parentes
-        o_parent_action: Optional[ActionAbstract] = None
-        # Pour chaque action définie dans le workflow, instanciation de l'objet Action puis création sur l'entrepôt
-        for d_action_raw in d_step_definition["actions"]:
-            # création de l'action
-            o_action = Workflow.generate(step_name, d_action_raw, o_parent_action, behavior, compatibility_cartes)
-            # choix du datastore
-            ## datastore donné en paramètre
-            ## sinon datastore du workflow au niveau de l'action
-            ## sinon datastore du workflow au niveau de l'étape
-            ## sinon datastore du workflow au niveau global (self.__datastore)
-            # NB: si None il sera récupérer dans la configuration
-            s_use_datastore = datastore if datastore else o_action.definition_dict.get("datastore", d_step_definition.get("datastore", self.__datastore))
-
-            # résolution
-            o_action.resolve(datastore=s_use_datastore)
-            # exécution de l'action
-            Config().om.info(f"Exécution de l'action '{o_action.workflow_context}-{o_action.index}'...")
-            o_action.run(s_use_datastore)
-            # on attend la fin de l'exécution si besoin
-            if isinstance(o_action, ProcessingExecutionAction):
-                s_status = o_action.monitoring_until_end(callback=callback, ctrl_c_action=ctrl_c_action)
-                if s_status != ProcessingExecution.STATUS_SUCCESS:
-                    s_error_message = f"L'exécution de traitement {o_action} ne s'est pas bien passée. Sortie {s_status}."
-                    Config().om.error(s_error_message)
-                    raise WorkflowError(s_error_message)
-
-            # On récupère l'entité créée par l'Action
-            if isinstance(o_action, ProcessingExecutionAction):
-                # Ajout de upload et/ou stored_data
-                if o_action.upload is not None:
-                    l_store_entity.append(o_action.upload)
-                if o_action.stored_data is not None:
-                    l_store_entity.append(o_action.stored_data)
-            elif isinstance(o_action, ConfigurationAction):
-                if o_action.configuration is not None:
-                    l_store_entity.append(o_action.configuration)
-            elif isinstance(o_action, OfferingAction):
-                if o_action.offering is not None:
-                    l_store_entity.append(o_action.offering)
-
-            # Message de fin
-            Config().om.info(f"Exécution de l'action '{o_action.workflow_context}-{o_action.index}' : terminée")
-            # cette action sera la parente de la suivante
-            o_parent_action = o_action
-        # Retour de la liste
-        return l_store_entity
+        # Portée de résolution propre à l'exécution : résolveurs d'itération et cache oubliés en fin d'étape
+        with GlobalResolver().scope():
+            # si compatibility_cartes n'est pas déterminé on récupère la valeur dans le workflow ou None
+            if compatibility_cartes is None:
+                compatibility_cartes = self.__raw_definition_dict.get("compatibility_cartes")
+            # Création d'une liste pour stocker les entités créées
+            l_store_entity: List[StoreEntity] = []
+            # Récupération de l'étape dans la définition de workflow (datastore forcé, sinon datastore du workflow/None)
+            d_step_definition = self.__get_step_definition(step_name, comments, tags, datastore if datastore else self.__datastore)
+            # initialisation des actions parentes
+            o_parent_action: Optional[ActionAbstract] = None
+            # Pour chaque action définie dans le workflow, instanciation de l'objet Action puis création sur l'entrepôt
+            for d_action_raw in d_step_definition["actions"]:
+                if stop_event is not None and stop_event.is_set():
+                    raise WorkflowError(f"Étape {step_name} interrompue.")
+                # création de l'action
+                o_action = Workflow.generate(step_name, d_action_raw, o_parent_action, behavior, compatibility_cartes)
+                # choix du datastore
+                ## datastore donné en paramètre
+                ## sinon datastore du workflow au niveau de l'action
+                ## sinon datastore du workflow au niveau de l'étape
+                ## sinon datastore du workflow au niveau global (self.__datastore)
+                # NB: si None il sera récupérer dans la configuration
+                s_use_datastore = datastore if datastore else o_action.definition_dict.get("datastore", d_step_definition.get("datastore", self.__datastore))
+
+                # résolution
+                o_action.resolve(datastore=s_use_datastore)
+                # exécution de l'action
+                Config().om.info(f"Exécution de l'action '{o_action.workflow_context}-{o_action.index}'...")
+                o_action.run(s_use_datastore)
+                # on attend la fin de l'exécution si besoin
+                if isinstance(o_action, ProcessingExecutionAction):
+                    # exécution suivie : run_all peut l'interrompre depuis le thread principal
+                    with self.__running_lock:
+                        self.__running_executions[step_name] = o_action
+                    try:
+                        s_status = o_action.monitoring_until_end(callback=callback, ctrl_c_action=ctrl_c_action, stop_event=stop_event)
+                    finally:
+                        with self.__running_lock:
+                            self.__running_executions.pop(step_name, None)
+                    if s_status != ProcessingExecution.STATUS_SUCCESS:
+                        s_error_message = f"L'exécution de traitement {o_action} ne s'est pas bien passée. Sortie {s_status}."
+                        Config().om.error(s_error_message)
+                        raise WorkflowError(s_error_message)
+
+                # On récupère l'entité créée par l'Action
+                if isinstance(o_action, ProcessingExecutionAction):
+                    # Ajout de upload et/ou stored_data
+                    if o_action.upload is not None:
+                        l_store_entity.append(o_action.upload)
+                    if o_action.stored_data is not None:
+                        l_store_entity.append(o_action.stored_data)
+                elif isinstance(o_action, ConfigurationAction):
+                    if o_action.configuration is not None:
+                        l_store_entity.append(o_action.configuration)
+                elif isinstance(o_action, OfferingAction):
+                    if o_action.offering is not None:
+                        l_store_entity.append(o_action.offering)
+
+                # Message de fin
+                Config().om.info(f"Exécution de l'action '{o_action.workflow_context}-{o_action.index}' : terminée")
+                # cette action sera la parente de la suivante
+                o_parent_action = o_action
+            # Retour de la liste
+            return l_store_entity
+
+    def run_all(  # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+        self,
+        callback: Optional[Callable[[ProcessingExecution], None]] = None,
+        ctrl_c_action: Optional[Callable[[], bool]] = None,
+        behavior: Optional[str] = None,
+        datastore: Optional[str] = None,
+        comments: List[str] = [],
+        tags: Dict[str, str] = {},
+        compatibility_cartes: Optional[bool] = None,
+        max_parallel_steps: Optional[int] = None,
+        continue_on_error: Optional[bool] = None,
+    ) -> Dict[str, List[StoreEntity]]:
+        """Lance toutes les étapes du workflow en respectant leurs dépendances (`parents`).
+
+        Une étape est lancée dès que tous ses parents se sont terminés avec succès : les branches
+        indépendantes du workflow sont donc exécutées en même temps (dans la limite de `max_parallel_steps`).
+
+        Si une étape échoue :
+
+        * par défaut, plus aucune étape n'est lancée, on attend la fin des étapes en cours puis on lève une erreur ;
+        * si `continue_on_error`, seules les étapes qui en dépendent (directement ou non) sont ignorées.
+
+        Les étapes tournant dans d'autres threads, le ctrl-C est géré ici : `ctrl_c_action` est appelée
+        (si elle renvoie False, le suivi reprend), sinon les étapes en cours sont arrêtées, les exécutions de traitement
+        suivies sont interrompues (cf. `ProcessingExecutionAction.abort`) et l'interruption est transmise sans attendre la fin des threads.
+
+        Args:
+            callback (Optional[Callable[[ProcessingExecution], None]], optional): callback de suivi si création d'une exécution de traitement.
+            ctrl_c_action (Optional[Callable[[], bool]], optional): gestion du ctrl-C lors d'une exécution de traitement.
+            behavior (Optional[str]): comportement à adopter si une entité existe déjà sur l'entrepôt.
+            datastore (Optional[str]): id du datastore à utiliser (cf. `run_step`).
+            comments (Optional[List[str]]): liste des commentaire à rajouté à toute les actions du workflow.
+            tags (Optional[Dict[str, str]]): dictionnaire des tag à rajouté pour toutes les action du workflow.
+            compatibility_cartes (Optional[bool]): ajout des tags pour compatibilité avec cartes.gouv.fr.
+            max_parallel_steps (Optional[int]): nombre maximal d'étapes lancées en même temps, `workflow.max_parallel_steps` si None.
+            continue_on_error (Optional[bool]): poursuite des branches indépendantes en cas d'erreur, `workflow.continue_on_error` si None.
+
+        Raises:
+            WorkflowError: levée si les dépendances sont incohérentes ou si au moins une étape a échoué
+
+        Returns:
+            Dict[str, List[StoreEntity]]: entités créées par chaque étape (dans l'ordre de fin d'exécution)
+        """
+        if max_parallel_steps is None:
+            max_parallel_steps = Config().get_int("workflow", "max_parallel_steps", 4)
+        max_parallel_steps = max(1, max_parallel_steps)
+        if continue_on_error is None:
+            continue_on_error = Config().get_bool("workflow", "continue_on_error", False)
+        d_parents = self.__get_parents()
+        s_pending: Set[str] = set(Workflow.__topological_order(d_parents))
+        Config().om.info(f"Lancement de toutes les étapes du workflow {self.__name} ({len(s_pending)} étapes, {max_parallel_steps} en parallèle au maximum)...")
+
+        d_results: Dict[str, List[StoreEntity]] = {}
+        d_errors: Dict[str, BaseException] = {}
+        l_skipped: List[str] = []
+        d_running: Dict["Future[List[StoreEntity]]", str] = {}
+        o_stop = threading.Event()
+        o_executor = ThreadPoolExecutor(max_workers=max_parallel_steps)
+        try:
+            while s_pending or d_running:
+                try:
+                    # Arrêt au plus tôt : plus aucune étape n'est lancée après une erreur
+                    if continue_on_error or not d_errors:
+                        for s_step in Workflow.__ready_steps(d_parents, s_pending, d_results, d_errors, l_skipped)[: max_parallel_steps - len(d_running)]:
+                            s_pending.discard(s_step)
+                            d_running[
+                                o_executor.submit(
+                                    self.run_step,
+                                    s_step,
+                                    callback,
+                                    ctrl_c_action,
+                                    behavior=behavior,
+                                    datastore=datastore,
+                                    comments=list(comments),
+                                    tags=dict(tags),
+                                    compatibility_cartes=compatibility_cartes,
+                                    stop_event=o_stop,
+                                )
+                            ] = s_step
+                    if not d_running:
+                        break
+                    # Attente de la fin d'au moins une étape
+                    l_done, _ = wait(list(d_running), return_when=FIRST_COMPLETED)
+                except KeyboardInterrupt:
+                    # on appelle la callback de gestion du ctrl-C : si False, on reprend le suivi
+                    if ctrl_c_action is not None and not ctrl_c_action():
+                        continue
+                    Config().om.warning("Ctrl+C : plus aucune étape ne sera lancée, interruption des étapes en cours...", force_flush=True)
+                    o_stop.set()
+                    self.__abort_running_executions(callback)
+                    raise
+                for o_future in l_done:
+                    s_step = d_running.pop(o_future)
+                    try:
+                        d_results[s_step] = o_future.result()
+                        Config().om.info(f"Étape {s_step} terminée.", green_colored=True)
+                    except Exception as e:
+                        d_errors[s_step] = e
+                        Config().om.error(f"Étape {s_step} en erreur : {e}")
+        except BaseException:
+            # interruption (ctrl-C, sys.exit...) : on n'attend pas la fin des étapes en cours
+            # (équivalent de shutdown(cancel_futures=True), indisponible en Python 3.8)
+            o_stop.set()
+            for o_future in d_running:
+                o_future.cancel()
+            o_executor.shutdown(wait=False)
+            raise
+        o_executor.shutdown()
+        l_skipped.extend(s for s in d_parents if s in s_pending)
+
+        if d_errors:
+            s_errors = "\n   * ".join(f"{s_step} : {e}" for s_step, e in d_errors.items())
+            s_message = f"{len(d_errors)} étape(s) en erreur dans le workflow {self.__name} :\n   * {s_errors}"
+            if l_skipped:
+                s_message += f"\nÉtape(s) non lancée(s) : {', '.join(l_skipped)}"
+            raise WorkflowError(s_message)
+        Config().om.info(f"Toutes les étapes du workflow {self.__name} sont terminées.", green_colored=True)
+        return d_results
+
+    def __abort_running_executions(self, callback: Optional[Callable[[ProcessingExecution], None]]) -> None:
+        """Interrompt les exécutions de traitement suivies par les étapes en cours (cf. `ProcessingExecutionAction.abort`).
+
+        Args:
+            callback (Optional[Callable[[ProcessingExecution], None]]): callback de suivi des exécutions de traitement.
+        """
+        with self.__running_lock:
+            l_actions = list(self.__running_executions.values())
+        for o_action in l_actions:
+            try:
+                o_action.abort(callback)
+            except Exception as e:
+                Config().om.error(f"Impossible d'interrompre l'exécution de traitement {o_action} : {e}")
+
+    @staticmethod
+    def __ready_steps(parents: Dict[str, List[str]], pending: Set[str], succeeded: Dict[str, List[StoreEntity]], failed: Dict[str, BaseException], skipped: List[str]) -> List[str]:
+        """Ignore les étapes en attente dont un parent a échoué ou a été ignoré puis renvoie les étapes prêtes à être lancées.
+
+        Args:
+            parents (Dict[str, List[str]]): association nom de l'étape / liste des parents
+            pending (Set[str]): étapes en attente (les étapes ignorées en sont retirées)
+            succeeded (Dict[str, List[StoreEntity]]): étapes terminées avec succès
+            failed (Dict[str, BaseException]): étapes en erreur
+            skipped (List[str]): étapes ignorées (complétée)
+
+        Returns:
+            List[str]: étapes dont tous les parents sont terminés avec succès, dans l'ordre de définition
+        """
+        for s_step, l_parents in parents.items():
+            if s_step in pending and any(s_parent in failed or s_parent in skipped for s_parent in l_parents):
+                Config().om.warning(f"Étape {s_step} ignorée : une étape parente a échoué.")
+                pending.discard(s_step)
+                skipped.append(s_step)
+        return [s_step for s_step, l_parents in parents.items() if s_step in pending and all(s_parent in succeeded for s_parent in l_parents)]
+
+    def __get_parents(self) -> Dict[str, List[str]]:
+        """Renvoie les parents de chaque étape du workflow.
+
+        Raises:
+            WorkflowError: levée si un parent n'est pas défini dans le workflow
+
+        Returns:
+            Dict[str, List[str]]: association nom de l'étape / liste des parents
+        """
+        d_parents: Dict[str, List[str]] = {}
+        for s_step_name, d_step in self.__raw_definition_dict["workflow"]["steps"].items():
+            d_parents[s_step_name] = list(d_step.get("parents", []))
+            for s_parent_name in d_parents[s_step_name]:
+                if s_parent_name not in self.__raw_definition_dict["workflow"]["steps"]:
+                    raise WorkflowError(f"Le parent « {s_parent_name} » de l'étape « {s_step_name} » n'est pas défini dans le workflow {self.__name}.")
+        return d_parents
+
+    @staticmethod
+    def __topological_order(parents: Dict[str, List[str]]) -> List[str]:
+        """Renvoie les étapes triées de manière à ce que chaque étape soit après ses parents (ordre de définition conservé sinon).
+
+        Args:
+            parents (Dict[str, List[str]]): association nom de l'étape / liste des parents
+
+        Raises:
+            WorkflowError: levée si les dépendances entre étapes forment un cycle
+
+        Returns:
+            List[str]: étapes triées
+        """
+        l_order: List[str] = []
+        l_remaining = list(parents)
+        while l_remaining:
+            l_ready = [s_step for s_step in l_remaining if all(s_parent in l_order for s_parent in parents[s_step])]
+            if not l_ready:
+                raise WorkflowError(f"Les dépendances entre les étapes suivantes forment un cycle : {', '.join(l_remaining)}.")
+            l_order.extend(l_ready)
+            l_remaining = [s_step for s_step in l_remaining if s_step not in l_ready]
+        return l_order
 
     def __get_step_definition(self, step_name: str, comments: List[str] = [], tags: Dict[str, str] = {}, datastore: Optional[str] = None) -> Dict[str, Any]:
         """Renvoie le dictionnaire correspondant à une étape du workflow à partir de son nom.
@@ -1,4 +1,4 @@
-import time
+from concurrent.futures import Future
 from typing import Any, Dict, Optional
 
 from sdk_entrepot_gpf.Errors import GpfSdkError
@@ -7,6 +7,8 @@ from sdk_entrepot_gpf.store.Configuration import Configuration
 from sdk_entrepot_gpf.workflow.Errors import StepActionError
 from sdk_entrepot_gpf.workflow.action.ActionAbstract import ActionAbstract
 from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.MonitoringScheduler import MonitoringScheduler
+from sdk_entrepot_gpf.io.PollingPolicy import PollingPolicy
 from sdk_entrepot_gpf.io.Errors import ConflictError
 
 
@@ -43,16 +45,55 @@ class OfferingAction(ActionAbstract):
         Config().om.info(f"Offre créée : {self.__offering}\n   - " + "\n   - ".join(o_offering.get_url()), green_colored=True)
         # vérification du status.
         Config().om.info("vérification du statut ...", force_flush=True)
-        while True:
-            o_offering.api_update()
-            s_status = o_offering["status"]
-            if s_status == Offering.STATUS_PUBLISHED:
-                Config().om.info("Création d'une offre : terminé")
-                break
-            if s_status == Offering.STATUS_UNSTABLE:
-                raise StepActionError("Création d'une offre : terminé en erreur.")
-            # on fixe à 1 seconde, normalement quasiment instantané
-            time.sleep(1)
+        # normalement quasiment instantané : vérifications rapprochées puis de plus en plus espacées
+        o_future = OfferingAction.monitor_in_background(o_offering)
+        try:
+            o_future.result()
+        except KeyboardInterrupt:
+            o_future.cancel()
+            raise
+
+    @staticmethod
+    def check_status(offering: Offering) -> bool:
+        """Met à jour l'offre et vérifie si elle est publiée.
+
+        Args:
+            offering (Offering): offre à vérifier
+
+        Raises:
+            StepActionError: levée si la publication de l'offre est en erreur
+
+        Returns:
+            bool: True si l'offre est publiée, False si la publication est en cours
+        """
+        offering.api_update()
+        s_status = offering["status"]
+        if s_status == Offering.STATUS_PUBLISHED:
+            Config().om.info("Création d'une offre : terminé")
+            return True
+        if s_status == Offering.STATUS_UNSTABLE:
+            raise StepActionError("Création d'une offre : terminé en erreur.")
+        return False
+
+    @staticmethod
+    def monitor_in_background(offering: Offering) -> "Future[bool]":
+        """Suit la publication de l'offre en arrière-plan (cf. `MonitoringScheduler`).
+
+        Args:
+            offering (Offering): offre à suivre
+
+        Returns:
+            Future[bool]: True une fois l'offre publiée (StepActionError si la publication est en erreur)
+        """
+        o_policy = PollingPolicy("offering")
+
+        def poll() -> Optional[bool]:
+            if OfferingAction.check_status(offering):
+                return True
+            o_policy.update()
+            return None
+
+        return MonitoringScheduler().watch(poll, o_policy.get_interval)
 
     def __create_offering(self, datastore: Optional[str]) -> None:
         """Création de l'Offering sur l'API à partir des paramètres de définition de l'action.
@@ -1,8 +1,13 @@
+import threading
 import time
+from concurrent.futures import Future, wait
 from typing import Any, Callable, Dict, List, Optional, Union
 
 from sdk_entrepot_gpf.Errors import GpfSdkError
+from sdk_entrepot_gpf.io.CircuitBreaker import CircuitBreaker
 from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.MonitoringScheduler import MonitoringScheduler
+from sdk_entrepot_gpf.io.PollingPolicy import PollingPolicy
 from sdk_entrepot_gpf.store.ProcessingExecution import ProcessingExecution
 from sdk_entrepot_gpf.store.StoredData import StoredData
 from sdk_entrepot_gpf.workflow.Errors import StepActionError
@@ -33,6 +38,9 @@ class ProcessingExecutionAction(ActionAbstract):
         ActionAbstract.BEHAVIOR_RESUME,
     ]
 
+    # Intervalle (en secondes) de vérification de la demande d'arrêt lors d'un suivi en arrière-plan
+    STOP_CHECK_SEC = 0.5
+
     # status possibles d'une ProcessingExecution (status délivrés par l'api)
     # STATUS_CREATED
     # STATUS_ABORTED STATUS_SUCCESS STATUS_FAILURE
@@ -348,109 +356,183 @@ class ProcessingExecutionAction(ActionAbstract):
         # sinon on retourne None
         return None
 
-    def monitoring_until_end(self, callback: Optional[Callable[[ProcessingExecution], None]] = None, ctrl_c_action: Optional[Callable[[], bool]] = None) -> str:
+    def monitoring_until_end(
+        self,
+        callback: Optional[Callable[[ProcessingExecution], None]] = None,
+        ctrl_c_action: Optional[Callable[[], bool]] = None,
+        stop_event: Optional[threading.Event] = None,
+    ) -> str:
         """Attend que la ProcessingExecution soit terminée (statut `SUCCESS`, `FAILURE` ou `ABORTED`) avant de rendre la main.
 
-        La fonction callback indiquée est exécutée après **chaque vérification du statut** en lui passant en paramètre
-        la processing execution (callback(self.processing_execution)).
+        Le suivi est confié au `MonitoringScheduler` (cf. `monitoring_in_background`) ; la fonction callback indiquée
+        est exécutée après **chaque vérification du statut** en lui passant en paramètre la processing execution
+        (callback(self.processing_execution)).
 
         Si l'utilisateur stoppe le programme (par ctrl-C), le devenir de la ProcessingExecutionAction sera géré par la callback ctrl_c_action().
+        Depuis un autre thread (qui ne reçoit pas le ctrl-C), le suivi peut être arrêté via `stop_event` :
+        l'interruption du traitement est alors à la charge de l'appelant (cf. `abort`).
 
         Args:
             callback (Optional[Callable[[ProcessingExecution], None]], optional): fonction de callback à exécuter. Prend en argument le traitement (callback(processing-execution)).
             ctrl_c_action (Optional[Callable[[], bool]], optional): fonction de gestion du ctrl-C. Renvoie True si on doit stopper le traitement.
+            stop_event (Optional[threading.Event], optional): événement demandant l'arrêt du suivi.
+
+        Raises:
+            StepActionError: levée si le suivi est arrêté via `stop_event`
 
         Returns:
             str: statut final de l'exécution du traitement
         """
 
-        def callback_not_null(o_pe: ProcessingExecution) -> None:
-            """fonction pour éviter des if à chaque appel
-
-            Args:
-                o_pe (ProcessingExecution): traitement en cours
-            """
-            if callback is not None:
-                callback(o_pe)
-
         # NOTE :  Ne pas utiliser self.__processing_execution mais self.processing_execution pour faciliter les tests
-        i_nb_sec_between_check = Config().get_int("processing_execution", "nb_sec_between_check_updates")
-        Config().om.info(f"Monitoring du traitement toutes les {i_nb_sec_between_check} secondes...", force_flush=True)
+        Config().om.info("Monitoring du traitement...", force_flush=True)
         if self.processing_execution is None:
             raise StepActionError("Aucune processing-execution trouvée. Impossible de suivre le déroulement du traitement")
+        if stop_event is not None:
+            return self.__wait_background_monitoring(callback, stop_event)
+        # Suivi par la boucle centrale (MonitoringScheduler), on attend le résultat
+        o_future = self.monitoring_in_background(callback)
+        while True:
+            try:
+                return o_future.result()
+            except KeyboardInterrupt:
+                # on appelle la callback de gestion du ctrl-C
+                if ctrl_c_action is None or ctrl_c_action():
+                    # on doit arrêter le traitement (maj + action spécifique selon le statut)
+                    o_future.cancel()
+                    self.abort(callback)
+                    # enfin, transmission de l'interruption
+                    raise
+
+    def __wait_background_monitoring(self, callback: Optional[Callable[[ProcessingExecution], None]], stop_event: threading.Event) -> str:
+        """Suit la ProcessingExecution en arrière-plan (cf. `monitoring_in_background`) en vérifiant régulièrement `stop_event`.
+
+        Args:
+            callback (Optional[Callable[[ProcessingExecution], None]]): fonction de callback à exécuter après chaque vérification du statut.
+            stop_event (threading.Event): événement demandant l'arrêt du suivi.
+
+        Raises:
+            StepActionError: levée si le suivi est arrêté via `stop_event`
+
+        Returns:
+            str: statut final de l'exécution du traitement
+        """
+        o_future = self.monitoring_in_background(callback)
+        while not wait([o_future], timeout=ProcessingExecutionAction.STOP_CHECK_SEC).done:
+            if stop_event.is_set():
+                o_future.cancel()
+                raise StepActionError(f"Suivi de l'exécution de traitement {self.processing_execution} interrompu.")
+        return o_future.result()
+
+    def abort(self, callback: Optional[Callable[[ProcessingExecution], None]] = None) -> None:
+        """Interrompt la ProcessingExecution si elle n'est pas terminée et attend qu'elle le soit.
+
+        Si elle a été interrompue (statut `ABORTED`), la livraison ou la donnée stockée créée en sortie est supprimée.
+
+        Args:
+            callback (Optional[Callable[[ProcessingExecution], None]], optional): fonction de callback à exécuter. Prend en argument le traitement (callback(processing-execution)).
+        """
+        if self.processing_execution is None:
+            return
+        # mise à jour du traitement
+        self.processing_execution.api_update()
+        s_status = self.processing_execution.get_store_properties()["status"]
 
+        # si le traitement est déjà dans un statut terminé, on ne fait rien (dernier affichage)
+        if s_status in [ProcessingExecution.STATUS_ABORTED, ProcessingExecution.STATUS_SUCCESS, ProcessingExecution.STATUS_FAILURE]:
+            if callback is not None:
+                callback(self.processing_execution)
+            Config().om.warning("traitement déjà terminé.")
+            return
+
+        # arrêt du traitement
+        Config().om.warning("Ctrl+C : traitement en cours d’interruption, veuillez attendre...", force_flush=True)
+        self.processing_execution.api_abort()
+        # attente que le traitement passe dans un statut terminé
         self.processing_execution.api_update()
         s_status = self.processing_execution.get_store_properties()["status"]
+        o_abort_policy = PollingPolicy("processing_execution")
         while s_status not in [ProcessingExecution.STATUS_ABORTED, ProcessingExecution.STATUS_SUCCESS, ProcessingExecution.STATUS_FAILURE]:
-            try:
-                # appel de la fonction affichant les logs
-                callback_not_null(self.processing_execution)
+            # On attend (de plus en plus longtemps)
+            time.sleep(o_abort_policy.update(s_status))
+            # On met à jour __processing_execution + valeur status
+            CircuitBreaker.pause_while_open(self.processing_execution.api_update)
+            s_status = self.processing_execution.get_store_properties()["status"]
+        # traitement terminé. On fait un dernier affichage :
+        if callback is not None:
+            callback(self.processing_execution)
+
+        # si statut Aborted :
+        # suppression de l'upload ou de la stored data en sortie
+        if s_status == ProcessingExecution.STATUS_ABORTED and self.output_new_entity:
+            if self.upload is not None:
+                Config().om.warning("Suppression de l'upload en cours de remplissage suite à l’interruption du programme")
+                self.upload.api_delete()
+            elif self.stored_data is not None:
+                Config().om.warning("Suppression de la stored-data en cours de remplissage suite à l'interruption du programme")
+                self.stored_data.api_delete()
+
+    def monitoring_in_background(self, callback: Optional[Callable[[ProcessingExecution], None]] = None) -> "Future[str]":
+        """Suit la ProcessingExecution en arrière-plan (cf. `MonitoringScheduler`) jusqu'à ce qu'elle soit terminée :
+        plusieurs exécutions peuvent ainsi être suivies en même temps.
+
+        La fonction callback indiquée est exécutée (depuis un autre thread) après **chaque vérification du statut**.
 
-                # On attend le temps demandé
-                time.sleep(i_nb_sec_between_check)
+        Args:
+            callback (Optional[Callable[[ProcessingExecution], None]], optional): fonction de callback à exécuter. Prend en argument le traitement (callback(processing-execution)).
 
-                # On met à jour __processing_execution + valeur status
-                self.processing_execution.api_update()
-                s_status = self.processing_execution.get_store_properties()["status"]
+        Returns:
+            Future[str]: statut final de l'exécution du traitement
+        """
+        if self.processing_execution is None:
+            raise StepActionError("Aucune processing-execution trouvée. Impossible de suivre le déroulement du traitement")
+        o_processing_execution: ProcessingExecution = self.processing_execution
+        o_policy = PollingPolicy("processing_execution", self.__expected_duration())
 
-            except KeyboardInterrupt:
-                # on appelle la callback de gestion du ctrl-C
-                if ctrl_c_action is None or ctrl_c_action():
-                    # on doit arrêter le traitement (maj + action spécifique selon le statut)
+        def poll() -> Optional[str]:
+            o_processing_execution.api_update()
+            s_status = o_processing_execution.get_store_properties()["status"]
+            if callback is not None:
+                callback(o_processing_execution)
+            if s_status not in [ProcessingExecution.STATUS_ABORTED, ProcessingExecution.STATUS_SUCCESS, ProcessingExecution.STATUS_FAILURE]:
+                o_policy.update(s_status)
+                return None
+            return self.__end_monitoring(s_status)
 
-                    # mise à jour du traitement
-                    self.processing_execution.api_update()
-
-                    # si le traitement est déjà dans un statut terminé, on ne fait rien => transmission de l'interruption
-                    s_status = self.processing_execution.get_store_properties()["status"]
-
-                    # si le traitement est terminé, on fait un dernier affichage :
-                    if s_status in [ProcessingExecution.STATUS_ABORTED, ProcessingExecution.STATUS_SUCCESS, ProcessingExecution.STATUS_FAILURE]:
-                        callback_not_null(self.processing_execution)
-                        Config().om.warning("traitement déjà terminé.")
-                        raise
-
-                    # arrêt du traitement
-                    Config().om.warning("Ctrl+C : traitement en cours d’interruption, veuillez attendre...", force_flush=True)
-                    self.processing_execution.api_abort()
-                    # attente que le traitement passe dans un statut terminé
-                    self.processing_execution.api_update()
-                    s_status = self.processing_execution.get_store_properties()["status"]
-                    while s_status not in [ProcessingExecution.STATUS_ABORTED, ProcessingExecution.STATUS_SUCCESS, ProcessingExecution.STATUS_FAILURE]:
-                        # On attend 2s
-                        time.sleep(2)
-                        # On met à jour __processing_execution + valeur status
-                        self.processing_execution.api_update()
-                        s_status = self.processing_execution.get_store_properties()["status"]
-                    # traitement terminé. On fait un dernier affichage :
-                    callback_not_null(self.processing_execution)
-
-                    # si statut Aborted :
-                    # suppression de l'upload ou de la stored data en sortie
-                    if s_status == ProcessingExecution.STATUS_ABORTED and self.output_new_entity:
-                        if self.upload is not None:
-                            Config().om.warning("Suppression de l'upload en cours de remplissage suite à l’interruption du programme")
-                            self.upload.api_delete()
-                        elif self.stored_data is not None:
-                            Config().om.warning("Suppression de la stored-data en cours de remplissage suite à l'interruption du programme")
-                            self.stored_data.api_delete()
-                    # enfin, transmission de l'interruption
-                    raise
+        return MonitoringScheduler().watch(poll, o_policy.get_interval)
+
+    def __expected_duration(self) -> Optional[float]:
+        """Durée attendue de l'exécution d'après les exécutions précédentes du même traitement
+        (si `processing_execution.poll_seed_from_history` est activé).
+
+        Returns:
+            Optional[float]: durée attendue en secondes, None si inconnue
+        """
+        if not Config().get_bool("processing_execution", "poll_seed_from_history", False) or self.processing_execution is None:
+            return None
+        s_processing = self.definition_dict.get("body_parameters", {}).get("processing")
+        if not isinstance(s_processing, str):
+            return None
+        return ProcessingExecution.api_expected_duration(s_processing, self.processing_execution.datastore)
 
-        # Si on est sorti du while c'est que la processing execution est terminée
-        ## dernier affichage
-        callback_not_null(self.processing_execution)
+    def __end_monitoring(self, status: str) -> str:
+        """Fin du suivi de l'exécution : gestion du mode cartes.
+
+        Args:
+            status (str): statut final de l'exécution du traitement
 
-        # gestion du mode cartes
-        if self.__mode_cartes and self.processing_execution.id == Config().get_str("compatibility_cartes", "id_mise_en_base"):
+        Returns:
+            str: statut final de l'exécution du traitement
+        """
+        if self.processing_execution is not None and self.__mode_cartes and self.processing_execution.id == Config().get_str("compatibility_cartes", "id_mise_en_base"):
             if not self.__inputs_upload:
                 raise GpfSdkError("Intégration de données vecteur livrées en base : input and output obligatoires")
-            s_key = "execution_end_ok_integration_progress" if s_status == ProcessingExecution.STATUS_SUCCESS else "execution_end_ko_integration_progress"
+            s_key = "execution_end_ok_integration_progress" if status == ProcessingExecution.STATUS_SUCCESS else "execution_end_ko_integration_progress"
             for o_upload in self.__inputs_upload:
                 o_upload.api_add_tags({"integration_progress": Config().get_str("compatibility_cartes", s_key)})
 
         ## on return le status de fin
-        return str(s_status)
+        return str(status)
 
     @property
     def processing_execution(self) -> Optional[ProcessingExecution]:
@@ -1,3 +1,6 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 import time
 from typing import Any, Callable, Dict, List, Optional, Tuple
@@ -8,8 +11,12 @@ from sdk_entrepot_gpf.Errors import GpfSdkError
 from sdk_entrepot_gpf.io.Errors import ConflictError
 from sdk_entrepot_gpf.store.CheckExecution import CheckExecution
 from sdk_entrepot_gpf.store.Upload import Upload
+from sdk_entrepot_gpf.io.CircuitBreaker import CircuitBreaker
 from sdk_entrepot_gpf.io.Dataset import Dataset
 from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.MonitoringScheduler import MonitoringScheduler
+from sdk_entrepot_gpf.io.Pipeline import Pipeline
+from sdk_entrepot_gpf.io.PollingPolicy import PollingPolicy
 from sdk_entrepot_gpf.workflow.Errors import UploadFileError
 from sdk_entrepot_gpf.workflow.action.ActionAbstract import ActionAbstract
 
@@ -77,7 +84,10 @@ class UploadAction:
 
         self.__add_carte_tags("upload_upload_start")
         # Envoie des fichiers de données (pas de vérification sur les problèmes de livraison si check_before_close)
-        self.__push_data_files(not check_before_close)
+        if self.__dataset.pipeline:
+            self.__push_data_files_pipeline(not check_before_close)
+        else:
+            self.__push_data_files(not check_before_close)
         # Envoie des fichiers md5 (pas de vérification sur les problèmes de livraison si check_before_close)
         self.__push_md5_files(not check_before_close)
         if check_before_close:
@@ -186,22 +196,88 @@ class UploadAction:
         if self.__upload is not None:
             # Liste les fichiers déjà téléversés sur l'entrepôt et récupère leur taille
             Config().om.info(f"Livraison {self.__upload['name']} : récupération de l'arborescence des données déjà téléversées...", force_flush=True)
+            # Clefs md5 calculées pendant l'envoi si demandé (chaque fichier n'est lu qu'une fois)
+            f_api_push: Callable[[Path, str], None] = self.__upload.api_push_data_file
+            if Config().get_bool("upload", "hash_while_upload", False):
+                f_api_push = self.__push_data_file_with_md5
             i_file_upload = self.__push_files(
                 list(self.__dataset.data_files.items()),
-                self.__upload.api_push_data_file,
+                f_api_push,
                 self.__upload.api_delete_data_file,
                 check_conflict,
             )
 
             Config().om.info(f"Livraison {self.__upload}: les {len(self.__dataset.data_files)} fichiers de données ont été ajoutés avec succès. ({i_file_upload} livré(s) lors de ce traitement)")
 
+    def __push_data_files_pipeline(self, check_conflict: bool = True) -> None:
+        """Téléverse les fichiers de données en pipeline (`upload.pipeline`) : parcours des dossiers, calcul des clefs md5
+        (`upload.md5_max_workers` threads) et envoi (`upload.max_parallel_files` threads) se font en même temps,
+        reliés par des files bornées (`upload.pipeline_queue_size`). Si les clefs sont calculées pendant l'envoi
+        (`upload.hash_while_upload`), il n'y a pas d'étape de calcul : chaque fichier n'est lu qu'une fois.
+        La mémoire utilisée reste proportionnelle au nombre de fichiers (liste des fichiers du dataset, clefs md5
+        jusqu'à l'écriture des fichiers md5, arborescence distante) : seuls les fichiers envoyés sont comptés.
+
+        Args:
+            check_conflict (bool): Si une vérification de la bonne livraison des fichier en conflict ou en timeout est lancée.
+        """
+        if self.__upload is None:
+            return
+        o_upload: Upload = self.__upload
+        Config().om.info(f"Livraison {o_upload['name']} : récupération de l'arborescence des données déjà téléversées...", force_flush=True)
+        d_destination_taille = UploadAction.parse_tree(CircuitBreaker.pause_while_open(o_upload.api_tree))
+        l_conflict: List[Tuple[Path, str]] = []
+        # Nombre de fichiers livrés lors de ce traitement (incrémenté par les threads d'envoi)
+        l_nb_pushed = [0]
+        o_lock = threading.Lock()
+
+        def hash_file(t_file: Tuple[Path, str]) -> Tuple[Path, str]:
+            if self.__dataset.needs_md5(t_file[0]):
+                self.__dataset.md5(t_file[0])
+            return t_file
+
+        def push_file(t_file: Tuple[Path, str]) -> None:
+            f_api_push: Callable[[Path, str], None] = o_upload.api_push_data_file
+            if self.__dataset.hash_while_upload and self.__dataset.needs_md5(t_file[0]):
+                f_api_push = self.__push_data_file_with_md5
+            b_pushed = self.__push_file(t_file[0], t_file[1], d_destination_taille, f_api_push, o_upload.api_delete_data_file)
+            if b_pushed is None:
+                l_conflict.append(t_file)
+            elif b_pushed:
+                with o_lock:
+                    l_nb_pushed[0] += 1
+
+        i_hash_workers = Config().get_int("upload", "md5_max_workers", 4) or os.cpu_count() or 1
+        i_push_workers = max(1, Config().get_int("upload", "max_parallel_files", 1))
+        l_stages: List[Tuple[Callable[[Tuple[Path, str]], Any], int]] = [(push_file, i_push_workers)]
+        if not self.__dataset.hash_while_upload:
+            l_stages.insert(0, (hash_file, i_hash_workers))
+        Pipeline(Config().get_int("upload", "pipeline_queue_size", 1000)).run(self.__dataset.iter_data_files(), l_stages)
+        self.__check_conflicts(l_conflict, check_conflict)
+        Config().om.info(f"Livraison {o_upload}: les {len(self.__dataset.data_files)} fichiers de données ont été ajoutés avec succès. ({l_nb_pushed[0]} livré(s) lors de ce traitement)")
+
+    def __push_data_file_with_md5(self, path: Path, api_path: str) -> None:
+        """fonction cachant api_push_data_file et transmettant au dataset la clef md5 du fichier calculée pendant son envoi,
+        utilisé comme paramètre de __push_files (cf. `upload.hash_while_upload`)
+
+        Args:
+            path (Path): chemin du fichier de données
+            api_path (str): chemin distant du dossier où déposer le fichier
+        """
+        if self.__upload is None:
+            raise GpfSdkError(f"Aucune livraison de définie - impossible de livrer {path}")
+        # État du fichier relevé avant l'envoi (pour le cache des empreintes)
+        o_stat = path.stat()
+        self.__upload.api_push_data_file(path, api_path, on_md5=lambda s_md5: self.__dataset.set_md5(path, s_md5, o_stat))
+
     def __push_md5_files(self, check_conflict: bool = True) -> None:
-        """Téléverse les fichiers de clefs (listés dans le dataset).
+        """Téléverse les fichiers de clefs (listés dans le dataset), une fois générés à partir des clefs calculées
+        pendant l'envoi des fichiers de données (les clefs manquantes sont calculées à ce moment).
 
         Args:
             check_conflict (bool): Si une vérification de la bonne livraison des fichier en conflict ou en timeout est lancée..
         """
         if self.__upload is not None:
+            self.__dataset.write_md5_files()
             i_file_upload = self.__push_files(
                 [(p_file, "") for p_file in self.__dataset.md5_files],
                 self.__normalise_api_push_md5_file,
@@ -235,39 +311,43 @@ class UploadAction:
         """
         if self.__upload is None:
             raise GpfSdkError("Aucune livraison de définie")
-        # Liste les fichiers téléversés sur l'entrepôt et récupère leur taille
-        l_arborescence = self.__upload.api_tree()
+        # Liste les fichiers téléversés sur l'entrepôt et récupère leur taille (en attendant que l'API soit de nouveau disponible si besoin)
+        l_arborescence = CircuitBreaker.pause_while_open(self.__upload.api_tree)
         d_destination_taille = UploadAction.parse_tree(l_arborescence)
-        l_conflict = []
+        l_conflict: List[Tuple[Path, str]] = []
         i_file_upload = 0
-        for p_file_path, s_api_path in l_files:
-            # Regarde si le fichier du dataset est déjà dans la liste des fichiers téléversés sur l'entrepôt
-            # NB: sur l'entrepot, tous les fichiers md5 sont à la racine
-            s_data_api_path = f"{s_api_path}/{p_file_path.name}" if s_api_path else p_file_path.name
-            Config().om.info(f"Livraison {self.__upload['name']} : livraison de {s_data_api_path}...")
-            if s_data_api_path in d_destination_taille:
-                # le fichier est déjà livré, on check sa taille :
-                if d_destination_taille[s_data_api_path] == p_file_path.stat().st_size:
-                    # le fichier a été complètement téléversé. On passe au fichier suivant.
-                    Config().om.info(f"Livraison {self.__upload['name']} : livraison de {s_data_api_path}: déjà livré")
-                    continue
+        # Les fichiers sont poussés en parallèle par un pool de taille bornée
+        i_max_workers = max(1, Config().get_int("upload", "max_parallel_files", 1))
+        with ThreadPoolExecutor(max_workers=i_max_workers) as o_executor:
+            l_futures = [o_executor.submit(self.__push_file, p_file_path, s_api_path, d_destination_taille, f_api_push, f_api_delete) for p_file_path, s_api_path in l_files]
+            try:
+                # Les résultats sont récupérés dans l'ordre de la liste pour garder un rapport identique
+                for (p_file_path, s_api_path), o_future in zip(l_files, l_futures):
+                    b_pushed = o_future.result()
+                    if b_pushed is None:
+                        l_conflict.append((p_file_path, s_api_path))
+                    elif b_pushed:
+                        i_file_upload += 1
+            except BaseException:
+                # Erreur inattendue : on annule les envois qui n'ont pas commencé
+                for o_future in l_futures:
+                    o_future.cancel()
+                raise
+        self.__check_conflicts(l_conflict, check_conflict)
+        return i_file_upload
 
-                # le fichier n'a pas été téléversé en totalité.
-                # Si le mode "Append" n'est pas disponible sur le serveur, il faut supprimer le fichier à moitié téléversé.
-                # Sinon il faudra reprendre le téléversement (!)
-                f_api_delete(s_data_api_path)
+    def __check_conflicts(self, l_conflict: List[Tuple[Path, str]], check_conflict: bool) -> None:
+        """Affiche ou vérifie (selon check_conflict) la livraison des fichiers en conflict ou en timeout.
 
-            try:
-                # livraison du fichier
-                f_api_push(p_file_path, s_api_path)
-                i_file_upload += 1
-                Config().om.info(f"Livraison {self.__upload['name']} : livraison de {s_data_api_path}: terminé")
-            except requests.Timeout:
-                Config().om.warning(f"Livraison {self.__upload['name']} : livraison de {s_data_api_path}: timeout.")
-                l_conflict.append((p_file_path, s_api_path))
-            except ConflictError:
-                Config().om.warning(f"Livraison {self.__upload['name']} : livraison de {s_data_api_path}: conflict.")
-                l_conflict.append((p_file_path, s_api_path))
+        Args:
+            l_conflict (List[Tuple[Path, str]]): fichiers en conflict (Path local, dossier sous la gpf)
+            check_conflict (bool): Si une vérification de la bonne livraison des fichier en conflict ou en timeout est lancée.
+
+        Raises:
+            UploadFileError: levée si des fichiers en conflict n'ont pas été correctement livrés
+        """
+        if self.__upload is None:
+            raise GpfSdkError("Aucune livraison de définie")
         if not check_conflict and l_conflict:
             # pas de vérification des conflicts
             Config().om.info(f"Livraison {self.__upload}: {len(l_conflict)} fichiers en conflict : " + "\n * ".join([s_data_api_path for (p_file_path, s_data_api_path) in l_conflict]))
@@ -277,7 +357,48 @@ class UploadAction:
             l_error = self.__check_file_uploaded(l_conflict)
             if l_error:
                 raise UploadFileError(f"Livraison {self.__upload['name']} : Problème de livraison pour {len(l_error)} fichiers. Il faut relancer la livraison.", l_error)
-        return i_file_upload
+
+    def __push_file(self, p_file_path: Path, s_api_path: str, d_destination_taille: Dict[str, int], f_api_push: Callable[[Path, str], None], f_api_delete: Callable[[str], None]) -> Optional[bool]:
+        """pousse un fichier sur le store en gérant la reprise (fichier déjà livré ou livré partiellement). Peut être lancé en parallèle.
+
+        Args:
+            p_file_path (Path): Path du ficher à livrer
+            s_api_path (str): nom du dossier sous la gpf
+            d_destination_taille (Dict[str, int]): fichiers déjà livrés et leur taille
+            f_api_push (Callable[[Path, str], None]): fonction pour livrer les données
+            f_api_delete (Callable[[str], None]): fonction pour supprimé les données si livrer partiellement.
+
+        Returns:
+            Optional[bool]: True si le fichier a été téléversé, False s'il était déjà livré, None en cas de conflict ou de timeout
+        """
+        if self.__upload is None:
+            raise GpfSdkError("Aucune livraison de définie")
+        # Regarde si le fichier du dataset est déjà dans la liste des fichiers téléversés sur l'entrepôt
+        # NB: sur l'entrepot, tous les fichiers md5 sont à la racine
+        s_data_api_path = f"{s_api_path}/{p_file_path.name}" if s_api_path else p_file_path.name
+        Config().om.info(f"Livraison {self.__upload['name']} : livraison de {s_data_api_path}...")
+        if s_data_api_path in d_destination_taille:
+            # le fichier est déjà livré, on check sa taille :
+            if d_destination_taille[s_data_api_path] == p_file_path.stat().st_size:
+                # le fichier a été complètement téléversé. On passe au fichier suivant.
+                Config().om.info(f"Livraison {self.__upload['name']} : livraison de {s_data_api_path}: déjà livré")
+                return False
+
+            # le fichier n'a pas été téléversé en totalité.
+            # Si le mode "Append" n'est pas disponible sur le serveur, il faut supprimer le fichier à moitié téléversé.
+            # Sinon il faudra reprendre le téléversement (!)
+            CircuitBreaker.pause_while_open(f_api_delete, s_data_api_path)
+
+        try:
+            # livraison du fichier (si l'API est indisponible, on fait une pause puis on reprend le même fichier)
+            CircuitBreaker.pause_while_open(f_api_push, p_file_path, s_api_path)
+            Config().om.info(f"Livraison {self.__upload['name']} : livraison de {s_data_api_path}: terminé")
+            return True
+        except requests.Timeout:
+            Config().om.warning(f"Livraison {self.__upload['name']} : livraison de {s_data_api_path}: timeout.")
+        except ConflictError:
+            Config().om.warning(f"Livraison {self.__upload['name']} : livraison de {s_data_api_path}: conflict.")
+        return None
 
     def __check_file_uploaded(self, l_files: List[Tuple[Path, str]]) -> List[Tuple[Path, str]]:
         """vérifie si les fichiers donnée en entrée soit bien livrer
@@ -348,8 +469,8 @@ class UploadAction:
         """Attend que toute les vérifications liées à la Livraison indiquée
         soient terminées (en erreur ou en succès) avant de rendre la main.
 
-        La fonction callback indiquée est exécutée à chaque vérification en lui passant en paramètre un
-        message de suivi du nombre de vérifications par statut.
+        Le suivi est confié au `MonitoringScheduler` (cf. `monitor_in_background`) ; la fonction callback indiquée
+        est exécutée à chaque vérification en lui passant en paramètre un message de suivi du nombre de vérifications par statut.
 
         Args:
             upload (Upload): Livraison à monitorer
@@ -359,70 +480,128 @@ class UploadAction:
         Returns:
             True si toutes les vérifications sont ok, sinon False
         """
-        i_nb_sec_between_check = Config().get_int("upload", "nb_sec_between_check_updates")
-        s_check_message_pattern = Config().get_str("upload", "check_message_pattern")
-        b_success: Optional[bool] = None
-        Config().om.info(f"Monitoring des vérifications toutes les {i_nb_sec_between_check} secondes...", force_flush=True)
-        while b_success is None:
+        Config().om.info("Monitoring des vérifications...", force_flush=True)
+        # Suivi par la boucle centrale (MonitoringScheduler), on attend le résultat
+        o_future = UploadAction.monitor_in_background(upload, callback, mode_cartes)
+        while True:
             try:
-                # On récupère les vérifications
-                d_checks = upload.api_list_checks()
-                # On peut déterminer b_success s'il n'y en a plus en attente et en cours
-                if 0 == len(d_checks["asked"]) == len(d_checks["in_progress"]):
-                    b_success = len(d_checks["failed"]) == 0
-                # On affiche un rapport via la fonction de callback précisée
-                s_message = s_check_message_pattern.format(
-                    nb_asked=len(d_checks["asked"]),
-                    nb_in_progress=len(d_checks["in_progress"]),
-                    nb_passed=len(d_checks["passed"]),
-                    nb_failed=len(d_checks["failed"]),
-                )
-                if callback is not None:
-                    callback(s_message)
-                # Si l'état est toujours indéterminé
-                if b_success is None:
-                    # On attend le temps demandé
-                    time.sleep(i_nb_sec_between_check)
-
+                return o_future.result()
             except KeyboardInterrupt:
                 # on appelle la callback de gestion du ctrl-C
                 if ctrl_c_action is None or ctrl_c_action():
-                    # on doit arrêter les vérifications :
-                    # si les vérifications sont déjà terminées, on ne fait rien => transmission de l'interruption
-                    d_checks = upload.api_list_checks()
-                    if 0 == len(d_checks["asked"]) == len(d_checks["in_progress"]):
-                        Config().om.warning("vérifications déjà terminées.")
-                        raise
-
-                    # arrêt des vérifications
-                    Config().om.warning("Ctrl+C : vérifications en cours d’interruption, veuillez attendre...", force_flush=True)
-                    # suppression des vérifications non terminées
-                    for d_check_exec in d_checks["in_progress"]:
-                        CheckExecution(d_check_exec, upload.datastore).api_delete()
-                    for d_check_exec in d_checks["asked"]:
-                        # on doit attendre que l'exécution soit lancée pour n'annulée
-                        o_check_exec = CheckExecution.api_get(d_check_exec["_id"], upload.datastore)
-                        # on attend que l'exécution soit lancée
-                        while o_check_exec["status"] == "WAITING":
-                            time.sleep(1)
-                            o_check_exec.api_update()
-                        if o_check_exec["status"] == "PROGRESS":
-                            o_check_exec.api_delete()
-
-                    # On rouvre la livraison
-                    upload.api_open()
-
-                    # enfin, transmission de l'interruption
+                    # on doit arrêter les vérifications puis transmettre l'interruption
+                    o_future.cancel()
+                    UploadAction.interrupt_checks(upload)
                     raise
 
-        # Si on est sorti du while c'est que les vérifications sont terminées
-        # On log le dernier rapport selon l'état et on sort
+    @staticmethod
+    def monitor_in_background(upload: Upload, callback: Optional[Callable[[str], None]] = None, mode_cartes: Optional[bool] = None) -> "Future[bool]":
+        """Suit les vérifications de la livraison en arrière-plan (cf. `MonitoringScheduler`) : plusieurs livraisons peuvent ainsi être suivies en même temps.
+
+        Args:
+            upload (Upload): Livraison à monitorer
+            callback (Optional[Callable[[str], None]]): fonction de callback à exécuter avec le message de suivi (depuis un autre thread).
+            mode_cartes (Optional[bool]): Si le mode carte est activé
+
+        Returns:
+            Future[bool]: True si toutes les vérifications sont ok, sinon False (une fois les vérifications terminées)
+        """
+
+        o_policy = PollingPolicy("upload")
+
+        def poll() -> Optional[bool]:
+            b_success, s_message = UploadAction.check_status(upload)
+            if callback is not None:
+                callback(s_message)
+            if b_success is None:
+                o_policy.update(s_message)
+                return None
+            return UploadAction.__end_monitoring(upload, b_success, s_message, mode_cartes)
+
+        return MonitoringScheduler().watch(poll, o_policy.get_interval)
+
+    @staticmethod
+    def check_status(upload: Upload) -> Tuple[Optional[bool], str]:
+        """Récupère l'état des vérifications de la livraison.
+
+        Args:
+            upload (Upload): Livraison à vérifier
+
+        Returns:
+            Tuple[Optional[bool], str]: succès des vérifications (None si elles ne sont pas terminées) et message de suivi
+        """
+        d_checks = upload.api_list_checks()
+        b_success: Optional[bool] = None
+        # On peut déterminer b_success s'il n'y en a plus en attente et en cours
+        if 0 == len(d_checks["asked"]) == len(d_checks["in_progress"]):
+            b_success = len(d_checks["failed"]) == 0
+        s_message = (
+            Config()
+            .get_str("upload", "check_message_pattern")
+            .format(
+                nb_asked=len(d_checks["asked"]),
+                nb_in_progress=len(d_checks["in_progress"]),
+                nb_passed=len(d_checks["passed"]),
+                nb_failed=len(d_checks["failed"]),
+            )
+        )
+        return b_success, s_message
+
+    @staticmethod
+    def interrupt_checks(upload: Upload) -> bool:
+        """Arrête les vérifications non terminées de la livraison puis la rouvre.
+
+        Args:
+            upload (Upload): Livraison dont les vérifications sont à arrêter
+
+        Returns:
+            bool: False si les vérifications étaient déjà terminées (rien n'est fait), True sinon
+        """
+        # si les vérifications sont déjà terminées, on ne fait rien
+        d_checks = upload.api_list_checks()
+        if 0 == len(d_checks["asked"]) == len(d_checks["in_progress"]):
+            Config().om.warning("vérifications déjà terminées.")
+            return False
+
+        # arrêt des vérifications
+        Config().om.warning("Ctrl+C : vérifications en cours d’interruption, veuillez attendre...", force_flush=True)
+        # suppression des vérifications non terminées
+        for d_check_exec in d_checks["in_progress"]:
+            CheckExecution(d_check_exec, upload.datastore).api_delete()
+        for d_check_exec in d_checks["asked"]:
+            # on doit attendre que l'exécution soit lancée pour n'annulée
+            o_check_exec = CheckExecution.api_get(d_check_exec["_id"], upload.datastore)
+            # on attend que l'exécution soit lancée
+            o_policy = PollingPolicy("upload")
+            while o_check_exec["status"] == "WAITING":
+                time.sleep(o_policy.update())
+                CircuitBreaker.pause_while_open(o_check_exec.api_update)
+            if o_check_exec["status"] == "PROGRESS":
+                o_check_exec.api_delete()
+
+        # On rouvre la livraison
+        upload.api_open()
+        return True
+
+    @staticmethod
+    def __end_monitoring(upload: Upload, success: bool, message: str, mode_cartes: Optional[bool]) -> bool:
+        """Log le dernier rapport selon l'état des vérifications terminées et ajoute les tags cartes.gouv.fr.
+
+        Args:
+            upload (Upload): Livraison monitorée
+            success (bool): succès des vérifications
+            message (str): dernier message de suivi
+            mode_cartes (Optional[bool]): Si le mode carte est activé
+
+        Returns:
+            bool: succès des vérifications
+        """
         mode_cartes = mode_cartes if mode_cartes is not None else Config().get_bool("compatibility_cartes", "activate", False)
-        if b_success:
-            Config().om.info(s_message)
+        if success:
+            Config().om.info(message)
             UploadAction.add_carte_tags(mode_cartes, upload, "upload_check_ok")
             return True
-        Config().om.warning(s_message)
+        Config().om.warning(message)
         UploadAction.add_carte_tags(mode_cartes, upload, "upload_check_ko")
         return False
 
@@ -1,34 +1,94 @@
+import json
 import re
-from typing import Any, Dict, Match, Pattern
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Pattern, Tuple
 
 from sdk_entrepot_gpf.pattern.Singleton import Singleton
 from sdk_entrepot_gpf.workflow.resolver.AbstractResolver import AbstractResolver
 from sdk_entrepot_gpf.workflow.resolver.Errors import ResolverNotFoundError
+from sdk_entrepot_gpf.workflow.resolver.ResolutionCache import ResolutionCache
 from sdk_entrepot_gpf.io.Config import Config
 
 
+class ResolutionScope:
+    """Portée de résolution (par exemple l'exécution d'une étape de workflow) : résolveurs ajoutés et cache propres à la portée.
+
+    Attributes:
+        resolvers (Dict[str, AbstractResolver]): résolveurs ajoutés dans la portée (prioritaires sur les résolveurs globaux)
+        cache (ResolutionCache): cache des chaînes résolues dans la portée
+    """
+
+    def __init__(self) -> None:
+        self.resolvers: Dict[str, AbstractResolver] = {}
+        self.cache = ResolutionCache()
+
+
 class GlobalResolver(metaclass=Singleton):
     """Classe permettant de résoudre une action en appelant les tous résolveurs listés.
 
     Attributes:
         __resolvers (Dict[str, AbstractResolver]): association nom du résolveur / résolveur.
+        __global_scope (ResolutionScope): portée utilisée hors de toute portée ouverte par `scope()`
+        __local (threading.local): pile des portées ouvertes par le thread courant
     """
 
-    _solved_strings: Dict[str, str] = {}
-
     def __init__(self) -> None:
         """Constructeur."""
         self.__resolvers: Dict[str, AbstractResolver] = {}
         self.__regex: Pattern[str] = re.compile(Config().get_str("workflow_resolution_regex", "global_regex"))
+        self.__global_scope = ResolutionScope()
+        self.__local = threading.local()
 
     def add_resolver(self, resolver: AbstractResolver) -> None:
-        """Ajoute un résolveur à la liste."""
-        self.__resolvers[resolver.name] = resolver
+        """Ajoute un résolveur à la liste (à la portée courante si une portée est ouverte)."""
+        o_scope = self.__current_scope()
+        if o_scope is self.__global_scope:
+            self.__resolvers[resolver.name] = resolver
+        else:
+            o_scope.resolvers[resolver.name] = resolver
+        # Les valeurs déjà résolues avec un résolveur du même nom ne sont plus valables
+        o_scope.cache.clear()
+
+    def remove_resolver(self, name: str) -> None:
+        """Retire un résolveur (de la portée courante s'il y a été ajouté, sinon de la liste globale).
+
+        Args:
+            name (str): nom du résolveur
+        """
+        o_scope = self.__current_scope()
+        if name in o_scope.resolvers:
+            del o_scope.resolvers[name]
+        else:
+            self.__resolvers.pop(name, None)
+        o_scope.cache.clear()
+
+    @contextmanager
+    def scope(self) -> Iterator[ResolutionScope]:
+        """Ouvre une portée de résolution pour le thread courant (par exemple le temps d'une exécution d'étape).
+
+        Les résolveurs ajoutés et les valeurs mises en cache dans la portée sont oubliés à sa fermeture :
+        rien n'est partagé entre deux exécutions, même dans un processus de longue durée.
+
+        Yields:
+            Iterator[ResolutionScope]: portée ouverte
+        """
+        if not hasattr(self.__local, "scopes"):
+            self.__local.scopes = []
+        o_scope = ResolutionScope()
+        self.__local.scopes.append(o_scope)
+        try:
+            yield o_scope
+        finally:
+            self.__local.scopes.pop()
+            Config().om.debug(f"Portée de résolution fermée : {o_scope.cache.hits} valeur(s) lue(s) en cache, {o_scope.cache.misses} résolution(s).")
 
     def resolve(self, string_to_solve_global: str, **kwargs: Any) -> str:
         """Résout la chaîne à traiter et retourne la chaîne obtenue.
 
-        Résout TOUT le paramétrage trouvé.
+        Résout TOUT le paramétrage trouvé, en deux temps : les références sont d'abord collectées (sans doublon)
+        puis résolues en parallèle (`workflow_resolution.nb_parallel_resolutions`), avant d'être substituées.
 
         Args:
             string_to_solve_global (str): chaîne globale à résoudre
@@ -40,48 +100,106 @@ class GlobalResolver(metaclass=Singleton):
         Returns:
             chaîne résolue
         """
+        return self.__resolve(string_to_solve_global, self.__current_scope(), **kwargs)
 
-        # à laisser ici pour avoir la valeur de kwargs
-        def resolve_group(match: Match[str]) -> str:
-            """Résout la chaîne trouvé par la regex et permet de la remplacer.
-
-            Args:
-                match (Match[str]): groupe capturé par la regex
+    def __resolve(self, string_to_solve_global: str, scope: ResolutionScope, **kwargs: Any) -> str:
+        """Résout la chaîne à traiter dans la portée indiquée (cf. `resolve`).
 
-            Raises:
-                ResolverNotFoundError: levée si le résolveur demandé n'est pas trouvé
+        Args:
+            string_to_solve_global (str): chaîne globale à résoudre
+            scope (ResolutionScope): portée de résolution (transmise explicitement aux threads de résolution)
+            kwargs (Any): paramètres supplémentaires.
 
-            Returns:
-                chaîne de remplacement
-            """
-            nonlocal kwargs
-            d_resolution = match.groupdict()
+        Returns:
+            chaîne résolue
+        """
+        # Les paramètres supplémentaires (datastore...) font partie de la clef de cache
+        s_kwargs = json.dumps(kwargs, sort_keys=True, default=str)
+        d_resolvers = {**self.__resolvers, **scope.resolvers}
+        # Phase 1 : collecte des références à résoudre (sans doublon et hors cache)
+        d_solved: Dict[str, str] = {}
+        d_to_solve: Dict[str, Tuple[str, str]] = {}
+        for o_match in self.__regex.finditer(string_to_solve_global):
+            d_resolution = o_match.groupdict()
             # La chaîne complète, à remplacer, est donnée par la clé "param"
             s_all: str = d_resolution["param"]
-            # Si cette chaîne n'est pas déjà dans _solved_strings
-            if not s_all in GlobalResolver._solved_strings:
-                # Le nom du résolveur est donnée par la clé "resolver_name"
-                s_resolver_name: str = d_resolution["resolver_name"]
-                # La chaîne à résoudre est donnée par la clé "to_solve"
-                s_to_solve: str = d_resolution["to_solve"]
-                # Vérification de l’existante du resolver
-                if not s_resolver_name in GlobalResolver().resolvers:
-                    Config().om.debug(f"Resolvers : {', '.join(GlobalResolver().resolvers.keys())}")
-                    raise ResolverNotFoundError(s_resolver_name)
-                # On résout globalement la chaîne à résoudre (si jamais on a des paramètres dans des paramètres...)
-                s_to_solve = GlobalResolver().resolve(s_to_solve, **kwargs)
-                # Puis on la résout avec le résolveur à utiliser et on l'ajoute à la liste
-                s_solved = GlobalResolver().resolvers[s_resolver_name].resolve(s_to_solve, **kwargs)
-                GlobalResolver._solved_strings[s_all] = s_solved
-                Config().om.debug(f"resolve_group - {s_all} ({s_resolver_name} : {s_to_solve} => {s_solved})")
-            Config().om.debug(f"resolve_group - {s_all} (from cache)")
-            return GlobalResolver._solved_strings[s_all]
-
-        return self.__regex.sub(resolve_group, string_to_solve_global)
+            if s_all in d_solved or s_all in d_to_solve:
+                continue
+            s_cached = scope.cache.get((s_all, s_kwargs))
+            if s_cached is not None:
+                Config().om.debug(f"resolve - {s_all} (from cache)")
+                d_solved[s_all] = s_cached
+                continue
+            # Le nom du résolveur est donnée par la clé "resolver_name"
+            s_resolver_name: str = d_resolution["resolver_name"]
+            # Vérification de l’existante du resolver
+            if not s_resolver_name in d_resolvers:
+                Config().om.debug(f"Resolvers : {', '.join(d_resolvers.keys())}")
+                raise ResolverNotFoundError(s_resolver_name)
+            # La chaîne à résoudre est donnée par la clé "to_solve"
+            d_to_solve[s_all] = (s_resolver_name, d_resolution["to_solve"])
+
+        # Phase 2 : résolution des références (en parallèle s'il y en a plusieurs)
+        if len(d_to_solve) == 1:
+            for s_all, (s_resolver_name, s_to_solve) in d_to_solve.items():
+                d_solved[s_all] = self.__resolve_one(s_all, d_resolvers[s_resolver_name], s_to_solve, scope, **kwargs)
+        elif d_to_solve:
+            i_max_workers = min(len(d_to_solve), max(1, Config().get_int("workflow_resolution", "nb_parallel_resolutions", 4)))
+            with ThreadPoolExecutor(max_workers=i_max_workers) as o_executor:
+                d_futures = {
+                    s_all: o_executor.submit(self.__resolve_one, s_all, d_resolvers[s_resolver_name], s_to_solve, scope, **kwargs) for s_all, (s_resolver_name, s_to_solve) in d_to_solve.items()
+                }
+                try:
+                    # Récupération dans l'ordre d'apparition : la première erreur rencontrée est levée
+                    for s_all, o_future in d_futures.items():
+                        d_solved[s_all] = o_future.result()
+                except BaseException:
+                    for o_future in d_futures.values():
+                        o_future.cancel()
+                    raise
+        for s_all, (s_resolver_name, _) in d_to_solve.items():
+            scope.cache.set((s_all, s_kwargs), d_solved[s_all], s_resolver_name)
+
+        # Phase 3 : substitution
+        return self.__regex.sub(lambda o_match: d_solved[o_match.group("param")], string_to_solve_global)
+
+    def __resolve_one(self, param: str, resolver: AbstractResolver, to_solve: str, scope: ResolutionScope, **kwargs: Any) -> str:
+        """Résout une référence trouvée par la regex.
+
+        Args:
+            param (str): référence complète (à remplacer)
+            resolver (AbstractResolver): résolveur à utiliser
+            to_solve (str): chaîne à résoudre par le résolveur
+            scope (ResolutionScope): portée de résolution
+            kwargs (Any): paramètres supplémentaires.
+
+        Returns:
+            chaîne de remplacement
+        """
+        # On résout globalement la chaîne à résoudre (si jamais on a des paramètres dans des paramètres...)
+        s_to_solve = self.__resolve(to_solve, scope, **kwargs)
+        # Puis on la résout avec le résolveur à utiliser
+        s_solved = resolver.resolve(s_to_solve, **kwargs)
+        Config().om.debug(f"resolve_group - {param} ({resolver.name} : {s_to_solve} => {s_solved})")
+        return s_solved
+
+    def __current_scope(self) -> ResolutionScope:
+        """Renvoie la portée ouverte par le thread courant, la portée globale sinon."""
+        l_scopes: List[ResolutionScope] = getattr(self.__local, "scopes", [])
+        return l_scopes[-1] if l_scopes else self.__global_scope
 
     @property
     def resolvers(self) -> Dict[str, AbstractResolver]:
-        return self.__resolvers
+        """Résolveurs utilisables dans la portée courante (globaux et propres à la portée)."""
+        o_scope = self.__current_scope()
+        if o_scope is self.__global_scope:
+            return self.__resolvers
+        return {**self.__resolvers, **o_scope.resolvers}
+
+    @property
+    def cache(self) -> ResolutionCache:
+        """Cache de la portée courante (compteurs `hits`/`misses`)."""
+        return self.__current_scope().cache
 
     @property
     def regex(self) -> Pattern[str]:
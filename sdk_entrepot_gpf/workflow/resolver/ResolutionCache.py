@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sdk_entrepot_gpf.io.Config import Config
+
+
+class ResolutionCache:
+    """Cache borné des chaînes résolues par le GlobalResolver.
+
+    Les entrées sont évincées par ordre d'utilisation (LRU) au-delà de `workflow_resolution.cache_max_size`
+    et expirent selon une durée de vie propre à chaque résolveur (`workflow_resolution.cache_ttl_<résolveur>`,
+    sinon `workflow_resolution.cache_ttl`) : 0 pour ne jamais mettre en cache, négative pour ne jamais expirer.
+
+    Attributes:
+        __lock (threading.Lock): verrou protégeant le cache
+        __entries (OrderedDict[Tuple[str, str], Tuple[float, str]]): date d'expiration et valeur par clef
+        __max_size (int): nombre maximal d'entrées
+        __hits (int): nombre de résolutions servies par le cache
+        __misses (int): nombre de résolutions absentes du cache
+    """
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        """Constructeur.
+
+        Args:
+            max_size (Optional[int], optional): nombre maximal d'entrées, `workflow_resolution.cache_max_size` si None.
+        """
+        self.__lock = threading.Lock()
+        self.__entries: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+        self.__max_size = max_size if max_size is not None else Config().get_int("workflow_resolution", "cache_max_size", 1000)
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[str]:
+        """Renvoie la valeur résolue si elle est dans le cache et n'a pas expiré.
+
+        Args:
+            key (Tuple[str, str]): clef (référence complète, paramètres de résolution)
+
+        Returns:
+            Optional[str]: valeur résolue, None si absente
+        """
+        with self.__lock:
+            o_entry = self.__entries.get(key)
+            if o_entry is not None and o_entry[0] > time.monotonic():
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                return o_entry[1]
+            # Absente ou expirée
+            self.__entries.pop(key, None)
+            self.__misses += 1
+            return None
+
+    def set(self, key: Tuple[str, str], value: str, resolver_name: str) -> None:
+        """Ajoute une valeur résolue au cache selon la durée de vie du résolveur utilisé.
+
+        Args:
+            key (Tuple[str, str]): clef (référence complète, paramètres de résolution)
+            value (str): valeur résolue
+            resolver_name (str): nom du résolveur ayant produit la valeur
+        """
+        f_ttl = ResolutionCache.ttl(resolver_name)
+        if f_ttl == 0 or self.__max_size <= 0:
+            return
+        f_expire = float("inf") if f_ttl < 0 else time.monotonic() + f_ttl
+        with self.__lock:
+            self.__entries[key] = (f_expire, value)
+            self.__entries.move_to_end(key)
+            # Éviction des entrées les moins récemment utilisées
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Vide le cache (les compteurs sont conservés)."""
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
+
+    @property
+    def hits(self) -> int:
+        """Nombre de résolutions servies par le cache."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """Nombre de résolutions absentes du cache."""
+        return self.__misses
+
+    @staticmethod
+    def ttl(resolver_name: str) -> float:
+        """Renvoie la durée de vie (en secondes) des valeurs produites par le résolveur.
+
+        Args:
+            resolver_name (str): nom du résolveur
+
+        Returns:
+            float: durée de vie (0 : pas de cache, négative : pas d'expiration)
+        """
+        f_default = Config().get_float("workflow_resolution", "cache_ttl", -1)
+        return Config().get_float("workflow_resolution", f"cache_ttl_{resolver_name}", f_default)
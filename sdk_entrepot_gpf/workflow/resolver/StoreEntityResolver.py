@@ -1,6 +1,7 @@
 import json
 import re
-from typing import Any, Dict, Optional, Pattern, Type
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Pattern, Type, TypeVar
 
 from sdk_entrepot_gpf.workflow.resolver.AbstractResolver import AbstractResolver
 from sdk_entrepot_gpf.workflow.resolver.Errors import NoEntityFoundError, ResolverError
@@ -19,6 +20,8 @@ from sdk_entrepot_gpf.store.Permission import Permission
 from sdk_entrepot_gpf.store.Key import Key
 from sdk_entrepot_gpf.io.Config import Config
 
+R = TypeVar("R")
+
 
 class StoreEntityResolver(AbstractResolver):
     """Classe permettant de résoudre des paramètres faisant référence à une entité.
@@ -94,14 +97,12 @@ class StoreEntityResolver(AbstractResolver):
 
         if d_groups["number_dict"] == "ONE":
             # json de la première entité trouvée
-            l_entities[0].api_update()
+            l_entities[0].api_update(use_cache=True)
             return l_entities[0].to_json()
         if d_groups["number_dict"] == "ALL":
             # json de toutes les entités trouvées
-            l_res1 = []
-            for o_entity in l_entities:
-                o_entity.api_update()
-                l_res1.append(o_entity.get_store_properties())
+            # (détails des entités récupérés en parallèle)
+            l_res1 = self.__map_entities(self.__get_details, l_entities)
             return json.dumps(l_res1)
         try:
             if not d_groups["number_selected"] or d_groups["number_selected"] == "ONE":
@@ -109,7 +110,8 @@ class StoreEntityResolver(AbstractResolver):
                 return self._get_info_or_tag(l_entities[0], d_groups)
             if d_groups["number_selected"] == "ALL":
                 # affichage d'une info ou d'un tag pour toutes les entités trouvées
-                l_res2 = [self._get_info_or_tag(o_entity, d_groups) for o_entity in l_entities]
+                # (détails des entités récupérés en parallèle)
+                l_res2 = self.__map_entities(lambda o_entity: self._get_info_or_tag(o_entity, d_groups), l_entities)
                 if d_groups["selected_field_type"] == "tags":
                     l_res2 = list(set(l_res2))
                 return json.dumps(l_res2)
@@ -118,8 +120,36 @@ class StoreEntityResolver(AbstractResolver):
 
         raise ResolverError(self.name, string_to_solve)
 
+    @staticmethod
+    def __map_entities(f_apply: Callable[[StoreEntity], R], l_entities: List[StoreEntity]) -> List[R]:
+        """Applique la fonction à chaque entité en parallèle (requêtes de détail) et renvoie les résultats dans l'ordre.
+
+        Args:
+            f_apply (Callable[[StoreEntity], R]): fonction à appliquer
+            l_entities (List[StoreEntity]): entités à traiter
+
+        Returns:
+            List[R]: résultats dans l'ordre des entités (la première erreur rencontrée est levée)
+        """
+        i_max_workers = min(max(1, len(l_entities)), max(1, Config().get_int("workflow_resolution", "nb_parallel_resolutions", 4)))
+        with ThreadPoolExecutor(max_workers=i_max_workers) as o_executor:
+            return list(o_executor.map(f_apply, l_entities))
+
+    @staticmethod
+    def __get_details(o_entity: StoreEntity) -> Dict[str, Any]:
+        """Met à jour l'entité puis renvoie son détail.
+
+        Args:
+            o_entity (StoreEntity): entité à traiter
+
+        Returns:
+            Dict[str, Any]: propriétés de l'entité
+        """
+        o_entity.api_update(use_cache=True)
+        return o_entity.get_store_properties()
+
     def _get_info_or_tag(self, o_entity: StoreEntity, d_groups: Dict[str, Any]) -> str:
-        o_entity.api_update()
+        o_entity.api_update(use_cache=True)
         s_selected_field = d_groups["selected_field"]
         # On doit envoyer une info ?
         if d_groups["selected_field_type"] == "infos":
@@ -1,3 +1,9 @@
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict
 from unittest.mock import patch
 from http import HTTPStatus
 import requests
@@ -5,6 +11,8 @@ import requests_mock
 
 from sdk_entrepot_gpf.io.Config import Config
 from sdk_entrepot_gpf.auth.Authentifier import Authentifier
+from sdk_entrepot_gpf.auth.Token import Token
+from sdk_entrepot_gpf.auth.TokenCache import TokenCache
 from sdk_entrepot_gpf.auth.Errors import AuthentificationError
 from tests.GpfTestCase import GpfTestCase
 
@@ -171,3 +179,62 @@ class AuthentifierTestCase(GpfTestCase):
             self.assertEqual(s_token, "test_token")
             # On a dû faire une seconde requête
             self.assertEqual(o_mock.call_count, 2, "o_mock.call_count == 2")
+
+    def test_get_access_token_string_cache(self) -> None:
+        """Vérifie le partage des jetons via le cache sur disque et leur rafraîchissement."""
+        d_token: Dict[str, Any] = {**AuthentifierTestCase.valid_token, "refresh_token": "test_refresh", "refresh_expires_in": 1800}
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            o_cache = TokenCache(Path(s_tmp_dir) / "tokens.json", AuthentifierTestCase.url, "TEST_CLIENT_ID", "TEST_LOGIN")
+            with patch.object(TokenCache, "from_config", return_value=o_cache), requests_mock.Mocker() as o_mock:
+                o_mock.post(AuthentifierTestCase.url, json=d_token)
+                # Premier "processus" : authentification puis enregistrement dans le cache
+                self.assertEqual(Authentifier().get_access_token_string(), "test_token")
+                self.assertEqual(o_mock.call_count, 1)
+                # Second "processus" : le jeton est lu dans le cache
+                Authentifier._instance = None
+                self.assertEqual(Authentifier().get_access_token_string(), "test_token")
+                self.assertEqual(o_mock.call_count, 1)
+                # Jeton en cache expiré : il est rafraîchi
+                with o_cache.lock():
+                    o_cache.save(Token({**d_token, "expires_in": -1}))
+                Authentifier._instance = None
+                o_mock.post(AuthentifierTestCase.url, json={**d_token, "access_token": "refreshed_token"})
+                self.assertEqual(Authentifier().get_access_token_string(), "refreshed_token")
+                self.assertEqual(o_mock.call_count, 2)
+                self.assertEqual(o_mock.last_request.text, "grant_type=refresh_token&refresh_token=test_refresh&client_id=TEST_CLIENT_ID&client_secret=TEST_CLIENT_SECRET")
+                # Rafraîchissement refusé : nouvelle authentification
+                with o_cache.lock():
+                    o_cache.save(Token({**d_token, "expires_in": -1}))
+                Authentifier._instance = None
+                o_mock.post(AuthentifierTestCase.url, [{"status_code": HTTPStatus.BAD_REQUEST, "json": {}}, {"json": d_token}])
+                self.assertEqual(Authentifier().get_access_token_string(), "test_token")
+                self.assertEqual(o_mock.call_count, 4)
+                self.assertTrue(o_mock.last_request.text.startswith("grant_type=password&"))
+                # Révocation : le jeton est retiré du cache
+                Authentifier().revoke_token()
+                with o_cache.lock():
+                    self.assertIsNone(o_cache.load())
+
+    def test_get_access_token_string_refresh_ahead(self) -> None:
+        """Vérifie le renouvellement anticipé du jeton, en arrière-plan et une seule fois."""
+        d_token: Dict[str, Any] = {**AuthentifierTestCase.valid_token, "refresh_token": "test_refresh", "refresh_expires_in": 1800}
+        with requests_mock.Mocker() as o_mock:
+            o_mock.post(AuthentifierTestCase.url, [{"json": d_token}, {"json": {**d_token, "access_token": "refreshed_token"}}])
+            self.assertEqual(Authentifier().get_access_token_string(), "test_token")
+            # Jeton récupéré il y a 250 s (sur 300) : il est renouvelé en arrière-plan
+            Authentifier()._Authentifier__last_token = Token(d_token, datetime.now() - timedelta(seconds=250))  # type: ignore
+            # Le jeton encore valide continue d'être utilisé par tous les threads
+            with ThreadPoolExecutor(max_workers=4) as o_executor:
+                l_tokens = list(o_executor.map(lambda i: Authentifier().get_access_token_string(), range(8)))
+            self.assertIn("test_token", l_tokens)
+            for o_thread in threading.enumerate():
+                if o_thread.name == "token-refresh":
+                    o_thread.join()
+            # Un seul renouvellement, via le jeton de rafraîchissement
+            self.assertEqual(o_mock.call_count, 2)
+            self.assertTrue(o_mock.last_request.text.startswith("grant_type=refresh_token&refresh_token=test_refresh&"))
+            self.assertEqual(Authentifier().get_access_token_string(), "refreshed_token")
+            # Un jeton déjà remplacé n'est pas révoqué
+            Authentifier().revoke_token("test_token")
+            self.assertEqual(Authentifier().get_access_token_string(), "refreshed_token")
+            self.assertEqual(o_mock.call_count, 2)
@@ -0,0 +1,68 @@
+import stat
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from sdk_entrepot_gpf.auth.Token import Token
+from sdk_entrepot_gpf.auth.TokenCache import TokenCache
+from sdk_entrepot_gpf.io.Config import Config
+from tests.GpfTestCase import GpfTestCase
+
+
+class TokenCacheTestCase(GpfTestCase):
+    """Tests TokenCache class.
+
+    cmd : python3 -m unittest -b tests.auth.TokenCacheTestCase
+    """
+
+    token = {
+        "access_token": "test_token",
+        "expires_in": 300,
+        "refresh_token": "test_refresh",
+        "refresh_expires_in": 1800,
+    }
+
+    def test_from_config(self) -> None:
+        """Vérifie que le cache est désactivé par défaut."""
+        self.assertIsNone(TokenCache.from_config())
+        f_get = Config().get
+        with patch.object(Config(), "get", side_effect=lambda s, o, fallback=None: "~/tokens.json" if o == "token_cache_file" else f_get(s, o, fallback)):
+            self.assertIsInstance(TokenCache.from_config(), TokenCache)
+
+    def test_save_load_remove(self) -> None:
+        """Vérifie l'enregistrement, la lecture et la suppression des jetons."""
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_file = Path(s_tmp_dir) / "cache" / "tokens.json"
+            o_cache = TokenCache(p_file, "https://auth.test.io", "client", "login")
+            o_other_cache = TokenCache(p_file, "https://auth.test.io", "client", "other_login")
+            with o_cache.lock():
+                # Cache vide
+                self.assertIsNone(o_cache.load())
+                o_cache.save(Token(TokenCacheTestCase.token))
+            # Fichier lisible par le seul utilisateur
+            self.assertEqual(stat.S_IMODE(p_file.stat().st_mode), 0o600)
+            with o_cache.lock():
+                o_token = o_cache.load()
+                assert o_token is not None
+                self.assertEqual(o_token.get_access_string(), "test_token")
+                self.assertEqual(o_token.get_refresh_string(), "test_refresh")
+                # Un autre compte ne voit pas le jeton
+                self.assertIsNone(o_other_cache.load())
+                o_other_cache.save(Token({**TokenCacheTestCase.token, "access_token": "other_token"}))
+                # Un jeton différent n'est pas retiré
+                o_cache.remove("other_token")
+                self.assertIsNotNone(o_cache.load())
+                o_cache.remove("test_token")
+                self.assertIsNone(o_cache.load())
+                self.assertIsNotNone(o_other_cache.load())
+
+    def test_load_corrupted(self) -> None:
+        """Vérifie qu'un fichier de cache illisible est ignoré."""
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_file = Path(s_tmp_dir) / "tokens.json"
+            p_file.write_text("{pas du json", encoding="utf-8")
+            o_cache = TokenCache(p_file, "https://auth.test.io", "client", "login")
+            with o_cache.lock():
+                self.assertIsNone(o_cache.load())
+                o_cache.save(Token(TokenCacheTestCase.token))
+                self.assertIsNotNone(o_cache.load())
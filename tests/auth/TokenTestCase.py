@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta
+
 from sdk_entrepot_gpf.auth.Token import Token
 from tests.GpfTestCase import GpfTestCase
 
@@ -34,3 +36,23 @@ class TokenTestCase(GpfTestCase):
         o_token = Token(TokenTestCase.invalid_token)
         # On vérifie que c'est bien non valide
         self.assertEqual(o_token.is_valid(), False)
+
+    def test_get_refresh_string(self) -> None:
+        """Vérifie le bon fonctionnement de get_refresh_string."""
+        # Pas de jeton de rafraîchissement
+        self.assertIsNone(Token(TokenTestCase.valid_token).get_refresh_string())
+        # Jeton de rafraîchissement valide (ou sans expiration)
+        self.assertEqual(Token({**TokenTestCase.valid_token, "refresh_token": "refresh", "refresh_expires_in": 1800}).get_refresh_string(), "refresh")
+        self.assertEqual(Token({**TokenTestCase.valid_token, "refresh_token": "refresh", "refresh_expires_in": 0}).get_refresh_string(), "refresh")
+        # Jeton de rafraîchissement expiré
+        self.assertIsNone(Token({**TokenTestCase.invalid_token, "refresh_token": "refresh", "refresh_expires_in": 60}, datetime.now() - timedelta(seconds=120)).get_refresh_string())
+
+    def test_to_dict_from_dict(self) -> None:
+        """Vérifie que la sérialisation conserve le jeton et sa date d'expiration."""
+        o_token = Token(TokenTestCase.valid_token, datetime.now() - timedelta(seconds=400))
+        d_data = o_token.to_dict()
+        self.assertEqual(d_data["token"], TokenTestCase.valid_token)
+        o_copy = Token.from_dict(d_data)
+        self.assertEqual(o_copy.get_access_string(), "test_token")
+        # Récupéré il y a 400 s pour une durée de 300 s : expiré
+        self.assertFalse(o_copy.is_valid())
@@ -1,3 +1,5 @@
+import hashlib
+
 from sdk_entrepot_gpf.helper.FileHelper import FileHelper
 from tests.GpfTestCase import GpfTestCase
 
@@ -20,3 +22,10 @@ class FileHelperTestCase(GpfTestCase):
     def test_md5_hash(self) -> None:
         """Vérification du bon fonctionnement de la fonction md5_hash."""
         self.assertEqual("54b63bf2c922188c1f19abe97e865005", FileHelper.md5_hash(GpfTestCase.test_dir_path / "helper" / "FileHelper" / "md5.txt"))
+
+    def test_file_hash(self) -> None:
+        """Vérification du bon fonctionnement de la fonction file_hash, quelle que soit la taille des blocs lus."""
+        p_file = GpfTestCase.test_dir_path / "helper" / "FileHelper" / "md5.txt"
+        for i_buffer_size in [1, 7, 1048576]:
+            self.assertEqual("54b63bf2c922188c1f19abe97e865005", FileHelper.file_hash(p_file, "md5", i_buffer_size))
+        self.assertEqual(hashlib.sha256(p_file.read_bytes()).hexdigest(), FileHelper.file_hash(p_file, "sha256"))
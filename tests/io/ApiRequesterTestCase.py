@@ -1,17 +1,25 @@
 from http import HTTPStatus
 from io import BufferedReader
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Any, Dict, List, Tuple
 from unittest.mock import MagicMock, patch, mock_open
 import requests
 import requests_mock
+from requests_toolbelt import MultipartEncoder
 
 from sdk_entrepot_gpf.io.Config import Config
 from sdk_entrepot_gpf.Errors import GpfSdkError
 from sdk_entrepot_gpf.auth.Authentifier import Authentifier
 from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
-from sdk_entrepot_gpf.io.Errors import NotFoundError, RouteNotFoundError, ConflictError
+from sdk_entrepot_gpf.io.CircuitBreaker import CircuitBreaker
+from sdk_entrepot_gpf.io.HttpCache import HttpCache
+from sdk_entrepot_gpf.io.PageSizeManager import PageSizeManager
+from sdk_entrepot_gpf.io.SingleFlight import SingleFlight
+from sdk_entrepot_gpf.io.Errors import CircuitOpenError, NotFoundError, RouteNotFoundError, ConflictError
 from tests.GpfTestCase import GpfTestCase
 
 # pylint:disable=protected-access
@@ -62,6 +70,10 @@ class ApiRequesterTestCase(GpfTestCase):
         # On détruit le Singleton Config
         Config._instance = None
 
+    def setUp(self) -> None:
+        # Les échecs s'accumulent d'un test à l'autre : on détruit le singleton CircuitBreaker
+        CircuitBreaker._instance = None
+
     def test_route_request_ok_datastore_config(self) -> None:
         """Test de route_request quand la route existe en utilisant le datastore de base."""
         # Instanciation d'une fausse réponse HTTP
@@ -79,7 +91,7 @@ class ApiRequesterTestCase(GpfTestCase):
             )
             # Vérification sur o_mock_request
             s_url = "https://api.test.io/api/v1/datastores/TEST_DATASTORE/create/42"
-            o_mock_request.assert_called_once_with(s_url, ApiRequester.POST, self.param, self.data, self.files, {}, -1000)
+            o_mock_request.assert_called_once_with(s_url, ApiRequester.POST, self.param, self.data, self.files, {}, -1000, route_name="test_create", stream=False)
             # Vérification sur la réponse renvoyée par la fonction : ça doit être celle renvoyée par url_request
             self.assertEqual(o_fct_response, o_api_response)
 
@@ -101,7 +113,7 @@ class ApiRequesterTestCase(GpfTestCase):
             )
             # Vérification sur o_mock_request
             s_url = "https://api.test.io/api/v1/datastores/TEST_DATASTORE/timeout/42"
-            o_mock_request.assert_called_once_with(s_url, ApiRequester.POST, self.param, self.data, self.files, {}, 40)
+            o_mock_request.assert_called_once_with(s_url, ApiRequester.POST, self.param, self.data, self.files, {}, 40, route_name="test_timeout", stream=False)
             # Vérification sur la réponse renvoyée par la fonction : ça doit être celle renvoyée par url_request
             self.assertEqual(o_fct_response, o_api_response)
         # timeout pour la route
@@ -117,7 +129,7 @@ class ApiRequesterTestCase(GpfTestCase):
             )
             # Vérification sur o_mock_request
             s_url = "https://api.test.io/api/v1/datastores/TEST_DATASTORE/timeout/42"
-            o_mock_request.assert_called_once_with(s_url, ApiRequester.POST, self.param, self.data, self.files, {}, 50)
+            o_mock_request.assert_called_once_with(s_url, ApiRequester.POST, self.param, self.data, self.files, {}, 50, route_name="test_timeout", stream=False)
             # Vérification sur la réponse renvoyée par la fonction : ça doit être celle renvoyée par url_request
             self.assertEqual(o_fct_response, o_api_response)
 
@@ -138,7 +150,7 @@ class ApiRequesterTestCase(GpfTestCase):
             )
             # Vérification sur o_mock_request
             s_url = "https://api.test.io/api/v1/datastores/OTHER_DATASTORE/create/42"
-            o_mock_request.assert_called_once_with(s_url, ApiRequester.POST, self.param, self.data, self.files, {}, -1000)
+            o_mock_request.assert_called_once_with(s_url, ApiRequester.POST, self.param, self.data, self.files, {}, -1000, route_name="test_create", stream=False)
             # Vérification sur la réponse renvoyée par la fonction : ça doit être celle renvoyée par url_request
             self.assertEqual(o_fct_response, o_api_response)
 
@@ -259,6 +271,105 @@ class ApiRequesterTestCase(GpfTestCase):
             # On a dû faire 3 requêtes
             self.assertEqual(o_mock.call_count, 3, "o_mock.call_count == 3")
 
+    def test_url_request_retry_policy(self) -> None:
+        """Test de url_request avec une politique de nouvelles tentatives propre à la route et au code retour."""
+        s_url = "https://api.test.io/api/v1/datastores/TEST_DATASTORE/retry"
+        with requests_mock.Mocker() as o_mock, patch("time.sleep") as o_mock_sleep:
+            # 503 : 4 tentatives (surcharge par code retour), délai demandé par le serveur respecté
+            o_mock.get(s_url, status_code=HTTPStatus.SERVICE_UNAVAILABLE, headers={"Retry-After": "7"})
+            with self.assertRaises(GpfSdkError) as o_arc:
+                ApiRequester().route_request("test_retry")
+            self.assertEqual(o_arc.exception.message, "L'exécution d'une requête a échoué après 4 tentatives.")
+            self.assertEqual(o_mock.call_count, 4)
+            self.assertListEqual([o_call.args[0] for o_call in o_mock_sleep.call_args_list], [7.0, 7.0, 7.0])
+            # 502 : 2 tentatives (surcharge de la route), disjoncteur remis à zéro pour ne pas cumuler les échecs
+            CircuitBreaker._instance = None
+            o_mock.get(s_url, status_code=HTTPStatus.BAD_GATEWAY)
+            with self.assertRaises(GpfSdkError):
+                ApiRequester().route_request("test_retry")
+            self.assertEqual(o_mock.call_count, 6)
+            # POST non idempotent : pas de nouvelle tentative
+            o_mock.post(s_url, status_code=HTTPStatus.SERVICE_UNAVAILABLE)
+            with self.assertRaises(GpfSdkError):
+                ApiRequester().route_request("test_retry", method=ApiRequester.POST)
+            self.assertEqual(o_mock.call_count, 7)
+
+    def test_url_request_http_cache(self) -> None:
+        """Test de url_request avec le cache HTTP : requête conditionnelle et réponse 304 servie depuis le cache."""
+        s_url = "https://api.test.io/api/v1/datastores/TEST_DATASTORE/get/1"
+        HttpCache._instance = None
+        with requests_mock.Mocker() as o_mock:
+            o_mock.get(s_url, [{"json": self.response, "headers": {"ETag": '"v1"'}}, {"status_code": HTTPStatus.NOT_MODIFIED}])
+            # Première lecture : réponse conservée
+            self.assertDictEqual(ApiRequester().route_request("test_get", route_params={"id": "1"}).json(), self.response)
+            self.assertNotIn("If-None-Match", o_mock.request_history[0].headers)
+            # Deuxième lecture : requête conditionnelle, 304 => réponse du cache
+            o_response = ApiRequester().route_request("test_get", route_params={"id": "1"})
+            self.assertEqual(o_mock.request_history[1].headers["If-None-Match"], '"v1"')
+            self.assertEqual(o_response.status_code, 200)
+            self.assertDictEqual(o_response.json(), self.response)
+            self.assertEqual(HttpCache().misses, 1)
+            self.assertEqual(HttpCache().revalidations, 1)
+        HttpCache._instance = None
+
+    def test_url_request_coalescing(self) -> None:
+        """Test de url_request avec des requêtes GET identiques simultanées : une seule requête, réponse partagée."""
+        o_started = threading.Event()
+        o_release = threading.Event()
+
+        def json_callback(o_request: Any, o_context: Any) -> Dict[str, str]:  # pylint:disable=unused-argument
+            o_started.set()
+            o_release.wait(5)
+            return self.response
+
+        SingleFlight._instance = None
+        with requests_mock.Mocker() as o_mock, ThreadPoolExecutor(max_workers=3) as o_executor:
+            o_mock.get(self.url, json=json_callback)
+            o_first = o_executor.submit(ApiRequester().url_request, self.url, params=self.param)
+            o_started.wait(5)
+            l_futures = [o_first] + [o_executor.submit(ApiRequester().url_request, self.url, params=self.param) for _ in range(2)]
+            f_end = time.monotonic() + 5
+            while SingleFlight().shared < 2 and time.monotonic() < f_end:
+                time.sleep(0.001)
+            o_release.set()
+            l_responses = [o_future.result(timeout=5) for o_future in l_futures]
+            self.assertEqual(o_mock.call_count, 1)
+            for o_response in l_responses:
+                self.assertDictEqual(o_response.json(), self.response)
+            # Chaque appelant a sa propre réponse
+            self.assertEqual(len({id(o_response) for o_response in l_responses}), 3)
+        SingleFlight._instance = None
+
+    def test_url_request_circuit_breaker(self) -> None:
+        """Test de url_request quand le disjoncteur de la route s'ouvre : plus de requête jusqu'à la requête de test."""
+        s_url = "https://api.test.io/api/v1/datastores/TEST_DATASTORE/retry"
+        with requests_mock.Mocker() as o_mock, patch("time.sleep"):
+            o_mock.get(s_url, status_code=HTTPStatus.SERVICE_UNAVAILABLE)
+            # 4 tentatives puis une 5e requête : 5 échecs consécutifs, le disjoncteur s'ouvre
+            with self.assertRaises(GpfSdkError):
+                ApiRequester().route_request("test_retry")
+            with self.assertRaises(GpfSdkError):
+                ApiRequester().route_request("test_retry")
+            self.assertEqual(o_mock.call_count, 5)
+            self.assertEqual(CircuitBreaker().state("test_retry"), CircuitBreaker.OPEN)
+            # Disjoncteur ouvert : échec immédiat sans requête
+            with self.assertRaises(CircuitOpenError) as o_arc:
+                ApiRequester().route_request("test_retry")
+            self.assertEqual(o_arc.exception.family, "test_retry")
+            self.assertEqual(o_mock.call_count, 5)
+            # Délai écoulé : la requête de test est interrompue, elle est libérée et la suivante sert de test
+            f_now = time.monotonic() + 60
+            with patch("time.monotonic", return_value=f_now):
+                o_mock.get(s_url, exc=KeyboardInterrupt)
+                with self.assertRaises(KeyboardInterrupt):
+                    ApiRequester().route_request("test_retry")
+                self.assertEqual(CircuitBreaker().state("test_retry"), CircuitBreaker.OPEN)
+                # la requête de test réussit et referme le disjoncteur
+                o_mock.get(s_url, status_code=HTTPStatus.OK, json=self.response)
+                ApiRequester().route_request("test_retry")
+            self.assertEqual(o_mock.call_count, 7)
+            self.assertEqual(CircuitBreaker().state("test_retry"), CircuitBreaker.CLOSED)
+
     def test_url_request_bad_request(self) -> None:
         """Test de url_request dans le cadre de 1 erreur bad request."""
         # On mock...
@@ -396,6 +507,61 @@ class ApiRequesterTestCase(GpfTestCase):
         # Content-Range non parsable : on doit s'arrêter
         self.assertFalse(ApiRequester.range_next_page("non_parsable", 0))
 
+    def test_range_total(self) -> None:
+        """Test de range_total."""
+        self.assertEqual(ApiRequester.range_total("1-10/25"), 25)
+        # Content-Range nul ou non parsable : total inconnu
+        self.assertIsNone(ApiRequester.range_total(None))
+        self.assertIsNone(ApiRequester.range_total("non_parsable"))
+
+    def test_route_request_pages(self) -> None:
+        """Test de route_request_pages."""
+
+        def route_request(route_name: str, route_params: Dict[str, Any], params: Dict[str, Any]) -> requests.Response:  # pylint:disable=unused-argument
+            # Le serveur limite les pages à 10 éléments, 45 éléments au total
+            i_min = (params["page"] - 1) * 10 + 1
+            i_max = min(params["page"] * 10, 45)
+            return GpfTestCase.get_response(json=list(range(i_min, i_max + 1)), headers={"Content-Range": f"{i_min}-{i_max}/45"})
+
+        # Pages récupérées en parallèle et renvoyées dans l'ordre
+        with patch.object(ApiRequester, "route_request", side_effect=route_request) as o_mock_request:
+            l_pages = list(ApiRequester().route_request_pages("route", route_params={"datastore": "ds"}, params={"k": "v"}, limit=50))
+        self.assertListEqual(l_pages, [list(range(i, min(i + 10, 46))) for i in range(1, 46, 10)])
+        self.assertEqual(o_mock_request.call_count, 5)
+        for i in range(1, 6):
+            o_mock_request.assert_any_call("route", route_params={"datastore": "ds"}, params={"k": "v", "page": i, "limit": 50})
+
+        # Une seule page
+        o_response = GpfTestCase.get_response(json=[1, 2], headers={"Content-Range": "1-2/2"})
+        with patch.object(ApiRequester, "route_request", return_value=o_response) as o_mock_request:
+            l_pages = list(ApiRequester().route_request_pages("route", limit=10))
+        self.assertListEqual(l_pages, [[1, 2]])
+        o_mock_request.assert_called_once_with("route", route_params={}, params={"page": 1, "limit": 10})
+
+        # Total inconnu : récupération page par page
+        o_response = GpfTestCase.get_response(json=[1, 2])
+        with patch.object(ApiRequester, "route_request", return_value=o_response) as o_mock_request:
+            with patch.object(ApiRequester, "range_next_page", side_effect=[True, True, False]):
+                l_pages = list(ApiRequester().route_request_pages("route", limit=2))
+        self.assertListEqual(l_pages, [[1, 2]] * 3)
+        self.assertEqual(o_mock_request.call_count, 3)
+
+    def test_route_request_pages_timeout(self) -> None:
+        """Test de route_request_pages si la première page est en timeout : on retente avec une taille de page réduite."""
+        PageSizeManager._instance = None
+        o_response = GpfTestCase.get_response(json=[1, 2], headers={"Content-Range": "1-2/2"})
+        with patch.object(ApiRequester, "route_request", side_effect=[requests.Timeout(), o_response]) as o_mock_request:
+            l_pages = list(ApiRequester().route_request_pages("route", limit=100))
+        self.assertListEqual(l_pages, [[1, 2]])
+        self.assertEqual(o_mock_request.call_count, 2)
+        o_mock_request.assert_called_with("route", route_params={}, params={"page": 1, "limit": 50})
+        # Taille minimale atteinte : le timeout est remonté
+        with patch.object(ApiRequester, "route_request", side_effect=requests.Timeout()) as o_mock_request:
+            with self.assertRaises(requests.Timeout):
+                list(ApiRequester().route_request_pages("route", limit=10))
+        o_mock_request.assert_called_once()
+        PageSizeManager._instance = None
+
     def test_route_upload_file(self) -> None:
         """test de route_upload_file"""
         p_file = Path("rep/file")
@@ -451,3 +617,20 @@ class ApiRequesterTestCase(GpfTestCase):
                         o_mock_open.assert_called_once_with("rb")
                         o_mock_request.assert_called_once_with(s_route_name, route_params=d_route_params, method=s_method, params=d_params, data=d_data, files=o_dict_files, timeout=i_timeout)
             o_mock_stat.reset_mock()
+
+    def test_route_upload_file_md5(self) -> None:
+        """Vérifie le calcul de la clef md5 du fichier pendant son envoi (fichier lu une seule fois)."""
+        p_file = GpfTestCase.test_dir_path / "helper" / "FileHelper" / "md5.txt"
+        l_md5: List[str] = []
+
+        def route_request(*args: Any, **kwargs: Any) -> None:  # pylint:disable=unused-argument
+            # Lecture du fichier par l'envoi
+            MultipartEncoder(fields=kwargs["files"]).read()
+
+        with patch.object(ApiRequester, "route_request", side_effect=route_request):
+            ApiRequester().route_upload_file("test_upload_fixe", p_file, "file", on_md5=l_md5.append)
+        self.assertListEqual(l_md5, ["54b63bf2c922188c1f19abe97e865005"])
+        # Fichier non lu en entier (requête interrompue) : pas de clef
+        with patch.object(ApiRequester, "route_request", return_value=None):
+            ApiRequester().route_upload_file("test_upload_fixe", p_file, "file", on_md5=l_md5.append)
+        self.assertEqual(len(l_md5), 1)
@@ -0,0 +1,196 @@
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import requests
+
+from sdk_entrepot_gpf.Errors import GpfSdkError
+from sdk_entrepot_gpf.auth.Authentifier import Authentifier
+from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
+from sdk_entrepot_gpf.io.AsyncApiRequester import AsyncApiRequester
+from sdk_entrepot_gpf.io.CircuitBreaker import CircuitBreaker
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.Errors import NotFoundError
+from sdk_entrepot_gpf.store.Upload import Upload
+from tests.GpfTestCase import GpfTestCase
+
+# pylint:disable=protected-access
+
+
+class AsyncApiRequesterTestCase(GpfTestCase):
+    """Tests AsyncApiRequester class.
+
+    cmd : python3 -m unittest -b tests.io.AsyncApiRequesterTestCase
+    """
+
+    def setUp(self) -> None:
+        # On détruit les singletons AsyncApiRequester et CircuitBreaker
+        AsyncApiRequester._instance = None
+        CircuitBreaker._instance = None
+
+    def tearDown(self) -> None:
+        AsyncApiRequester._instance = None
+        CircuitBreaker._instance = None
+
+    @staticmethod
+    def patch_config(d_values: Dict[str, str]) -> Any:
+        """Surcharge des paramètres de la section store_api."""
+        f_get = Config().get
+
+        def get(s_section: str, s_option: str, fallback: Optional[object] = None) -> Optional[str]:
+            if s_section == "store_api" and s_option in d_values:
+                return d_values[s_option]
+            return f_get(s_section, s_option, fallback)
+
+        return patch.object(Config(), "get", side_effect=get)
+
+    def test_route_request(self) -> None:
+        """Vérifie que les requêtes sont déléguées à ApiRequester, hors de la boucle d'évènements."""
+        o_response = GpfTestCase.get_response(json={"_id": "123456789"})
+        l_threads: List[str] = []
+
+        def route_request(*_args: object) -> object:
+            l_threads.append(threading.current_thread().name)
+            return o_response
+
+        with patch.object(ApiRequester(), "route_request", side_effect=route_request) as o_mock_request:
+            self.assertEqual(asyncio.run(AsyncApiRequester().route_request("route", {"datastore": "datastore"}, method=ApiRequester.POST, data={"k": "v"})), o_response)
+            o_mock_request.assert_called_once_with("route", {"datastore": "datastore"}, ApiRequester.POST, None, {"k": "v"}, None, -1000)
+        self.assertTrue(l_threads[0].startswith("async-api"))
+        with patch.object(ApiRequester(), "url_request", return_value=o_response) as o_mock_request:
+            self.assertEqual(asyncio.run(AsyncApiRequester().url_request("https://url.test.io")), o_response)
+            o_mock_request.assert_called_once_with("https://url.test.io", "GET", None, None, None, {}, -1000, route_name=None)
+        with patch.object(ApiRequester(), "route_upload_file", return_value=o_response) as o_mock_request:
+            self.assertEqual(asyncio.run(AsyncApiRequester().route_upload_file("route", Path("file"), "key")), o_response)
+            o_mock_request.assert_called_once_with("route", Path("file"), "key", None, "POST", None, None, -1000)
+
+    def test_concurrent_and_errors(self) -> None:
+        """Vérifie que plusieurs requêtes sont attendues en même temps et que les erreurs sont propagées."""
+        o_barrier = threading.Barrier(3, timeout=5)
+
+        def route_request(route_name: str, *_args: object) -> str:
+            # Les 3 requêtes doivent être en cours en même temps pour franchir la barrière
+            o_barrier.wait()
+            if route_name == "ko":
+                raise NotFoundError("url", "GET", None, None, "not found")
+            return route_name
+
+        async def main() -> List[object]:
+            return await asyncio.gather(*[AsyncApiRequester().route_request(s) for s in ["a", "b", "ko"]], return_exceptions=True)
+
+        with patch.object(ApiRequester(), "route_request", side_effect=route_request):
+            l_results = asyncio.run(main())
+        self.assertEqual(l_results[:2], ["a", "b"])
+        self.assertIsInstance(l_results[2], NotFoundError)
+
+    def test_native_transport(self) -> None:
+        """Vérifie les requêtes natives (transport httpx) : routage, nouvelles tentatives, erreurs et conversion des réponses."""
+        l_requests: List[httpx.Request] = []
+        l_responses: List[Any] = [
+            httpx.Response(503, headers={"Retry-After": "0"}),
+            httpx.Response(200, json={"_id": "123456789"}, headers={"Content-Range": "0-0/1"}),
+            httpx.Response(404, text="not found"),
+        ]
+
+        def handler(o_request: httpx.Request) -> httpx.Response:
+            l_requests.append(o_request)
+            o_response = l_responses.pop(0)
+            if isinstance(o_response, Exception):
+                raise o_response
+            return o_response  # type: ignore[no-any-return]
+
+        async def main() -> requests.Response:
+            try:
+                return await AsyncApiRequester().route_request("datastore_get", {"datastore": "datastore_id"}, params={"k": "v"})
+            finally:
+                await AsyncApiRequester().aclose()
+
+        with self.patch_config({"async_transport": "httpx"}):
+            with patch.object(AsyncApiRequester, "_AsyncApiRequester__create_client", side_effect=lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))):
+                with patch.object(Authentifier(), "get_http_header", return_value={"Authorization": "Bearer token"}):
+                    with patch.object(ApiRequester(), "route_request") as o_mock_route_request:
+                        with patch("asyncio.sleep", new=AsyncMock()) as o_mock_sleep:
+                            # 503 puis 200 : une nouvelle tentative, sans passer par ApiRequester ni par le pool de threads
+                            o_response = asyncio.run(main())
+                            o_mock_route_request.assert_not_called()
+                            o_mock_sleep.assert_awaited_once()
+                            self.assertIsInstance(o_response, requests.Response)
+                            self.assertEqual(o_response.status_code, 200)
+                            self.assertDictEqual(o_response.json(), {"_id": "123456789"})
+                            self.assertEqual(o_response.headers["content-range"], "0-0/1")
+                            self.assertEqual(len(l_requests), 2)
+                            self.assertEqual(str(l_requests[1].url), Config().get_str("routing", "datastore_get").format(datastore="datastore_id") + "?k=v")
+                            self.assertEqual(l_requests[1].headers["Authorization"], "Bearer token")
+                            # 404 : erreur propagée sans nouvelle tentative
+                            with self.assertRaises(NotFoundError):
+                                asyncio.run(main())
+                            # Timeout : converti en erreur requests et propagé
+                            l_responses.append(httpx.ConnectTimeout("timeout"))
+                            with self.assertRaises(requests.Timeout):
+                                asyncio.run(main())
+            # Transport inconnu
+            with self.patch_config({"async_transport": "inconnu"}):
+                with self.assertRaises(GpfSdkError):
+                    asyncio.run(AsyncApiRequester().url_request("https://url.test.io"))
+
+    def test_native_entities(self) -> None:
+        """Vérifie que les versions `*_async` des entités utilisent le transport natif (sans ApiRequester ni pool de threads)."""
+        l_requests: List[httpx.Request] = []
+        l_responses: List[httpx.Response] = [
+            # api_get_async
+            httpx.Response(200, json={"_id": "upload_1"}),
+            # api_list_async : deux pages récupérées
+            httpx.Response(200, json=[{"_id": "upload_1"}, {"_id": "upload_2"}], headers={"Content-Range": "0-1/3"}),
+            httpx.Response(200, json=[{"_id": "upload_3"}], headers={"Content-Range": "2-2/3"}),
+            # api_update_async
+            httpx.Response(200, json={"_id": "upload_1", "name": "nom"}),
+            # api_add_tags_async, api_list_comments_async, api_list_sharings_async, api_delete_async
+            httpx.Response(200, json={}),
+            httpx.Response(200, json=[{"_id": "comment_1"}]),
+            httpx.Response(200, json=[{"_id": "datastore_2"}]),
+            httpx.Response(204),
+        ]
+
+        def handler(o_request: httpx.Request) -> httpx.Response:
+            l_requests.append(o_request)
+            return l_responses.pop(0)
+
+        async def main() -> None:
+            try:
+                o_upload = await Upload.api_get_async("upload_1", "datastore_id")
+                self.assertEqual(o_upload.id, "upload_1")
+                l_uploads = await Upload.api_list_async(datastore="datastore_id")
+                self.assertListEqual([o.id for o in l_uploads], ["upload_1", "upload_2", "upload_3"])
+                await o_upload.api_update_async()
+                self.assertEqual(o_upload["name"], "nom")
+                await o_upload.api_add_tags_async({"k": "v"})
+                self.assertListEqual(await o_upload.api_list_comments_async(), [{"_id": "comment_1"}])
+                self.assertListEqual(await o_upload.api_list_sharings_async(), [{"_id": "datastore_2"}])
+                await o_upload.api_delete_async()
+            finally:
+                await AsyncApiRequester().aclose()
+
+        with self.patch_config({"async_transport": "httpx", "nb_limit": "2"}):
+            with patch.object(AsyncApiRequester, "_AsyncApiRequester__create_client", side_effect=lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))):
+                with patch.object(Authentifier(), "get_http_header", return_value={"Authorization": "Bearer token"}):
+                    with patch.object(ApiRequester(), "route_request") as o_mock_route_request:
+                        with patch.object(AsyncApiRequester(), "run") as o_mock_run:
+                            asyncio.run(main())
+                            o_mock_route_request.assert_not_called()
+                            o_mock_run.assert_not_called()
+        self.assertListEqual(
+            [(o.method, o.url.path, o.url.params.get("page")) for o in l_requests],
+            [
+                ("GET", "/api/datastores/datastore_id/uploads/upload_1", None),
+                ("GET", "/api/datastores/datastore_id/uploads", "1"),
+                ("GET", "/api/datastores/datastore_id/uploads", "2"),
+                ("GET", "/api/datastores/datastore_id/uploads/upload_1", None),
+                ("POST", "/api/datastores/datastore_id/uploads/upload_1/tags", None),
+                ("GET", "/api/datastores/datastore_id/uploads/upload_1/comments", None),
+                ("GET", "/api/datastores/datastore_id/uploads/upload_1/sharings", None),
+                ("DELETE", "/api/datastores/datastore_id/uploads/upload_1", None),
+            ],
+        )
@@ -0,0 +1,125 @@
+import time
+from typing import Any, Dict, Optional
+from unittest.mock import MagicMock, patch
+
+from sdk_entrepot_gpf.io.CircuitBreaker import CircuitBreaker
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.Errors import CircuitOpenError
+from tests.GpfTestCase import GpfTestCase
+
+# pylint:disable=protected-access
+
+
+class CircuitBreakerTestCase(GpfTestCase):
+    """Tests CircuitBreaker class.
+
+    cmd : python3 -m unittest -b tests.io.CircuitBreakerTestCase
+    """
+
+    def setUp(self) -> None:
+        # On détruit le singleton CircuitBreaker
+        CircuitBreaker._instance = None
+
+    def tearDown(self) -> None:
+        CircuitBreaker._instance = None
+
+    @staticmethod
+    def patch_config(d_values: Dict[str, str]) -> Any:
+        """Surcharge des paramètres de la section circuit_breaker."""
+        f_get = Config().get
+
+        def get(s_section: str, s_option: str, fallback: Optional[object] = None) -> Optional[str]:
+            if s_section == "circuit_breaker" and s_option in d_values:
+                return d_values[s_option]
+            return f_get(s_section, s_option, fallback)
+
+        return patch.object(Config(), "get", side_effect=get)
+
+    def test_consecutive_failures(self) -> None:
+        """Vérifie l'ouverture après des échecs consécutifs, la requête de test et la fermeture."""
+        o_breaker = CircuitBreaker()
+        # Les routes d'une même famille partagent le disjoncteur
+        for _ in range(4):
+            o_breaker.record("upload_push_data", False)
+        o_breaker.record("upload_push_data", True)
+        self.assertEqual(o_breaker.state("upload_push_md5"), CircuitBreaker.CLOSED)
+        for _ in range(5):
+            o_breaker.before("upload_push_md5")
+            o_breaker.record("upload_push_md5", False)
+        self.assertEqual(o_breaker.state("upload_push_data"), CircuitBreaker.OPEN)
+        # Ouvert : échec immédiat pour la famille, les autres routes ne sont pas concernées
+        with self.assertRaises(CircuitOpenError) as o_arc:
+            o_breaker.before("upload_push_data")
+        self.assertEqual(o_arc.exception.family, "upload_push")
+        self.assertGreater(o_arc.exception.retry_in, 0)
+        o_breaker.before("upload_get")
+        o_breaker.before(None)
+        # Délai écoulé : une seule requête de test passe, elle échoue et rouvre le disjoncteur
+        f_now = time.monotonic() + 60
+        with patch("time.monotonic", return_value=f_now):
+            o_breaker.before("upload_push_data")
+            self.assertEqual(o_breaker.state("upload_push_data"), CircuitBreaker.HALF_OPEN)
+            with self.assertRaises(CircuitOpenError):
+                o_breaker.before("upload_push_data")
+            o_breaker.record("upload_push_data", False)
+            self.assertEqual(o_breaker.state("upload_push_data"), CircuitBreaker.OPEN)
+        # Nouvelle requête de test réussie : fermeture
+        with patch("time.monotonic", return_value=f_now + 60):
+            o_breaker.before("upload_push_data")
+            o_breaker.record("upload_push_data", True)
+        self.assertEqual(o_breaker.state("upload_push_data"), CircuitBreaker.CLOSED)
+        o_breaker.before("upload_push_data")
+
+    def test_probe_without_outcome(self) -> None:
+        """Vérifie qu'une requête de test sans résultat ne bloque pas le disjoncteur à l'état semi-ouvert."""
+        o_breaker = CircuitBreaker()
+        for _ in range(5):
+            o_breaker.record("upload_get", False)
+        f_now = time.monotonic() + 60
+        with patch("time.monotonic", return_value=f_now):
+            # Requête de test libérée : la suivante sert de test
+            o_breaker.before("upload_get")
+            o_breaker.release("upload_get")
+            self.assertEqual(o_breaker.state("upload_get"), CircuitBreaker.OPEN)
+            o_breaker.before("upload_get")
+            self.assertEqual(o_breaker.state("upload_get"), CircuitBreaker.HALF_OPEN)
+        # Requête de test jamais terminée : une nouvelle requête de test passe après open_sec
+        with patch("time.monotonic", return_value=f_now + 10):
+            with self.assertRaises(CircuitOpenError):
+                o_breaker.before("upload_get")
+        with patch("time.monotonic", return_value=f_now + 31):
+            o_breaker.before("upload_get")
+            o_breaker.record("upload_get", True)
+        self.assertEqual(o_breaker.state("upload_get"), CircuitBreaker.CLOSED)
+        # Rien à libérer si le disjoncteur est fermé
+        o_breaker.release("upload_get")
+        self.assertEqual(o_breaker.state("upload_get"), CircuitBreaker.CLOSED)
+
+    def test_error_rate(self) -> None:
+        """Vérifie l'ouverture selon le taux d'échec et la désactivation du disjoncteur."""
+        with CircuitBreakerTestCase.patch_config({"consecutive_failures": "0", "min_calls": "4", "error_rate": "0.5"}):
+            o_breaker = CircuitBreaker()
+            for b_success in [True, False, True]:
+                o_breaker.record("upload_get", b_success)
+            self.assertEqual(o_breaker.state("upload_get"), CircuitBreaker.CLOSED)
+            o_breaker.record("upload_get", False)
+            self.assertEqual(o_breaker.state("upload_get"), CircuitBreaker.OPEN)
+        with CircuitBreakerTestCase.patch_config({"enabled": "false"}):
+            CircuitBreaker._instance = None
+            for _ in range(10):
+                CircuitBreaker().record("upload_get", False)
+            CircuitBreaker().before("upload_get")
+
+    def test_pause_while_open(self) -> None:
+        """Vérifie que la fonction est rappelée après une pause, dans la limite de max_pause_sec."""
+        o_function = MagicMock(side_effect=[CircuitOpenError("upload_push", 30), "ok"])
+        with patch("time.sleep") as o_mock_sleep:
+            self.assertEqual(CircuitBreaker.pause_while_open(o_function, 1, key="value"), "ok")
+            o_mock_sleep.assert_called_once_with(30)
+            o_function.assert_called_with(1, key="value")
+        # Pauses limitées : l'erreur finit par être propagée
+        o_function = MagicMock(side_effect=CircuitOpenError("upload_push", 30))
+        with CircuitBreakerTestCase.patch_config({"max_pause_sec": "45"}), patch("time.sleep") as o_mock_sleep:
+            with self.assertRaises(CircuitOpenError):
+                CircuitBreaker.pause_while_open(o_function)
+            self.assertListEqual([o_call.args[0] for o_call in o_mock_sleep.call_args_list], [30, 15])
@@ -1,8 +1,15 @@
+import os
+import tempfile
+import time
 from pathlib import Path
+from typing import Any, Dict, Optional
+from unittest.mock import patch
 
 from sdk_entrepot_gpf.helper.FileHelper import FileHelper
 from sdk_entrepot_gpf.helper.JsonHelper import JsonHelper
+from sdk_entrepot_gpf.io.Config import Config
 from sdk_entrepot_gpf.io.Dataset import Dataset
+from sdk_entrepot_gpf.io.HashCache import HashCache
 
 from tests.GpfTestCase import GpfTestCase
 
@@ -13,6 +20,13 @@ class DatasetTestCase(GpfTestCase):
     cmd : python3 -m unittest -b tests.io.DatasetTestCase
     """
 
+    def setUp(self) -> None:
+        # On détruit le singleton HashCache
+        HashCache._instance = None  # pylint:disable=protected-access
+
+    def tearDown(self) -> None:
+        HashCache._instance = None  # pylint:disable=protected-access
+
     def test_init(self) -> None:
         """Test du constructeur."""
         self.maxDiff = None
@@ -50,3 +64,167 @@ class DatasetTestCase(GpfTestCase):
             s_md5 = FileHelper.md5_hash(p_file)
             s_line = f"{s_md5}  {p_file.relative_to(p_root).as_posix()}"
             self.assertIn(s_line, s_data_md5)
+
+    @staticmethod
+    def patch_config(d_values: Dict[str, str]) -> Any:
+        """Surcharge des paramètres de la section upload."""
+        f_get = Config().get
+
+        def get(s_section: str, s_option: str, fallback: Optional[object] = None) -> Optional[str]:
+            if s_section == "upload" and s_option in d_values:
+                return d_values[s_option]
+            return f_get(s_section, s_option, fallback)
+
+        return patch.object(Config(), "get", side_effect=get)
+
+    def test_generate_md5_parallel(self) -> None:
+        """Vérifie que le fichier md5 généré en parallèle est identique (ordre compris) au calcul séquentiel."""
+        d_dataset = {"data_dirs": ["data"], "upload_infos": {}, "comments": [], "tags": {}}
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_root = Path(s_tmp_dir)
+            for i in range(20):
+                p_file = p_root / "data" / f"dir_{i % 3}" / f"fichier_{i}.txt"
+                p_file.parent.mkdir(parents=True, exist_ok=True)
+                p_file.write_bytes(f"contenu {i}".encode() * (i + 1) * 1000)
+            p_md5 = p_root / "data.md5"
+            d_contents = {}
+            for s_workers in ["1", "8"]:
+                p_md5.unlink(missing_ok=True)
+                with DatasetTestCase.patch_config({"md5_max_workers": s_workers}):
+                    o_dataset = Dataset(d_dataset, p_root)
+                self.assertEqual(o_dataset.md5_files, [p_md5])
+                d_contents[s_workers] = p_md5.read_text(encoding="utf-8")
+            self.assertEqual(d_contents["1"], d_contents["8"])
+            s_expected = "".join(f"{FileHelper.md5_hash(p_file)}  {p_file.relative_to(p_root).as_posix()}\n" for p_file in sorted(o_dataset.data_files, key=str))
+            self.assertEqual(d_contents["8"], s_expected)
+            # Fichier md5 existant : rien n'est recalculé
+            with patch.object(FileHelper, "md5_hash") as o_mock_hash:
+                Dataset(d_dataset, p_root)
+                o_mock_hash.assert_not_called()
+
+    def test_update_md5(self) -> None:
+        """Vérifie qu'un fichier md5 existant n'est mis à jour que pour les fichiers ajoutés, supprimés ou modifiés."""
+        d_dataset = {"data_dirs": ["data"], "upload_infos": {}, "comments": [], "tags": {}}
+        f_old = time.time() - 100
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_root = Path(s_tmp_dir)
+            (p_root / "data").mkdir()
+            for i in range(10):
+                p_file = p_root / "data" / f"fichier_{i}.txt"
+                p_file.write_text(f"contenu {i}", encoding="utf-8")
+                os.utime(p_file, (f_old, f_old))
+            p_md5 = p_root / "data.md5"
+            Dataset(d_dataset, p_root)
+            s_initial = p_md5.read_text(encoding="utf-8")
+            # Rien n'a changé : aucun fichier relu, fichier md5 inchangé
+            with patch.object(FileHelper, "file_hash", wraps=FileHelper.file_hash) as o_mock_hash:
+                Dataset(d_dataset, p_root)
+                o_mock_hash.assert_not_called()
+            self.assertEqual(p_md5.read_text(encoding="utf-8"), s_initial)
+            # Un fichier modifié, un supprimé, un ajouté : seuls le modifié et l'ajouté sont hachés
+            (p_root / "data" / "fichier_3.txt").write_text("contenu modifié", encoding="utf-8")
+            os.utime(p_root / "data" / "fichier_3.txt", (f_old + 50, f_old + 50))
+            (p_root / "data" / "fichier_5.txt").unlink()
+            (p_root / "data" / "nouveau.txt").write_text("nouveau", encoding="utf-8")
+            with patch.object(FileHelper, "file_hash", wraps=FileHelper.file_hash) as o_mock_hash:
+                o_dataset = Dataset(d_dataset, p_root)
+                self.assertEqual(o_mock_hash.call_count, 2)
+            s_expected = "".join(f"{FileHelper.file_hash(p_file, 'md5')}  {p_file.relative_to(p_root).as_posix()}\n" for p_file in sorted(o_dataset.data_files, key=str))
+            self.assertEqual(p_md5.read_text(encoding="utf-8"), s_expected)
+            # Cache vide (nouveau processus) : les fichiers plus anciens que le fichier md5 ne sont pas relus
+            HashCache._instance = None  # pylint:disable=protected-access
+            with patch.object(FileHelper, "file_hash", wraps=FileHelper.file_hash) as o_mock_hash:
+                Dataset(d_dataset, p_root)
+                o_mock_hash.assert_not_called()
+            # Fichier md5 ne suivant pas le modèle : conservé tel quel
+            p_md5.write_text("format inconnu\n", encoding="utf-8")
+            self.assertEqual(Dataset(d_dataset, p_root).md5_files, [p_md5])
+            self.assertEqual(p_md5.read_text(encoding="utf-8"), "format inconnu\n")
+
+    def test_md5_kept_as_is(self) -> None:
+        """Vérifie que les fichiers d'un dossier dont le fichier md5 est conservé tel quel ne sont pas hachés."""
+        d_dataset = {"data_dirs": ["kept", "data"], "upload_infos": {}, "comments": [], "tags": {}}
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_root = Path(s_tmp_dir)
+            for s_dir in ["kept", "data"]:
+                (p_root / s_dir).mkdir()
+                for i in range(2):
+                    (p_root / s_dir / f"fichier_{i}.txt").write_text(f"contenu {i}", encoding="utf-8")
+            (p_root / "kept.md5").write_text("format inconnu\n", encoding="utf-8")
+            l_data = sorted((p_root / "data").iterdir(), key=str)
+            # Seuls les fichiers du dossier dont le fichier md5 est généré sont hachés
+            with patch.object(FileHelper, "md5_hash", wraps=FileHelper.md5_hash) as o_mock_hash:
+                o_dataset = Dataset(d_dataset, p_root)
+                self.assertListEqual(sorted([o_call.args[0] for o_call in o_mock_hash.call_args_list], key=str), l_data)
+            self.assertEqual((p_root / "kept.md5").read_text(encoding="utf-8"), "format inconnu\n")
+            self.assertTrue((p_root / "data.md5").exists())
+            self.assertFalse(o_dataset.needs_md5(p_root / "kept" / "fichier_0.txt"))
+            self.assertTrue(o_dataset.needs_md5(l_data[0]))
+            # Idem si les clefs sont calculées à la fin de l'envoi
+            with DatasetTestCase.patch_config({"hash_while_upload": "True"}):
+                o_dataset = Dataset(d_dataset, p_root)
+            self.assertListEqual(o_dataset.pending_md5, [])
+            (p_root / "data.md5").unlink()
+            HashCache._instance = None  # pylint:disable=protected-access
+            with DatasetTestCase.patch_config({"hash_while_upload": "True"}):
+                o_dataset = Dataset(d_dataset, p_root)
+            self.assertListEqual(sorted(o_dataset.pending_md5, key=str), l_data)
+
+    def test_hash_while_upload(self) -> None:
+        """Vérifie que, si les clefs sont calculées pendant l'envoi, les fichiers md5 ne sont générés qu'à la fin à partir de ces clefs."""
+        d_dataset = {"data_dirs": ["data"], "upload_infos": {}, "comments": [], "tags": {}}
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_root = Path(s_tmp_dir)
+            (p_root / "data").mkdir()
+            for i in range(4):
+                (p_root / "data" / f"fichier_{i}.txt").write_text(f"contenu {i}", encoding="utf-8")
+            p_md5 = p_root / "data.md5"
+            with DatasetTestCase.patch_config({"hash_while_upload": "True"}):
+                o_dataset = Dataset(d_dataset, p_root)
+            # Aucun fichier lu ni fichier md5 généré à la création
+            self.assertTrue(o_dataset.hash_while_upload)
+            self.assertEqual(o_dataset.md5_files, [p_md5])
+            self.assertFalse(p_md5.exists())
+            self.assertEqual(len(o_dataset.pending_md5), 4)
+            # Clefs de 3 fichiers calculées pendant l'envoi, la dernière à la génération
+            l_files = sorted(o_dataset.data_files, key=str)
+            for p_file in l_files[:3]:
+                o_dataset.set_md5(p_file, FileHelper.file_hash(p_file, "md5"))
+            with patch.object(FileHelper, "md5_hash", wraps=FileHelper.md5_hash) as o_mock_hash:
+                o_dataset.write_md5_files()
+                o_mock_hash.assert_called_once_with(l_files[3])
+            s_expected = "".join(f"{FileHelper.file_hash(p_file, 'md5')}  {p_file.relative_to(p_root).as_posix()}\n" for p_file in l_files)
+            self.assertEqual(p_md5.read_text(encoding="utf-8"), s_expected)
+            self.assertListEqual(o_dataset.pending_md5, [])
+
+    def test_pipeline(self) -> None:
+        """Vérifie qu'en pipeline les fichiers sont listés et hachés au fil de l'itération."""
+        d_dataset = {"data_dirs": ["data"], "upload_infos": {}, "comments": [], "tags": {}}
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_root = Path(s_tmp_dir)
+            for i in range(6):
+                p_file = p_root / "data" / f"dir_{i % 2}" / f"fichier_{i}.txt"
+                p_file.parent.mkdir(parents=True, exist_ok=True)
+                p_file.write_text(f"contenu {i}", encoding="utf-8")
+            p_md5 = p_root / "data.md5"
+            with DatasetTestCase.patch_config({"pipeline": "True"}):
+                o_dataset = Dataset(d_dataset, p_root)
+            # Rien n'est listé à la création
+            self.assertTrue(o_dataset.pipeline)
+            self.assertDictEqual(o_dataset.data_files, {})
+            self.assertEqual(o_dataset.md5_files, [p_md5])
+            # Listing au fil de l'itération
+            o_iterator = o_dataset.iter_data_files()
+            p_first, s_api_path = next(o_iterator)
+            self.assertEqual(len(o_dataset.data_files), 1)
+            self.assertEqual(s_api_path, p_first.parent.relative_to(p_root).as_posix())
+            self.assertEqual(o_dataset.md5(p_first), FileHelper.md5_hash(p_first))
+            l_others = list(o_iterator)
+            self.assertEqual(len(l_others), 5)
+            self.assertEqual(len(o_dataset.data_files), 6)
+            self.assertEqual(len(list(o_dataset.iter_data_files())), 6)
+            # Clefs manquantes calculées à la génération du fichier md5
+            self.assertEqual(len(o_dataset.pending_md5), 5)
+            o_dataset.write_md5_files()
+            s_expected = "".join(f"{FileHelper.file_hash(p_file, 'md5')}  {p_file.relative_to(p_root).as_posix()}\n" for p_file in sorted(o_dataset.data_files, key=str))
+            self.assertEqual(p_md5.read_text(encoding="utf-8"), s_expected)
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from unittest.mock import patch
+
+from sdk_entrepot_gpf.helper.FileHelper import FileHelper
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.HashCache import HashCache
+from tests.GpfTestCase import GpfTestCase
+
+# pylint:disable=protected-access
+
+
+class HashCacheTestCase(GpfTestCase):
+    """Tests HashCache class.
+
+    cmd : python3 -m unittest -b tests.io.HashCacheTestCase
+    """
+
+    def setUp(self) -> None:
+        # On détruit le singleton HashCache
+        HashCache._instance = None
+
+    def tearDown(self) -> None:
+        HashCache._instance = None
+
+    @staticmethod
+    def patch_config(d_values: Dict[str, str]) -> Any:
+        """Surcharge des paramètres de la section hash_cache."""
+        f_get = Config().get
+
+        def get(s_section: str, s_option: str, fallback: Optional[object] = None) -> Optional[str]:
+            if s_section == "hash_cache" and s_option in d_values:
+                return d_values[s_option]
+            return f_get(s_section, s_option, fallback)
+
+        return patch.object(Config(), "get", side_effect=get)
+
+    @staticmethod
+    def write_old(p_file: Path, s_content: str, f_mtime: float) -> None:
+        """Écrit le fichier avec une date de modification passée."""
+        p_file.write_text(s_content, encoding="utf-8")
+        os.utime(p_file, (f_mtime, f_mtime))
+
+    def test_get_put(self) -> None:
+        """Vérifie que l'empreinte n'est servie que tant que le fichier n'a pas changé."""
+        f_old = time.time() - 100
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_file = Path(s_tmp_dir) / "fichier.txt"
+            HashCacheTestCase.write_old(p_file, "contenu", f_old)
+            self.assertIsNone(HashCache().get(p_file, "md5"))
+            s_md5 = FileHelper.md5_hash(p_file)
+            with patch.object(FileHelper, "file_hash") as o_mock_hash:
+                self.assertEqual(FileHelper.md5_hash(p_file), s_md5)
+                o_mock_hash.assert_not_called()
+            self.assertEqual((HashCache().hits, HashCache().misses), (1, 2))
+            self.assertIsNone(HashCache().get(p_file, "sha256"))
+            # Modification (même taille) : date de modification différente, empreinte périmée
+            HashCacheTestCase.write_old(p_file, "CONTENU", f_old + 1)
+            self.assertIsNone(HashCache().get(p_file, "md5"))
+            self.assertTrue(HashCache().contains(p_file, "md5"))
+            self.assertNotEqual(FileHelper.md5_hash(p_file), s_md5)
+            # Fichier modifié à l'instant : pas mis en cache (une nouvelle modification pourrait garder la même date)
+            p_file.write_text("récent", encoding="utf-8")
+            FileHelper.md5_hash(p_file)
+            self.assertIsNone(HashCache().get(p_file, "md5"))
+            # Cache désactivé
+            with HashCacheTestCase.patch_config({"enabled": "false"}):
+                HashCache._instance = None
+                HashCacheTestCase.write_old(p_file, "contenu", f_old)
+                FileHelper.md5_hash(p_file)
+                self.assertIsNone(HashCache().get(p_file, "md5"))
+
+    def test_persistent(self) -> None:
+        """Vérifie que les empreintes sont conservées d'un processus à l'autre dans le fichier de cache."""
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_file = Path(s_tmp_dir) / "fichier.txt"
+            HashCacheTestCase.write_old(p_file, "contenu", time.time() - 100)
+            with HashCacheTestCase.patch_config({"file": str(Path(s_tmp_dir) / "cache" / "hashes.sqlite")}):
+                s_md5 = FileHelper.md5_hash(p_file)
+                HashCache._instance = None
+                self.assertEqual(HashCache().get(p_file, "md5"), s_md5)
+                HashCache().clear()
+                self.assertIsNone(HashCache().get(p_file, "md5"))
+                HashCache()._HashCache__connection.close()  # type: ignore[attr-defined]
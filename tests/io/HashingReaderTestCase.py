@@ -0,0 +1,46 @@
+import hashlib
+import io
+import tempfile
+from pathlib import Path
+
+from requests_toolbelt import MultipartEncoder
+
+from sdk_entrepot_gpf.io.HashingReader import HashingReader
+from tests.GpfTestCase import GpfTestCase
+
+
+class HashingReaderTestCase(GpfTestCase):
+    """Tests HashingReader class.
+
+    cmd : python3 -m unittest -b tests.io.HashingReaderTestCase
+    """
+
+    def test_hexdigest(self) -> None:
+        """Vérifie l'empreinte calculée pendant l'envoi, les lectures partielles et le retour au début."""
+        b_content = b"contenu du fichier " * 10000
+        s_md5 = hashlib.md5(b_content).hexdigest()
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_file = Path(s_tmp_dir) / "fichier.bin"
+            p_file.write_bytes(b_content)
+            with p_file.open("rb") as o_file:
+                o_reader = HashingReader(o_file)
+                o_encoder = MultipartEncoder(fields={"file": (p_file.name, io.BufferedReader(o_reader))})
+                # Fichier pas encore lu en entier
+                o_encoder.read(1000)
+                self.assertIsNone(o_reader.hexdigest())
+                # Envoi complet
+                while o_encoder.read(8192):
+                    pass
+                self.assertEqual(o_reader.hexdigest(), s_md5)
+                # Nouvelle tentative : le calcul reprend du début
+                o_buffered = io.BufferedReader(o_reader)
+                o_buffered.seek(0)
+                self.assertIsNone(o_reader.hexdigest())
+                self.assertEqual(o_buffered.read(), b_content)
+                self.assertEqual(o_reader.hexdigest(), s_md5)
+            # Lectures non séquentielles ignorées
+            with p_file.open("rb") as o_file:
+                o_reader = HashingReader(o_file, "sha256")
+                o_reader.seek(10)
+                o_reader.read()
+                self.assertIsNone(o_reader.hexdigest())
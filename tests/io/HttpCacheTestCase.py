@@ -0,0 +1,124 @@
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from unittest.mock import patch
+
+import requests
+
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.HttpCache import CachedResponse, HttpCache
+from tests.GpfTestCase import GpfTestCase
+
+# pylint:disable=protected-access
+
+
+class HttpCacheTestCase(GpfTestCase):
+    """Tests HttpCache class.
+
+    cmd : python3 -m unittest -b tests.io.HttpCacheTestCase
+    """
+
+    def setUp(self) -> None:
+        # On détruit le singleton HttpCache
+        HttpCache._instance = None
+
+    def tearDown(self) -> None:
+        HttpCache._instance = None
+
+    @staticmethod
+    def patch_config(d_values: Dict[str, str]) -> Any:
+        """Surcharge des paramètres de la section http_cache."""
+        f_get = Config().get
+
+        def get(s_section: str, s_option: str, fallback: Optional[object] = None) -> Optional[str]:
+            if s_section == "http_cache" and s_option in d_values:
+                return d_values[s_option]
+            return f_get(s_section, s_option, fallback)
+
+        return patch.object(Config(), "get", side_effect=get)
+
+    @staticmethod
+    def response(headers: Dict[str, str], content: bytes = b'{"_id": "1"}') -> requests.Response:
+        """Instancie une réponse `requests`."""
+        o_response = requests.Response()
+        o_response.status_code = 200
+        o_response.headers.update(headers)
+        o_response._content = content
+        return o_response
+
+    def test_key(self) -> None:
+        """Vérifie que seules les requêtes GET des routes autorisées ont une clef, indépendante de l'ordre des paramètres."""
+        s_key = HttpCache().key("upload_get", "GET", "https://api/uploads/1", {"a": 1, "b": ["x", "y"]})
+        self.assertIsNotNone(s_key)
+        self.assertEqual(s_key, HttpCache().key("upload_get", "get", "https://api/uploads/1", {"b": ["x", "y"], "a": 1}))
+        self.assertNotEqual(s_key, HttpCache().key("upload_get", "GET", "https://api/uploads/1", {"a": 2, "b": ["x", "y"]}))
+        self.assertIsNotNone(HttpCache().key("tms_list", "GET", "https://api/statics/tms", None))
+        self.assertIsNone(HttpCache().key("upload_get", "PATCH", "https://api/uploads/1", None))
+        self.assertIsNone(HttpCache().key("upload_list", "GET", "https://api/uploads", None))
+        self.assertIsNone(HttpCache().key(None, "GET", "https://api/uploads/1", None))
+        with HttpCacheTestCase.patch_config({"enabled": "false"}):
+            HttpCache._instance = None
+            self.assertIsNone(HttpCache().key("upload_get", "GET", "https://api/uploads/1", None))
+
+    def test_validators(self) -> None:
+        """Vérifie la conservation des réponses avec validateur, leur revalidation et l'invalidation."""
+        s_key = "k"
+        HttpCache().store("upload_get", s_key, "https://api/uploads/1", HttpCacheTestCase.response({"ETag": '"v1"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}))
+        o_entry = HttpCache().get(s_key)
+        assert o_entry is not None
+        self.assertDictEqual(o_entry.validators, {"If-None-Match": '"v1"', "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        # Avec validateur : jamais servie sans requête
+        self.assertIsNone(HttpCache().serve("upload_get", s_key, o_entry))
+        o_response = HttpCache().revalidate("upload_get", s_key, o_entry)
+        self.assertEqual(o_response.json(), {"_id": "1"})
+        self.assertEqual(o_response.headers["etag"], '"v1"')
+        self.assertEqual((HttpCache().misses, HttpCache().revalidations, HttpCache().hits), (1, 1, 0))
+        # Modification de l'entité (ou d'une entité parente) : réponse retirée
+        HttpCache().invalidate("https://api/uploads/2")
+        self.assertIsNotNone(HttpCache().get(s_key))
+        HttpCache().invalidate("https://api/uploads/1")
+        self.assertIsNone(HttpCache().get(s_key))
+        # Modification d'une sous-ressource (étiquettes, partages...) : l'entité parente est retirée, même avec une durée de vie
+        with HttpCacheTestCase.patch_config({"upload_get_max_age_sec": "60"}):
+            HttpCache().store("upload_get", "k1", "https://api/uploads/1", HttpCacheTestCase.response({}))
+            HttpCache().store("upload_get", "k2", "https://api/uploads/2", HttpCacheTestCase.response({}))
+            HttpCache().store("upload_get", "k3", "https://api/uploads/10", HttpCacheTestCase.response({}))
+            HttpCache().invalidate("https://api/uploads/1/tags?tags=a")
+            self.assertIsNone(HttpCache().get("k1"))
+            self.assertIsNotNone(HttpCache().get("k2"))
+            self.assertIsNotNone(HttpCache().get("k3"))
+            HttpCache().invalidate("https://api/uploads/1")
+            self.assertIsNotNone(HttpCache().get("k3"))
+
+    def test_max_age(self) -> None:
+        """Vérifie que les réponses sans validateur ne sont conservées (et servies sans requête) que pendant leur durée de vie."""
+        HttpCache().store("upload_get", "k1", "https://api/uploads/1", HttpCacheTestCase.response({}))
+        self.assertIsNone(HttpCache().get("k1"))
+        with HttpCacheTestCase.patch_config({"tms_list_max_age_sec": "60"}):
+            HttpCache().store("tms_list", "k2", "https://api/statics/tms", HttpCacheTestCase.response({}, b"[]"))
+            o_entry = HttpCache().get("k2")
+            assert o_entry is not None
+            o_response = HttpCache().serve("tms_list", "k2", o_entry)
+            assert o_response is not None
+            self.assertEqual(o_response.json(), [])
+            self.assertEqual(HttpCache().hits, 1)
+            with patch("time.time", return_value=time.time() + 61):
+                self.assertIsNone(HttpCache().serve("tms_list", "k2", o_entry))
+
+    def test_lru_and_disk(self) -> None:
+        """Vérifie l'éviction des réponses les moins récemment utilisées et le cache sur disque."""
+        with tempfile.TemporaryDirectory() as s_directory:
+            with HttpCacheTestCase.patch_config({"max_entries": "2", "directory": s_directory}):
+                HttpCache._instance = None
+                for s_key in ["k1", "k2", "k3"]:
+                    HttpCache().store("upload_get", s_key, f"https://api/uploads/{s_key}", HttpCacheTestCase.response({"ETag": s_key}))
+                self.assertEqual(len(list(Path(s_directory).glob("*.json"))), 3)
+                self.assertListEqual(list(HttpCache()._HttpCache__entries), ["k2", "k3"])  # type: ignore[attr-defined]
+                # k1 évincée de la mémoire mais relue sur disque (par un autre processus par exemple)
+                HttpCache().clear()
+                o_entry = HttpCache().get("k1")
+                assert o_entry is not None
+                self.assertEqual(o_entry.url, "https://api/uploads/k1")
+                self.assertEqual(o_entry.validators, {"If-None-Match": "k1"})
+                self.assertEqual(CachedResponse.from_dict(o_entry.to_dict()).content, b'{"_id": "1"}')
@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+import requests
+import requests_mock
+
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.HttpSession import HttpSession
+from tests.GpfTestCase import GpfTestCase
+
+# pylint:disable=protected-access
+
+
+class HttpSessionTestCase(GpfTestCase):
+    """Tests HttpSession class.
+
+    cmd : python3 -m unittest -b tests.io.HttpSessionTestCase
+    """
+
+    def setUp(self) -> None:
+        # On détruit le singleton HttpSession
+        HttpSession._instance = None
+
+    def tearDown(self) -> None:
+        # On ferme la session et on détruit le singleton
+        HttpSession().close()
+        HttpSession._instance = None
+
+    def test_session(self) -> None:
+        """Vérifie que la session est créée une seule fois et configurée selon la config."""
+        o_session = HttpSession().session
+        self.assertIsInstance(o_session, requests.Session)
+        # La même session est renvoyée à chaque appel
+        self.assertIs(HttpSession().session, o_session)
+        # Le pool est paramétré selon la config
+        o_adapter = o_session.get_adapter("https://test.com/")
+        self.assertEqual(o_adapter._pool_connections, Config().get_int("store_api", "pool_connections"))  # type: ignore
+        self.assertEqual(o_adapter._pool_maxsize, Config().get_int("store_api", "pool_maxsize"))  # type: ignore
+        self.assertEqual(o_adapter._pool_block, Config().get_bool("store_api", "pool_block"))  # type: ignore
+        # Keep-alive actif par défaut
+        self.assertEqual(o_session.headers["Connection"], "keep-alive")
+
+    def test_close(self) -> None:
+        """Vérifie le bon fonctionnement de close."""
+        o_session = HttpSession().session
+        with patch.object(o_session, "close") as o_mock_close:
+            HttpSession().close()
+            o_mock_close.assert_called_once_with()
+        # Une nouvelle session est créée après fermeture
+        self.assertIsNot(HttpSession().session, o_session)
+
+    def test_keep_alive_disabled(self) -> None:
+        """Vérifie que le keep-alive peut être désactivé."""
+
+        def get_bool(section: str, option: str, fallback: bool = False) -> bool:
+            if (section, option) == ("store_api", "keep_alive"):
+                return False
+            return bool(fallback)
+
+        with patch.object(Config(), "get_bool", side_effect=get_bool):
+            o_session = HttpSession().session
+        self.assertEqual(o_session.headers["Connection"], "close")
+
+    def test_no_cookies(self) -> None:
+        """Vérifie que les cookies renvoyés par le serveur ne sont pas conservés."""
+        with requests_mock.Mocker(session=HttpSession().session) as o_mock:
+            o_mock.get("https://test.com/", headers={"Set-Cookie": "session=abc; Domain=test.com; Path=/"})
+            HttpSession().session.get("https://test.com/")
+        self.assertEqual(len(HttpSession().session.cookies), 0)
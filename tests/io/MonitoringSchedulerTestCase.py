@@ -0,0 +1,47 @@
+from concurrent.futures import Future, wait
+from typing import Any
+from unittest.mock import MagicMock
+
+from sdk_entrepot_gpf.io.Errors import CircuitOpenError
+from sdk_entrepot_gpf.io.MonitoringScheduler import MonitoringScheduler
+
+from tests.GpfTestCase import GpfTestCase
+
+
+class MonitoringSchedulerTestCase(GpfTestCase):
+    """Tests MonitoringScheduler class.
+
+    cmd : python3 -m unittest -b tests.io.MonitoringSchedulerTestCase
+    """
+
+    def test_watch(self) -> None:
+        """Vérifie que plusieurs suivis sont menés en même temps jusqu'à leur état final."""
+        # Le premier suivi se termine à la troisième vérification, le second à la première
+        o_poll_1 = MagicMock(side_effect=[None, None, "fini_1"])
+        o_poll_2 = MagicMock(side_effect=["fini_2"])
+        o_future_1: "Future[Any]" = MonitoringScheduler().watch(o_poll_1, 0.01)
+        o_future_2: "Future[Any]" = MonitoringScheduler().watch(o_poll_2, 0.01)
+        self.assertEqual(o_future_2.result(timeout=5), "fini_2")
+        self.assertEqual(o_future_1.result(timeout=5), "fini_1")
+        self.assertEqual(o_poll_1.call_count, 3)
+        self.assertEqual(o_poll_2.call_count, 1)
+
+    def test_watch_error_cancel(self) -> None:
+        """Vérifie la transmission des erreurs et l'annulation d'un suivi."""
+        # Erreur : transmise au Future
+        o_future: "Future[Any]" = MonitoringScheduler().watch(MagicMock(side_effect=ValueError("erreur")), 0.01)
+        with self.assertRaises(ValueError):
+            o_future.result(timeout=5)
+        # Annulation : plus aucune vérification
+        o_poll = MagicMock(return_value=None)
+        o_future = MonitoringScheduler().watch(o_poll, 60)
+        wait([MonitoringScheduler().watch(MagicMock(return_value=True), 0.01)], timeout=5)
+        self.assertTrue(o_future.cancel())
+        self.assertLessEqual(o_poll.call_count, 1)
+
+    def test_watch_circuit_open(self) -> None:
+        """Vérifie qu'un disjoncteur ouvert reporte la vérification au lieu d'arrêter le suivi."""
+        o_poll = MagicMock(side_effect=[CircuitOpenError("test", 0.01), "fini"])
+        o_future: "Future[Any]" = MonitoringScheduler().watch(o_poll, 0.01)
+        self.assertEqual(o_future.result(timeout=5), "fini")
+        self.assertEqual(o_poll.call_count, 2)
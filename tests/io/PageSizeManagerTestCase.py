@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.PageSizeManager import PageSizeManager
+from tests.GpfTestCase import GpfTestCase
+
+# pylint:disable=protected-access
+
+
+class PageSizeManagerTestCase(GpfTestCase):
+    """Tests PageSizeManager class.
+
+    cmd : python3 -m unittest -b tests.io.PageSizeManagerTestCase
+    """
+
+    def setUp(self) -> None:
+        # On détruit le singleton PageSizeManager
+        PageSizeManager._instance = None
+
+    def test_get(self) -> None:
+        """Vérifie le bon fonctionnement de get."""
+        # Rien de connu : valeur par défaut
+        self.assertEqual(PageSizeManager().get("route", 10), 10)
+        # Après un listing complet et rapide, la taille augmente (uniquement pour cette route)
+        PageSizeManager().record("route", 10, 10, 100, 0.1)
+        self.assertEqual(PageSizeManager().get("route", 10), 40)
+        self.assertEqual(PageSizeManager().get("other_route", 10), 10)
+        # Ajustement désactivé : valeur par défaut
+        with patch.object(Config(), "get_bool", return_value=False):
+            self.assertEqual(PageSizeManager().get("route", 10), 10)
+
+    def test_record(self) -> None:
+        """Vérifie le bon fonctionnement de record."""
+        # Total inconnu : pas d'ajustement
+        PageSizeManager().record("route", 10, 10, None, 0.1)
+        self.assertEqual(PageSizeManager().get("route", 10), 10)
+        # Tout tient dans une page : pas d'ajustement
+        PageSizeManager().record("route", 10, 5, 5, 0.1)
+        self.assertEqual(PageSizeManager().get("route", 10), 10)
+        # Augmentation jusqu'au maximum de la config
+        for i_size in [40, 160, 640, 2000, 2000]:
+            PageSizeManager().record("route", PageSizeManager().get("route", 10), PageSizeManager().get("route", 10), 100000, 0.1)
+            self.assertEqual(PageSizeManager().get("route", 10), i_size)
+        # Le serveur plafonne à 500 : on s'y tient, même si les pages suivantes sont rapides
+        PageSizeManager().record("route", 2000, 500, 100000, 0.1)
+        self.assertEqual(PageSizeManager().get("route", 10), 500)
+        PageSizeManager().record("route", 500, 500, 100000, 0.1)
+        self.assertEqual(PageSizeManager().get("route", 10), 500)
+        # Réponse lente : la taille est divisée par deux
+        PageSizeManager().record("route", 500, 500, 100000, 60)
+        self.assertEqual(PageSizeManager().get("route", 10), 250)
+
+    def test_record_timeout(self) -> None:
+        """Vérifie le bon fonctionnement de record_timeout."""
+        PageSizeManager().record_timeout("route", 100)
+        self.assertEqual(PageSizeManager().get("route", 100), 50)
+        # On ne descend pas sous le minimum
+        PageSizeManager().record_timeout("route", 12)
+        self.assertEqual(PageSizeManager().get("route", 100), 10)
+        PageSizeManager().record_timeout("route", 5)
+        self.assertEqual(PageSizeManager().get("route", 100), 5)
@@ -0,0 +1,70 @@
+import threading
+import time
+from typing import Iterator, List
+
+from sdk_entrepot_gpf.io.Pipeline import Pipeline
+from tests.GpfTestCase import GpfTestCase
+
+
+class PipelineTestCase(GpfTestCase):
+    """Tests Pipeline class.
+
+    cmd : python3 -m unittest -b tests.io.PipelineTestCase
+    """
+
+    def test_run(self) -> None:
+        """Vérifie que tous les éléments passent par toutes les étapes."""
+        l_results: List[int] = []
+        o_lock = threading.Lock()
+
+        def store(i_value: int) -> None:
+            with o_lock:
+                l_results.append(i_value)
+
+        Pipeline(5).run(range(100), [(lambda i: i * 2, 3), (lambda i: i + 1, 2), (store, 4)])
+        self.assertListEqual(sorted(l_results), [i * 2 + 1 for i in range(100)])
+        # Source vide
+        Pipeline(5).run([], [(store, 2)])
+        self.assertEqual(len(l_results), 100)
+
+    def test_bounded(self) -> None:
+        """Vérifie que la lecture de la source ne prend pas d'avance au-delà des files (mémoire bornée)."""
+        l_read: List[int] = []
+        o_release = threading.Event()
+
+        def source() -> Iterator[int]:
+            for i in range(1000):
+                l_read.append(i)
+                yield i
+
+        def slow(i_value: int) -> None:  # pylint:disable=unused-argument
+            o_release.wait(5)
+
+        o_thread = threading.Thread(target=Pipeline(2).run, args=(source(), [(lambda i: i, 1), (slow, 1)]))
+        o_thread.start()
+        time.sleep(0.3)
+        # 2 éléments par file, 1 en cours par étape et 1 en attente d'ajout dans la source
+        self.assertLessEqual(len(l_read), 8)
+        o_release.set()
+        o_thread.join(5)
+        self.assertEqual(len(l_read), 1000)
+
+    def test_error(self) -> None:
+        """Vérifie que la première erreur arrête toutes les étapes et est levée."""
+        l_done: List[int] = []
+
+        def fail(i_value: int) -> int:
+            if i_value == 10:
+                raise ValueError("erreur")
+            return i_value
+
+        with self.assertRaises(ValueError):
+            Pipeline(2).run(range(100000), [(fail, 2), (l_done.append, 2)])
+        self.assertLess(len(l_done), 100000)
+
+        def source() -> Iterator[int]:
+            yield 1
+            raise OSError("lecture impossible")
+
+        with self.assertRaises(OSError):
+            Pipeline(2).run(source(), [(l_done.append, 1)])
@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.PollingPolicy import PollingPolicy
+
+from tests.GpfTestCase import GpfTestCase
+
+
+class PollingPolicyTestCase(GpfTestCase):
+    """Tests PollingPolicy class.
+
+    cmd : python3 -m unittest -b tests.io.PollingPolicyTestCase
+    """
+
+    def test_update(self) -> None:
+        """Vérifie la croissance exponentielle, le plafond et la remise à zéro sur changement de statut."""
+        # Valeurs par défaut de la section processing_execution : 2s, x1.5, 60s au maximum
+        o_policy = PollingPolicy("processing_execution")
+        self.assertEqual(o_policy.get_interval(), 2)
+        self.assertListEqual([o_policy.update("PROGRESS") for _ in range(4)], [2, 3, 4.5, 6.75])
+        self.assertEqual(o_policy.get_interval(), 6.75)
+        for _ in range(20):
+            o_policy.update("PROGRESS")
+        self.assertEqual(o_policy.update("PROGRESS"), 60)
+        # Changement de statut : on repart du début
+        self.assertEqual(o_policy.update("SUCCESS"), 2)
+
+    def test_seed(self) -> None:
+        """Vérifie l'estimation du premier intervalle d'après la durée attendue."""
+        self.assertEqual(PollingPolicy("processing_execution", 300).update(), 30)
+        # Bornes
+        self.assertEqual(PollingPolicy("processing_execution", 5).update(), 2)
+        self.assertEqual(PollingPolicy("processing_execution", 36000).update(), 60)
+
+    def test_not_adaptive(self) -> None:
+        """Vérifie l'intervalle fixe si le suivi adaptatif est désactivé."""
+        with patch.object(Config(), "get_bool", return_value=False):
+            o_policy = PollingPolicy("upload")
+        self.assertListEqual([o_policy.update("PROGRESS") for _ in range(3)], [10, 10, 10])
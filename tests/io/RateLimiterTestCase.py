@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+from unittest.mock import patch
+
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.RateLimiter import RateLimiter, TokenBucket
+from tests.GpfTestCase import GpfTestCase
+
+# pylint:disable=protected-access
+
+
+class RateLimiterTestCase(GpfTestCase):
+    """Tests RateLimiter class.
+
+    cmd : python3 -m unittest -b tests.io.RateLimiterTestCase
+    """
+
+    def setUp(self) -> None:
+        # On détruit le singleton RateLimiter
+        RateLimiter._instance = None
+
+    def tearDown(self) -> None:
+        RateLimiter._instance = None
+
+    @staticmethod
+    def patch_config(d_values: Dict[str, str]) -> Any:
+        """Surcharge des paramètres de la section rate_limit."""
+        f_get = Config().get
+
+        def get(s_section: str, s_option: str, fallback: Optional[object] = None) -> Optional[str]:
+            if s_section == "rate_limit" and s_option in d_values:
+                return d_values[s_option]
+            return f_get(s_section, s_option, fallback)
+
+        return patch.object(Config(), "get", side_effect=get)
+
+    def test_token_bucket(self) -> None:
+        """Vérifie que le seau autorise une rafale puis limite le débit."""
+        o_bucket = TokenBucket(50, 2)
+        f_start = time.monotonic()
+        # Rafale : pas d'attente
+        self.assertEqual(o_bucket.acquire(), 0)
+        self.assertEqual(o_bucket.acquire(), 0)
+        # Ensuite 50 requêtes par seconde au plus
+        for _ in range(5):
+            o_bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - f_start, 0.09)
+
+    def test_family(self) -> None:
+        """Vérifie le regroupement des routes en familles selon la configuration par défaut."""
+        self.assertEqual(RateLimiter().family("upload_push_data"), "upload_push")
+        self.assertEqual(RateLimiter().family("stored_data_list"), "list")
+        self.assertEqual(RateLimiter().family("processing_execution_logs"), "logs")
+        self.assertEqual(RateLimiter().family("upload_delete"), "delete")
+        self.assertIsNone(RateLimiter().family("upload_get"))
+        self.assertIsNone(RateLimiter().family(None))
+
+    def test_limit(self) -> None:
+        """Vérifie la limite de requêtes simultanées par famille et le débit global."""
+        with RateLimiterTestCase.patch_config({"rate": "0", "families": '{"test": "^test_"}', "test_max_in_flight": "2"}):
+            RateLimiter()
+        i_in_flight = 0
+        i_max_in_flight = 0
+        o_lock = threading.Lock()
+
+        def request(s_route: str) -> None:
+            nonlocal i_in_flight, i_max_in_flight
+            with RateLimiter().limit(s_route):
+                with o_lock:
+                    i_in_flight += 1
+                    i_max_in_flight = max(i_max_in_flight, i_in_flight)
+                time.sleep(0.02)
+                with o_lock:
+                    i_in_flight -= 1
+
+        with ThreadPoolExecutor(max_workers=6) as o_executor:
+            list(o_executor.map(request, ["test_route"] * 6))
+        self.assertEqual(i_max_in_flight, 2)
+        # Débit global
+        RateLimiter._instance = None
+        with RateLimiterTestCase.patch_config({"rate": "100", "burst": "1", "families": "{}"}):
+            RateLimiter()
+        f_start = time.monotonic()
+        for _ in range(4):
+            with RateLimiter().limit("other_route"):
+                pass
+        self.assertGreaterEqual(time.monotonic() - f_start, 0.025)
+
+    def test_limit_async(self) -> None:
+        """Vérifie la limite de requêtes simultanées et le débit depuis du code asynchrone."""
+        with RateLimiterTestCase.patch_config({"rate": "50", "burst": "2", "families": '{"test": "^test_"}', "test_max_in_flight": "2"}):
+            RateLimiter()
+        i_in_flight = 0
+        i_max_in_flight = 0
+
+        async def request(s_route: str) -> None:
+            nonlocal i_in_flight, i_max_in_flight
+            async with RateLimiter().limit_async(s_route):
+                i_in_flight += 1
+                i_max_in_flight = max(i_max_in_flight, i_in_flight)
+                await asyncio.sleep(0.02)
+                i_in_flight -= 1
+
+        async def main() -> None:
+            await asyncio.gather(*[request("test_route") for _ in range(7)])
+
+        f_start = time.monotonic()
+        asyncio.run(main())
+        self.assertEqual(i_max_in_flight, 2)
+        # Rafale de 2 puis 50 requêtes par seconde au plus
+        self.assertGreaterEqual(time.monotonic() - f_start, 0.09)
@@ -0,0 +1,77 @@
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.RetryPolicy import RetryPolicy
+from tests.GpfTestCase import GpfTestCase
+
+
+class RetryPolicyTestCase(GpfTestCase):
+    """Tests RetryPolicy class.
+
+    cmd : python3 -m unittest -b tests.io.RetryPolicyTestCase
+    """
+
+    def test_from_config(self) -> None:
+        """Vérifie que la politique par défaut correspond au comportement historique et que les surcharges s'appliquent."""
+        o_policy = RetryPolicy.from_config()
+        self.assertEqual(o_policy.nb_attempts, Config().get_int("store_api", "nb_attempts"))
+        self.assertEqual(o_policy.sec_between_attempt, Config().get_float("store_api", "sec_between_attempt"))
+        self.assertEqual(o_policy.backoff, RetryPolicy.BACKOFF_FIXED)
+        self.assertFalse(o_policy.jitter)
+        self.assertFalse(o_policy.idempotent_only)
+        self.assertEqual(o_policy.deadline_sec, 0)
+        # Route sans surcharge
+        self.assertEqual(vars(RetryPolicy.from_config("datastore_get")), vars(o_policy))
+        # Surcharges de la route puis du code retour
+        f_get = Config().get
+        s_retry = '{"backoff": "exponential", "status": {"429": {"nb_attempts": 10, "jitter": true}}}'
+        with patch.object(Config(), "get", side_effect=lambda s, o, fallback=None: s_retry if o == "upload_push_data_retry" else f_get(s, o, fallback)):
+            o_route_policy = RetryPolicy.from_config("upload_push_data")
+        self.assertEqual(o_route_policy.backoff, RetryPolicy.BACKOFF_EXPONENTIAL)
+        self.assertIs(o_route_policy.for_status(503), o_route_policy)
+        o_status_policy = o_route_policy.for_status(429)
+        self.assertEqual(o_status_policy.nb_attempts, 10)
+        self.assertTrue(o_status_policy.jitter)
+        self.assertEqual(o_status_policy.backoff, RetryPolicy.BACKOFF_EXPONENTIAL)
+
+    def test_get_delay(self) -> None:
+        """Vérifie le calcul du délai avant la tentative suivante."""
+        f_start = time.monotonic()
+        # Délai fixe, jusqu'au nombre de tentatives
+        o_policy = RetryPolicy(3, 2)
+        self.assertEqual(o_policy.get_delay(1, "POST", f_start), 2)
+        self.assertEqual(o_policy.get_delay(2, "POST", f_start), 2)
+        self.assertIsNone(o_policy.get_delay(3, "POST", f_start))
+        # Délai exponentiel plafonné
+        o_policy = RetryPolicy(10, 1, backoff=RetryPolicy.BACKOFF_EXPONENTIAL, sec_max=5)
+        self.assertListEqual([o_policy.get_delay(i, "GET", f_start) for i in range(1, 6)], [1, 2, 4, 5, 5])
+        # Tirage aléatoire entre 0 et le délai calculé
+        o_policy = RetryPolicy(10, 1, backoff=RetryPolicy.BACKOFF_EXPONENTIAL, sec_max=5, jitter=True)
+        for i in range(1, 6):
+            f_delay = o_policy.get_delay(i, "GET", f_start)
+            assert f_delay is not None
+            self.assertTrue(0 <= f_delay <= min(5, 2 ** (i - 1)))
+        # Retry-After respecté (ou non)
+        self.assertEqual(RetryPolicy(3, 1).get_delay(1, "GET", f_start, 30), 30)
+        self.assertEqual(RetryPolicy(3, 1, retry_after=False).get_delay(1, "GET", f_start, 30), 1)
+        # Méthodes idempotentes uniquement
+        o_policy = RetryPolicy(3, 1, idempotent_only=True)
+        self.assertEqual(o_policy.get_delay(1, "put", f_start), 1)
+        self.assertIsNone(o_policy.get_delay(1, "POST", f_start))
+        # Durée totale maximale
+        o_policy = RetryPolicy(10, 4, deadline_sec=10)
+        self.assertEqual(o_policy.get_delay(1, "GET", f_start), 4)
+        self.assertIsNone(o_policy.get_delay(1, "GET", f_start - 8))
+
+    def test_parse_retry_after(self) -> None:
+        """Vérifie la lecture de l'entête Retry-After."""
+        self.assertIsNone(RetryPolicy.parse_retry_after(None))
+        self.assertIsNone(RetryPolicy.parse_retry_after("pas une date"))
+        self.assertEqual(RetryPolicy.parse_retry_after("120"), 120)
+        self.assertEqual(RetryPolicy.parse_retry_after("-5"), 0)
+        f_delay = RetryPolicy.parse_retry_after(format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True))
+        assert f_delay is not None
+        self.assertTrue(50 < f_delay <= 60)
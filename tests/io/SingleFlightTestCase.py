@@ -0,0 +1,77 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from sdk_entrepot_gpf.io.SingleFlight import SingleFlight
+from tests.GpfTestCase import GpfTestCase
+
+# pylint:disable=protected-access
+
+
+class SingleFlightTestCase(GpfTestCase):
+    """Tests SingleFlight class.
+
+    cmd : python3 -m unittest -b tests.io.SingleFlightTestCase
+    """
+
+    def setUp(self) -> None:
+        # On détruit le singleton SingleFlight
+        SingleFlight._instance = None
+
+    def tearDown(self) -> None:
+        SingleFlight._instance = None
+
+    def wait_shared(self, i_shared: int) -> None:
+        """Attend que le nombre d'appels en attente du résultat d'un autre atteigne la valeur indiquée."""
+        f_end = time.monotonic() + 5
+        while SingleFlight().shared < i_shared and time.monotonic() < f_end:
+            time.sleep(0.001)
+        self.assertEqual(SingleFlight().shared, i_shared)
+
+    def test_call(self) -> None:
+        """Vérifie que les appels simultanés de même clef partagent un seul appel, et que les suivants refont l'appel."""
+        o_started = threading.Event()
+        o_release = threading.Event()
+        l_calls: List[str] = []
+
+        def function() -> str:
+            l_calls.append("call")
+            o_started.set()
+            o_release.wait(5)
+            return "résultat"
+
+        with ThreadPoolExecutor(max_workers=4) as o_executor:
+            o_leader = o_executor.submit(lambda: SingleFlight().call("clef", function))
+            o_started.wait(5)
+            l_followers = [o_executor.submit(lambda: SingleFlight().call("clef", function)) for _ in range(3)]
+            self.wait_shared(3)
+            o_release.set()
+            self.assertEqual(o_leader.result(timeout=5), ("résultat", False))
+            for o_future in l_followers:
+                self.assertEqual(o_future.result(timeout=5), ("résultat", True))
+        self.assertEqual(len(l_calls), 1)
+        # Appel terminé : l'appel suivant est refait
+        self.assertEqual(SingleFlight().call("clef", function), ("résultat", False))
+        self.assertEqual(len(l_calls), 2)
+
+    def test_call_error(self) -> None:
+        """Vérifie que l'erreur de l'appel est transmise à tous les appelants."""
+        o_started = threading.Event()
+        o_release = threading.Event()
+
+        def function() -> str:
+            o_started.set()
+            o_release.wait(5)
+            raise ValueError("erreur")
+
+        with ThreadPoolExecutor(max_workers=2) as o_executor:
+            o_leader = o_executor.submit(lambda: SingleFlight().call("clef", function))
+            o_started.wait(5)
+            o_follower = o_executor.submit(lambda: SingleFlight().call("clef", function))
+            self.wait_shared(1)
+            o_release.set()
+            with self.assertRaises(ValueError):
+                o_leader.result(timeout=5)
+            with self.assertRaises(ValueError):
+                o_follower.result(timeout=5)
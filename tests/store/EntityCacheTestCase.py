@@ -0,0 +1,115 @@
+from unittest.mock import patch
+
+from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.Errors import NotFoundError
+from sdk_entrepot_gpf.store.EntityCache import EntityCache
+from sdk_entrepot_gpf.store.StoreEntity import StoreEntity
+from sdk_entrepot_gpf.store.Configuration import Configuration
+from sdk_entrepot_gpf.store.Offering import Offering
+from sdk_entrepot_gpf.store.Upload import Upload
+from tests.GpfTestCase import GpfTestCase
+
+# pylint:disable=protected-access
+
+
+class EntityCacheTestCase(GpfTestCase):
+    """Tests EntityCache class.
+
+    cmd : python3 -m unittest -b tests.store.EntityCacheTestCase
+    """
+
+    def setUp(self) -> None:
+        # On détruit le singleton EntityCache
+        EntityCache._instance = None
+
+    def tearDown(self) -> None:
+        EntityCache._instance = None
+
+    def test_disabled(self) -> None:
+        """Vérifie que la table n'est pas utilisée par défaut."""
+        self.assertFalse(EntityCache().enabled)
+        o_entity = StoreEntity({"_id": "1"}, "datastore")
+        EntityCache().set(o_entity)
+        self.assertIsNone(EntityCache().get(StoreEntity, "datastore", "1"))
+        # api_get fait donc toujours la requête
+        o_response = GpfTestCase.get_response(json={"_id": "1"})
+        with patch.object(ApiRequester(), "route_request", return_value=o_response) as o_mock_request:
+            StoreEntity.api_get("1", "datastore")
+            StoreEntity.api_get("1", "datastore")
+        self.assertEqual(o_mock_request.call_count, 2)
+
+    def test_get_set_invalidate(self) -> None:
+        """Vérifie le bon fonctionnement de get, set et invalidate."""
+        with patch.object(Config(), "get_float", return_value=60):
+            o_entity = StoreEntity({"_id": "1"}, "datastore")
+            EntityCache().set(o_entity)
+            # Même instance pour la même clef (classe, datastore, id)
+            self.assertIs(EntityCache().get(StoreEntity, "datastore", "1"), o_entity)
+            self.assertIsNone(EntityCache().get(StoreEntity, "other_datastore", "1"))
+            self.assertIsNone(EntityCache().get(Upload, "datastore", "1"))
+            self.assertEqual(EntityCache().hits, 1)
+            self.assertEqual(EntityCache().misses, 2)
+            # Invalidation
+            EntityCache().invalidate(o_entity)
+            self.assertIsNone(EntityCache().get(StoreEntity, "datastore", "1"))
+            # Vidage
+            EntityCache().set(o_entity)
+            EntityCache().clear()
+            self.assertIsNone(EntityCache().get(StoreEntity, "datastore", "1"))
+        # Expiration
+        with patch.object(Config(), "get_float", return_value=-1):
+            EntityCache().set(o_entity)
+        with patch.object(Config(), "get_float", return_value=60):
+            self.assertIsNone(EntityCache().get(StoreEntity, "datastore", "1"))
+
+    def test_api_get_update(self) -> None:
+        """Vérifie l'utilisation de la table par api_get, api_update et api_delete."""
+        o_response = GpfTestCase.get_response(json={"_id": "1", "name": "nom"})
+        with patch.object(Config(), "get_float", return_value=60):
+            with patch.object(ApiRequester(), "route_request", return_value=o_response) as o_mock_request:
+                # Une seule requête pour deux lectures : la même instance est renvoyée
+                o_entity = StoreEntity.api_get("1", "datastore")
+                self.assertIs(StoreEntity.api_get("1", "datastore"), o_entity)
+                o_mock_request.assert_called_once()
+                # api_update utilise la table seulement si demandé
+                o_other = StoreEntity({"_id": "1"}, "datastore")
+                o_other.api_update(use_cache=True)
+                self.assertEqual(o_other["name"], "nom")
+                o_mock_request.assert_called_once()
+                o_other.api_update()
+                self.assertEqual(o_mock_request.call_count, 2)
+                # Suppression : l'entité est retirée de la table
+                o_other.api_delete()
+                self.assertIsNone(EntityCache().get(StoreEntity, "datastore", "1"))
+            # Entité non trouvée lors de la mise à jour : elle est retirée de la table
+            EntityCache().set(o_entity)
+            with patch.object(ApiRequester(), "route_request", side_effect=NotFoundError("url", "GET", None, None, "")):
+                with self.assertRaises(NotFoundError):
+                    o_entity.api_update()
+            self.assertIsNone(EntityCache().get(StoreEntity, "datastore", "1"))
+
+    def test_invalidate_on_change(self) -> None:
+        """Vérifie que les partages, commentaires, vérifications et offres invalident l'entité."""
+        with patch.object(Config(), "get_float", return_value=60):
+            with patch.object(ApiRequester(), "route_request", return_value=None):
+                # Partages, commentaires et vérifications (portés par la Livraison)
+                o_upload = Upload({"_id": "2"}, "datastore")
+                for s_method, l_args in [
+                    ("api_add_sharings", [["d1"]]),
+                    ("api_remove_sharings", [["d1"]]),
+                    ("api_add_comment", [{"text": "t"}]),
+                    ("api_edit_comment", ["c1", {"text": "t"}]),
+                    ("api_remove_comment", ["c1"]),
+                    ("api_run_checks", [["check"]]),
+                ]:
+                    EntityCache().set(o_upload)
+                    getattr(o_upload, s_method)(*l_args)
+                    self.assertIsNone(EntityCache().get(Upload, "datastore", "2"), s_method)
+            # Publication d'une offre
+            o_configuration = Configuration({"_id": "1"}, "datastore")
+            EntityCache().set(o_configuration)
+            with patch.object(Offering, "api_create", return_value=Offering({"_id": "3"}, "datastore")) as o_mock_create:
+                o_configuration.api_add_offering({"key": "value"})
+            o_mock_create.assert_called_once_with({"key": "value"}, route_params={"configuration": "1", "datastore": "datastore"})
+            self.assertIsNone(EntityCache().get(Configuration, "datastore", "1"))
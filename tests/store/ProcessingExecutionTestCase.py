@@ -56,3 +56,19 @@ class ProcessingExecutionTestCase(GpfTestCase):
             # on vérifie que route_request est appelé correctement
             o_mock_get_datetime.assert_called_once_with("launch")
             self.assertEqual(o_datetime, o_mock_get_datetime.return_value)
+
+    def test_api_expected_duration(self) -> None:
+        """Vérifie le bon fonctionnement de api_expected_duration."""
+        l_executions = [
+            ProcessingExecution({"_id": "1", "start": "2024-01-01T10:00:00+00:00", "finish": "2024-01-01T10:10:00+00:00"}),
+            ProcessingExecution({"_id": "2", "start": "2024-01-01T10:00:00+00:00", "finish": "2024-01-01T10:20:00+00:00"}),
+            ProcessingExecution({"_id": "3", "start": "2024-01-01T10:00:00+00:00", "finish": "2024-01-01T11:00:00+00:00"}),
+        ]
+        with patch.object(ProcessingExecution, "api_iter", return_value=iter(l_executions)) as o_mock_iter:
+            self.assertEqual(ProcessingExecution.api_expected_duration("id_processing", "datastore_id"), 1200)
+            o_mock_iter.assert_called_once_with(infos_filter={"processing": "id_processing", "status": "SUCCESS"}, datastore="datastore_id")
+        # Pas d'historique ou historique indisponible
+        with patch.object(ProcessingExecution, "api_iter", return_value=iter([])):
+            self.assertIsNone(ProcessingExecution.api_expected_duration("id_processing"))
+        with patch.object(ProcessingExecution, "api_iter", side_effect=Exception("erreur")):
+            self.assertIsNone(ProcessingExecution.api_expected_duration("id_processing"))
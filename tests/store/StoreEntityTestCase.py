@@ -1,13 +1,17 @@
+import asyncio
 import json
-import time
 from typing import List
-from unittest.mock import MagicMock, Mock, call, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 from sdk_entrepot_gpf.store.Errors import StoreEntityError
 from sdk_entrepot_gpf.store.StoreEntity import StoreEntity
 from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
+from sdk_entrepot_gpf.io.AsyncApiRequester import AsyncApiRequester
+from sdk_entrepot_gpf.io.PageSizeManager import PageSizeManager
 from tests.GpfTestCase import GpfTestCase
 
+# pylint:disable=protected-access
+
 
 class StoreEntityTestCase(GpfTestCase):
     """Tests StoreEntity class.
@@ -15,6 +19,10 @@ class StoreEntityTestCase(GpfTestCase):
     cmd : python3 -m unittest -b tests.store.StoreEntityTestCase
     """
 
+    def setUp(self) -> None:
+        # On détruit le singleton PageSizeManager (tailles de page mémorisées)
+        PageSizeManager._instance = None
+
     def test_init_getters(self) -> None:
         """Vérifie le bon fonctionnement du constructeur et des getters."""
         # Donnée renvoyée par l'API
@@ -105,6 +113,24 @@ class StoreEntityTestCase(GpfTestCase):
             self.assertEqual(o_store_entity.id, "123456789")
             self.assertEqual(o_store_entity.datastore, "datastore1")
 
+    def test_api_async(self) -> None:
+        """Vérifie que les versions asynchrones appellent l'API comme les versions synchrones."""
+        o_response = GpfTestCase.get_response(json={"_id": "123456789"})
+        with patch.object(AsyncApiRequester(), "route_request", new=AsyncMock(return_value=o_response)) as o_mock_request:
+            o_store_entity = asyncio.run(StoreEntity.api_get_async("1234", "datastore1"))
+            o_mock_request.assert_called_once_with(
+                "store_entity_get",
+                route_params={"datastore": "datastore1", StoreEntity.entity_name(): "1234"},
+            )
+            self.assertEqual(o_store_entity.id, "123456789")
+            self.assertEqual(o_store_entity.datastore, "datastore1")
+            asyncio.run(o_store_entity.api_delete_async())
+            o_mock_request.assert_called_with(
+                "store_entity_delete",
+                method=ApiRequester.DELETE,
+                route_params={"datastore": "datastore1", StoreEntity.entity_name(): "123456789"},
+            )
+
     def test_api_create_1(self) -> None:
         """Vérifie le bon fonctionnement de api_create sans route_params."""
         # on créé un store entity dans l'api (avec un dictionnaire)
@@ -211,6 +237,8 @@ class StoreEntityTestCase(GpfTestCase):
             for i, o_entity in enumerate(l_entities, start=1):
                 self.assertIsInstance(o_entity, StoreEntity)
                 self.assertEqual(o_entity.id, str(i))
+            # La première page était complète : la taille de page de la route a augmenté
+            self.assertEqual(PageSizeManager().get("store_entity_list", 10), 40)
 
         # 2 : si on demande une page précisé (la 1) on ne fait pas d'autre requête
         # On mock la fonction route_request, on veut vérifier qu'elle est appelée avec les bons param
@@ -296,6 +324,29 @@ class StoreEntityTestCase(GpfTestCase):
                 self.assertIsInstance(o_entity, StoreEntity)
                 self.assertEqual(o_entity.id, str(i))
 
+    def test_api_iter(self) -> None:
+        """Vérifie le bon fonctionnement de api_iter."""
+        l_pages = [[{"_id": str(i)} for i in range(1, 11)], [{"_id": str(i)} for i in range(11, 13)]]
+        # On mock la fonction route_request_pages, on veut vérifier qu'elle est appelée avec les bons param
+        with patch.object(ApiRequester(), "route_request_pages", return_value=iter(l_pages)) as o_mock_pages:
+            # On effectue le listing d'une entité
+            o_iter = StoreEntity.api_iter(infos_filter={"k_info": "v_info"}, tags_filter={"k_tag": "v_tag"}, datastore="datastore1")
+            # Rien n'est demandé tant que l'on n'itère pas
+            o_mock_pages.assert_not_called()
+            # La première entité est disponible dès la première page
+            o_entity = next(o_iter)
+            self.assertIsInstance(o_entity, StoreEntity)
+            self.assertEqual(o_entity.id, "1")
+            self.assertEqual(o_entity.datastore, "datastore1")
+            o_mock_pages.assert_called_once_with(
+                "store_entity_list",
+                route_params={"datastore": "datastore1"},
+                params={"k_info": "v_info", "tags[k_tag]": "v_tag"},
+                limit=10,
+            )
+            # Puis les suivantes
+            self.assertListEqual([o_entity.id for o_entity in o_iter], [str(i) for i in range(2, 13)])
+
     def test_api_delete(self) -> None:
         """Vérifie le bon fonctionnement de api_delete."""
         # on créé une instance puis on la supprime
@@ -403,8 +454,7 @@ class StoreEntityTestCase(GpfTestCase):
             o_store_entity.delete_cascade(o_mock.before_delete_function)
             o_mock_delete.assert_called_once_with([o_store_entity], o_mock.before_delete_function)
 
-    @patch.object(time, "sleep", return_value=None)
-    def test_delete_liste_entities(self, o_mock_sleep: Mock) -> None:
+    def test_delete_liste_entities(self) -> None:
         """test de delete_liste_entities"""
 
         o_mock_1 = MagicMock()
@@ -416,12 +466,10 @@ class StoreEntityTestCase(GpfTestCase):
             o_mock_1.reset_mock()
             o_mock_2.reset_mock()
             o_mock_3.reset_mock()
-            o_mock_sleep.reset_mock()
 
         # suppression d'un élément sans before_delete
         StoreEntity.delete_liste_entities([o_mock_1])
         o_mock_1.api_delete.assert_called_once_with()
-        self.assertEqual(1, o_mock_sleep.call_count)
         reset_mock()
 
         # suppression de plusieurs éléments sans before_delete
@@ -429,7 +477,6 @@ class StoreEntityTestCase(GpfTestCase):
         StoreEntity.delete_liste_entities(l_entity)
         o_mock_1.api_delete.assert_called_once_with()
         o_mock_2.api_delete.assert_called_once_with()
-        self.assertEqual(2, o_mock_sleep.call_count)
         reset_mock()
 
         # suppression avec before_delete, sans modification
@@ -439,7 +486,6 @@ class StoreEntityTestCase(GpfTestCase):
         o_mock_function.before_delete_function.assert_called_once_with(l_entity)
         o_mock_1.api_delete.assert_called_once_with()
         o_mock_2.api_delete.assert_called_once_with()
-        self.assertEqual(2, o_mock_sleep.call_count)
         reset_mock()
 
         # suppression avec before_delete, avec modification
@@ -450,7 +496,6 @@ class StoreEntityTestCase(GpfTestCase):
         o_mock_1.api_delete.assert_called_once_with()
         o_mock_2.api_delete.assert_not_called()
         o_mock_3.api_delete.assert_called_once_with()
-        self.assertEqual(2, o_mock_sleep.call_count)
         reset_mock()
 
         # suppression avec before_delete, avec annulation liste vide ou None
@@ -462,7 +507,6 @@ class StoreEntityTestCase(GpfTestCase):
             o_mock_1.api_delete.assert_not_called()
             o_mock_2.api_delete.assert_not_called()
             o_mock_3.api_delete.assert_not_called()
-            self.assertEqual(0, o_mock_sleep.call_count)
             reset_mock()
 
     def test_edit(self) -> None:
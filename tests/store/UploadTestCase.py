@@ -39,6 +39,7 @@ class UploadTestCase(GpfTestCase):
                 route_params={"datastore": "id_datastore", "upload": "id_de_test"},
                 params={"path": s_api_path + "/" + p_file_path.name},
                 method=ApiRequester.POST,
+                on_md5=None,
             )
 
     def test_api_push_md5_file(self) -> None:
@@ -1,7 +1,15 @@
+import tempfile
 from pathlib import Path
-from unittest.mock import mock_open, patch
+from typing import Any, Dict, Iterator, List, Optional
+from unittest.mock import MagicMock, patch
+import requests
 
+from sdk_entrepot_gpf.Errors import GpfSdkError
+from sdk_entrepot_gpf.helper.FileHelper import FileHelper
 from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.Errors import StatusCodeError
+from sdk_entrepot_gpf.store.Errors import StoreEntityError
 from sdk_entrepot_gpf.store.interface.DownloadInterface import DownloadInterface
 from tests.GpfTestCase import GpfTestCase
 
@@ -14,21 +22,204 @@ class DownloadInterfaceTestCase(GpfTestCase):
 
     def test_api_download(self) -> None:
         """Vérifie le bon fonctionnement de api_download."""
-        p_file = Path("rep/output.txt")
-        o_response = GpfTestCase.get_response(content=b"contenu du fichier")
+        o_response = GpfTestCase.get_response(content=b"contenu du fichier", headers={"Content-Length": "18"})
         for s_datastore in [None, "api_download"]:
-            # On mock la fonction route_request, on veut vérifier qu'elle est appelée avec les bons param
-            with patch.object(ApiRequester, "route_request", return_value=o_response) as o_mock_request:
-                o_opener = mock_open()
-                with patch.object(Path, "open", return_value=o_opener.return_value) as o_mock_open:
+            with tempfile.TemporaryDirectory() as s_tmp_dir:
+                p_file = Path(s_tmp_dir) / "output.txt"
+                # On mock la fonction route_request, on veut vérifier qu'elle est appelée avec les bons param
+                with patch.object(ApiRequester, "route_request", return_value=o_response) as o_mock_request:
                     # On instancie une entité qu'on va télécharger
                     o_download_interface = DownloadInterface({"_id": "id_entité"}, s_datastore)
                     # On appelle la fonction api_download
                     o_download_interface.api_download(p_file)
-                    # Vérification sur o_mock_request
+                    # Vérification sur o_mock_request : téléchargement en flux, première plage demandée (ignorée par le serveur)
                     o_mock_request.assert_called_once_with(
                         "store_entity_download",
                         route_params={"store_entity": "id_entité", "datastore": s_datastore},
+                        header={"Range": "bytes=0-33554431"},
+                        stream=True,
                     )
-                    o_mock_open.assert_called_once_with("wb", encoding="UTF-8")
-                    o_opener.return_value.write.assert_called_once()
+                # Fichier écrit, fichier temporaire renommé
+                self.assertEqual(p_file.read_bytes(), b"contenu du fichier")
+                self.assertFalse((Path(s_tmp_dir) / "output.txt.part").exists())
+
+    def test_api_download_resume(self) -> None:
+        """Vérifie la reprise d'un téléchargement à partir du fichier temporaire, et le cas où le serveur ne gère pas les plages."""
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_file = Path(s_tmp_dir) / "output.txt"
+            p_part = Path(s_tmp_dir) / "output.txt.part"
+            p_validator = Path(s_tmp_dir) / "output.txt.part.validator"
+            # Reprise : seule la fin est demandée, si le fichier distant n'a pas changé
+            p_part.write_bytes(b"contenu ")
+            p_validator.write_text('"v1"', encoding="utf-8")
+            o_response = GpfTestCase.get_response(content=b"du fichier", status_code=206, headers={"Content-Range": "bytes 8-17/18", "ETag": '"v1"'})
+            with patch.object(ApiRequester, "route_request", return_value=o_response) as o_mock_request:
+                DownloadInterface({"_id": "id_entité"}).api_download(p_file)
+                self.assertEqual(o_mock_request.call_args.kwargs["header"], {"Range": "bytes=8-", "If-Range": '"v1"'})
+            self.assertEqual(p_file.read_bytes(), b"contenu du fichier")
+            self.assertFalse(p_validator.exists())
+            # Plage ignorée par le serveur (200) : le fichier temporaire est réécrit
+            p_part.write_bytes(b"contenu ")
+            p_validator.write_text('"v1"', encoding="utf-8")
+            o_response = GpfTestCase.get_response(content=b"contenu du fichier")
+            with patch.object(ApiRequester, "route_request", return_value=o_response):
+                DownloadInterface({"_id": "id_entité"}).api_download(p_file)
+            self.assertEqual(p_file.read_bytes(), b"contenu du fichier")
+            # Plage hors du fichier (416) : le fichier temporaire était déjà complet
+            p_part.write_bytes(b"contenu complet")
+            p_validator.write_text('"v1"', encoding="utf-8")
+            o_error = GpfSdkError("erreur")
+            o_error.__cause__ = StatusCodeError("url", "GET", None, None, 416, "")
+            with patch.object(ApiRequester, "route_request", side_effect=o_error):
+                DownloadInterface({"_id": "id_entité"}).api_download(p_file)
+            self.assertEqual(p_file.read_bytes(), b"contenu complet")
+
+    def test_api_download_empty(self) -> None:
+        """Vérifie le téléchargement d'un fichier vide (première plage hors du fichier : 416)."""
+        o_error = GpfSdkError("erreur")
+        o_error.__cause__ = StatusCodeError("url", "GET", None, None, 416, "")
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_file = Path(s_tmp_dir) / "output.txt"
+            with patch.object(ApiRequester, "route_request", side_effect=o_error) as o_mock_request:
+                DownloadInterface({"_id": "id_entité"}).api_download(p_file)
+                o_mock_request.assert_called_once()
+                self.assertEqual(o_mock_request.call_args.kwargs["header"], {"Range": "bytes=0-33554431"})
+            self.assertEqual(p_file.read_bytes(), b"")
+            self.assertFalse((Path(s_tmp_dir) / "output.txt.part").exists())
+
+    def test_api_download_interrupted(self) -> None:
+        """Vérifie qu'un téléchargement coupé en cours de route reprend là où il s'est arrêté."""
+
+        def iter_content(chunk_size: int) -> Iterator[bytes]:  # pylint:disable=unused-argument
+            yield b"contenu "
+            raise requests.exceptions.ChunkedEncodingError("coupure")
+
+        o_interrupted = MagicMock(status_code=200, headers={"Content-Length": "18", "Last-Modified": "Wed, 14 Oct 2026 10:00:00 GMT"})
+        o_interrupted.__enter__.return_value = o_interrupted
+        o_interrupted.iter_content.side_effect = iter_content
+        o_end = GpfTestCase.get_response(content=b"du fichier", status_code=206, headers={"Content-Range": "bytes 8-17/18", "Last-Modified": "Wed, 14 Oct 2026 10:00:00 GMT"})
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_file = Path(s_tmp_dir) / "output.txt"
+            with patch.object(ApiRequester, "route_request", side_effect=[o_interrupted, o_end]) as o_mock_request, patch("time.sleep"):
+                DownloadInterface({"_id": "id_entité"}).api_download(p_file)
+                self.assertEqual(o_mock_request.call_count, 2)
+                self.assertEqual(o_mock_request.call_args.kwargs["header"], {"Range": "bytes=8-", "If-Range": "Wed, 14 Oct 2026 10:00:00 GMT"})
+            self.assertEqual(p_file.read_bytes(), b"contenu du fichier")
+
+    def test_api_download_remote_changed(self) -> None:
+        """Vérifie qu'un fichier temporaire n'est pas complété si le fichier distant a changé (ou ne peut être vérifié)."""
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_file = Path(s_tmp_dir) / "output.txt"
+            p_part = Path(s_tmp_dir) / "output.txt.part"
+            p_validator = Path(s_tmp_dir) / "output.txt.part.validator"
+            # Le serveur renvoie le nouveau fichier complet (If-Range non satisfait) : il remplace le fichier temporaire
+            p_part.write_bytes(b"ancien ")
+            p_validator.write_text('"v1"', encoding="utf-8")
+            o_response = GpfTestCase.get_response(content=b"nouveau fichier", headers={"ETag": '"v2"'})
+            with patch.object(ApiRequester, "route_request", return_value=o_response) as o_mock_request:
+                DownloadInterface({"_id": "id_entité"}).api_download(p_file)
+                self.assertEqual(o_mock_request.call_args.kwargs["header"], {"Range": "bytes=7-", "If-Range": '"v1"'})
+            self.assertEqual(p_file.read_bytes(), b"nouveau fichier")
+            # Le serveur ignore If-Range et renvoie la fin du nouveau fichier : on repart de zéro
+            p_part.write_bytes(b"ancien ")
+            p_validator.write_text('"v1"', encoding="utf-8")
+            o_changed = GpfTestCase.get_response(content=b"fichier", status_code=206, headers={"Content-Range": "bytes 7-14/15", "ETag": '"v2"'})
+            o_full = GpfTestCase.get_response(content=b"nouveau fichier", headers={"ETag": '"v2"'})
+            with patch.object(ApiRequester, "route_request", side_effect=[o_changed, o_full]) as o_mock_request, patch("time.sleep"):
+                DownloadInterface({"_id": "id_entité"}).api_download(p_file)
+                self.assertEqual(o_mock_request.call_count, 2)
+                self.assertEqual(o_mock_request.call_args.kwargs["header"], {"Range": "bytes=0-33554431"})
+            self.assertEqual(p_file.read_bytes(), b"nouveau fichier")
+            # Fichier temporaire sans validateur : on ne peut pas le vérifier, on repart de zéro
+            p_part.write_bytes(b"ancien ")
+            o_full = GpfTestCase.get_response(content=b"nouveau fichier")
+            with patch.object(ApiRequester, "route_request", return_value=o_full) as o_mock_request:
+                DownloadInterface({"_id": "id_entité"}).api_download(p_file)
+                self.assertEqual(o_mock_request.call_args.kwargs["header"], {"Range": "bytes=0-33554431"})
+            self.assertEqual(p_file.read_bytes(), b"nouveau fichier")
+
+    @staticmethod
+    def patch_config(d_values: Dict[str, str]) -> Any:
+        """Surcharge des paramètres de la section download."""
+        f_get = Config().get
+
+        def get(s_section: str, s_option: str, fallback: Optional[object] = None) -> Optional[str]:
+            if s_section == "download" and s_option in d_values:
+                return d_values[s_option]
+            return f_get(s_section, s_option, fallback)
+
+        return patch.object(Config(), "get", side_effect=get)
+
+    def test_api_download_ranges(self) -> None:
+        """Vérifie le téléchargement par plages parallèles et la reprise des plages manquantes."""
+        b_content = b"contenu du fichier en plusieurs plages"
+        l_ranges: List[str] = []
+        s_fail = ""
+        s_etag = '"v1"'
+
+        def route_request(*args: Any, **kwargs: Any) -> requests.Response:  # pylint:disable=unused-argument
+            s_range = kwargs["header"]["Range"]
+            l_ranges.append(s_range)
+            if s_range == s_fail:
+                raise requests.exceptions.ConnectionError("coupure")
+            if kwargs["header"].get("If-Range", s_etag) != s_etag:
+                return GpfTestCase.get_response(content=b_content, headers={"ETag": s_etag})
+            i_start, i_end = [int(s) for s in s_range[len("bytes=") :].split("-")]
+            i_end = min(i_end, len(b_content) - 1)
+            d_headers = {"Content-Range": f"bytes {i_start}-{i_end}/{len(b_content)}", "ETag": s_etag}
+            return GpfTestCase.get_response(content=b_content[i_start : i_end + 1], status_code=206, headers=d_headers)
+
+        with tempfile.TemporaryDirectory() as s_tmp_dir, DownloadInterfaceTestCase.patch_config({"range_size": "10", "nb_parallel_ranges": "3"}):
+            p_file = Path(s_tmp_dir) / "output.txt"
+            with patch.object(ApiRequester, "route_request", side_effect=route_request):
+                DownloadInterface({"_id": "id_entité"}).api_download(p_file)
+            self.assertEqual(p_file.read_bytes(), b_content)
+            self.assertEqual(l_ranges[0], "bytes=0-9")
+            self.assertListEqual(sorted(l_ranges[1:]), ["bytes=10-19", "bytes=20-29", "bytes=30-37"])
+            self.assertFalse((Path(s_tmp_dir) / "output.txt.part.ranges").exists())
+            # Coupure sur une plage : seule la plage manquante est téléchargée à la tentative suivante
+            l_ranges.clear()
+            s_fail = "bytes=20-29"
+            with patch.object(ApiRequester, "route_request", side_effect=route_request):
+                with DownloadInterfaceTestCase.patch_config({"range_size": "10", "nb_parallel_ranges": "3", "nb_attempts": "1"}):
+                    with self.assertRaises(GpfSdkError):
+                        DownloadInterface({"_id": "id_entité"}).api_download(p_file)
+                self.assertTrue((Path(s_tmp_dir) / "output.txt.part.ranges").exists())
+                l_ranges.clear()
+                s_fail = ""
+                DownloadInterface({"_id": "id_entité"}).api_download(p_file)
+            self.assertListEqual(l_ranges, ["bytes=20-29"])
+            self.assertEqual(p_file.read_bytes(), b_content)
+            # Fichier distant modifié entre deux tentatives : les plages déjà téléchargées sont abandonnées
+            s_fail = "bytes=20-29"
+            with patch.object(ApiRequester, "route_request", side_effect=route_request):
+                with DownloadInterfaceTestCase.patch_config({"range_size": "10", "nb_parallel_ranges": "3", "nb_attempts": "1"}):
+                    with self.assertRaises(GpfSdkError):
+                        DownloadInterface({"_id": "id_entité"}).api_download(p_file)
+                l_ranges.clear()
+                s_fail = ""
+                s_etag = '"v2"'
+                with patch("time.sleep"):
+                    DownloadInterface({"_id": "id_entité"}).api_download(p_file)
+            self.assertEqual(l_ranges[0], "bytes=20-29")
+            self.assertIn("bytes=0-9", l_ranges)
+            self.assertEqual(p_file.read_bytes(), b_content)
+            self.assertFalse((Path(s_tmp_dir) / "output.txt.part.ranges").exists())
+
+    def test_api_download_checksum(self) -> None:
+        """Vérifie la vérification de l'empreinte du fichier téléchargé."""
+        s_md5 = "5c5c0c6cd04d2d0b5b3e6d5b2c1b0ba8"
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_file = Path(s_tmp_dir) / "output.txt"
+            with patch.object(ApiRequester, "route_request", side_effect=lambda *a, **k: GpfTestCase.get_response(content=b"contenu du fichier")):
+                # Empreinte incorrecte : erreur, rien n'est conservé
+                with self.assertRaises(StoreEntityError):
+                    DownloadInterface({"_id": "id_entité"}).api_download(p_file, checksum=s_md5)
+                self.assertFalse(p_file.exists())
+                self.assertFalse((Path(s_tmp_dir) / "output.txt.part").exists())
+                # Empreinte correcte
+                p_expected = Path(s_tmp_dir) / "expected.txt"
+                p_expected.write_bytes(b"contenu du fichier")
+                s_sha256 = FileHelper.file_hash(p_expected, "sha256")
+                DownloadInterface({"_id": "id_entité"}).api_download(p_file, checksum=s_sha256.upper(), checksum_algorithm="sha256")
+            self.assertEqual(p_file.read_bytes(), b"contenu du fichier")
@@ -2,9 +2,12 @@ from typing import List, Dict, Any
 from unittest.mock import patch
 
 from sdk_entrepot_gpf.io.ApiRequester import ApiRequester
+from sdk_entrepot_gpf.io.PageSizeManager import PageSizeManager
 from sdk_entrepot_gpf.store.interface.LogsInterface import LogsInterface
 from tests.GpfTestCase import GpfTestCase
 
+# pylint:disable=protected-access
+
 
 class LogsInterfaceTestCase(GpfTestCase):
     """Tests LogsInterface class.
@@ -12,6 +15,10 @@ class LogsInterfaceTestCase(GpfTestCase):
     cmd : python3 -m unittest -b tests.store.interface.LogsInterfaceTestCase
     """
 
+    def setUp(self) -> None:
+        # On détruit le singleton PageSizeManager (tailles de page mémorisées)
+        PageSizeManager._instance = None
+
     def test_api_logs_monopage(self) -> None:
         "Vérifie le bon fonctionnement de api_logs (une seule page)."
         s_data = "2022/05/18 14:29:25       INFO §USER§ Envoi du signal de début de l'exécution à l'API.\n2022/05/18 14:29:25       INFO §USER§ Signal transmis avec succès."
@@ -1,7 +1,10 @@
 import json
+import threading
+import time
+from concurrent.futures import wait
 from pathlib import Path
 from typing import Any, Dict, Optional, Type, List
-from unittest.mock import PropertyMock, patch, MagicMock
+from unittest.mock import ANY, PropertyMock, patch, MagicMock
 
 import jsonschema
 
@@ -196,7 +199,7 @@ class WorkflowTestCase(GpfTestCase):
                     # si monitoring : vérification des appels à monitoring
                     if monitoring_until_end:
                         self.assertEqual(o_mock_action.resolve.call_count, len(l_run_args))
-                        o_mock_action.monitoring_until_end.assert_any_call(callback=d_args_run_step["callback"], ctrl_c_action=None)
+                        o_mock_action.monitoring_until_end.assert_any_call(callback=d_args_run_step["callback"], ctrl_c_action=None, stop_event=None)
 
     def test_run_step(self) -> None:
         """test de run_step"""
@@ -636,3 +639,120 @@ class WorkflowTestCase(GpfTestCase):
         self.assertEqual(l_steps[1], "Etape « etape2A » [parent(s) : etape1]")
         self.assertEqual(l_steps[2], "Etape « etape2B » [parent(s) : etape1]")
         self.assertEqual(l_steps[3], "Etape « etape3 » [parent(s) : etape2A, etape2B]")
+
+    def test_run_all(self) -> None:
+        """test de run_all"""
+        d_steps: Dict[str, Dict[str, List[str]]] = {
+            "etape1": {"parents": [], "actions": []},
+            "etape2A": {"parents": ["etape1"], "actions": []},
+            "etape2B": {"parents": ["etape1"], "actions": []},
+            "etape3": {"parents": ["etape2A", "etape2B"], "actions": []},
+            "etape4": {"parents": [], "actions": []},
+        }
+        o_workflow = Workflow("workflow_name", {"workflow": {"steps": d_steps}})
+        l_done: List[str] = []
+
+        def run_step(step_name: str, *args: Any, **kwargs: Any) -> List[Any]:  # pylint:disable=unused-argument
+            # les parents sont toujours terminés avant le lancement d'une étape
+            for s_parent in d_steps[step_name]["parents"]:
+                self.assertIn(s_parent, l_done)
+            if step_name in l_errors:
+                raise WorkflowError(f"erreur {step_name}")
+            l_done.append(step_name)
+            return [step_name]
+
+        # Tout se passe bien
+        l_errors: List[str] = []
+        with patch.object(o_workflow, "run_step", side_effect=run_step) as o_mock_run_step:
+            d_results = o_workflow.run_all(datastore="datastore_id", max_parallel_steps=2, continue_on_error=False)
+            self.assertEqual(o_mock_run_step.call_count, 5)
+            o_mock_run_step.assert_any_call("etape3", None, None, behavior=None, datastore="datastore_id", comments=[], tags={}, compatibility_cartes=None, stop_event=ANY)
+        self.assertDictEqual(d_results, {s: [s] for s in d_steps})
+
+        # Continue-on-error : les descendants de l'étape en erreur sont ignorés, pas les autres branches
+        l_done.clear()
+        l_errors = ["etape2A"]
+        with patch.object(o_workflow, "run_step", side_effect=run_step):
+            with self.assertRaises(WorkflowError) as o_arc:
+                o_workflow.run_all(max_parallel_steps=1, continue_on_error=True)
+        self.assertListEqual(l_done, ["etape1", "etape2B", "etape4"])
+        self.assertIn("etape2A : erreur etape2A", o_arc.exception.message)
+        self.assertIn("Étape(s) non lancée(s) : etape3", o_arc.exception.message)
+
+        # Fail-fast : plus aucune étape n'est lancée après l'erreur
+        l_done.clear()
+        l_errors = ["etape1"]
+        with patch.object(o_workflow, "run_step", side_effect=run_step):
+            with self.assertRaises(WorkflowError) as o_arc:
+                o_workflow.run_all(max_parallel_steps=1, continue_on_error=False)
+        self.assertListEqual(l_done, [])
+        self.assertIn("Étape(s) non lancée(s) : etape2A, etape2B, etape3, etape4", o_arc.exception.message)
+
+        # Dépendances incohérentes
+        o_workflow = Workflow("workflow_name", {"workflow": {"steps": {"etape1": {"parents": ["etape2"], "actions": []}, "etape2": {"parents": ["etape1"], "actions": []}}}})
+        with self.assertRaises(WorkflowError) as o_arc:
+            o_workflow.run_all()
+        self.assertEqual(o_arc.exception.message, "Les dépendances entre les étapes suivantes forment un cycle : etape1, etape2.")
+        o_workflow = Workflow("workflow_name", {"workflow": {"steps": {"etape1": {"parents": ["inconnue"], "actions": []}}}})
+        with self.assertRaises(WorkflowError) as o_arc:
+            o_workflow.run_all()
+        self.assertEqual(o_arc.exception.message, "Le parent « inconnue » de l'étape « etape1 » n'est pas défini dans le workflow workflow_name.")
+
+    def test_run_all_interrupt(self) -> None:
+        """test de run_all avec un ctrl-C : interruption depuis le thread principal"""
+        o_workflow = Workflow("workflow_name", {"workflow": {"steps": {"etape1": {"actions": []}, "etape2": {"actions": []}, "etape3": {"parents": ["etape1"], "actions": []}}}})
+        d_running: Dict[str, MagicMock] = getattr(o_workflow, "_Workflow__running_executions")
+        l_stopped: List[str] = []
+
+        def run_step(step_name: str, *args: Any, stop_event: threading.Event, **kwargs: Any) -> List[Any]:  # pylint:disable=unused-argument
+            # étape suivant une exécution de traitement jusqu'à l'arrêt demandé
+            d_running[step_name] = MagicMock()
+            if stop_event.wait(5):
+                l_stopped.append(step_name)
+                raise WorkflowError(f"Étape {step_name} interrompue.")
+            return [step_name]
+
+        def wait_interrupt(*args: Any, **kwargs: Any) -> Any:  # pylint:disable=unused-argument
+            # ctrl-C reçu par le thread principal une fois les deux étapes lancées
+            while len(d_running) < 2:
+                time.sleep(0.01)
+            raise KeyboardInterrupt()
+
+        f_ctrl_c = MagicMock(return_value=True)
+        f_callback = MagicMock()
+        with patch.object(o_workflow, "run_step", side_effect=run_step) as o_mock_run_step:
+            with patch("sdk_entrepot_gpf.workflow.Workflow.wait", side_effect=wait_interrupt):
+                f_start = time.monotonic()
+                with self.assertRaises(KeyboardInterrupt):
+                    o_workflow.run_all(f_callback, f_ctrl_c, max_parallel_steps=2)
+        # pas d'attente de la fin des étapes en cours, qui sont arrêtées
+        self.assertLess(time.monotonic() - f_start, 4)
+        f_ctrl_c.assert_called_once_with()
+        for o_action in d_running.values():
+            o_action.abort.assert_called_once_with(f_callback)
+        self.assertEqual(o_mock_run_step.call_count, 2)
+        for _ in range(100):
+            if len(l_stopped) == 2:
+                break
+            time.sleep(0.01)
+        self.assertCountEqual(l_stopped, ["etape1", "etape2"])
+
+        # ctrl-C annulé : le suivi reprend et toutes les étapes sont exécutées
+        d_running.clear()
+        l_waits: List[int] = []
+
+        def wait_once(*args: Any, **kwargs: Any) -> Any:
+            l_waits.append(1)
+            if len(l_waits) == 1:
+                raise KeyboardInterrupt()
+            return wait(*args, **kwargs)
+
+        def run_step_ok(step_name: str, *args: Any, **kwargs: Any) -> List[Any]:  # pylint:disable=unused-argument
+            return [step_name]
+
+        f_ctrl_c = MagicMock(return_value=False)
+        with patch.object(o_workflow, "run_step", side_effect=run_step_ok):
+            with patch("sdk_entrepot_gpf.workflow.Workflow.wait", side_effect=wait_once):
+                d_results = o_workflow.run_all(f_callback, f_ctrl_c, max_parallel_steps=2)
+        f_ctrl_c.assert_called_once_with()
+        self.assertListEqual(sorted(d_results), ["etape1", "etape2", "etape3"])
@@ -1,8 +1,8 @@
-import time
 from unittest.mock import patch, MagicMock
 from typing import Any, Dict, Optional
 from sdk_entrepot_gpf.Errors import GpfSdkError
 from sdk_entrepot_gpf.io.Errors import ConflictError
+from sdk_entrepot_gpf.io.PollingPolicy import PollingPolicy
 
 from sdk_entrepot_gpf.store.Offering import Offering
 from sdk_entrepot_gpf.store.Configuration import Configuration
@@ -105,7 +105,8 @@ class OfferingActionTestCase(GpfTestCase):
         # On mock find_offering et api_create
         with patch.object(o_offering_action, "find_offering", return_value=None) as o_mock_offering_action_list_offering:
             with patch.object(Offering, "api_create", return_value=o_mock_offering) as o_mock_offering_api_create:
-                with patch.object(time, "sleep", return_value=None) as o_mock_time:
+                # suivi en arrière-plan (MonitoringScheduler) avec un intervalle réduit
+                with patch.object(PollingPolicy, "get_interval", return_value=0.01) as o_mock_interval:
                     # on lance l'exécution de run
                     with self.assertRaises(StepActionError) as o_err:
                         o_offering_action.run("datastore")
@@ -114,7 +115,7 @@ class OfferingActionTestCase(GpfTestCase):
                     o_mock_offering_action_list_offering.assert_called_once()
                     o_mock_offering_api_create.assert_called_once_with(self.d_action["body_parameters"], route_params={"datastore": "datastore", **self.d_action["url_parameters"]})
                     self.assertEqual(o_mock_offering.api_update.call_count, 4)
-                    o_mock_time.assert_any_call(1)
+                    self.assertEqual(o_mock_interval.call_count, 2)
 
     # On mock find_offering et api_create
     def test_run_existing_behavior_continue(self) -> None:
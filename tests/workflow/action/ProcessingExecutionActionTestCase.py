@@ -1,10 +1,12 @@
 # mypy: disable-error-code="attr-defined"
+import threading
 import time
 from typing import Any, Dict, List
 
 from unittest.mock import PropertyMock, call, patch, MagicMock
 
 from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.PollingPolicy import PollingPolicy
 from sdk_entrepot_gpf.store.ProcessingExecution import ProcessingExecution
 from sdk_entrepot_gpf.store.StoredData import StoredData
 from sdk_entrepot_gpf.store.Upload import Upload
@@ -742,12 +744,14 @@ class ProcessingExecutionActionTestCase(GpfTestCase):
         o_mock_processing_execution.api_update.return_value = None
 
         with patch.object(ProcessingExecutionAction, "processing_execution", new_callable=PropertyMock, return_value=o_mock_processing_execution):
-            with patch.object(time, "sleep", return_value=None):
+            # suivi par le MonitoringScheduler, sans attente entre deux vérifications
+            with patch.object(PollingPolicy, "get_interval", return_value=0), patch.object(time, "sleep") as o_mock_sleep:
                 with patch.object(Config, "get_int", return_value=0):
 
                     # initialisation de ProcessingExecutionAction
                     o_pea = ProcessingExecutionAction("contexte", {})
                     s_return = o_pea.monitoring_until_end(f_callback, f_ctrl_c)
+                    o_mock_sleep.assert_not_called()
 
                     # vérification valeur de sortie
                     self.assertEqual(s_return, s_status_end)
@@ -786,20 +790,11 @@ class ProcessingExecutionActionTestCase(GpfTestCase):
         #     "b_stored_data", b_stored_data,
         #     "b_new_output", b_new_output,
         # )
+        # statuts lus par abort() : traitement en cours (interrompu) ou déjà terminé
         if b_waits:
-            i_nb_call_back = 4
-            l_status = [
-                {"status": ProcessingExecution.STATUS_CREATED},
-                {"status": ProcessingExecution.STATUS_WAITING},
-                {"status": ProcessingExecution.STATUS_PROGRESS},
-                {"raise": "KeyboardInterrupt"},
-                {"status": ProcessingExecution.STATUS_PROGRESS},
-                {"status": ProcessingExecution.STATUS_PROGRESS},
-                {"status": s_status_end},
-            ]
+            l_status = [ProcessingExecution.STATUS_PROGRESS, ProcessingExecution.STATUS_PROGRESS, s_status_end]
         else:
-            i_nb_call_back = 2
-            l_status = [{"status": ProcessingExecution.STATUS_PROGRESS}, {"raise": "KeyboardInterrupt"}, {"status": s_status_end}]
+            l_status = [s_status_end]
 
         f_callback = MagicMock() if b_callback else None
         if s_ctrl_c == "delete":
@@ -825,36 +820,20 @@ class ProcessingExecutionActionTestCase(GpfTestCase):
             o_mock_upload = None
             o_mock_stored_data = None
 
-        i_iter = 0
-
-        def status() -> Dict[str, Any]:
-            """fonction pour mock de get_store_properties (=> status)
-
-            Raises:
-                KeyboardInterrupt: simulation du Ctrl+C
-
-            Returns:
-                Dict[str, Any]: dict contenant le status
-            """
-            nonlocal i_iter
-            s_el = l_status[i_iter]
-
-            i_iter += 1
-            if "raise" in s_el:
-                raise KeyboardInterrupt()
-            return s_el
-
         # mock de o_mock_processing_execution
         o_mock_processing_execution = MagicMock(name="test")
-        o_mock_processing_execution.get_store_properties.side_effect = status
+        o_mock_processing_execution.get_store_properties.side_effect = [{"status": s_status} for s_status in l_status]
         o_mock_processing_execution.api_update.return_value = None
         o_mock_processing_execution.api_abort.return_value = None
+        # suivi en arrière-plan : ctrl+C pendant l'attente du résultat
+        o_mock_future = MagicMock()
+        o_mock_future.result.side_effect = [KeyboardInterrupt(), s_status_end]
 
         with patch.object(ProcessingExecutionAction, "processing_execution", new_callable=PropertyMock) as o_mock_pe:
             with patch.object(ProcessingExecutionAction, "upload", new_callable=PropertyMock) as o_mock_u:
                 with patch.object(ProcessingExecutionAction, "stored_data", new_callable=PropertyMock) as o_mock_sd:
-                    with patch.object(time, "sleep", return_value=None):
-                        with patch.object(Config, "get_int", return_value=0):
+                    with patch.object(ProcessingExecutionAction, "monitoring_in_background", return_value=o_mock_future) as o_mock_background:
+                        with patch.object(time, "sleep", return_value=None):
 
                             o_mock_pe.return_value = o_mock_processing_execution
                             o_mock_u.return_value = o_mock_upload
@@ -867,16 +846,12 @@ class ProcessingExecutionActionTestCase(GpfTestCase):
                             if s_ctrl_c == "pass":
                                 s_return = o_pea.monitoring_until_end(f_callback, f_ctrl_c)
 
-                                # vérification valeur de sortie
+                                # vérification valeur de sortie : on attend toujours le même suivi
                                 self.assertEqual(s_return, s_status_end)
-
-                                # vérification de l'attente
-                                ## update
-                                self.assertEqual(o_mock_processing_execution.api_update.call_count, len(l_status))
-                                ##log + callback
-                                if f_callback is not None:
-                                    self.assertEqual(f_callback.call_count, len(l_status))
-                                    self.assertEqual(f_callback.mock_calls, [call(o_mock_processing_execution)] * (len(l_status)))
+                                o_mock_background.assert_called_once_with(f_callback)
+                                self.assertEqual(o_mock_future.result.call_count, 2)
+                                o_mock_future.cancel.assert_not_called()
+                                o_mock_processing_execution.api_abort.assert_not_called()
                                 if f_ctrl_c:
                                     f_ctrl_c.assert_called_once_with()
                                 return
@@ -884,6 +859,7 @@ class ProcessingExecutionActionTestCase(GpfTestCase):
                             # vérification sortie en erreur de monitoring_until_end
                             with self.assertRaises(KeyboardInterrupt):
                                 o_pea.monitoring_until_end(f_callback, f_ctrl_c)
+                            o_mock_future.cancel.assert_called_once_with()
 
                             # exécution de abort
                             if not b_waits:
@@ -894,10 +870,9 @@ class ProcessingExecutionActionTestCase(GpfTestCase):
                             # vérification de l'attente
                             ## update
                             self.assertEqual(o_mock_processing_execution.api_update.call_count, len(l_status))
-                            ##log + callback
+                            ## callback (dernier affichage)
                             if f_callback is not None:
-                                self.assertEqual(f_callback.call_count, i_nb_call_back)
-                                self.assertEqual(f_callback.mock_calls, [call(o_mock_processing_execution)] * i_nb_call_back)
+                                f_callback.assert_called_once_with(o_mock_processing_execution)
 
                             # vérification suppression el de sortie si nouveau
                             if b_waits and s_status_end == ProcessingExecution.STATUS_ABORTED:
@@ -956,6 +931,34 @@ class ProcessingExecutionActionTestCase(GpfTestCase):
                 for o_upload in l_inputs:
                     o_upload.api_add_tags({"integration_progress": "execution_end_ko_integration_progress"})
 
+    def test_monitoring_until_end_stop_event(self) -> None:
+        """test de monitoring_until_end depuis un autre thread (stop_event) puis de abort"""
+        o_mock_processing_execution = MagicMock(name="test")
+        o_mock_processing_execution.get_store_properties.return_value = {"status": ProcessingExecution.STATUS_PROGRESS}
+        o_stop = threading.Event()
+        o_stop.set()
+        with patch.object(ProcessingExecutionAction, "processing_execution", new_callable=PropertyMock, return_value=o_mock_processing_execution):
+            o_pea = ProcessingExecutionAction("contexte", {"body_parameters": {}})
+            # suivi arrêté sans attendre ni interrompre le traitement
+            with patch.object(time, "sleep") as o_mock_sleep:
+                with self.assertRaises(StepActionError):
+                    o_pea.monitoring_until_end(stop_event=o_stop)
+            o_mock_sleep.assert_not_called()
+            o_mock_processing_execution.api_abort.assert_not_called()
+            # suivi en arrière-plan (MonitoringScheduler) jusqu'à la fin du traitement
+            o_mock_processing_execution.get_store_properties.side_effect = [{"status": ProcessingExecution.STATUS_PROGRESS}, {"status": ProcessingExecution.STATUS_SUCCESS}]
+            f_callback = MagicMock()
+            with patch.object(PollingPolicy, "get_interval", return_value=0.01):
+                s_status = o_pea.monitoring_until_end(f_callback, stop_event=threading.Event())
+            self.assertEqual(s_status, ProcessingExecution.STATUS_SUCCESS)
+            self.assertEqual(f_callback.call_count, 2)
+            # interruption par l'appelant
+            o_mock_processing_execution.get_store_properties.side_effect = [{"status": ProcessingExecution.STATUS_PROGRESS}, {"status": ProcessingExecution.STATUS_ABORTED}]
+            f_callback = MagicMock()
+            o_pea.abort(f_callback)
+            o_mock_processing_execution.api_abort.assert_called_once_with()
+            f_callback.assert_called_once_with(o_mock_processing_execution)
+
     def test_output_new_entity(self) -> None:
         """test de output_new_entity"""
         for s_output in ["upload", "stored_data"]:
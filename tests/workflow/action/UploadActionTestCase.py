@@ -1,5 +1,6 @@
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, call, patch
 
@@ -12,6 +13,8 @@ from sdk_entrepot_gpf.workflow.action.ActionAbstract import ActionAbstract
 from sdk_entrepot_gpf.workflow.action.UploadAction import UploadAction
 from sdk_entrepot_gpf.store.Upload import Upload
 from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.io.Dataset import Dataset
+from sdk_entrepot_gpf.helper.FileHelper import FileHelper
 from sdk_entrepot_gpf.Errors import GpfSdkError
 from tests.GpfTestCase import GpfTestCase
 
@@ -22,6 +25,7 @@ from tests.GpfTestCase import GpfTestCase
 # pylint:disable=dangerous-default-value
 # pylint:disable=too-many-statements
 # pylint:disable=protected-access
+# pylint:disable=too-many-lines
 # fmt: off
 # (on désactive le formatage en attendant Python 3.10 et la possibilité de mettre des parenthèses pour gérer le multi with proprement)
 
@@ -54,6 +58,13 @@ class  UploadActionNoPrivate(UploadAction):
             check_conflict (bool): Si une vérification de la bonne livraison des fichier en conflict ou en timeout est lancée.
         """
         self._UploadAction__push_data_files(check_conflict) # pylint: disable=no-member
+    def push_data_files_pipeline(self, check_conflict: bool = True) -> None:
+        """Téléverse les fichiers de données en pipeline.
+
+        Args:
+            check_conflict (bool): Si une vérification de la bonne livraison des fichier en conflict ou en timeout est lancée.
+        """
+        self._UploadAction__push_data_files_pipeline(check_conflict) # pylint: disable=no-member
     def push_md5_files(self, check_conflict: bool = True) -> None:
         """Téléverse les fichiers de clefs (listés dans le dataset).
 
@@ -166,7 +177,7 @@ class UploadActionTestCase(GpfTestCase):
         # upload None
         with patch.object(UploadAction, "_UploadAction__create_upload") as o_mock__create_upload:
 
-            o_mock_dataset = MagicMock()
+            o_mock_dataset = MagicMock(pipeline=False)
             o_ua = UploadAction(o_mock_dataset)
             with self.assertRaises(GpfSdkError) as o_err:
                 o_upload = o_ua.run(s_datastore)
@@ -183,7 +194,7 @@ class UploadActionTestCase(GpfTestCase):
             patch.object(UploadAction, "_UploadAction__check_file_uploaded") as o_mock__check_file_uploaded, \
             patch.object(UploadAction, "_UploadAction__close") as o_mock__close:
 
-            o_mock_dataset = MagicMock()
+            o_mock_dataset = MagicMock(pipeline=False)
             o_ua = UploadActionNoPrivate(o_mock_dataset)
             o_mock_upload = MagicMock()
             o_mock_upload.is_open.return_value = False
@@ -208,7 +219,7 @@ class UploadActionTestCase(GpfTestCase):
             patch.object(UploadAction, "_UploadAction__check_file_uploaded") as o_mock__check_file_uploaded, \
             patch.object(UploadAction, "_UploadAction__close") as o_mock__close:
 
-            o_mock_dataset = MagicMock()
+            o_mock_dataset = MagicMock(pipeline=False)
             o_ua = UploadActionNoPrivate(o_mock_dataset)
             o_mock_upload = MagicMock()
             o_mock_upload.is_open.return_value = True
@@ -243,7 +254,7 @@ class UploadActionTestCase(GpfTestCase):
             patch.object(UploadAction, "_UploadAction__check_file_uploaded", return_value=[]) as o_mock__check_file_uploaded, \
             patch.object(UploadAction, "_UploadAction__close") as o_mock__close:
 
-            o_mock_dataset = MagicMock()
+            o_mock_dataset = MagicMock(pipeline=False)
             o_mock_dataset.data_files = {
                 Path("file1"): "file1",
                 Path("file2"): "file2",
@@ -292,7 +303,7 @@ class UploadActionTestCase(GpfTestCase):
             patch.object(UploadAction, "_UploadAction__check_file_uploaded", return_value=l_error) as o_mock__check_file_uploaded, \
             patch.object(UploadAction, "_UploadAction__close") as o_mock__close:
 
-            o_mock_dataset = MagicMock()
+            o_mock_dataset = MagicMock(pipeline=False)
             o_mock_dataset.data_files = {
                 Path("file1"): "file1",
                 Path("file2"): "file2",
@@ -517,6 +528,96 @@ class UploadActionTestCase(GpfTestCase):
             )
 
 
+    def test_push_data_files_with_md5(self)->None:
+        """test de __push_data_files avec calcul des clefs md5 pendant l'envoi"""
+        o_dataset=MagicMock()
+        o_dataset.data_files = {Path("a"): "a"}
+        o_ua = UploadActionNoPrivate(o_dataset)
+        o_mock_upload = MagicMock()
+        o_ua.set_upload(o_mock_upload)
+        f_get = Config().get
+        def get(s_section: str, s_option: str, fallback: Optional[object] = None) -> Optional[str]:
+            if (s_section, s_option) == ("upload", "hash_while_upload"):
+                return "True"
+            return f_get(s_section, s_option, fallback)
+        with patch.object(Config(), "get", side_effect=get), patch.object(UploadAction, "_UploadAction__push_files") as o_mock_push_files:
+            o_ua.push_data_files()
+        f_api_push = o_mock_push_files.call_args.args[1]
+        self.assertNotEqual(f_api_push, o_mock_upload.api_push_data_file)
+        # la fonction d'envoi transmet au dataset la clef calculée pendant l'envoi
+        o_stat = MagicMock()
+        with patch.object(Path, "stat", return_value=o_stat):
+            f_api_push(Path("a"), "a")
+        o_mock_upload.api_push_data_file.assert_called_once()
+        o_mock_upload.api_push_data_file.call_args.kwargs["on_md5"]("clef")
+        o_dataset.set_md5.assert_called_once_with(Path("a"), "clef", o_stat)
+
+    def test_push_data_files_pipeline(self)->None:
+        """test de __push_data_files_pipeline"""
+        d_dataset = {"data_dirs": ["data"], "upload_infos": {}, "comments": [], "tags": {}}
+        f_get = Config().get
+        def get(s_section: str, s_option: str, fallback: Optional[object] = None) -> Optional[str]:
+            if (s_section, s_option) in [("upload", "pipeline"), ("upload", "pipeline_queue_size")]:
+                return {"pipeline": "True", "pipeline_queue_size": "2"}[s_option]
+            return f_get(s_section, s_option, fallback)
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_root = Path(s_tmp_dir)
+            (p_root / "data" / "sous_dossier").mkdir(parents=True)
+            for i in range(10):
+                (p_root / "data" / ("sous_dossier" if i % 2 else "") / f"fichier_{i}.txt").write_text(f"contenu {i}", encoding="utf-8")
+            with patch.object(Config(), "get", side_effect=get):
+                o_dataset = Dataset(d_dataset, p_root)
+                o_ua = UploadActionNoPrivate(o_dataset)
+                o_mock_upload = MagicMock()
+                o_ua.set_upload(o_mock_upload)
+                # fichier_0.txt déjà livré
+                with patch.object(UploadAction, "parse_tree", return_value={"data/fichier_0.txt": 9}):
+                    o_ua.push_data_files_pipeline()
+            # tous les fichiers sont listés et hachés, ceux pas encore livrés sont envoyés
+            self.assertEqual(len(o_dataset.data_files), 10)
+            self.assertListEqual(o_dataset.pending_md5, [])
+            self.assertEqual(o_mock_upload.api_push_data_file.call_count, 9)
+            self.assertSetEqual(
+                {(o_call.args[0].name, o_call.args[1]) for o_call in o_mock_upload.api_push_data_file.call_args_list},
+                {(f"fichier_{i}.txt", "data/sous_dossier" if i % 2 else "data") for i in range(1, 10)},
+            )
+            # fichier md5 conservé tel quel : les fichiers ne sont pas hachés
+            (p_root / "data.md5").write_text("format inconnu\n", encoding="utf-8")
+            with patch.object(Config(), "get", side_effect=get), patch.object(FileHelper, "md5_hash") as o_mock_hash:
+                o_dataset = Dataset(d_dataset, p_root)
+                o_ua = UploadActionNoPrivate(o_dataset)
+                o_ua.set_upload(MagicMock())
+                with patch.object(UploadAction, "parse_tree", return_value={}):
+                    o_ua.push_data_files_pipeline()
+                o_mock_hash.assert_not_called()
+            self.assertEqual(len(o_dataset.data_files), 10)
+
+    def test_push_data_files_pipeline_hash_while_upload(self)->None:
+        """test de __push_data_files_pipeline avec calcul des clefs pendant l'envoi : pas d'étape de calcul"""
+        d_dataset = {"data_dirs": ["data"], "upload_infos": {}, "comments": [], "tags": {}}
+        f_get = Config().get
+        def get(s_section: str, s_option: str, fallback: Optional[object] = None) -> Optional[str]:
+            if (s_section, s_option) in [("upload", "pipeline"), ("upload", "hash_while_upload")]:
+                return "True"
+            return f_get(s_section, s_option, fallback)
+        with tempfile.TemporaryDirectory() as s_tmp_dir:
+            p_root = Path(s_tmp_dir)
+            (p_root / "data").mkdir()
+            for i in range(4):
+                (p_root / "data" / f"fichier_{i}.txt").write_text(f"contenu {i}", encoding="utf-8")
+            with patch.object(Config(), "get", side_effect=get):
+                o_dataset = Dataset(d_dataset, p_root)
+                o_ua = UploadActionNoPrivate(o_dataset)
+                o_mock_upload = MagicMock()
+                o_mock_upload.api_push_data_file.side_effect = lambda p_file, s_api, on_md5: on_md5(FileHelper.md5_hash(p_file))
+                o_ua.set_upload(o_mock_upload)
+                with patch.object(UploadAction, "parse_tree", return_value={}), patch.object(Dataset, "md5") as o_mock_md5:
+                    o_ua.push_data_files_pipeline()
+                    o_mock_md5.assert_not_called()
+            # clefs transmises pendant l'envoi
+            self.assertEqual(o_mock_upload.api_push_data_file.call_count, 4)
+            self.assertListEqual(o_dataset.pending_md5, [])
+
     def test_push_md5_files(self)->None:
         """test de __push_md5_files"""
         # pas de upload => rien n'est fait
@@ -537,6 +638,8 @@ class UploadActionTestCase(GpfTestCase):
             with patch.object(UploadAction, "_UploadAction__push_files") as o_mock_push_files:
                 with patch.object(UploadAction, "_UploadAction__normalise_api_push_md5_file") as o_mock_normalise_api_push_md5_file:
                     o_ua.push_md5_files(b_check_conflict)
+                    # les fichiers md5 sont générés avant d'être envoyés
+                    o_dataset.write_md5_files.assert_called()
                     o_mock_push_files.assert_called_once_with(
                         [(p_file, "") for p_file in o_dataset.md5_files],
                         o_mock_normalise_api_push_md5_file,
@@ -693,6 +796,35 @@ class UploadActionTestCase(GpfTestCase):
                         o_mock_upload.push.assert_any_call(o_file, f"base/{o_file.name}")
                     o_mock_check_file.assert_called_once_with(l_files)
 
+    def test_push_files_parallel(self)->None:
+        """test de __push_files avec plusieurs fichiers livrés en parallèle"""
+        o_mock_upload=MagicMock(**{"api_tree.return_value" : []})
+        o_ua = UploadActionNoPrivate(MagicMock())
+        o_ua.set_upload(o_mock_upload)
+        l_files_upload = [MagicMock(**{"name": f"upload_{i}"}) for i in range(10)]
+        l_files = [(o_mock, "base") for o_mock in l_files_upload]
+        # un fichier sur trois est en conflict
+        def push(p_file: Path, s_api_path: str) -> None:  # pylint:disable=unused-argument
+            if l_files_upload.index(p_file) % 3 == 0:
+                raise ConflictError("", "", {}, {}, "")
+        o_mock_upload.push.side_effect = push
+        with patch.object(UploadAction, "parse_tree", return_value={}), patch.object(Config(), "get_int", return_value=4) as o_mock_get_int:
+            with patch.object(UploadAction, "_UploadAction__check_file_uploaded", return_value=[]) as o_mock_check_file:
+                i=o_ua.push_files(l_files, o_mock_upload.push, o_mock_upload.delete, check_conflict=True)
+        o_mock_get_int.assert_called_once_with("upload", "max_parallel_files", 1)
+        # tous les fichiers ont été poussés
+        self.assertEqual(len(l_files), o_mock_upload.push.call_count)
+        self.assertEqual(6, i)
+        # les fichiers en conflict sont vérifiés dans l'ordre de la liste initiale
+        o_mock_check_file.assert_called_once_with([l_files[0], l_files[3], l_files[6], l_files[9]])
+
+        # erreur inattendue : elle est remontée
+        o_mock_upload.push.side_effect = GpfSdkError("erreur")
+        with patch.object(UploadAction, "parse_tree", return_value={}), patch.object(Config(), "get_int", return_value=4):
+            with self.assertRaises(GpfSdkError) as o_err:
+                o_ua.push_files(l_files, o_mock_upload.push, o_mock_upload.delete)
+        self.assertEqual("erreur", o_err.exception.message)
+
     def test_check_file_uploaded(self)->None:
         """test de __check_file_uploaded"""
         # pas d'upload
@@ -796,27 +928,30 @@ class UploadActionTestCase(GpfTestCase):
                 # Vérification sur add_carte_tags() : on devrait avoir "upload_check_ko"
                 o_mock__add_carte_tags.assert_called_once_with(True, o_upload, "upload_check_ko")
 
-    def test_interrupt_monitor_until_end(self) -> None:
-        """Vérifie le bon fonctionnement de monitor_until_end si il y a interruption en cours de route."""
-        # tout déjà traité
-        with patch.object(Upload, "api_list_checks", side_effect=[KeyboardInterrupt(), {"asked":[], "in_progress": []}] ) as o_mock_list_checks:
-            with patch.object(Upload, "api_open") as o_mock_api_open:
-                # On instancie un Upload
+    def test_monitor_in_background(self) -> None:
+        """Vérifie le bon fonctionnement de monitor_in_background."""
+        d_list_checks_wait = {"asked": [{}], "in_progress": [], "passed": [], "failed": []}
+        d_list_checks_ko = {"asked": [], "in_progress": [], "passed": [{}], "failed": [{}]}
+        with patch.object(Upload, "api_list_checks", side_effect=[d_list_checks_wait, d_list_checks_ko]) as o_mock_list_checks:
+            with patch.object(UploadAction, "add_carte_tags") as o_mock__add_carte_tags:
                 o_upload = Upload({"_id": "id_upload_monitor"})
-                # On instancie un faux callback
                 f_callback = MagicMock()
-                f_ctrl_c = MagicMock(return_value=True)
-                # On effectue le monitoring
-                with self.assertRaises(KeyboardInterrupt):
-                    UploadAction.monitor_until_end(o_upload, f_callback, f_ctrl_c)
-
-            # Vérification sur les appels de fonction
-            self.assertEqual(2, o_mock_list_checks.call_count)
-            f_ctrl_c.assert_called_once_with()
-            o_mock_api_open.assert_not_called()
-        # tout traitement en cours
-        with patch.object(Upload, "api_list_checks", side_effect=[KeyboardInterrupt(), {"asked":[], "in_progress": [{'_id': "1"}, {'_id': "2"}]}] ) as o_mock_list_checks:
-            with patch.object(CheckExecution, "api_delete") as o_mock_delete:
+                # Le suivi est mené en arrière-plan, le résultat est transmis par le Future
+                o_future = UploadAction.monitor_in_background(o_upload, f_callback, mode_cartes=True)
+                self.assertFalse(o_future.result(timeout=5))
+                self.assertEqual(o_mock_list_checks.call_count, 2)
+                f_callback.assert_any_call("Vérifications : 1 en attente, 0 en cours, 0 en échec, 0 en succès")
+                f_callback.assert_any_call("Vérifications : 0 en attente, 0 en cours, 1 en échec, 1 en succès")
+                o_mock__add_carte_tags.assert_called_once_with(True, o_upload, "upload_check_ko")
+
+    def test_interrupt_monitor_until_end(self) -> None:
+        """Vérifie le bon fonctionnement de monitor_until_end si il y a interruption en cours de route."""
+        # suivi en arrière-plan : ctrl+C pendant l'attente du résultat
+        o_mock_future = MagicMock()
+        o_mock_future.result.side_effect = KeyboardInterrupt()
+        with patch.object(UploadAction, "monitor_in_background", return_value=o_mock_future) as o_mock_background:
+            # tout déjà traité
+            with patch.object(Upload, "api_list_checks", side_effect=[{"asked":[], "in_progress": []}] ) as o_mock_list_checks:
                 with patch.object(Upload, "api_open") as o_mock_api_open:
                     # On instancie un Upload
                     o_upload = Upload({"_id": "id_upload_monitor"})
@@ -827,26 +962,18 @@ class UploadActionTestCase(GpfTestCase):
                     with self.assertRaises(KeyboardInterrupt):
                         UploadAction.monitor_until_end(o_upload, f_callback, f_ctrl_c)
 
-            # Vérification sur les appels de fonction
-            self.assertEqual(2, o_mock_list_checks.call_count)
-            self.assertEqual(2, o_mock_delete.call_count)
-            f_ctrl_c.assert_called_once_with()
-            o_mock_api_open.assert_called_once_with()
-        # traitement en cours et en attente
-        o_mock_1 = MagicMock()
-        o_mock_1.__getitem__.side_effect = ["WAITING", "WAITING", "PROGRESS", "PROGRESS"]
-        o_mock_1.api_update.return_value = None
-        o_mock_1.api_delete.return_value = None
-        o_mock_2 = MagicMock()
-        o_mock_2.__getitem__.side_effect = ["WAITING", "WAITING", "FAIL", "FAIL"]
-        o_mock_2.api_update.return_value = None
-        o_mock_2.api_delete.return_value = None
-        with patch.object(Upload, "api_list_checks", side_effect=[KeyboardInterrupt(), {"asked":[{'_id': "3"}, {'_id': "4"}], "in_progress": [{'_id': "1"}, {'_id': "2"}]}] ) as o_mock_list_checks:
-            with patch.object(CheckExecution, "api_delete") as o_mock_delete:
-                with patch.object(CheckExecution, "api_get", side_effect=[o_mock_1, o_mock_2]) as o_mock_get:
+                # Vérification sur les appels de fonction
+                o_mock_background.assert_called_once_with(o_upload, f_callback, None)
+                o_mock_future.cancel.assert_called_once_with()
+                self.assertEqual(1, o_mock_list_checks.call_count)
+                f_ctrl_c.assert_called_once_with()
+                o_mock_api_open.assert_not_called()
+            # tout traitement en cours
+            with patch.object(Upload, "api_list_checks", side_effect=[{"asked":[], "in_progress": [{'_id': "1"}, {'_id': "2"}]}] ) as o_mock_list_checks:
+                with patch.object(CheckExecution, "api_delete") as o_mock_delete:
                     with patch.object(Upload, "api_open") as o_mock_api_open:
                         # On instancie un Upload
-                        o_upload = Upload({"_id": "id_upload_monitor"}, "test")
+                        o_upload = Upload({"_id": "id_upload_monitor"})
                         # On instancie un faux callback
                         f_callback = MagicMock()
                         f_ctrl_c = MagicMock(return_value=True)
@@ -854,18 +981,55 @@ class UploadActionTestCase(GpfTestCase):
                         with self.assertRaises(KeyboardInterrupt):
                             UploadAction.monitor_until_end(o_upload, f_callback, f_ctrl_c)
 
-            # Vérification sur les appels de fonction
-            self.assertEqual(2, o_mock_list_checks.call_count)
-            self.assertEqual(2, o_mock_delete.call_count)
-            self.assertEqual(2, o_mock_get.call_count)
-            o_mock_get.assert_any_call("3", "test")
-            o_mock_get.assert_any_call("4", "test")
-            f_ctrl_c.assert_called_once_with()
-            o_mock_api_open.assert_called_once_with()
-            self.assertEqual(2, o_mock_1.api_update.call_count)
-            self.assertEqual(2, o_mock_2.api_update.call_count)
-            o_mock_1.api_delete.assert_called_once_with()
-            o_mock_2.api_delete.assert_not_called()
+                # Vérification sur les appels de fonction
+                self.assertEqual(1, o_mock_list_checks.call_count)
+                self.assertEqual(2, o_mock_delete.call_count)
+                f_ctrl_c.assert_called_once_with()
+                o_mock_api_open.assert_called_once_with()
+            # traitement en cours et en attente
+            o_mock_1 = MagicMock()
+            o_mock_1.__getitem__.side_effect = ["WAITING", "WAITING", "PROGRESS", "PROGRESS"]
+            o_mock_1.api_update.return_value = None
+            o_mock_1.api_delete.return_value = None
+            o_mock_2 = MagicMock()
+            o_mock_2.__getitem__.side_effect = ["WAITING", "WAITING", "FAIL", "FAIL"]
+            o_mock_2.api_update.return_value = None
+            o_mock_2.api_delete.return_value = None
+            with patch.object(Upload, "api_list_checks", side_effect=[{"asked":[{'_id': "3"}, {'_id': "4"}], "in_progress": [{'_id': "1"}, {'_id': "2"}]}] ) as o_mock_list_checks:
+                with patch.object(CheckExecution, "api_delete") as o_mock_delete:
+                    with patch.object(CheckExecution, "api_get", side_effect=[o_mock_1, o_mock_2]) as o_mock_get:
+                        with patch.object(Upload, "api_open") as o_mock_api_open:
+                            # On instancie un Upload
+                            o_upload = Upload({"_id": "id_upload_monitor"}, "test")
+                            # On instancie un faux callback
+                            f_callback = MagicMock()
+                            f_ctrl_c = MagicMock(return_value=True)
+                            # On effectue le monitoring
+                            with self.assertRaises(KeyboardInterrupt):
+                                UploadAction.monitor_until_end(o_upload, f_callback, f_ctrl_c)
+
+                # Vérification sur les appels de fonction
+                self.assertEqual(1, o_mock_list_checks.call_count)
+                self.assertEqual(2, o_mock_delete.call_count)
+                self.assertEqual(2, o_mock_get.call_count)
+                o_mock_get.assert_any_call("3", "test")
+                o_mock_get.assert_any_call("4", "test")
+                f_ctrl_c.assert_called_once_with()
+                o_mock_api_open.assert_called_once_with()
+                self.assertEqual(2, o_mock_1.api_update.call_count)
+                self.assertEqual(2, o_mock_2.api_update.call_count)
+                o_mock_1.api_delete.assert_called_once_with()
+                o_mock_2.api_delete.assert_not_called()
+            # ctrl+C sans arrêt des vérifications : on attend toujours le même suivi
+            o_mock_future.reset_mock()
+            o_mock_future.result.side_effect = [KeyboardInterrupt(), True]
+            with patch.object(Upload, "api_list_checks") as o_mock_list_checks:
+                f_ctrl_c = MagicMock(return_value=False)
+                self.assertTrue(UploadAction.monitor_until_end(Upload({"_id": "id_upload_monitor"}), None, f_ctrl_c))
+                o_mock_list_checks.assert_not_called()
+            self.assertEqual(o_mock_future.result.call_count, 2)
+            o_mock_future.cancel.assert_not_called()
+
 
     def test_api_tree_not_empty(self) -> None:
         """Vérifie le bon fonctionnement de api_tree si ce n'est pas vide."""
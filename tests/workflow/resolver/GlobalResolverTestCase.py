@@ -146,3 +146,46 @@ class GlobalResolverTestCase(GpfTestCase):
             GlobalResolver().resolve("{resolver_not_found.foo}")
         self.assertEqual(o_arc.exception.resolver_name, "resolver_not_found")
         self.assertEqual(o_arc.exception.message, "Le résolveur 'resolver_not_found' demandé est non défini.")
+
+    def test_resolve_batch(self) -> None:
+        """Vérifie que les références sont dédoublonnées puis résolues (en parallèle) avant substitution."""
+        o_mock_resolver = MagicMock()
+        o_mock_resolver.name = "batch_resolver"
+        o_mock_resolver.resolve.side_effect = lambda s_to_solve, **kwargs: s_to_solve.upper()
+        GlobalResolver().add_resolver(o_mock_resolver)
+        s_result = GlobalResolver().resolve("{batch_resolver.a} {batch_resolver.b} {batch_resolver.a} {batch_resolver.{profession.chef}}", datastore="datastore_id")
+        self.assertEqual(s_result, "A B A JACQUES")
+        # Une seule résolution par référence distincte
+        self.assertEqual(o_mock_resolver.resolve.call_count, 3)
+        for s_to_solve in ["a", "b", "Jacques"]:
+            o_mock_resolver.resolve.assert_any_call(s_to_solve, datastore="datastore_id")
+        # Erreur lors d'une résolution : elle est remontée
+        o_mock_resolver.resolve.side_effect = ValueError("erreur")
+        with self.assertRaises(ValueError):
+            GlobalResolver().resolve("{batch_resolver.c} {batch_resolver.d}")
+
+    def test_scope(self) -> None:
+        """Vérifie que les résolveurs ajoutés et les valeurs mises en cache dans une portée y restent confinés."""
+        o_mock_resolver = MagicMock()
+        o_mock_resolver.name = "scope_resolver"
+        o_mock_resolver.resolve.side_effect = ["v1", "v2", "v3"]
+        with GlobalResolver().scope():
+            GlobalResolver().add_resolver(o_mock_resolver)
+            self.assertIn("scope_resolver", GlobalResolver().resolvers)
+            self.assertIn("localization", GlobalResolver().resolvers)
+            # La deuxième résolution est servie par le cache de la portée
+            self.assertEqual(GlobalResolver().resolve("{scope_resolver.a}"), "v1")
+            self.assertEqual(GlobalResolver().resolve("{scope_resolver.a}"), "v1")
+            self.assertEqual(GlobalResolver().cache.hits, 1)
+            self.assertEqual(o_mock_resolver.resolve.call_count, 1)
+            # Les paramètres supplémentaires font partie de la clef
+            self.assertEqual(GlobalResolver().resolve("{scope_resolver.a}", datastore="datastore_id"), "v2")
+        # Hors de la portée, le résolveur n'existe plus
+        self.assertNotIn("scope_resolver", GlobalResolver().resolvers)
+        with self.assertRaises(ResolverNotFoundError):
+            GlobalResolver().resolve("{scope_resolver.a}")
+        # Une nouvelle portée repart d'un cache vide
+        with GlobalResolver().scope():
+            GlobalResolver().add_resolver(o_mock_resolver)
+            self.assertEqual(GlobalResolver().resolve("{scope_resolver.a}"), "v3")
+            self.assertEqual(GlobalResolver().cache.hits, 0)
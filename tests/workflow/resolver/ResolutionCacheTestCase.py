@@ -0,0 +1,53 @@
+from unittest.mock import patch
+
+from sdk_entrepot_gpf.io.Config import Config
+from sdk_entrepot_gpf.workflow.resolver.ResolutionCache import ResolutionCache
+
+from tests.GpfTestCase import GpfTestCase
+
+
+class ResolutionCacheTestCase(GpfTestCase):
+    """Tests ResolutionCache class.
+
+    cmd : python3 -m unittest -b tests.workflow.resolver.ResolutionCacheTestCase
+    """
+
+    def test_get_set(self) -> None:
+        """Vérifie la mise en cache, l'éviction LRU et les compteurs."""
+        o_cache = ResolutionCache(max_size=2)
+        self.assertIsNone(o_cache.get(("{a.x}", "{}")))
+        o_cache.set(("{a.x}", "{}"), "x", "a")
+        o_cache.set(("{a.y}", "{}"), "y", "a")
+        # Lecture de x : y devient la moins récemment utilisée
+        self.assertEqual(o_cache.get(("{a.x}", "{}")), "x")
+        o_cache.set(("{a.z}", "{}"), "z", "a")
+        self.assertEqual(len(o_cache), 2)
+        self.assertIsNone(o_cache.get(("{a.y}", "{}")))
+        self.assertEqual(o_cache.get(("{a.z}", "{}")), "z")
+        self.assertEqual(o_cache.hits, 2)
+        self.assertEqual(o_cache.misses, 2)
+        # Vidage
+        o_cache.clear()
+        self.assertEqual(len(o_cache), 0)
+
+    def test_ttl(self) -> None:
+        """Vérifie la durée de vie par résolveur."""
+        # Valeurs par défaut de la configuration
+        self.assertEqual(ResolutionCache.ttl("datetime"), 0)
+        self.assertEqual(ResolutionCache.ttl("store_entity"), 60)
+        self.assertEqual(ResolutionCache.ttl("params"), -1)
+        o_cache = ResolutionCache()
+        # TTL nul : pas de mise en cache
+        o_cache.set(("{datetime.now}", "{}"), "2024", "datetime")
+        self.assertEqual(len(o_cache), 0)
+        # TTL positif : expiration
+        with patch("time.monotonic", return_value=1000.0):
+            o_cache.set(("{store_entity.x}", "{}"), "id", "store_entity")
+            self.assertEqual(o_cache.get(("{store_entity.x}", "{}")), "id")
+        with patch("time.monotonic", return_value=1061.0):
+            self.assertIsNone(o_cache.get(("{store_entity.x}", "{}")))
+        # Taille maximale lue dans la configuration
+        with patch.object(Config(), "get_int", return_value=0):
+            o_cache = ResolutionCache()
+        o_cache.set(("{params.x}", "{}"), "x", "params")
+        self.assertEqual(len(o_cache), 0)
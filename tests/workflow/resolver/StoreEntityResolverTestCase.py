@@ -108,7 +108,7 @@ class StoreEntityResolverTestCase(GpfTestCase):
                     datastore=None,
                 )
                 # Vérification maj entité via appel de api_update
-                o_mock_api_update.assert_called_once_with()
+                o_mock_api_update.assert_called_once_with(use_cache=True)
 
     def run_resolve(self, d_param: Dict[str, Any]) -> None:
         """lancement des tests pour resolve() sans erreur